@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+JobDeduplicator micro-benchmark.
+
+Feeds synthetic batches (a few large employers with thousands of listings,
+cross-platform reposts, exact re-scrapes) through JobDeduplicator and
+reports throughput and retained-state size. With --compare, the same jobs
+also go through the previous linear-scan fuzzy check to confirm both give
+identical keep/drop decisions and to show the speedup (the scan is O(n^2),
+so keep --compare-jobs modest).
+
+Usage:
+    python benchmark_deduplicator.py
+    python benchmark_deduplicator.py --jobs 100000 --batches 3
+    python benchmark_deduplicator.py --compare --compare-jobs 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+from core import Job, JobDeduplicator
+
+COMPANIES = (
+    ["Bank of America", "Wells Fargo & Co.", "Lowe's Companies, Inc.", "Duke University",
+     "Atrium Health", "Amazon.com LLC"] +
+    [f"Employer {i} Inc." for i in range(2000)]
+)
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Registered Nurse (RN)",
+    "Customer Service Representative", "Warehouse Associate", "Data Analyst II",
+    "Store Manager", "Financial Advisor", "Teller - Part Time", "Medical Assistant",
+    "Project Manager", "Sales Associate", "Pharmacy Technician", "Truck Driver CDL-A",
+]
+CITIES = ["Charlotte", "Raleigh", "Durham", "Greensboro", "Winston-Salem", "Cary",
+          "Wilmington", "Asheville", "Chapel Hill", "High Point"]
+LOCATION_FORMATS = ["{city}, NC", "{city}, NC 27601", "{city}, North Carolina",
+                    "Remote - {city}, NC", "{city} NC", "Hybrid {city}, NC"]
+PLATFORMS = ["indeed", "ziprecruiter", "linkedin", "usajobs", "activejobsdb"]
+
+
+def synthetic_jobs(count: int, rng: random.Random) -> list[Job]:
+    """
+    Jobs skewed towards a handful of large employers, ~30% of them reposts of
+    an earlier job (same URL, or same title/city on another platform).
+    """
+    jobs = []
+    for i in range(count):
+        if jobs and rng.random() < 0.3:
+            original = rng.choice(jobs)
+            if rng.random() < 0.5:
+                # Exact re-scrape of the same URL
+                jobs.append(Job(title=original.title, company=original.company,
+                                location=original.location, platform=original.platform,
+                                url=original.url))
+            else:
+                # Cross-platform repost with a differently formatted location
+                city = original.location.replace("Remote - ", "").replace("Hybrid ", "").split(",")[0].split()[0]
+                jobs.append(Job(title=original.title.upper(), company=original.company + " Inc",
+                                location=rng.choice(LOCATION_FORMATS).format(city=city),
+                                platform=rng.choice(PLATFORMS), url=f"https://example.com/repost/{i}"))
+            continue
+
+        company = COMPANIES[min(int(rng.paretovariate(1.2)) - 1, len(COMPANIES) - 1)]
+        title = f"{rng.choice(TITLES)} {rng.randint(1, 400)}"
+        jobs.append(Job(
+            title=title,
+            company=company,
+            location=rng.choice(LOCATION_FORMATS).format(city=rng.choice(CITIES)),
+            platform=rng.choice(PLATFORMS),
+            url=f"https://example.com/job/{i}",
+        ))
+    rng.shuffle(jobs)
+    return jobs
+
+
+class LinearScanDeduplicator(JobDeduplicator):
+    """The previous fuzzy check: re-normalize every earlier job from the company."""
+
+    def __init__(self):
+        super().__init__()
+        self.jobs_by_company = defaultdict(list)
+
+    def _locations_match(self, loc1: str, loc2: str) -> bool:
+        city1 = self._city(loc1) if loc1 else ''
+        city2 = self._city(loc2) if loc2 else ''
+        return bool(city1 and city2) and city1 == city2
+
+    def add_job(self, job: Job) -> bool:
+        if job.url_hash in self.seen_urls or job.unique_id in self.seen_ids:
+            return False
+
+        company = self._normalize_company(job.company)
+        title = self._normalize_title(job.title)
+        location = self._normalize_location(job.location)
+        for existing in self.jobs_by_company.get(company, []):
+            if (self._normalize_title(existing.title) == title and
+                    self._locations_match(location, self._normalize_location(existing.location))):
+                return False
+
+        self.seen_urls.add(job.url_hash)
+        self.seen_ids.add(job.unique_id)
+        self.jobs_by_company[company].append(job)
+        return True
+
+
+def run(deduplicator_class, jobs: list[Job], batches: int) -> tuple[list[bool], float, int]:
+    """Feed `jobs` in `batches` slices; returns (decisions, seconds, peak bytes)."""
+    dedup = deduplicator_class()
+    size = -(-len(jobs) // batches)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    decisions = []
+    for offset in range(0, len(jobs), size):
+        decisions.extend(dedup.add_job(job) for job in jobs[offset:offset + size])
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return decisions, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JobDeduplicator micro-benchmark")
+    parser.add_argument("--jobs", type=int, default=100_000, help="Jobs per batch")
+    parser.add_argument("--batches", type=int, default=1, help="Number of batches")
+    parser.add_argument("--compare", action="store_true",
+                        help="Also run the previous linear-scan check and verify parity")
+    parser.add_argument("--compare-jobs", type=int, default=3_000,
+                        help="Jobs for the linear-scan comparison")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Generating {args.jobs * args.batches:,} synthetic jobs...")
+    jobs = synthetic_jobs(args.jobs * args.batches, rng)
+
+    decisions, elapsed, peak = run(JobDeduplicator, jobs, args.batches)
+    kept = sum(decisions)
+    print(f"JobDeduplicator: {len(jobs):,} jobs in {elapsed:.2f}s "
+          f"({len(jobs) / elapsed:,.0f} jobs/s), kept {kept:,}, "
+          f"dropped {len(jobs) - kept:,}, peak {peak / 1e6:.1f} MB")
+
+    if not args.compare:
+        return 0
+
+    sample = jobs[:args.compare_jobs]
+    indexed, indexed_s, indexed_peak = run(JobDeduplicator, sample, 1)
+    linear, linear_s, linear_peak = run(LinearScanDeduplicator, sample, 1)
+    print(f"\nComparison on {len(sample):,} jobs:")
+    print(f"  indexed:     {indexed_s:.3f}s, peak {indexed_peak / 1e6:.1f} MB")
+    print(f"  linear scan: {linear_s:.3f}s, peak {linear_peak / 1e6:.1f} MB "
+          f"({linear_s / indexed_s:.0f}x slower)")
+
+    mismatches = sum(a != b for a, b in zip(indexed, linear))
+    if mismatches:
+        print(f"  FAILED: {mismatches} keep/drop decisions differ")
+        return 1
+    print("  OK: identical keep/drop decisions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
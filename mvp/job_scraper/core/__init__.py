@@ -3,6 +3,8 @@
 from .models import Job, SearchQuery, ScrapeResult, StateResult
 from .iterator import StateConfig, GroupIterator, load_state_config, list_available_states
 from .deduplicator import JobDeduplicator
+from .scheduler import PlatformConfig, ScrapeOutcome, ScrapeScheduler
+from .sink import StreamingJobSink, job_from_record
 
 __all__ = [
     "Job",
@@ -14,4 +16,9 @@ __all__ = [
     "load_state_config",
     "list_available_states",
     "JobDeduplicator",
+    "PlatformConfig",
+    "ScrapeOutcome",
+    "ScrapeScheduler",
+    "StreamingJobSink",
+    "job_from_record",
 ]
@@ -3,35 +3,57 @@
 from typing import Optional
 from collections import defaultdict
 import re
+import threading
 
 from .models import Job
 
 
+# Compiled once; normalization runs once per incoming job
+_COMPANY_SUFFIXES = [
+    re.compile(r'\s+(inc\.?|llc\.?|ltd\.?|corp\.?|corporation|company|co\.?)$', re.IGNORECASE),
+    re.compile(r'\s+\(.*\)$', re.IGNORECASE),
+]
+_NON_WORD = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+_ZIP_CODE = re.compile(r'\d{5}(-\d{4})?')
+_ARRANGEMENT_WORDS = re.compile(r'\b(remote|hybrid|onsite|on-site)\b')
+
+# (normalized title, city) - what the fuzzy cross-platform check compares
+FuzzyKey = tuple[str, str]
+
+
 class JobDeduplicator:
-    """Removes duplicate job listings across platforms and searches."""
+    """
+    Removes duplicate job listings across platforms and searches.
+
+    Besides exact URL / unique_id matches, a job is a fuzzy duplicate of an
+    earlier one from the same (normalized) company with the same normalized
+    title in the same city. Those (title, city) keys are computed once per
+    job and kept in a per-company hash set, so the check is a set lookup
+    and only compact keys are retained, not the Job objects.
+
+    Thread-safe: platform workers can feed one deduplicator concurrently.
+    """
 
     def __init__(self):
+        self._lock = threading.RLock()
         self.seen_urls: set[str] = set()
         self.seen_ids: set[str] = set()
-        self.jobs_by_company: dict[str, list[Job]] = defaultdict(list)
+        self.keys_by_company: dict[str, set[FuzzyKey]] = defaultdict(set)
 
     def _normalize_company(self, company: str) -> str:
         """Normalize company name for comparison."""
         # Remove common suffixes
-        suffixes = [
-            r'\s+(inc\.?|llc\.?|ltd\.?|corp\.?|corporation|company|co\.?)$',
-            r'\s+\(.*\)$',
-        ]
         normalized = company.lower().strip()
-        for suffix in suffixes:
-            normalized = re.sub(suffix, '', normalized, flags=re.IGNORECASE)
+        for suffix in _COMPANY_SUFFIXES:
+            normalized = suffix.sub('', normalized)
         return normalized.strip()
 
     def _normalize_title(self, title: str) -> str:
         """Normalize job title for comparison."""
         # Remove special characters and extra spaces
-        normalized = re.sub(r'[^\w\s]', ' ', title.lower())
-        normalized = re.sub(r'\s+', ' ', normalized)
+        normalized = _NON_WORD.sub(' ', title.lower())
+        normalized = _WHITESPACE.sub(' ', normalized)
         return normalized.strip()
 
     def _normalize_location(self, location: str) -> str:
@@ -39,68 +61,80 @@ class JobDeduplicator:
         # Extract city and state
         normalized = location.lower().strip()
         # Remove zip codes
-        normalized = re.sub(r'\d{5}(-\d{4})?', '', normalized)
+        normalized = _ZIP_CODE.sub('', normalized)
         # Remove common words
-        normalized = re.sub(r'\b(remote|hybrid|onsite|on-site)\b', '', normalized)
+        normalized = _ARRANGEMENT_WORDS.sub('', normalized)
         return normalized.strip()
 
+    def _city(self, normalized_location: str) -> str:
+        """First word of the first comma-separated part (usually the city); '' if none."""
+        words = normalized_location.split(',')[0].split()
+        return words[0] if words else ''
+
+    def _fuzzy_key(self, job: Job) -> tuple[str, Optional[FuzzyKey]]:
+        """
+        (normalized company, (normalized title, city)). The key is None when
+        the job has no city, since such jobs never fuzzy-match.
+        """
+        company = self._normalize_company(job.company)
+        city = self._city(self._normalize_location(job.location))
+        if not city:
+            return company, None
+        return company, (self._normalize_title(job.title), city)
+
     def is_duplicate(self, job: Job, fuzzy: bool = True) -> bool:
         """Check if a job is a duplicate."""
+        with self._lock:
+            return self._is_duplicate(job.url_hash, job.unique_id,
+                                      self._fuzzy_key(job) if fuzzy else None)
+
+    def _is_duplicate(
+        self,
+        url_hash: str,
+        unique_id: str,
+        fuzzy_key: Optional[tuple[str, Optional[FuzzyKey]]]
+    ) -> bool:
         # Check URL first (exact match)
-        if job.url_hash in self.seen_urls:
+        if url_hash in self.seen_urls:
             return True
 
         # Check unique ID (title + company + location hash)
-        if job.unique_id in self.seen_ids:
+        if unique_id in self.seen_ids:
             return True
 
-        if fuzzy:
-            # Fuzzy matching for cross-platform duplicates
-            normalized_company = self._normalize_company(job.company)
-            normalized_title = self._normalize_title(job.title)
-            normalized_location = self._normalize_location(job.location)
-
-            # Check against existing jobs from same company
-            for existing in self.jobs_by_company.get(normalized_company, []):
-                existing_title = self._normalize_title(existing.title)
-                existing_location = self._normalize_location(existing.location)
-
-                # Same title and similar location = duplicate
-                if normalized_title == existing_title:
-                    # Check if locations are similar (same city)
-                    if self._locations_match(normalized_location, existing_location):
-                        return True
+        # Fuzzy matching for cross-platform duplicates: same company, same
+        # title and same city
+        if fuzzy_key is not None:
+            company, key = fuzzy_key
+            if key is not None and key in self.keys_by_company.get(company, ()):
+                return True
 
         return False
 
-    def _locations_match(self, loc1: str, loc2: str) -> bool:
-        """Check if two locations are the same city."""
-        # Extract first word (usually city name)
-        city1 = loc1.split(',')[0].split()[0] if loc1 else ''
-        city2 = loc2.split(',')[0].split()[0] if loc2 else ''
-
-        if not city1 or not city2:
-            return False
-
-        return city1 == city2
-
     def add_job(self, job: Job) -> bool:
         """
         Add a job to the deduplicator.
         Returns True if the job was added (not a duplicate).
         Returns False if the job was a duplicate.
         """
-        if self.is_duplicate(job):
-            return False
+        # Hash and normalize outside the lock; it's the expensive part
+        url_hash = job.url_hash
+        unique_id = job.unique_id
+        company, key = self._fuzzy_key(job)
 
-        # Track this job
-        self.seen_urls.add(job.url_hash)
-        self.seen_ids.add(job.unique_id)
+        with self._lock:
+            if self._is_duplicate(url_hash, unique_id, (company, key)):
+                return False
 
-        normalized_company = self._normalize_company(job.company)
-        self.jobs_by_company[normalized_company].append(job)
+            # Track this job
+            self.seen_urls.add(url_hash)
+            self.seen_ids.add(unique_id)
 
-        return True
+            keys = self.keys_by_company[company]
+            if key is not None:
+                keys.add(key)
+
+            return True
 
     def deduplicate_batch(self, jobs: list[Job]) -> tuple[list[Job], int]:
         """
@@ -120,14 +154,16 @@ class JobDeduplicator:
 
     def get_stats(self) -> dict:
         """Get deduplication statistics."""
-        return {
-            "total_unique_urls": len(self.seen_urls),
-            "total_unique_ids": len(self.seen_ids),
-            "companies_seen": len(self.jobs_by_company),
-        }
+        with self._lock:
+            return {
+                "total_unique_urls": len(self.seen_urls),
+                "total_unique_ids": len(self.seen_ids),
+                "companies_seen": len(self.keys_by_company),
+            }
 
     def reset(self):
         """Reset the deduplicator state."""
-        self.seen_urls.clear()
-        self.seen_ids.clear()
-        self.jobs_by_company.clear()
+        with self._lock:
+            self.seen_urls.clear()
+            self.seen_ids.clear()
+            self.keys_by_company.clear()
@@ -1,9 +1,10 @@
 """Data models for job scraping."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from typing import Optional
 import hashlib
+import json
 
 
 @dataclass
@@ -78,6 +79,11 @@ class SearchQuery:
     group_name: str = ""
     phase: int = 1
 
+    @property
+    def key(self) -> str:
+        """Stable identifier for checkpointing completed queries."""
+        return json.dumps(asdict(self), sort_keys=True)
+
 
 @dataclass
 class ScrapeResult:
@@ -0,0 +1,181 @@
+"""Concurrent per-platform scrape scheduling."""
+
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+import logging
+import queue
+import threading
+
+from .models import SearchQuery, ScrapeResult
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PlatformConfig:
+    """
+    Scheduling options for one platform.
+
+    Each worker owns its own scraper instance, and so its own session and
+    rate limiter: `workers` multiplies the request rate against the platform.
+    """
+    workers: int = 1
+    rate_limit_seconds: Optional[float] = None  # Overrides the scraper's default
+    scraper_config: Optional[dict] = None       # Passed to the scraper constructor
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "PlatformConfig":
+        data = dict(data or {})
+        return cls(
+            workers=max(1, int(data.pop("workers", 1))),
+            rate_limit_seconds=data.pop("rate_limit_seconds", None),
+            scraper_config=data or None,
+        )
+
+
+@dataclass
+class ScrapeOutcome:
+    """One query executed on one platform."""
+    platform: str
+    query: SearchQuery
+    result: Optional[ScrapeResult] = None
+    error: Optional[str] = None
+
+
+# Sentinel that tells a worker thread to exit
+_STOP = object()
+
+
+class PlatformWorker:
+    """A queue of queries for one platform, drained by its own worker threads."""
+
+    def __init__(self, platform: str, scrapers: list):
+        self.platform = platform
+        self.scrapers = scrapers
+        self.tasks: queue.Queue = queue.Queue()
+        self.threads: list[threading.Thread] = []
+
+    def start(self):
+        self.threads = [
+            threading.Thread(
+                target=self._run, args=(scraper,),
+                name=f"scrape-{self.platform}-{i}", daemon=True
+            )
+            for i, scraper in enumerate(self.scrapers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, query: SearchQuery, replies: queue.Queue):
+        self.tasks.put((query, replies))
+
+    def stop(self):
+        for _ in self.threads:
+            self.tasks.put(_STOP)
+
+    def join(self, timeout: Optional[float] = None):
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def _run(self, scraper):
+        while True:
+            task = self.tasks.get()
+            if task is _STOP:
+                return
+            query, replies = task
+            try:
+                replies.put(ScrapeOutcome(self.platform, query, result=scraper.search(query)))
+            except Exception as e:
+                replies.put(ScrapeOutcome(self.platform, query, error=str(e)))
+
+
+class ScrapeScheduler:
+    """
+    Runs every query on every platform, with platforms working in parallel.
+
+    Each platform has its own worker(s), so one platform's rate-limit sleeps
+    never hold up another, and total wall time approaches the slowest
+    platform's rather than the sum. The scheduler is long-lived: several
+    run() calls (e.g. one per state) can be in flight at once and still
+    share each platform's rate limiter.
+    """
+
+    def __init__(
+        self,
+        scraper_factory: Callable[[str, PlatformConfig], Optional[object]],
+        platforms: list[str],
+        platform_configs: Optional[dict[str, PlatformConfig]] = None
+    ):
+        platform_configs = platform_configs or {}
+        self.workers: dict[str, PlatformWorker] = {}
+
+        for platform in platforms:
+            config = platform_configs.get(platform) or PlatformConfig()
+            scrapers = []
+            for _ in range(config.workers):
+                scraper = scraper_factory(platform, config)
+                if scraper is None:
+                    break
+                if config.rate_limit_seconds is not None:
+                    scraper.rate_limit_seconds = config.rate_limit_seconds
+                scrapers.append(scraper)
+            if scrapers:
+                self.workers[platform] = PlatformWorker(platform, scrapers)
+            else:
+                logger.warning(f"Unknown platform: {platform}")
+
+        self._started = False
+        self._lock = threading.Lock()
+
+    @property
+    def platforms(self) -> list[str]:
+        return list(self.workers)
+
+    def start(self):
+        with self._lock:
+            if not self._started:
+                for worker in self.workers.values():
+                    worker.start()
+                self._started = True
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if not self._started:
+                return
+            for worker in self.workers.values():
+                worker.stop()
+            if wait:
+                for worker in self.workers.values():
+                    worker.join()
+            self._started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def run(
+        self,
+        queries: list[SearchQuery],
+        skip: Optional[Callable[[SearchQuery, str], bool]] = None
+    ) -> Iterator[ScrapeOutcome]:
+        """
+        Fan every query out to every platform and yield outcomes as they
+        complete (one per submitted pair, in completion order). Pairs for
+        which skip(query, platform) is true are not run.
+        """
+        self.start()
+        replies: queue.Queue = queue.Queue()
+        submitted = 0
+        for query in queries:
+            for platform, worker in self.workers.items():
+                if skip and skip(query, platform):
+                    continue
+                worker.submit(query, replies)
+                submitted += 1
+
+        for _ in range(submitted):
+            yield replies.get()
@@ -0,0 +1,442 @@
+"""Streaming, resumable output for state scrapes."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+import csv
+import json
+import logging
+import os
+import sqlite3
+import time
+
+from .models import Job, SearchQuery
+
+
+logger = logging.getLogger(__name__)
+
+
+CSV_COLUMNS = [
+    'title', 'company', 'location', 'platform', 'url',
+    'salary_min', 'salary_max', 'salary_type', 'job_type',
+    'remote', 'posted_date', 'search_group'
+]
+
+# Fields needed to rebuild deduplicator state on resume
+_IDENTITY_FIELDS = ('title', 'company', 'location', 'platform', 'url')
+
+
+def _truncate_partial_line(path: Path):
+    """Drop a trailing half-written line left by a crash mid-write."""
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    with open(path, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b'\n':
+            return
+        f.seek(0)
+        data = f.read()
+        f.truncate(data.rfind(b'\n') + 1)
+
+
+def _truncate_file(path: Path, size: int):
+    """Cut a file back to its first `size` bytes."""
+    if path.exists() and path.stat().st_size > size:
+        with open(path, 'rb+') as f:
+            f.truncate(size)
+
+
+class JobWriter(ABC):
+    """Appends jobs to one output file."""
+
+    extension = ""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @abstractmethod
+    def open(self):
+        """Open the output for appending."""
+        pass
+
+    @abstractmethod
+    def write(self, job: Job):
+        """Append one job; durable once flush() returns."""
+        pass
+
+    @abstractmethod
+    def flush(self):
+        """Make everything written so far durable."""
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Release the output."""
+        pass
+
+    @abstractmethod
+    def read_existing(self) -> Iterator[dict]:
+        """Jobs already written by an interrupted run."""
+        pass
+
+    @abstractmethod
+    def position(self) -> int:
+        """Where the durable output ends; valid right after flush()."""
+        pass
+
+    @abstractmethod
+    def truncate(self, position: int):
+        """Drop everything written after `position` (called before open())."""
+        pass
+
+
+class _LineFileWriter(JobWriter):
+    """A writer whose output is a text file; positions are byte offsets."""
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def position(self) -> int:
+        return self._file.tell()
+
+    def truncate(self, position: int):
+        _truncate_file(self.path, position)
+
+
+class NDJSONWriter(_LineFileWriter):
+    """One Job.to_dict() JSON object per line."""
+
+    extension = "ndjson"
+
+    def open(self):
+        _truncate_partial_line(self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def write(self, job: Job):
+        self._file.write(json.dumps(job.to_dict()) + '\n')
+
+    def read_existing(self) -> Iterator[dict]:
+        if not self.path.exists():
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+class CSVWriter(_LineFileWriter):
+    """The flat CSV used for easy viewing."""
+
+    extension = "csv"
+
+    def open(self):
+        _truncate_partial_line(self.path)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open(self.path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if is_new:
+            self._writer.writerow(CSV_COLUMNS)
+
+    def write(self, job: Job):
+        self._writer.writerow([
+            job.title,
+            job.company,
+            job.location,
+            job.platform,
+            job.url,
+            job.salary_min,
+            job.salary_max,
+            job.salary_type,
+            job.job_type,
+            job.remote,
+            job.posted_date.isoformat() if job.posted_date else '',
+            job.search_group
+        ])
+
+    def read_existing(self) -> Iterator[dict]:
+        if not self.path.exists():
+            return
+        with open(self.path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+
+class SQLiteWriter(JobWriter):
+    """A local SQLite table of Job.to_dict() rows, keyed by unique_id."""
+
+    extension = "sqlite"
+
+    def open(self):
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                unique_id TEXT PRIMARY KEY,
+                title TEXT, company TEXT, location TEXT, platform TEXT, url TEXT,
+                description TEXT, salary_min REAL, salary_max REAL, salary_type TEXT,
+                job_type TEXT, posted_date TEXT, industry TEXT, remote INTEGER,
+                scraped_at TEXT, search_group TEXT, search_term TEXT
+            )
+        """)
+        self._pending: list[dict] = []
+
+    def write(self, job: Job):
+        self._pending.append(job.to_dict())
+
+    def flush(self):
+        if not self._pending:
+            return
+        columns = list(self._pending[0])
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO jobs ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            [[row[c] for c in columns] for row in self._pending]
+        )
+        self._conn.commit()
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def read_existing(self) -> Iterator[dict]:
+        if not self.path.exists():
+            return
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            for row in conn.execute(f"SELECT {', '.join(_IDENTITY_FIELDS)} FROM jobs"):
+                yield dict(row)
+        except sqlite3.OperationalError:
+            return
+        finally:
+            conn.close()
+
+    def position(self) -> int:
+        return self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM jobs").fetchone()[0]
+
+    def truncate(self, position: int):
+        if not self.path.exists():
+            return
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("DELETE FROM jobs WHERE rowid > ?", (position,))
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            conn.close()
+
+
+WRITERS = {cls.extension: cls for cls in (NDJSONWriter, CSVWriter, SQLiteWriter)}
+
+
+class StreamingJobSink:
+    """
+    Writes a state's deduplicated jobs as they arrive, instead of holding
+    them all for one JSON/CSV dump at the end.
+
+    While a run is in progress its files have fixed names
+    ({state}_jobs.{ndjson,csv,sqlite}) next to {state}_checkpoint.ndjson,
+    which lists every completed (query, platform) pair with its job and
+    error counts. Jobs and checkpoint entries are buffered and flushed
+    together - jobs first - every `flush_every` jobs or `flush_seconds`,
+    so a pair is never recorded as done before its jobs are on disk. Each
+    entry also records every writer's position after that flush.
+
+    A rerun after a crash resumes: every output is cut back to the
+    positions in the last checkpoint entry, so all formats hold the same
+    jobs even if some had flushed more than others before the crash
+    (the file buffers fill at different rates; SQLite holds rows until
+    flush). Completed pairs are skipped, running counters are restored
+    from the checkpoint, and the checkpointed jobs are replayed into the
+    deduplicator. finish() writes the summary from
+    the counters and renames the files to timestamped names.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        state_slug: str,
+        formats: tuple[str, ...] = ("ndjson", "csv"),
+        flush_every: int = 500,
+        flush_seconds: float = 30.0
+    ):
+        unknown = set(formats) - set(WRITERS)
+        if unknown or not formats:
+            raise ValueError(f"Unknown output format(s): {sorted(unknown) or formats}")
+
+        self.output_dir = output_dir
+        self.state_slug = state_slug
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.writers = [
+            WRITERS[fmt](output_dir / f"{state_slug}_jobs.{WRITERS[fmt].extension}")
+            for fmt in formats
+        ]
+        self.checkpoint_path = output_dir / f"{state_slug}_checkpoint.ndjson"
+
+        # Running counters (restored on resume)
+        self.total_jobs = 0
+        self.unique_jobs = 0
+        self.errors: list[str] = []
+        self.prior_seconds = 0.0
+        self.completed: set[tuple[str, str]] = set()
+        self.positions: dict[str, int] = {}
+
+        self._pending_checkpoints: list[dict] = []
+        self._unflushed = 0
+        self._last_flush = time.time()
+        self._started = time.time()
+        self._checkpoint_file = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def in_progress(self) -> bool:
+        """True if an interrupted run left a checkpoint behind."""
+        return self.checkpoint_path.exists()
+
+    def discard(self):
+        """Delete an interrupted run's files to start over."""
+        for path in [w.path for w in self.writers] + [self.checkpoint_path]:
+            if path.exists():
+                path.unlink()
+
+    def open(self) -> list[dict]:
+        """
+        Open the files for appending. Returns the jobs an interrupted run
+        already wrote (identity fields only), for replaying into the
+        deduplicator.
+        """
+        existing = []
+        if self.in_progress:
+            self._load_checkpoint()
+            # Anything past the last checkpoint belongs to pairs that will be rerun
+            for writer in self.writers:
+                writer.truncate(self.positions.get(writer.extension, 0))
+            existing = list(self.writers[0].read_existing())
+            self.unique_jobs = len(existing)
+            logger.info(
+                f"Resuming {self.state_slug}: {len(self.completed)} query/platform pairs done, "
+                f"{self.unique_jobs} jobs already written"
+            )
+
+        for writer in self.writers:
+            writer.open()
+        _truncate_partial_line(self.checkpoint_path)
+        self._checkpoint_file = open(self.checkpoint_path, 'a', encoding='utf-8')
+        self._started = time.time()
+        return existing
+
+    def _load_checkpoint(self):
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.completed.add((entry['query'], entry['platform']))
+                self.total_jobs += entry.get('jobs_found', 0)
+                self.errors.extend(entry.get('errors', []))
+                self.prior_seconds = max(self.prior_seconds, entry.get('elapsed', 0.0))
+                self.positions = entry.get('positions', self.positions)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent on this state, including interrupted runs."""
+        return self.prior_seconds + (time.time() - self._started)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def is_done(self, query: SearchQuery, platform: str) -> bool:
+        return (query.key, platform) in self.completed
+
+    def write_job(self, job: Job):
+        """Append one deduplicated job."""
+        for writer in self.writers:
+            writer.write(job)
+        self.unique_jobs += 1
+        self._unflushed += 1
+
+    def mark_done(self, query: SearchQuery, platform: str, jobs_found: int, errors: list[str]):
+        """Record a completed (query, platform) pair once its jobs are written."""
+        self.total_jobs += jobs_found
+        self.errors.extend(errors)
+        self.completed.add((query.key, platform))
+        self._pending_checkpoints.append({
+            'query': query.key,
+            'platform': platform,
+            'jobs_found': jobs_found,
+            'errors': errors,
+            'elapsed': round(self.elapsed, 2),
+        })
+        if (self._unflushed >= self.flush_every or
+                time.time() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def add_error(self, error: str):
+        """An error for a pair that will be retried (not checkpointed)."""
+        self.errors.append(error)
+
+    def flush(self):
+        """Flush jobs, then the checkpoint entries that cover them."""
+        for writer in self.writers:
+            writer.flush()
+        if self._pending_checkpoints:
+            self.positions = {w.extension: w.position() for w in self.writers}
+            self._checkpoint_file.write(''.join(
+                json.dumps({**entry, 'positions': self.positions}) + '\n'
+                for entry in self._pending_checkpoints
+            ))
+            self._checkpoint_file.flush()
+            os.fsync(self._checkpoint_file.fileno())
+            self._pending_checkpoints = []
+        self._unflushed = 0
+        self._last_flush = time.time()
+
+    def close(self):
+        """Flush and close, leaving the checkpoint so a rerun resumes."""
+        self.flush()
+        for writer in self.writers:
+            writer.close()
+        self._checkpoint_file.close()
+
+    def finish(self, summary: dict) -> dict[str, Path]:
+        """
+        Close, write the summary, rename outputs to timestamped names and
+        drop the checkpoint. Returns the final paths.
+        """
+        self.close()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        paths = {}
+        for writer in self.writers:
+            final = self.output_dir / f"{self.state_slug}_jobs_{timestamp}.{writer.extension}"
+            writer.path.rename(final)
+            paths[writer.extension] = final
+
+        summary_path = self.output_dir / f"{self.state_slug}_summary_{timestamp}.json"
+        with open(summary_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        paths['summary'] = summary_path
+
+        self.checkpoint_path.unlink()
+        return paths
+
+
+def job_from_record(record: dict) -> Optional[Job]:
+    """Rebuild the identity part of a Job from a written record."""
+    try:
+        return Job(**{field: record[field] or '' for field in _IDENTITY_FIELDS})
+    except KeyError:
+        return None
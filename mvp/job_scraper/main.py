@@ -10,15 +10,15 @@ import argparse
 import json
 import logging
 import sys
-import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from core import (
-    Job, SearchQuery, ScrapeResult, StateResult,
+    SearchQuery, StateResult,
     GroupIterator, load_state_config, list_available_states,
-    JobDeduplicator
+    JobDeduplicator, PlatformConfig, ScrapeScheduler,
+    StreamingJobSink, job_from_record
 )
 from scrapers import ScraperRegistry
 
@@ -31,31 +31,56 @@ logger = logging.getLogger(__name__)
 
 
 class JobScrapeOrchestrator:
-    """Orchestrates job scraping across platforms and search groups."""
+    """
+    Orchestrates job scraping across platforms and search groups.
+
+    Queries run on all platforms in parallel through a ScrapeScheduler (one
+    worker and rate limiter per platform, configurable via platform_configs),
+    and results from every platform funnel into one deduplicator per state.
+    max_workers is the number of states scraped concurrently.
+
+    Deduplicated jobs stream to output_dir in output_formats (ndjson, csv,
+    sqlite) as they arrive rather than being held in memory; with resume,
+    an interrupted state continues from its checkpoint.
+    """
 
     def __init__(
         self,
         platforms: Optional[list[str]] = None,
         max_workers: int = 2,
-        output_dir: Path = None
+        output_dir: Path = None,
+        platform_configs: Optional[dict[str, dict]] = None,
+        output_formats: tuple[str, ...] = ("ndjson", "csv"),
+        resume: bool = True
     ):
         self.platforms = platforms or ["indeed", "ziprecruiter"]
         self.max_workers = max_workers
         self.output_dir = output_dir or Path(__file__).parent / "output"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_formats = tuple(output_formats)
+        self.resume = resume
+
+        self.platform_configs = {
+            platform: PlatformConfig.from_dict(config)
+            for platform, config in (platform_configs or {}).items()
+        }
+        self.scheduler = ScrapeScheduler(
+            lambda platform, config: ScraperRegistry.create(platform, config.scraper_config),
+            self.platforms,
+            self.platform_configs
+        )
 
-        # Initialize scrapers
-        self.scrapers = {}
-        for platform in self.platforms:
-            scraper = ScraperRegistry.create(platform)
-            if scraper:
-                self.scrapers[platform] = scraper
-            else:
-                logger.warning(f"Unknown platform: {platform}")
+    @property
+    def scrapers(self) -> dict:
+        """First scraper instance per platform."""
+        return {name: worker.scrapers[0] for name, worker in self.scheduler.workers.items()}
+
+    def close(self):
+        """Stop the platform worker threads."""
+        self.scheduler.shutdown()
 
     def scrape_state(self, state_name: str, progress_callback=None) -> StateResult:
         """Scrape all jobs for a single state."""
-        start_time = time.time()
         logger.info(f"Starting scrape for {state_name}")
 
         # Load state config
@@ -79,111 +104,93 @@ class JobScrapeOrchestrator:
         iterator = GroupIterator(config)
         deduplicator = JobDeduplicator()
 
-        all_jobs: list[Job] = []
-        all_results: list[ScrapeResult] = []
-        all_errors: list[str] = []
-        total_jobs_before_dedup = 0
+        # Jobs stream to disk as they arrive; a checkpoint of completed
+        # (query, platform) pairs lets a rerun pick up where this one stopped
+        state_slug = config.state.lower().replace(" ", "_")
+        sink = StreamingJobSink(self.output_dir, state_slug, self.output_formats)
+        if sink.in_progress and not self.resume:
+            logger.info(f"Discarding interrupted run for {config.state}")
+            sink.discard()
+        for record in sink.open():
+            job = job_from_record(record)
+            if job:
+                deduplicator.add_job(job)
 
         # Get all queries
         queries = list(iterator.iterate_all())
         total_queries = len(queries)
         logger.info(f"Total queries to execute: {total_queries}")
 
-        # Process queries
-        for i, query in enumerate(queries, 1):
-            if progress_callback:
-                progress_callback(i, total_queries, query)
-
-            logger.info(f"[{i}/{total_queries}] Processing: {query.group_name} - {query.location}")
-
-            # Execute on each platform
-            for platform_name, scraper in self.scrapers.items():
-                try:
-                    result = scraper.search(query)
-                    all_results.append(result)
-
-                    if result.errors:
-                        all_errors.extend(result.errors)
+        # Every query runs on every platform in parallel; outcomes arrive
+        # in completion order and are deduplicated here as they land
+        total_tasks = total_queries * len(self.scheduler.platforms)
+        done_before = len(sink.completed)
+        try:
+            for i, outcome in enumerate(self.scheduler.run(queries, skip=sink.is_done), done_before + 1):
+                query = outcome.query
+                platform_name = outcome.platform
+                if progress_callback:
+                    progress_callback(i, total_tasks, query)
+
+                if outcome.error is not None:
+                    # Not checkpointed, so a rerun retries this pair
+                    error_msg = f"Error with {platform_name}: {outcome.error}"
+                    logger.error(error_msg)
+                    sink.add_error(error_msg)
+                    continue
 
-                    # Deduplicate jobs
-                    for job in result.jobs:
-                        total_jobs_before_dedup += 1
-                        if deduplicator.add_job(job):
-                            all_jobs.append(job)
+                result = outcome.result
 
-                    logger.info(
-                        f"  {platform_name}: {len(result.jobs)} jobs found, "
-                        f"{deduplicator.get_stats()['total_unique_ids']} unique total"
-                    )
+                # Deduplicate jobs
+                for job in result.jobs:
+                    if deduplicator.add_job(job):
+                        sink.write_job(job)
+                sink.mark_done(query, platform_name, len(result.jobs), result.errors)
 
-                except Exception as e:
-                    error_msg = f"Error with {platform_name}: {str(e)}"
-                    logger.error(error_msg)
-                    all_errors.append(error_msg)
-
-        duration = time.time() - start_time
-        duplicates_removed = total_jobs_before_dedup - len(all_jobs)
+                logger.info(
+                    f"[{i}/{total_tasks}] {platform_name}: {query.group_name} - {query.location}: "
+                    f"{len(result.jobs)} jobs found, {sink.unique_jobs} unique total"
+                )
+        except BaseException:
+            sink.close()
+            raise
 
         # Estimate coverage
         estimated_total = config.config.get("estimated_total_jobs", 0)
-        coverage = len(all_jobs) / estimated_total if estimated_total > 0 else 0
+        coverage = sink.unique_jobs / estimated_total if estimated_total > 0 else 0
 
         result = StateResult(
             state=config.state,
             state_abbrev=config.state_abbrev,
-            total_jobs=total_jobs_before_dedup,
-            unique_jobs=len(all_jobs),
-            duplicates_removed=duplicates_removed,
+            total_jobs=sink.total_jobs,
+            unique_jobs=sink.unique_jobs,
+            duplicates_removed=sink.total_jobs - sink.unique_jobs,
             coverage_estimate=coverage,
-            jobs=all_jobs,
-            scrape_results=all_results,
-            errors=all_errors,
-            duration_seconds=duration
+            jobs=[],
+            scrape_results=[],
+            errors=sink.errors,
+            duration_seconds=sink.elapsed
         )
 
-        # Save results
-        self._save_results(result)
+        # Summary from the running counters; outputs get timestamped names
+        paths = sink.finish(self._summary(result))
+        for kind, path in paths.items():
+            logger.info(f"Saved {kind} to {path}")
 
         return result
 
     def scrape_multiple_states(self, state_names: list[str]) -> dict[str, StateResult]:
-        """Scrape multiple states sequentially."""
-        results = {}
-        for state_name in state_names:
-            results[state_name] = self.scrape_state(state_name)
-        return results
-
-    def _save_results(self, result: StateResult):
-        """Save scrape results to files."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        state_slug = result.state.lower().replace(" ", "_")
-
-        # Save jobs as JSON
-        jobs_file = self.output_dir / f"{state_slug}_jobs_{timestamp}.json"
-        jobs_data = {
-            "state": result.state,
-            "state_abbrev": result.state_abbrev,
-            "scraped_at": result.scraped_at.isoformat(),
-            "total_jobs": result.total_jobs,
-            "unique_jobs": result.unique_jobs,
-            "duplicates_removed": result.duplicates_removed,
-            "coverage_estimate": result.coverage_estimate,
-            "duration_seconds": result.duration_seconds,
-            "jobs": [job.to_dict() for job in result.jobs]
-        }
-
-        with open(jobs_file, 'w') as f:
-            json.dump(jobs_data, f, indent=2)
-
-        logger.info(f"Saved {len(result.jobs)} jobs to {jobs_file}")
-
-        # Save CSV for easy viewing
-        csv_file = self.output_dir / f"{state_slug}_jobs_{timestamp}.csv"
-        self._save_csv(result.jobs, csv_file)
-
-        # Save summary
-        summary_file = self.output_dir / f"{state_slug}_summary_{timestamp}.json"
-        summary = {
+        """
+        Scrape up to max_workers states at once. States share the platform
+        workers, so each platform's rate limit still applies across all of them.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            futures = {name: pool.submit(self.scrape_state, name) for name in state_names}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _summary(self, result: StateResult) -> dict:
+        """Summary file contents for a finished state."""
+        return {
             "state": result.state,
             "state_abbrev": result.state_abbrev,
             "scraped_at": result.scraped_at.isoformat(),
@@ -196,39 +203,6 @@ class JobScrapeOrchestrator:
             "errors": result.errors[:20]  # First 20 errors
         }
 
-        with open(summary_file, 'w') as f:
-            json.dump(summary, f, indent=2)
-
-    def _save_csv(self, jobs: list[Job], filepath: Path):
-        """Save jobs to CSV format."""
-        import csv
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                'title', 'company', 'location', 'platform', 'url',
-                'salary_min', 'salary_max', 'salary_type', 'job_type',
-                'remote', 'posted_date', 'search_group'
-            ])
-
-            for job in jobs:
-                writer.writerow([
-                    job.title,
-                    job.company,
-                    job.location,
-                    job.platform,
-                    job.url,
-                    job.salary_min,
-                    job.salary_max,
-                    job.salary_type,
-                    job.job_type,
-                    job.remote,
-                    job.posted_date.isoformat() if job.posted_date else '',
-                    job.search_group
-                ])
-
-        logger.info(f"Saved CSV to {filepath}")
-
 
 def print_progress(current: int, total: int, query: SearchQuery):
     """Print progress to console."""
@@ -270,6 +244,26 @@ def main():
         action="store_true",
         help="Scrape all available platforms"
     )
+    parser.add_argument(
+        "--platform-config",
+        type=Path,
+        help="JSON file of per-platform settings, e.g. "
+             '{"indeed": {"workers": 1, "rate_limit_seconds": 5}, '
+             '"usajobs": {"workers": 2, "api_key": "..."}}'
+    )
+    parser.add_argument(
+        "--format",
+        nargs="+",
+        dest="formats",
+        default=["ndjson", "csv"],
+        choices=["ndjson", "csv", "sqlite"],
+        help="Output formats, written incrementally as jobs arrive (default: ndjson csv)"
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Discard an interrupted run's checkpoint instead of resuming it"
+    )
     parser.add_argument(
         "--output", "-o",
         type=Path,
@@ -326,10 +320,18 @@ def main():
     else:
         platforms = args.platforms
 
+    platform_configs = None
+    if args.platform_config:
+        with open(args.platform_config) as f:
+            platform_configs = json.load(f)
+
     # Create orchestrator
     orchestrator = JobScrapeOrchestrator(
         platforms=platforms,
-        output_dir=args.output
+        output_dir=args.output,
+        platform_configs=platform_configs,
+        output_formats=tuple(args.formats),
+        resume=not args.fresh
     )
 
     # Run scraping
@@ -356,6 +358,8 @@ def main():
 
         total_jobs += result.unique_jobs
 
+    orchestrator.close()
+
     print("\n" + "="*50)
     print(f"TOTAL UNIQUE JOBS COLLECTED: {total_jobs:,}")
     print("="*50)
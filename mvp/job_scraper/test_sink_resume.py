@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+StreamingJobSink crash/resume check
+===================================
+
+Runs a scrape into a StreamingJobSink with every output format, kills the
+process (os._exit) between flushes - after the first pairs are checkpointed
+but while most jobs are still unflushed - then resumes the way main.py does
+and finishes. The file outputs will have had part of the unflushed tail
+reach disk when their buffers filled, SQLite none of it; after the resume
+every format must hold every job exactly once.
+
+No network access needed.
+
+Usage:
+    python test_sink_resume.py
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from core import Job, JobDeduplicator, SearchQuery, StreamingJobSink, job_from_record
+
+FORMATS = ("ndjson", "csv", "sqlite")
+PLATFORM = "fake"
+CHECKPOINTED_PAIRS = 3
+TOTAL_PAIRS = 100
+JOBS_PER_PAIR = 3
+
+
+def make_queries() -> list[SearchQuery]:
+    return [SearchQuery(location=f"Town {i}, NC", group_name="test") for i in range(TOTAL_PAIRS)]
+
+
+def make_jobs(i: int) -> list[Job]:
+    return [
+        Job(
+            title=f"Role {i}-{j}",
+            company=f"Employer {i * JOBS_PER_PAIR + j} Inc.",
+            location=f"Town {i}, NC",
+            platform=PLATFORM,
+            url=f"https://example.com/jobs/{i}/{j}",
+            description="x" * 200,
+        )
+        for j in range(JOBS_PER_PAIR)
+    ]
+
+
+def run(output_dir: Path, crash: bool):
+    """Scrape every pair not already done; with crash, die after the checkpointed ones."""
+    sink = StreamingJobSink(output_dir, "test", FORMATS, flush_every=10_000, flush_seconds=3600)
+    deduplicator = JobDeduplicator()
+    for record in sink.open():
+        job = job_from_record(record)
+        if job:
+            deduplicator.add_job(job)
+
+    for i, query in enumerate(make_queries()):
+        if sink.is_done(query, PLATFORM):
+            continue
+        jobs = make_jobs(i)
+        for job in jobs:
+            if deduplicator.add_job(job):
+                sink.write_job(job)
+        sink.mark_done(query, PLATFORM, len(jobs), [])
+        if crash and i == CHECKPOINTED_PAIRS - 1:
+            sink.flush()
+
+    if crash:
+        # Flush Python's file buffers as if they had filled, then die
+        # without flushing the sink (SQLite rows and checkpoint stay pending)
+        for writer in sink.writers:
+            if hasattr(writer, '_file'):
+                writer._file.flush()
+        os._exit(0)
+
+    return sink.finish({})
+
+
+def count_jobs(paths: dict) -> dict[str, tuple[int, int]]:
+    """(rows, distinct jobs) per format; more rows than jobs means duplicates."""
+    with open(paths['ndjson'], encoding='utf-8') as f:
+        ids = [json.loads(line)['unique_id'] for line in f]
+    with open(paths['csv'], newline='', encoding='utf-8') as f:
+        keys = [(r['title'], r['company'], r['location']) for r in csv.DictReader(f)]
+    conn = sqlite3.connect(paths['sqlite'])
+    rows = conn.execute("SELECT unique_id FROM jobs").fetchall()
+    conn.close()
+    return {
+        'ndjson': (len(ids), len(set(ids))),
+        'csv': (len(keys), len(set(keys))),
+        'sqlite': (len(rows), len(set(rows))),
+    }
+
+
+def main():
+    expected = TOTAL_PAIRS * JOBS_PER_PAIR
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        crashed = subprocess.run([sys.executable, __file__, "--crash", tmp])
+        if crashed.returncode != 0:
+            print("FAIL  crash run did not complete")
+            return 1
+
+        on_disk = {
+            fmt: (output_dir / f"test_jobs.{fmt}").stat().st_size
+            for fmt in FORMATS
+        }
+        print(f"After crash: {on_disk} bytes on disk")
+
+        paths = run(output_dir, crash=False)
+        counts = count_jobs(paths)
+
+    results = []
+    for fmt in FORMATS:
+        rows, distinct = counts[fmt]
+        passed = rows == distinct == expected
+        print(f"{'PASS' if passed else 'FAIL'}  {fmt}: {rows} rows, "
+              f"{distinct} distinct jobs (expected {expected})")
+        results.append(passed)
+
+    passed = all(results)
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--crash":
+        run(Path(sys.argv[2]), crash=True)
+    sys.exit(main())
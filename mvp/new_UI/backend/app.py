@@ -29,12 +29,15 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
-# Optional: Numpy for cosine similarity
-try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
-except ImportError:
-    NUMPY_AVAILABLE = False
+import numpy as np
+
+import db_pool
+from bench_stats import get_role_bench_stats
+from job_index import job_index
+from recommendation_cache import for_you_cache, profile_version
+from preference_scoring import parse_salary_range, calculate_preference_score
+from classification_job import classification_job
+from embedding_codec import encode_embedding, read_embedding, select_embedding
 
 app = Flask(__name__)
 
@@ -70,23 +73,17 @@ SECRET_KEY = os.environ.get('SECRET_KEY', secrets.token_hex(32))
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Database connection
+# Database connection (one pooled connection per request, see db_pool.py)
 def get_db():
     if 'db' not in g:
-        g.db = psycopg2.connect(
-            host=os.environ.get('DB_HOST', 'localhost'),
-            port=os.environ.get('DB_PORT', '5432'),
-            dbname=os.environ.get('DB_NAME', 'jobs_comprehensive'),
-            user=os.environ.get('DB_USER', 'noahhopkins'),
-            password=os.environ.get('DB_PASSWORD', '')
-        )
+        g.db = db_pool.get_connection()
     return g.db
 
 @app.teardown_appcontext
 def close_db(e=None):
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        db_pool.release_connection(db)
 
 # Auth helpers
 def hash_password(password):
@@ -395,6 +392,7 @@ def update_profile():
             WHERE user_id = %s
         """, (experience_level, work_preference, g.user_id))
         conn.commit()
+    for_you_cache.invalidate_user(g.user_id)
 
     return jsonify({'success': True})
 
@@ -470,6 +468,7 @@ def update_preferences():
         query = f"UPDATE seeker_profiles SET {', '.join(updates)} WHERE user_id = %s"
         cur.execute(query, params)
         conn.commit()
+    for_you_cache.invalidate_user(g.user_id)
 
     return jsonify({'success': True})
 
@@ -615,139 +614,6 @@ def get_locations():
         return jsonify({'locations': locations})
 
 
-# ============================================================================
-# JOB CLASSIFICATION HELPERS
-# ============================================================================
-
-def classify_role_type(title):
-    """
-    Classify a job title into one of 12 role categories.
-    Returns the role_type string or None if unclassified.
-    """
-    if not title:
-        return None
-
-    title_lower = title.lower()
-
-    # Order matters - more specific patterns first
-    patterns = [
-        # Engineering Manager (before software_engineer to catch managers)
-        ('engineering_manager', [
-            r'engineering manager', r'eng manager', r'development manager',
-            r'software manager', r'technical manager', r'head of engineering',
-            r'director.*(engineering|software|development)', r'vp.*(engineering|software)'
-        ]),
-        # Software Engineer
-        ('software_engineer', [
-            r'software engineer', r'software developer', r'backend engineer',
-            r'frontend engineer', r'full.?stack', r'web developer',
-            r'mobile (developer|engineer)', r'ios (developer|engineer)',
-            r'android (developer|engineer)', r'platform engineer',
-            r'systems engineer', r'devops', r'sre', r'site reliability',
-            r'infrastructure engineer', r'cloud engineer', r'qa engineer',
-            r'test engineer', r'sdet', r'automation engineer',
-            r'security engineer', r'application engineer', r'embedded'
-        ]),
-        # Data Scientist
-        ('data_scientist', [
-            r'data scientist', r'machine learning', r'ml engineer',
-            r'ai engineer', r'research scientist', r'applied scientist',
-            r'deep learning', r'nlp engineer', r'computer vision'
-        ]),
-        # Data Analyst
-        ('data_analyst', [
-            r'data analyst', r'business analyst', r'analytics',
-            r'bi analyst', r'business intelligence', r'reporting analyst',
-            r'insights analyst', r'data engineer'
-        ]),
-        # Product Manager
-        ('product_manager', [
-            r'product manager', r'product owner', r'program manager',
-            r'project manager', r'technical program', r'tpm',
-            r'product lead', r'head of product'
-        ]),
-        # Sales
-        ('sales', [
-            r'sales', r'account executive', r'business development',
-            r'bdr', r'sdr', r'account manager', r'customer success',
-            r'solutions consultant', r'solutions engineer', r'pre.?sales'
-        ]),
-        # Marketing
-        ('marketing', [
-            r'marketing', r'growth', r'content', r'brand',
-            r'communications', r'pr ', r'public relations',
-            r'social media', r'seo', r'sem', r'demand gen'
-        ]),
-        # Design
-        ('design', [
-            r'designer', r'ux', r'ui', r'user experience',
-            r'user interface', r'product design', r'visual design',
-            r'graphic design', r'creative', r'art director'
-        ]),
-        # Operations
-        ('operations', [
-            r'operations', r'supply chain', r'logistics', r'procurement',
-            r'facilities', r'office manager', r'executive assistant',
-            r'chief of staff', r'strategy', r'consulting'
-        ]),
-        # Finance
-        ('finance', [
-            r'finance', r'accountant', r'accounting', r'controller',
-            r'cfo', r'financial analyst', r'fp&a', r'treasury',
-            r'audit', r'tax', r'payroll'
-        ]),
-        # HR
-        ('hr', [
-            r'human resources', r'\bhr\b', r'recruiter', r'recruiting',
-            r'talent', r'people ops', r'people operations',
-            r'compensation', r'benefits', r'hrbp'
-        ]),
-        # Support
-        ('support', [
-            r'customer support', r'customer service', r'technical support',
-            r'help desk', r'support engineer', r'support specialist',
-            r'client services', r'implementation'
-        ]),
-    ]
-
-    for role_type, role_patterns in patterns:
-        for pattern in role_patterns:
-            if re.search(pattern, title_lower):
-                return role_type
-
-    return None
-
-
-def classify_experience_level(title):
-    """
-    Classify a job title into one of 4 experience levels.
-    Returns: 'intern', 'entry', 'mid', 'senior', or None if unclear.
-    """
-    if not title:
-        return None
-
-    title_lower = title.lower()
-
-    # Intern
-    if re.search(r'\bintern\b|\binternship\b', title_lower):
-        return 'intern'
-
-    # Senior/Lead/Staff/Principal
-    if re.search(r'\bsenior\b|\bsr\.?\b|\blead\b|\bprincipal\b|\bstaff\b|\bdirector\b|\bhead\b|\bvp\b|\bchief\b|\bmanager\b|\biii\b|\biv\b|\b[4-9]\b', title_lower):
-        return 'senior'
-
-    # Entry/Junior/Associate
-    if re.search(r'\bjunior\b|\bjr\.?\b|\bentry\b|\bassociate\b|\b[i1]\b(?!\w)|\bnew grad\b', title_lower):
-        return 'entry'
-
-    # Mid-level (II or 2, or no explicit level)
-    if re.search(r'\bii\b|\b2\b|\bmid\b', title_lower):
-        return 'mid'
-
-    # If no explicit level indicators, return None (could be any level)
-    return None
-
-
 # ============================================================================
 # FIT QUESTIONS - Hardcoded questions by role type
 # ============================================================================
@@ -937,33 +803,6 @@ def get_questions_for_role_type(role_type):
 # ROLES ENDPOINTS
 # ============================================================================
 
-def parse_salary_range(salary_str):
-    """Extract min/max salary from salary range string."""
-    if not salary_str:
-        return None, None
-    # Find all numbers in the string
-    numbers = re.findall(r'[\d,]+', salary_str.replace(',', ''))
-    if len(numbers) >= 2:
-        return int(numbers[0]), int(numbers[1])
-    elif len(numbers) == 1:
-        return int(numbers[0]), int(numbers[0])
-    return None, None
-
-
-def has_any_preferences(user_prefs):
-    """Check if user has filled in any preferences."""
-    if not user_prefs:
-        return False
-    return bool(
-        user_prefs.get('preferred_locations') or
-        user_prefs.get('salary_min') or
-        user_prefs.get('salary_max') or
-        user_prefs.get('open_to_roles') or
-        user_prefs.get('experience_level') or
-        user_prefs.get('work_preference')
-    )
-
-
 def evaluate_hard_filters(eligibility_data, job_requirements):
     """
     Evaluate hard pass/fail requirements for a candidate.
@@ -1048,190 +887,39 @@ def evaluate_hard_filters(eligibility_data, job_requirements):
     }
 
 
-def calculate_preference_score(role, user_prefs):
-    """
-    Calculate how well a role matches user preferences.
-    Returns score 0-100 based on weighted preferences.
+def get_required_skills(role_ids):
+    """Required skill_id sets for many roles in one query ({role_id: set()})."""
+    required = {role_id: set() for role_id in role_ids}
+    if not required:
+        return required
+
+    conn = get_db()
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT position_id, skill_id FROM job_required_skills
+            WHERE position_id = ANY(%s)
+        """, (list(required),))
+        for position_id, skill_id in cur.fetchall():
+            required[position_id].add(skill_id)
+    return required
 
-    Weights (when preference is set):
-    - Location: 35% (most important - if user wants Boston, CA jobs should score lower)
-    - Role type: 25% (second most important)
-    - Salary: 15%
-    - Experience: 15%
-    - Work arrangement: 10% (remote/onsite/hybrid)
 
-    Returns None if no preferences are set.
+def calculate_skills_scores(role_ids, user_skill_ids):
     """
-    if not user_prefs or not has_any_preferences(user_prefs):
-        return None
+    Skill-overlap scores for many roles at once.
+    Returns {role_id: 0-100}, or None for every role if the user has no skills.
+    """
+    if not user_skill_ids:
+        return {role_id: None for role_id in role_ids}  # No skills = no score
 
-    weighted_scores = []
-    total_weight = 0
-
-    # Location match - HIGHEST WEIGHT (50%)
-    if user_prefs.get('preferred_locations'):
-        location_score = 0
-        role_location = (role.get('location') or '').lower()
-
-        # Extract state from job location (e.g., "Foster City, CA" -> "ca")
-        job_state = None
-        if ', ' in role_location:
-            parts = role_location.split(', ')
-            # Last part might be state abbreviation or full state name
-            potential_state = parts[-1].strip()
-            if len(potential_state) == 2:
-                job_state = potential_state
-            elif len(parts) >= 2:
-                # Try second to last (e.g., "City, MA, USA")
-                potential_state = parts[-2].strip() if len(parts[-2].strip()) == 2 else None
-                job_state = potential_state
-
-        # Check for exact or partial location match
-        for pref_loc in user_prefs['preferred_locations']:
-            pref_lower = pref_loc.lower()
-
-            # Exact city match
-            if pref_lower in role_location or role_location in pref_lower:
-                location_score = 100
-                break
-
-            # Check for state abbreviation match (e.g., user selected "MA")
-            if len(pref_lower) == 2 and f', {pref_lower}' in role_location:
-                location_score = 100
-                break
-
-            # Extract state from user's preferred location
-            pref_state = None
-            if ', ' in pref_loc:
-                pref_parts = pref_loc.split(', ')
-                potential_pref_state = pref_parts[-1].strip().lower()
-                if len(potential_pref_state) == 2:
-                    pref_state = potential_pref_state
-
-            # Same state but different city = 65% credit
-            if location_score == 0 and job_state and pref_state and job_state == pref_state:
-                location_score = 65
-                # Don't break - keep looking for exact match
-
-        # Remote jobs get partial credit if user didn't specifically select remote
-        if location_score == 0 and 'remote' in role_location:
-            location_score = 40  # Remote is ok but not as good as preferred location
-
-        weighted_scores.append((location_score, 35))
-        total_weight += 35
-
-    # Role type match - SECOND HIGHEST (25%)
-    if user_prefs.get('open_to_roles'):
-        role_type_score = 0
-        role_type = role.get('role_type')
-        if role_type and role_type in user_prefs['open_to_roles']:
-            role_type_score = 100
-        elif not role_type:
-            # No role type on job - check title for keywords
-            title = (role.get('title') or '').lower()
-            for pref_role in user_prefs['open_to_roles']:
-                if pref_role.replace('_', ' ') in title:
-                    role_type_score = 75
-                    break
-            # Give some credit if we can't determine role type
-            if role_type_score == 0:
-                role_type_score = 30
-
-        weighted_scores.append((role_type_score, 25))
-        total_weight += 25
-
-    # Salary match (15%)
-    if user_prefs.get('salary_min') or user_prefs.get('salary_max'):
-        salary_score = 0
-        role_min, role_max = parse_salary_range(role.get('salary_range'))
-        user_min = user_prefs.get('salary_min') or 0
-        user_max = user_prefs.get('salary_max') or 999999
-
-        if role_min and role_max:
-            # Check if ranges overlap
-            if role_max >= user_min and role_min <= user_max:
-                # Calculate overlap percentage
-                overlap_min = max(role_min, user_min)
-                overlap_max = min(role_max, user_max)
-                user_range = user_max - user_min if user_max != 999999 else role_max - user_min
-                if user_range > 0:
-                    overlap = (overlap_max - overlap_min) / user_range
-                    salary_score = min(100, int(overlap * 100) + 50)
-                else:
-                    salary_score = 100
-        elif role.get('salary_range'):
-            # Has salary but couldn't parse - give partial credit
-            salary_score = 50
-
-        weighted_scores.append((salary_score, 15))
-        total_weight += 15
-
-    # Experience level match (15%)
-    if user_prefs.get('experience_level'):
-        exp_score = 0
-        title = (role.get('title') or '').lower()
-        job_exp_level = role.get('experience_level')
-        user_level = user_prefs['experience_level']
-
-        if job_exp_level and job_exp_level == user_level:
-            exp_score = 100
-        else:
-            level_keywords = {
-                'intern': ['intern', 'internship'],
-                'entry': ['entry', 'junior', 'associate', 'i ', ' i,', ' 1', 'new grad'],
-                'mid': ['mid', 'ii ', ' ii,', ' 2', ' 3'],
-                'senior': ['senior', 'sr', 'lead', 'principal', 'staff', 'iii', ' 4', ' 5']
-            }
-
-            # Check if job title contains keywords for user's preferred level
-            for keyword in level_keywords.get(user_level, []):
-                if keyword in title:
-                    exp_score = 100
-                    break
-
-            # If user wants intern, non-intern jobs should score low
-            if exp_score == 0 and user_level == 'intern':
-                # Check if it's an entry-level job (partial credit)
-                for keyword in level_keywords['entry']:
-                    if keyword in title:
-                        exp_score = 40  # Entry-level is somewhat close to intern
-                        break
-                # If still 0, it's likely mid/senior - no credit
-            elif exp_score == 0 and user_level in ['entry', 'mid']:
-                has_senior_keywords = any(kw in title for kw in level_keywords['senior'])
-                if not has_senior_keywords:
-                    exp_score = 50
-
-        weighted_scores.append((exp_score, 15))
-        total_weight += 15
-
-    # Work arrangement match (10%)
-    if user_prefs.get('work_preference'):
-        work_score = 0
-        role_arrangement = (role.get('work_arrangement') or '').lower()
-        user_pref = user_prefs['work_preference'].lower()
-
-        if user_pref in role_arrangement or role_arrangement in user_pref:
-            work_score = 100
-        elif 'hybrid' in role_arrangement and user_pref in ['remote', 'onsite', 'on-site']:
-            # Hybrid is a partial match for both remote and onsite preferences
-            work_score = 60
-        elif role_arrangement:
-            # Has arrangement but doesn't match
-            work_score = 20
+    scores = {}
+    for role_id, job_skill_ids in get_required_skills(role_ids).items():
+        if not job_skill_ids:
+            scores[role_id] = 100  # No skills required = full match
         else:
-            # No arrangement specified on job - neutral
-            work_score = 50
-
-        weighted_scores.append((work_score, 10))
-        total_weight += 10
-
-    # Calculate weighted average
-    if not weighted_scores or total_weight == 0:
-        return None
-
-    weighted_sum = sum(score * weight for score, weight in weighted_scores)
-    return int(weighted_sum / total_weight)
+            matched = len(user_skill_ids & job_skill_ids)
+            scores[role_id] = int((matched / len(job_skill_ids)) * 100)
+    return scores
 
 
 def calculate_skills_score(role_id, user_skill_ids):
@@ -1239,34 +927,11 @@ def calculate_skills_score(role_id, user_skill_ids):
     Calculate how well user's skills match job requirements.
     Returns 0-100 based on skill overlap.
     """
-    if not user_skill_ids:
-        return None  # No skills = no score
-
-    conn = get_db()
-    with conn.cursor() as cur:
-        # Get job's required skills
-        cur.execute("""
-            SELECT skill_id FROM job_required_skills WHERE position_id = %s
-        """, (role_id,))
-        job_skill_ids = {row[0] for row in cur.fetchall()}
-
-    if not job_skill_ids:
-        return 100  # No skills required = full match
+    return calculate_skills_scores([role_id], user_skill_ids)[role_id]
 
-    # Calculate overlap
-    matched = len(user_skill_ids & job_skill_ids)
-    return int((matched / len(job_skill_ids)) * 100)
-
-
-def calculate_match_score(role, user_prefs, user_skill_ids=None):
-    """
-    Calculate overall match score: 50% preferences + 50% skills.
-    If user has no skills extracted, uses 100% preferences.
-    Returns score 0-100 or None if no data.
-    """
-    preference_score = calculate_preference_score(role, user_prefs)
-    skills_score = calculate_skills_score(role.get('id'), user_skill_ids) if user_skill_ids else None
 
+def combine_match_score(preference_score, skills_score):
+    """50% preferences + 50% skills, falling back to whichever score exists."""
     # If we have both scores, use 50/50 weighting
     if preference_score is not None and skills_score is not None:
         return int((preference_score * 0.5) + (skills_score * 0.5))
@@ -1282,23 +947,55 @@ def calculate_match_score(role, user_prefs, user_skill_ids=None):
     return None
 
 
+def calculate_match_score(role, user_prefs, user_skill_ids=None):
+    """
+    Calculate overall match score: 50% preferences + 50% skills.
+    If user has no skills extracted, uses 100% preferences.
+    Returns score 0-100 or None if no data.
+    """
+    preference_score = calculate_preference_score(role, user_prefs)
+    skills_score = calculate_skills_score(role.get('id'), user_skill_ids) if user_skill_ids else None
+    return combine_match_score(preference_score, skills_score)
+
+
+def calculate_match_scores(roles, user_prefs, user_skill_ids=None):
+    """
+    calculate_match_score() for a list of roles, fetching every role's
+    required skills in a single query. Returns scores in the same order.
+    """
+    if user_skill_ids:
+        skills_scores = calculate_skills_scores([role['id'] for role in roles], user_skill_ids)
+    else:
+        skills_scores = {}
+    return [
+        combine_match_score(calculate_preference_score(role, user_prefs), skills_scores.get(role['id']))
+        for role in roles
+    ]
+
+
 # ============================================================================
 # SEMANTIC MATCHING HELPERS
 # ============================================================================
 
+def get_job_index():
+    """Return the process-wide job embedding index, loading/refreshing it as needed."""
+    job_index.maybe_refresh(get_db())
+    return job_index
+
+
 def cosine_similarity(a, b):
     """Calculate cosine similarity between two vectors."""
-    if not NUMPY_AVAILABLE:
-        # Fallback without numpy
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
-        return dot / (norm_a * norm_b) if norm_a and norm_b else 0
     a = np.array(a)
     b = np.array(b)
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
 
+# Adjusted thresholds based on actual similarity distributions
+# These are calibrated for OpenAI text-embedding-3-small model
+SIMILARITY_MIN = 0.28  # Below this is essentially random/unrelated
+SIMILARITY_MAX = 0.50  # Above this is a very strong match
+
+
 def normalize_similarity(raw_similarity):
     """
     Convert raw cosine similarity to a more intuitive 0-100 scale.
@@ -1310,13 +1007,8 @@ def normalize_similarity(raw_similarity):
     - Related: 0.38-0.45
     - Very related: 0.45+
     """
-    # Adjusted thresholds based on actual similarity distributions
-    # These are calibrated for OpenAI text-embedding-3-small model
-    min_sim = 0.28  # Below this is essentially random/unrelated
-    max_sim = 0.50  # Above this is a very strong match
-
     # Clamp and normalize
-    normalized = (raw_similarity - min_sim) / (max_sim - min_sim)
+    normalized = (raw_similarity - SIMILARITY_MIN) / (SIMILARITY_MAX - SIMILARITY_MIN)
     normalized = max(0, min(1, normalized))
 
     # Apply slight curve to spread out middle values and reward stronger matches
@@ -1326,6 +1018,13 @@ def normalize_similarity(raw_similarity):
     return round(score, 1)
 
 
+def normalize_similarity_array(raw_similarities):
+    """Vectorized normalize_similarity over an array of cosine similarities."""
+    normalized = (raw_similarities - SIMILARITY_MIN) / (SIMILARITY_MAX - SIMILARITY_MIN)
+    normalized = np.clip(normalized, 0, 1)
+    return np.round(normalized ** 0.85 * 100, 1)
+
+
 def calculate_experience_match(user_level, job_level):
     """
     Calculate how well the user's experience level matches the job's requirements.
@@ -1423,17 +1122,15 @@ def get_semantic_matches(user_id=None, resume_embedding=None, filters=None, limi
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
         # Get user's embedding and profile if not provided
         if (resume_embedding is None or extracted_profile is None) and user_id:
-            cur.execute("""
-                SELECT resume_embedding, extracted_profile, experience_level
+            cur.execute(f"""
+                SELECT {select_embedding('resume_embedding')}, extracted_profile, experience_level
                 FROM seeker_profiles
                 WHERE user_id = %s
             """, (user_id,))
             row = cur.fetchone()
             if row:
-                if row.get('resume_embedding') and resume_embedding is None:
-                    resume_embedding = row['resume_embedding']
-                    if isinstance(resume_embedding, str):
-                        resume_embedding = json.loads(resume_embedding)
+                if resume_embedding is None:
+                    resume_embedding = read_embedding(row, 'resume_embedding')
                 if row.get('extracted_profile') and extracted_profile is None:
                     extracted_profile = row['extracted_profile']
                     if isinstance(extracted_profile, str):
@@ -1446,81 +1143,48 @@ def get_semantic_matches(user_id=None, resume_embedding=None, filters=None, limi
         if resume_embedding is None:
             return []
 
-        # Get user's experience level from profile
-        user_experience = None
-        if extracted_profile:
-            user_experience = extracted_profile.get('experience_level')
-
-        # Get all jobs with embeddings
-        query = """
-            SELECT id, title, company_name, location, description,
-                   role_type, experience_level, salary_range, salary_min, salary_max,
-                   work_arrangement, description_embedding
-            FROM watchable_positions
-            WHERE description_embedding IS NOT NULL
-        """
-
-        params = []
-        if filters:
-            if filters.get('role_types'):
-                query += " AND role_type = ANY(%s)"
-                params.append(filters['role_types'])
-
-            if filters.get('experience_levels'):
-                query += " AND experience_level = ANY(%s)"
-                params.append(filters['experience_levels'])
-
-            if filters.get('min_salary'):
-                query += " AND salary_max >= %s"
-                params.append(filters['min_salary'])
+    # Get user's experience level from profile
+    user_experience = None
+    if extracted_profile:
+        user_experience = extracted_profile.get('experience_level')
+
+    # Score every indexed job at once: one matrix-vector product plus
+    # an experience multiplier looked up per distinct job level
+    index = get_job_index()
+    with index.lock:
+        mask = index.filter_mask(filters)
+        base_scores = normalize_similarity_array(index.similarities(resume_embedding))
+        exp_multipliers = index.map_column(
+            'experience_level',
+            lambda level: calculate_experience_match(user_experience, level)
+        )
 
-            if filters.get('work_arrangements'):
-                query += " AND work_arrangement = ANY(%s)"
-                params.append(filters['work_arrangements'])
+        # Cap at 98 to avoid perfect matches (nothing is perfect)
+        final_scores = np.clip(base_scores * exp_multipliers, 5, 98)
 
-        cur.execute(query, params) if params else cur.execute(query)
-        jobs = cur.fetchall()
+        top_rows = index.top_k(np.round(final_scores), mask, limit)
+        matches = [(index.jobs[i], float(final_scores[i]), float(exp_multipliers[i])) for i in top_rows]
 
-    # Calculate similarity scores with experience level adjustment
     results = []
-    for job in jobs:
-        if job.get('description_embedding'):
-            job_embedding = job['description_embedding']
-            if isinstance(job_embedding, str):
-                job_embedding = json.loads(job_embedding)
-
-            # Calculate base semantic similarity
-            raw_similarity = cosine_similarity(resume_embedding, job_embedding)
-            base_score = normalize_similarity(raw_similarity)
-
-            # Apply experience level adjustment
-            exp_multiplier = calculate_experience_match(user_experience, job.get('experience_level'))
-            adjusted_score = base_score * exp_multiplier
-
-            # Cap at 98 to avoid perfect matches (nothing is perfect)
-            final_score = min(98, max(5, adjusted_score))
-
-            # Generate match reason
-            match_reason = generate_match_reason(extracted_profile, job, final_score, exp_multiplier)
-
-            results.append({
-                'id': job['id'],
-                'title': job['title'],
-                'company_name': job['company_name'],
-                'location': job['location'],
-                'role_type': job['role_type'],
-                'experience_level': job['experience_level'],
-                'salary_range': job['salary_range'],
-                'work_arrangement': job['work_arrangement'],
-                'match_score': round(final_score, 0),
-                'match_reason': match_reason,
-                'description': (job['description'][:500] + '...') if job.get('description') and len(job['description']) > 500 else job.get('description')
-            })
-
-    # Sort by match score
-    results.sort(key=lambda x: x['match_score'], reverse=True)
+    for job, final_score, exp_multiplier in matches:
+        # Generate match reason
+        match_reason = generate_match_reason(extracted_profile, job, final_score, exp_multiplier)
+
+        results.append({
+            'id': job['id'],
+            'title': job['title'],
+            'company_name': job['company_name'],
+            'location': job['location'],
+            'role_type': job['role_type'],
+            'experience_level': job['experience_level'],
+            'salary_range': job['salary_range'],
+            'work_arrangement': job['work_arrangement'],
+            'match_score': round(final_score, 0),
+            'match_reason': match_reason,
+            'description': job['description']
+        })
 
-    return results[:limit]
+    return results
 
 
 def process_resume_and_get_matches(user_id, pdf_bytes):
@@ -1685,12 +1349,14 @@ Return ONLY valid JSON, no markdown."""
             UPDATE seeker_profiles
             SET resume_text = %s,
                 extracted_profile = %s,
-                resume_embedding = %s,
+                resume_embedding_bin = %s,
+                resume_embedding = NULL,
                 skills_extracted = TRUE,
                 skills_extracted_at = NOW()
             WHERE user_id = %s
-        """, (resume_text, json.dumps(profile), json.dumps(embedding), user_id))
+        """, (resume_text, json.dumps(profile), encode_embedding(embedding), user_id))
         conn.commit()
+    for_you_cache.invalidate_user(user_id)
 
     # Get matching jobs
     matches = get_semantic_matches(resume_embedding=embedding, limit=20)
@@ -1721,8 +1387,8 @@ def get_recommendations():
     # Check if user has a resume embedding
     conn = get_db()
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute("""
-            SELECT resume_embedding, extracted_profile, skills_extracted, experience_level
+        cur.execute(f"""
+            SELECT {select_embedding('resume_embedding')}, extracted_profile, skills_extracted, experience_level
             FROM seeker_profiles WHERE user_id = %s
         """, (user_id,))
         profile = cur.fetchone()
@@ -1730,7 +1396,8 @@ def get_recommendations():
     if not profile:
         return jsonify({'error': 'Profile not found'}), 404
 
-    if not profile.get('resume_embedding'):
+    resume_embedding = read_embedding(profile, 'resume_embedding')
+    if resume_embedding is None:
         return jsonify({
             'error': 'No resume processed yet',
             'needs_resume': True,
@@ -1757,7 +1424,7 @@ def get_recommendations():
     # Get semantic matches with user profile for better scoring
     matches = get_semantic_matches(
         user_id=user_id,
-        resume_embedding=profile['resume_embedding'],
+        resume_embedding=resume_embedding,
         filters=filters,
         limit=limit * 2,  # Get more to allow for filtering
         user_profile=extracted_profile
@@ -1797,8 +1464,8 @@ def get_for_you_jobs():
     conn = get_db()
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
         # Get user's resume embedding and preferences
-        cur.execute("""
-            SELECT sp.resume_embedding, sp.extracted_profile, sp.experience_level,
+        cur.execute(f"""
+            SELECT {select_embedding('resume_embedding', 'sp')}, sp.extracted_profile, sp.experience_level,
                    sp.preferred_locations, sp.salary_min, sp.salary_max,
                    sp.open_to_roles, sp.work_preference
             FROM seeker_profiles sp
@@ -1809,17 +1476,14 @@ def get_for_you_jobs():
     if not profile:
         return jsonify({'error': 'Profile not found'}), 404
 
-    if not profile.get('resume_embedding'):
+    resume_embedding = read_embedding(profile, 'resume_embedding')
+    if resume_embedding is None:
         return jsonify({
             'error': 'No resume processed yet',
             'needs_resume': True,
             'message': 'Please upload your resume to get personalized recommendations'
         }), 400
 
-    resume_embedding = profile['resume_embedding']
-    if isinstance(resume_embedding, str):
-        resume_embedding = json.loads(resume_embedding)
-
     extracted_profile = profile.get('extracted_profile')
     if isinstance(extracted_profile, str):
         extracted_profile = json.loads(extracted_profile)
@@ -1837,113 +1501,103 @@ def get_for_you_jobs():
         'work_preference': profile.get('work_preference')
     }
 
-    # DEBUG: Log user preferences
-    print(f"[FOR-YOU DEBUG] User {user_id} explicit preferences: {user_prefs}")
-
     # For semantic scoring multiplier, use extracted profile experience if not set
     user_experience = profile.get('experience_level') or (extracted_profile.get('experience_level') if extracted_profile else None)
 
-    # Fetch all jobs with embeddings
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute("""
-            SELECT id, title, company_name, location, description,
-                   role_type, experience_level, salary_range, salary_min, salary_max,
-                   work_arrangement, bench_status, description_embedding
-            FROM watchable_positions
-            WHERE description_embedding IS NOT NULL
-        """)
-        jobs = cur.fetchall()
+    # If user has preferences set, use combined scoring
+    # If not, use semantic score only (don't penalize for missing preferences)
+    has_preferences = any([
+        user_prefs.get('preferred_locations'),
+        user_prefs.get('open_to_roles'),
+        user_prefs.get('salary_min'),
+        user_prefs.get('experience_level'),
+        user_prefs.get('work_preference')
+    ])
+
+    # Scored results only change with the profile row or the job index, so
+    # repeat visits are served from the per-user cache
+    index = get_job_index()
+    index_version = index.version
+    cache_key = (user_id, profile_version(profile), index_version, min_score)
+    results = for_you_cache.get(cache_key, index_version)
+    if results is not None:
+        return jsonify({
+            'jobs': results[:limit],
+            'total': len(results),
+            'profile': extracted_profile,
+            'min_score_used': min_score
+        })
 
-    # Calculate combined scores for each job
-    results = []
-    for job in jobs:
-        if not job.get('description_embedding'):
-            continue
+    # Semantic scores for every indexed job in one matrix-vector product
+    with index.lock:
+        semantic_scores = normalize_similarity_array(index.similarities(resume_embedding))
+        semantic_scores = semantic_scores * index.map_column(
+            'experience_level',
+            lambda level: calculate_experience_match(user_experience, level)
+        )
 
-        job_embedding = job['description_embedding']
-        if isinstance(job_embedding, str):
-            job_embedding = json.loads(job_embedding)
+        # Preference score is at most 100, so skip jobs that cannot reach
+        # min_score even with a perfect preference match
+        if has_preferences:
+            best_possible = semantic_scores * 0.60 + 100 * 0.40
+        else:
+            best_possible = semantic_scores
+        best_possible = np.clip(best_possible, 5, 98)
+        candidate_rows = np.flatnonzero(best_possible >= min_score)
+        candidate_semantic = semantic_scores[candidate_rows].astype(np.float64)
+
+        # Preference scores for every candidate from the index's parsed columns
+        pref_scores = index.preferences.score(user_prefs, candidate_rows)
+        candidate_jobs = [index.jobs[i] for i in candidate_rows]
+
+    if has_preferences and pref_scores is not None:
+        # Combined score with preference-based ceiling
+        # Base: 60% semantic/resume + 40% preferences
+        base_scores = (candidate_semantic * 0.60) + (pref_scores * 0.40)
+
+        # Apply a ceiling based on preference score so 90%+ requires a strong
+        # preference match: poor (<50) caps at 75, moderate (<70) at 85,
+        # good (<85) at 92, excellent can reach 98
+        max_allowed = np.select([pref_scores < 50, pref_scores < 70, pref_scores < 85], [75, 85, 92], 98)
+        combined_scores = np.minimum(base_scores, max_allowed)
+    else:
+        # No preferences set - use semantic score directly
+        combined_scores = candidate_semantic
 
-        # Calculate semantic similarity (65% weight when preferences are set)
-        raw_similarity = cosine_similarity(resume_embedding, job_embedding)
-        semantic_score = normalize_similarity(raw_similarity)
+    combined_scores = np.clip(combined_scores, 5, 98)  # Final bounds
 
-        # Apply experience level adjustment
+    # Only include jobs with 70%+ match
+    results = []
+    for pos in np.flatnonzero(combined_scores >= min_score):
+        job = candidate_jobs[pos]
+        semantic_score = float(candidate_semantic[pos])
+        combined_score = float(combined_scores[pos])
+        pref_score = int(pref_scores[pos]) if pref_scores is not None else None
         exp_multiplier = calculate_experience_match(user_experience, job.get('experience_level'))
-        semantic_score = semantic_score * exp_multiplier
-
-        # Calculate preference score (35% weight when preferences are set)
-        pref_score = calculate_preference_score(job, user_prefs)
-
-        # If user has preferences set, use combined scoring
-        # If not, use semantic score only (don't penalize for missing preferences)
-        has_preferences = any([
-            user_prefs.get('preferred_locations'),
-            user_prefs.get('open_to_roles'),
-            user_prefs.get('salary_min'),
-            user_prefs.get('experience_level'),
-            user_prefs.get('work_preference')
-        ])
-
-        if has_preferences and pref_score is not None:
-            # Combined score with preference-based ceiling
-            # Base: 60% semantic/resume + 40% preferences
-            base_score = (semantic_score * 0.60) + (pref_score * 0.40)
-
-            # Apply a ceiling based on preference score
-            # If preferences don't match well, cap the maximum score
-            # This ensures 90%+ requires strong preference match
-            if pref_score < 50:
-                # Poor preference match - cap at 75%
-                max_allowed = 75
-            elif pref_score < 70:
-                # Moderate preference match - cap at 85%
-                max_allowed = 85
-            elif pref_score < 85:
-                # Good preference match - cap at 92%
-                max_allowed = 92
-            else:
-                # Excellent preference match - can reach 98%
-                max_allowed = 98
-
-            combined_score = min(base_score, max_allowed)
 
-            # DEBUG: Log scoring for jobs in non-Boston locations
-            job_loc = (job.get('location') or '').lower()
-            if 'boston' not in job_loc and 'ma' not in job_loc and combined_score >= 90:
-                print(f"[SCORING DEBUG] High score for non-Boston job: {job['title'][:40]} @ {job_loc}")
-                print(f"  semantic={semantic_score:.1f}, pref={pref_score}, base={base_score:.1f}, max_allowed={max_allowed}, final={combined_score:.1f}")
-        else:
-            # No preferences set - use semantic score directly
-            combined_score = semantic_score
-            print(f"[SCORING DEBUG] No preferences detected! has_preferences={has_preferences}, pref_score={pref_score}")
-
-        combined_score = min(98, max(5, combined_score))  # Final bounds
-
-        # Only include jobs with 70%+ match
-        if combined_score >= min_score:
-            # Generate match reason
-            match_reason = generate_match_reason(extracted_profile, job, combined_score, exp_multiplier)
-
-            results.append({
-                'id': job['id'],
-                'title': job['title'],
-                'company_name': job['company_name'],
-                'location': job['location'],
-                'role_type': job['role_type'],
-                'experience_level': job['experience_level'],
-                'salary_range': job['salary_range'],
-                'work_arrangement': job['work_arrangement'],
-                'bench_status': job.get('bench_status', 'open'),
-                'match_score': round(combined_score, 0),
-                'semantic_score': round(semantic_score, 0),
-                'preference_score': round(pref_score, 0) if pref_score is not None else None,
-                'match_reason': match_reason,
-                'description': (job['description'][:500] + '...') if job.get('description') and len(job['description']) > 500 else job.get('description')
-            })
+        # Generate match reason
+        match_reason = generate_match_reason(extracted_profile, job, combined_score, exp_multiplier)
+
+        results.append({
+            'id': job['id'],
+            'title': job['title'],
+            'company_name': job['company_name'],
+            'location': job['location'],
+            'role_type': job['role_type'],
+            'experience_level': job['experience_level'],
+            'salary_range': job['salary_range'],
+            'work_arrangement': job['work_arrangement'],
+            'bench_status': job.get('bench_status', 'open'),
+            'match_score': round(combined_score, 0),
+            'semantic_score': round(semantic_score, 0),
+            'preference_score': round(pref_score, 0) if pref_score is not None else None,
+            'match_reason': match_reason,
+            'description': job['description']
+        })
 
     # Sort by combined match score descending
     results.sort(key=lambda x: x['match_score'], reverse=True)
+    for_you_cache.put(cache_key, index_version, results)
 
     return jsonify({
         'jobs': results[:limit],
@@ -2104,10 +1758,9 @@ def get_roles():
         query = """
             SELECT
                 wp.id, wp.title, wp.company_name, wp.location, wp.department,
-                wp.status, wp.bench_status, wp.salary_range, wp.role_type,
-                (SELECT COUNT(*) FROM shortlist_applications sa WHERE sa.position_id = wp.id) as applicant_count
+                wp.status, wp.bench_status, wp.salary_range, wp.role_type
             FROM watchable_positions wp
-            WHERE (wp.location ILIKE '%%boston%%' OR wp.location ILIKE '%%cambridge%%' OR wp.location ILIKE '%%massachusetts%%' OR wp.location ILIKE '%%, MA%%')
+            WHERE wp.location_metro = 'boston'
         """
         params = []
 
@@ -2144,9 +1797,20 @@ def get_roles():
             cur.execute(query)
         roles = [dict(r) for r in cur.fetchall()]
 
-        # Calculate match scores and filter by salary if needed
+        # Applicant counts for the whole page in one grouped query
+        cur.execute("""
+            SELECT position_id, COUNT(*) AS applicant_count
+            FROM shortlist_applications
+            WHERE position_id = ANY(%s)
+            GROUP BY position_id
+        """, ([role['id'] for role in roles],))
+        applicant_counts = {row['position_id']: row['applicant_count'] for row in cur.fetchall()}
+
+        # Filter by salary if needed
         filtered_roles = []
         for role in roles:
+            role['applicant_count'] = applicant_counts.get(role['id'], 0)
+
             # Filter by salary range if specified
             if salary_min_filter or salary_max_filter:
                 role_min, role_max = parse_salary_range(role.get('salary_range'))
@@ -2156,11 +1820,13 @@ def get_roles():
                     continue
                 if salary_max_filter and role_min and role_min > salary_max_filter:
                     continue
-
-            # Calculate match score (50% preferences + 50% skills if user has skills)
-            role['match_score'] = calculate_match_score(role, user_prefs, user_skill_ids)
             filtered_roles.append(role)
 
+        # Calculate match scores (50% preferences + 50% skills if user has skills)
+        scores = calculate_match_scores(filtered_roles, user_prefs, user_skill_ids)
+        for role, score in zip(filtered_roles, scores):
+            role['match_score'] = score
+
         # Sort by status (open first), salary presence, then company name
         # Note: Match scores are still calculated for use in role detail view
         filtered_roles.sort(key=lambda r: (
@@ -2189,10 +1855,10 @@ def get_role(role_id):
                 conn = get_db()
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Get preferences and embedding
-                    cur.execute("""
+                    cur.execute(f"""
                         SELECT preferred_locations, salary_min, salary_max,
                                open_to_roles, experience_level, work_preference,
-                               resume_embedding
+                               {select_embedding('resume_embedding')}
                         FROM seeker_profiles WHERE user_id = %s
                     """, (user_id,))
                     profile = cur.fetchone()
@@ -2205,7 +1871,7 @@ def get_role(role_id):
                             'experience_level': profile.get('experience_level'),
                             'work_preference': profile.get('work_preference')
                         }
-                        user_embedding = profile.get('resume_embedding')
+                        user_embedding = read_embedding(profile, 'resume_embedding')
 
                     # Get user's extracted skills
                     cur.execute("""
@@ -2217,12 +1883,12 @@ def get_role(role_id):
 
     conn = get_db()
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute("""
+        cur.execute(f"""
             SELECT
                 wp.id, wp.title, wp.company_name, wp.location, wp.department,
                 wp.status, wp.bench_status, wp.salary_range, wp.salary_min, wp.salary_max,
                 wp.description, wp.role_type, wp.experience_level,
-                wp.description_embedding as embedding,
+                {select_embedding('description_embedding', 'wp')},
                 (SELECT COUNT(*) FROM shortlist_applications sa WHERE sa.position_id = wp.id) as applicant_count
             FROM watchable_positions wp
             WHERE wp.id = %s
@@ -2233,9 +1899,10 @@ def get_role(role_id):
             return jsonify({'error': 'Role not found'}), 404
 
         role = dict(role)
+        role_embedding = read_embedding(role, 'description_embedding')
 
         # Calculate match score if user is authenticated
-        if user_prefs or user_embedding:
+        if user_prefs or user_embedding is not None:
             # Use the same scoring logic as for-you page
             has_preferences = any([
                 user_prefs.get('preferred_locations') if user_prefs else None,
@@ -2250,12 +1917,9 @@ def get_role(role_id):
                 pref_score = calculate_preference_score(role, user_prefs)
 
             semantic_score = 0
-            if user_embedding and role.get('embedding'):
+            if user_embedding is not None and role_embedding is not None:
                 try:
-                    import json
-                    user_emb = json.loads(user_embedding) if isinstance(user_embedding, str) else user_embedding
-                    role_emb = json.loads(role['embedding']) if isinstance(role['embedding'], str) else role['embedding']
-                    semantic_score = cosine_similarity(user_emb, role_emb) * 100
+                    semantic_score = cosine_similarity(user_embedding, role_embedding) * 100
                 except:
                     pass
 
@@ -2277,7 +1941,8 @@ def get_role(role_id):
                 role['match_score'] = None
 
         # Remove embedding from response (large)
-        role.pop('embedding', None)
+        role.pop('description_embedding', None)
+        role.pop('description_embedding_bin', None)
 
         return jsonify({'role': role})
 
@@ -2899,98 +2564,23 @@ def get_ranked_applicants(role_id):
         query += " LIMIT %s OFFSET %s"
         params.extend([limit, offset])
 
+        # JSONB columns (skill chips, strengths, risks, breakdowns, profile)
+        # come back from psycopg2 as native objects
         cur.execute(query, params)
-        applicants = []
-        for row in cur.fetchall():
-            applicant = dict(row)
-            # Parse JSON fields
-            if applicant.get('matched_skill_chips'):
-                try:
-                    applicant['matched_skill_chips'] = json.loads(applicant['matched_skill_chips']) if isinstance(applicant['matched_skill_chips'], str) else applicant['matched_skill_chips']
-                except:
-                    applicant['matched_skill_chips'] = []
-            if applicant.get('strengths'):
-                try:
-                    applicant['strengths'] = json.loads(applicant['strengths']) if isinstance(applicant['strengths'], str) else applicant['strengths']
-                except:
-                    applicant['strengths'] = []
-            if applicant.get('risks'):
-                try:
-                    applicant['risks'] = json.loads(applicant['risks']) if isinstance(applicant['risks'], str) else applicant['risks']
-                except:
-                    applicant['risks'] = []
-            if applicant.get('hard_filter_breakdown'):
-                try:
-                    applicant['hard_filter_breakdown'] = json.loads(applicant['hard_filter_breakdown']) if isinstance(applicant['hard_filter_breakdown'], str) else applicant['hard_filter_breakdown']
-                except:
-                    applicant['hard_filter_breakdown'] = {}
-            if applicant.get('extracted_profile'):
-                try:
-                    applicant['extracted_profile'] = json.loads(applicant['extracted_profile']) if isinstance(applicant['extracted_profile'], str) else applicant['extracted_profile']
-                except:
-                    applicant['extracted_profile'] = {}
-            applicants.append(applicant)
-
-        # Get hidden count
-        cur.execute("""
-            SELECT COUNT(*) as hidden_count
-            FROM shortlist_applications
-            WHERE position_id = %s AND (fit_score < %s OR hard_filter_failed = TRUE)
-            AND status != 'cancelled'
-        """, (role_id, min_score))
-        hidden_count = cur.fetchone()['hidden_count']
+        applicants = [dict(row) for row in cur.fetchall()]
 
-        # Get total count
-        cur.execute("""
-            SELECT COUNT(*) as total_count
-            FROM shortlist_applications
-            WHERE position_id = %s AND status != 'cancelled'
-        """, (role_id,))
-        total_count = cur.fetchone()['total_count']
-
-        # Bench stats: candidates on bench (>= min_score and not failed hard filters)
-        cur.execute("""
-            SELECT COUNT(*) as bench_count
-            FROM shortlist_applications
-            WHERE position_id = %s
-              AND fit_score >= %s
-              AND hard_filter_failed = FALSE
-              AND status != 'cancelled'
-        """, (role_id, min_score))
-        bench_count = cur.fetchone()['bench_count']
-
-        # New this week: candidates on bench who applied in last 7 days
-        cur.execute("""
-            SELECT COUNT(*) as new_this_week
-            FROM shortlist_applications
-            WHERE position_id = %s
-              AND fit_score >= %s
-              AND hard_filter_failed = FALSE
-              AND status != 'cancelled'
-              AND applied_at >= NOW() - INTERVAL '7 days'
-        """, (role_id, min_score))
-        new_this_week = cur.fetchone()['new_this_week']
-
-        # Top fit score on bench
-        cur.execute("""
-            SELECT MAX(fit_score) as top_fit_score
-            FROM shortlist_applications
-            WHERE position_id = %s
-              AND fit_score >= %s
-              AND hard_filter_failed = FALSE
-              AND status != 'cancelled'
-        """, (role_id, min_score))
-        top_fit_score = cur.fetchone()['top_fit_score']
+        # Hidden/total/bench counts in one pass
+        stats = get_role_bench_stats(cur, role_id, min_score)
 
     return jsonify({
         'job': dict(job) if job else None,
         'applicants': applicants,
-        'hidden_count': hidden_count,
-        'total_count': total_count,
+        'hidden_count': stats['hidden_count'],
+        'total_count': stats['total_count'],
         'bench_stats': {
-            'bench_count': bench_count,
-            'new_this_week': new_this_week,
-            'top_fit_score': top_fit_score
+            'bench_count': stats['bench_count'],
+            'new_this_week': stats['new_this_week'],
+            'top_fit_score': stats['top_fit_score']
         },
         'filters_applied': {
             'min_score': min_score,
@@ -3385,16 +2975,9 @@ def get_shared_bench(token):
         candidates = []
         for row in cur.fetchall():
             candidate = dict(row)
-            # Parse JSON fields
-            for field in ['extracted_profile', 'strengths', 'risks', 'matched_skill_chips']:
-                if candidate.get(field):
-                    try:
-                        candidate[field] = json.loads(candidate[field]) if isinstance(candidate[field], str) else candidate[field]
-                    except:
-                        candidate[field] = [] if field != 'extracted_profile' else {}
-
-            # Extract current position from profile
-            profile = candidate.get('extracted_profile', {})
+
+            # Extract current position from profile (JSONB, already decoded)
+            profile = candidate.get('extracted_profile') or {}
             work_history = profile.get('work_experience', [])
             if work_history and len(work_history) > 0:
                 current = work_history[0]
@@ -3408,6 +2991,8 @@ def get_shared_bench(token):
             del candidate['extracted_profile']
             candidates.append(candidate)
 
+        stats = get_role_bench_stats(cur, link['role_id'], min_score)
+
         # Update view count
         cur.execute("""
             UPDATE share_links
@@ -3421,6 +3006,11 @@ def get_shared_bench(token):
         'company_name': link['company_name'] or link['company_profile_name'],
         'candidates': candidates,
         'candidate_count': len(candidates),
+        'bench_stats': {
+            'bench_count': stats['bench_count'],
+            'new_this_week': stats['new_this_week'],
+            'top_fit_score': stats['top_fit_score']
+        },
         'min_score_threshold': min_score,
         'expires_at': link['expires_at'].isoformat() if link['expires_at'] else None
     })
@@ -3662,70 +3252,20 @@ def classify_all_jobs():
     """
     Classify all jobs that don't have role_type or experience_level set.
     This can be run anytime to classify new jobs in bulk.
-    """
-    conn = get_db()
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        # Get jobs that need classification
-        cur.execute("""
-            SELECT id, title FROM watchable_positions
-            WHERE role_type IS NULL OR experience_level IS NULL
-        """)
-        jobs = cur.fetchall()
-
-        classified_role = 0
-        classified_exp = 0
-
-        for job in jobs:
-            title = job['title']
-            updates = []
-            params = []
-
-            # Classify role type if missing
-            role_type = classify_role_type(title)
-            if role_type:
-                updates.append("role_type = %s")
-                params.append(role_type)
-                classified_role += 1
-
-            # Classify experience level if missing
-            exp_level = classify_experience_level(title)
-            if exp_level:
-                updates.append("experience_level = %s")
-                params.append(exp_level)
-                classified_exp += 1
-
-            # Update if we have classifications
-            if updates:
-                params.append(job['id'])
-                cur.execute(f"""
-                    UPDATE watchable_positions
-                    SET {', '.join(updates)}
-                    WHERE id = %s
-                """, params)
 
-        conn.commit()
-
-        # Get stats
-        cur.execute("SELECT COUNT(*) as total FROM watchable_positions")
-        total = cur.fetchone()['total']
-
-        cur.execute("SELECT COUNT(*) as classified FROM watchable_positions WHERE role_type IS NOT NULL")
-        role_classified = cur.fetchone()['classified']
+    Runs in the background; poll GET /api/admin/classify-jobs for progress.
+    """
+    status, started = classification_job.start()
+    return jsonify({
+        'success': started,
+        'job': status
+    }), 202 if started else 409
 
-        cur.execute("SELECT COUNT(*) as classified FROM watchable_positions WHERE experience_level IS NOT NULL")
-        exp_classified = cur.fetchone()['classified']
 
-        return jsonify({
-            'success': True,
-            'jobs_processed': len(jobs),
-            'role_types_classified': classified_role,
-            'experience_levels_classified': classified_exp,
-            'stats': {
-                'total_jobs': total,
-                'jobs_with_role_type': role_classified,
-                'jobs_with_experience_level': exp_classified
-            }
-        })
+@app.route('/api/admin/classify-jobs', methods=['GET'])
+def get_classify_jobs_status():
+    """Progress / result of the current or last classification run."""
+    return jsonify({'job': classification_job.status()})
 
 
 @app.route('/api/admin/classification-stats', methods=['GET'])
@@ -3778,8 +3318,20 @@ def get_classification_stats():
 
 @app.route('/api/health', methods=['GET'])
 def health():
-    return jsonify({'status': 'ok', 'timestamp': datetime.utcnow().isoformat()})
+    return jsonify({
+        'status': 'ok',
+        'timestamp': datetime.utcnow().isoformat(),
+        'db_pool': db_pool.pool.stats(),
+        'for_you_cache': for_you_cache.stats()
+    })
 
 
 if __name__ == '__main__':
+    # Warm the job embedding index so the first request doesn't pay for it
+    with app.app_context():
+        try:
+            db_pool.pool.warm()
+            get_job_index()
+        except psycopg2.Error as e:
+            print(f"Could not preload job index: {e}")
     app.run(debug=True, port=5002, host='0.0.0.0')
@@ -0,0 +1,69 @@
+"""
+Bench Statistics for ShortList
+Per-role applicant counts shared by the ranked inbox, the public shared
+bench and the weekly digest.
+
+Every count comes out of a single pass over shortlist_applications using
+COUNT(*) FILTER (...), served by idx_applications_bench_stats
+(position_id, status, hard_filter_failed, fit_score, applied_at).
+"""
+
+from typing import Dict, Iterable
+
+# A candidate is "on the bench" when fit_score >= min_score and they passed
+# the hard filters; hidden ones scored below the bar or failed a filter.
+BENCH_STATS_QUERY = """
+    SELECT
+        position_id,
+        COUNT(*) AS total_count,
+        COUNT(*) FILTER (
+            WHERE fit_score < %(min_score)s OR hard_filter_failed = TRUE
+        ) AS hidden_count,
+        COUNT(*) FILTER (
+            WHERE fit_score >= %(min_score)s AND hard_filter_failed = FALSE
+        ) AS bench_count,
+        COUNT(*) FILTER (
+            WHERE fit_score >= %(min_score)s AND hard_filter_failed = FALSE
+              AND applied_at >= NOW() - INTERVAL '7 days'
+        ) AS new_this_week,
+        MAX(fit_score) FILTER (
+            WHERE fit_score >= %(min_score)s AND hard_filter_failed = FALSE
+        ) AS top_fit_score
+    FROM shortlist_applications
+    WHERE position_id = ANY(%(role_ids)s)
+      AND status != 'cancelled'
+    GROUP BY position_id
+"""
+
+
+def empty_stats() -> Dict:
+    return {
+        'total_count': 0,
+        'hidden_count': 0,
+        'bench_count': 0,
+        'new_this_week': 0,
+        'top_fit_score': None,
+    }
+
+
+def get_bench_stats(cur, role_ids: Iterable[int], min_score: int) -> Dict[int, Dict]:
+    """
+    Applicant counts for each role in one query.
+    Works with plain or RealDictCursor; roles with no applicants get zeros.
+    """
+    role_ids = list(role_ids)
+    stats = {role_id: empty_stats() for role_id in role_ids}
+    if not role_ids:
+        return stats
+
+    cur.execute(BENCH_STATS_QUERY, {'role_ids': role_ids, 'min_score': min_score})
+    columns = [desc[0] for desc in cur.description]
+    for row in cur.fetchall():
+        values = dict(row) if isinstance(row, dict) else dict(zip(columns, row))
+        stats[values.pop('position_id')] = values
+    return stats
+
+
+def get_role_bench_stats(cur, role_id: int, min_score: int) -> Dict:
+    """get_bench_stats() for a single role."""
+    return get_bench_stats(cur, [role_id], min_score)[role_id]
@@ -0,0 +1,160 @@
+"""
+Bulk Job Classification for ShortList
+Backs /api/admin/classify-jobs: fills in role_type / experience_level for
+every watchable_position missing either, in a background thread so a fresh
+import of tens of thousands of rows doesn't hold an HTTP request open.
+
+Titles are deduped before classifying (imports repeat the same titles across
+companies and locations), and results are written back with one
+UPDATE ... FROM (VALUES ...) per batch, committed per batch so progress is
+visible and a failure keeps the batches already written.
+
+    CLASSIFY_BATCH_SIZE  rows per UPDATE (default 1000)
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Tuple
+
+from psycopg2.extras import execute_values
+
+from db_pool import pooled_connection
+from job_classifier import classify_role_type, classify_experience_level
+
+BATCH_SIZE = int(os.environ.get('CLASSIFY_BATCH_SIZE', 1000))
+
+UNCLASSIFIED_QUERY = """
+    SELECT id, title FROM watchable_positions
+    WHERE role_type IS NULL OR experience_level IS NULL
+"""
+
+# A NULL classification keeps whatever the row already has
+UPDATE_QUERY = """
+    UPDATE watchable_positions wp
+    SET role_type = COALESCE(v.role_type, wp.role_type),
+        experience_level = COALESCE(v.experience_level, wp.experience_level)
+    FROM (VALUES %s) AS v(id, role_type, experience_level)
+    WHERE wp.id = v.id
+"""
+
+STATS_QUERY = """
+    SELECT
+        COUNT(*) AS total_jobs,
+        COUNT(*) FILTER (WHERE role_type IS NOT NULL) AS jobs_with_role_type,
+        COUNT(*) FILTER (WHERE experience_level IS NOT NULL) AS jobs_with_experience_level
+    FROM watchable_positions
+"""
+
+
+class ClassificationJob:
+    """
+    At most one classification run per process. status() is a snapshot that
+    is safe to return from any request while the run is in progress.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._thread = None
+        self._status: Dict = {'state': 'idle'}
+
+    def _update(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return dict(self._status)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> Tuple[Dict, bool]:
+        """Start a run unless one is in progress. Returns (status, started)."""
+        with self._lock:
+            if self.is_running():
+                return dict(self._status), False
+            self._status = {
+                'state': 'running',
+                'phase': 'loading',
+                'started_at': datetime.utcnow().isoformat(),
+                'jobs_processed': 0,
+                'distinct_titles': 0,
+                'jobs_updated': 0,
+                'role_types_classified': 0,
+                'experience_levels_classified': 0,
+            }
+            self._thread = threading.Thread(target=self._run, name='classify-jobs', daemon=True)
+            self._thread.start()
+            return dict(self._status), True
+
+    def _run(self):
+        start = time.time()
+        try:
+            with pooled_connection() as conn:
+                self._classify(conn)
+                with conn.cursor() as cur:
+                    cur.execute(STATS_QUERY)
+                    total, with_role, with_exp = cur.fetchone()
+                conn.commit()
+            self._update(
+                state='done',
+                phase='done',
+                stats={
+                    'total_jobs': total,
+                    'jobs_with_role_type': with_role,
+                    'jobs_with_experience_level': with_exp
+                }
+            )
+        except Exception as e:
+            print(f"[CLASSIFY] Failed: {e}")
+            self._update(state='failed', error=str(e))
+        finally:
+            self._update(finished_at=datetime.utcnow().isoformat(),
+                         seconds=round(time.time() - start, 2))
+
+    def _classify(self, conn):
+        with conn.cursor() as cur:
+            cur.execute(UNCLASSIFIED_QUERY)
+            rows = cur.fetchall()
+        conn.commit()
+
+        ids_by_title = defaultdict(list)
+        for job_id, title in rows:
+            ids_by_title[title].append(job_id)
+        self._update(phase='classifying', jobs_processed=len(rows), distinct_titles=len(ids_by_title))
+
+        updates = []
+        classified_role = classified_exp = 0
+        for title, ids in ids_by_title.items():
+            role_type = classify_role_type(title)
+            exp_level = classify_experience_level(title)
+            if not role_type and not exp_level:
+                continue
+            updates.extend((job_id, role_type, exp_level) for job_id in ids)
+            if role_type:
+                classified_role += len(ids)
+            if exp_level:
+                classified_exp += len(ids)
+
+        self._update(phase='writing', jobs_to_update=len(updates),
+                     role_types_classified=classified_role,
+                     experience_levels_classified=classified_exp)
+
+        for offset in range(0, len(updates), self.batch_size):
+            batch = updates[offset:offset + self.batch_size]
+            with conn.cursor() as cur:
+                execute_values(cur, UPDATE_QUERY, batch,
+                               template="(%s::integer, %s::text, %s::text)", page_size=len(batch))
+            conn.commit()
+            self._update(jobs_updated=offset + len(batch))
+
+        print(f"[CLASSIFY] {len(rows)} jobs ({len(ids_by_title)} distinct titles), "
+              f"{len(updates)} updated")
+
+
+# Shared by every request in this process
+classification_job = ClassificationJob()
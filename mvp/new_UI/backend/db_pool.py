@@ -0,0 +1,302 @@
+"""
+Database Connection Pool for ShortList
+Shared by app.py, insights_generator, digest_service, semantic_matcher and
+interview_service so requests reuse warm connections instead of paying
+TCP + auth setup on every psycopg2.connect().
+
+Connections are health-checked on checkout (a `SELECT 1` ping when a
+connection has sat idle longer than DB_POOL_PING_SECONDS) and reset on
+return (any open or failed transaction is rolled back, autocommit is
+restored), so a handler that errors mid-transaction can't leak state into
+the next request.
+
+Sized from the environment:
+    DB_POOL_MIN           connections kept open when idle (default 1)
+    DB_POOL_MAX           hard cap on open connections (default 10)
+    DB_POOL_TIMEOUT       seconds to wait for a free connection (default 10)
+    DB_POOL_PING_SECONDS  idle time after which checkout pings first (default 30)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_CONFIG = {
+    'dbname': os.environ.get('DB_NAME', 'jobs_comprehensive'),
+    'user': os.environ.get('DB_USER', 'noahhopkins'),
+    'password': os.environ.get('DB_PASSWORD', ''),
+    'host': os.environ.get('DB_HOST', 'localhost'),
+    'port': int(os.environ.get('DB_PORT', 5432))
+}
+
+POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+POOL_MAX = int(os.environ.get('DB_POOL_MAX', 10))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+POOL_PING_SECONDS = float(os.environ.get('DB_POOL_PING_SECONDS', 30))
+
+# Checkout latencies kept for the percentile in stats()
+LATENCY_WINDOW = 1024
+
+
+def _connect():
+    """Open a new connection; DATABASE_URL wins over the DB_* settings."""
+    dsn = os.environ.get('DATABASE_URL')
+    if dsn:
+        return psycopg2.connect(dsn)
+    return psycopg2.connect(**DB_CONFIG)
+
+
+class ConnectionPool:
+    """
+    Thread-safe, lazily filled connection pool.
+
+    Unlike psycopg2.pool.ThreadedConnectionPool, a checkout blocks for up to
+    `timeout` seconds when every connection is in use instead of failing
+    immediately, and checkout/return do the health check and reset above.
+    """
+
+    def __init__(self, minconn: int = POOL_MIN, maxconn: int = POOL_MAX,
+                 timeout: float = POOL_TIMEOUT, ping_after: float = POOL_PING_SECONDS):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._cond = threading.Condition(threading.Lock())
+        self._reset_state()
+
+    def _reset_state(self):
+        # Idle connections as (connection, returned_at), most recent last
+        self._idle = []
+        self._in_use = set()
+        # Open connections, including ones being created
+        self._size = 0
+        self._waiters = 0
+        self._pid = os.getpid()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {
+            'checkouts': 0,
+            'created': 0,
+            'discarded': 0,
+            'timeouts': 0,
+            'max_checkout_ms': 0.0,
+        }
+
+    def _check_pid(self):
+        """
+        After a fork (e.g. gunicorn --preload) inherited sockets belong to the
+        parent: forget them without closing and start a fresh pool.
+        """
+        if self._pid != os.getpid():
+            self._reset_state()
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to `timeout` seconds."""
+        start = time.perf_counter()
+        deadline = start + self.timeout
+
+        while True:
+            conn, idle_since = self._acquire(deadline)
+            if conn is None:
+                conn = self._create()
+            elif not self._healthy(conn, time.time() - idle_since):
+                self._discard(conn)
+                continue
+            break
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._cond:
+            self._in_use.add(id(conn))
+            self._counters['checkouts'] += 1
+            self._latencies.append(elapsed_ms)
+            if elapsed_ms > self._counters['max_checkout_ms']:
+                self._counters['max_checkout_ms'] = elapsed_ms
+        return conn
+
+    def _acquire(self, deadline: float):
+        """
+        Take an idle connection, or reserve a slot for a new one (returns
+        (None, None)). Blocks while the pool is at maxconn.
+        """
+        with self._cond:
+            self._check_pid()
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.maxconn:
+                    self._size += 1
+                    return None, None
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolError(
+                        f"connection pool exhausted ({self.maxconn} in use, "
+                        f"waited {self.timeout:.1f}s)"
+                    )
+                self._waiters += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+    def _create(self):
+        """Open a connection for a slot reserved by _acquire()."""
+        try:
+            conn = _connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters['created'] += 1
+        return conn
+
+    def _healthy(self, conn, idle_for: float) -> bool:
+        if conn.closed:
+            return False
+        if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if idle_for < self.ping_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def putconn(self, conn, close: bool = False):
+        """Return a connection, rolling back whatever the caller left open."""
+        with self._cond:
+            if self._pid != os.getpid():
+                return
+            if id(conn) not in self._in_use:
+                raise PoolError("trying to put unkeyed connection")
+            self._in_use.discard(id(conn))
+
+        if not close and not self._reset(conn):
+            close = True
+
+        if close:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            if len(self._idle) >= self.maxconn:
+                # Shouldn't happen, but never grow past maxconn
+                self._size -= 1
+                self._counters['discarded'] += 1
+                conn.close()
+            else:
+                self._idle.append((conn, time.time()))
+            self._cond.notify()
+
+    @staticmethod
+    def _reset(conn) -> bool:
+        """Put a returned connection back in its default state; False if it's unusable."""
+        if conn.closed:
+            return False
+        try:
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except psycopg2.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._counters['discarded'] += 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """`with pool.connection() as conn:` - checkout for the block's duration."""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def closeall(self):
+        """Close idle connections (checked-out ones are closed when returned)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for conn, _ in idle:
+            conn.close()
+
+    def warm(self):
+        """Open connections up to minconn so the first requests don't pay for them."""
+        conns = [self.getconn() for _ in range(max(self.minconn - len(self._idle), 0))]
+        for conn in conns:
+            self.putconn(conn)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        """Snapshot for /api/health."""
+        with self._cond:
+            latencies = sorted(self._latencies)
+            stats = {
+                'size': self._size,
+                'max_size': self.maxconn,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'waiters': self._waiters,
+                **self._counters,
+            }
+        if latencies:
+            stats['avg_checkout_ms'] = round(sum(latencies) / len(latencies), 3)
+            stats['p95_checkout_ms'] = round(latencies[int(0.95 * (len(latencies) - 1))], 3)
+        else:
+            stats['avg_checkout_ms'] = stats['p95_checkout_ms'] = 0.0
+        stats['max_checkout_ms'] = round(stats['max_checkout_ms'], 3)
+        return stats
+
+
+# Shared by every module in this process
+pool = ConnectionPool()
+
+
+def get_connection():
+    """Check out a pooled connection; pair with release_connection()."""
+    return pool.getconn()
+
+
+def release_connection(conn):
+    """Return a connection obtained from get_connection()."""
+    pool.putconn(conn)
+
+
+def pooled_connection():
+    """Context manager form of get_connection()/release_connection()."""
+    return pool.connection()
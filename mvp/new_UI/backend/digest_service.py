@@ -8,9 +8,11 @@ import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
-import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from bench_stats import get_bench_stats
+from db_pool import pooled_connection
+
 # SendGrid import (optional - graceful fallback if not installed)
 try:
     from sendgrid import SendGridAPIClient
@@ -26,18 +28,12 @@ FROM_EMAIL = os.environ.get('DIGEST_FROM_EMAIL', 'alerts@shortlist.ai')
 APP_URL = os.environ.get('APP_URL', 'http://localhost:5002')
 
 
-def get_db():
-    """Get database connection."""
-    return psycopg2.connect(os.environ.get('DATABASE_URL'))
-
-
 def get_companies_for_digest() -> List[Dict]:
     """
     Get all companies that should receive a digest this week.
     Returns companies with at least one role that has new high-scoring candidates.
     """
-    conn = get_db()
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    with pooled_connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
         # Get companies with digest-worthy updates
         cur.execute("""
             SELECT DISTINCT
@@ -62,52 +58,55 @@ def get_digest_data_for_company(company_id: int, min_score: int = 80) -> Dict:
     Get digest data for a specific company.
     Returns roles with new high-scoring candidates since last week.
     """
-    conn = get_db()
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        # Get roles with new candidates above threshold in the last 7 days
+    with pooled_connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
         cur.execute("""
-            SELECT
-                wp.id as role_id,
-                wp.title as role_title,
-                COUNT(sa.id) as new_candidate_count
-            FROM watchable_positions wp
-            JOIN shortlist_applications sa ON sa.position_id = wp.id
-            WHERE wp.company_profile_id = %s
-              AND sa.fit_score >= %s
-              AND sa.hard_filter_failed = FALSE
-              AND sa.applied_at >= NOW() - INTERVAL '7 days'
-              AND sa.status != 'cancelled'
-            GROUP BY wp.id, wp.title
-            HAVING COUNT(sa.id) > 0
-            ORDER BY COUNT(sa.id) DESC
-        """, (company_id, min_score))
-
-        roles_with_updates = []
-        for role in cur.fetchall():
-            # Get top candidates for this role
+            SELECT id, title FROM watchable_positions
+            WHERE company_profile_id = %s
+        """, (company_id,))
+        titles = {row['id']: row['title'] for row in cur.fetchall()}
+
+        # Roles with new candidates above threshold in the last 7 days
+        stats = get_bench_stats(cur, titles, min_score)
+        role_ids = sorted((role_id for role_id, s in stats.items() if s['new_this_week'] > 0),
+                          key=lambda role_id: stats[role_id]['new_this_week'], reverse=True)
+
+        # Top 5 new candidates per role in one query
+        top_candidates = {role_id: [] for role_id in role_ids}
+        if role_ids:
             cur.execute("""
-                SELECT
-                    sa.id as application_id,
-                    TRIM(CONCAT(pu.first_name, ' ', pu.last_name)) as full_name,
-                    sa.fit_score,
-                    sp.extracted_profile,
-                    ci.why_this_person
-                FROM shortlist_applications sa
-                JOIN platform_users pu ON pu.id = sa.user_id
-                LEFT JOIN seeker_profiles sp ON sp.user_id = sa.user_id
-                LEFT JOIN candidate_insights ci ON ci.application_id = sa.id
-                WHERE sa.position_id = %s
-                  AND sa.fit_score >= %s
-                  AND sa.hard_filter_failed = FALSE
-                  AND sa.applied_at >= NOW() - INTERVAL '7 days'
-                  AND sa.status != 'cancelled'
-                ORDER BY sa.fit_score DESC
-                LIMIT 5
-            """, (role['role_id'], min_score))
+                SELECT * FROM (
+                    SELECT
+                        sa.position_id,
+                        sa.id as application_id,
+                        TRIM(CONCAT(pu.first_name, ' ', pu.last_name)) as full_name,
+                        sa.fit_score,
+                        sp.extracted_profile,
+                        ci.why_this_person,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY sa.position_id ORDER BY sa.fit_score DESC
+                        ) as candidate_rank
+                    FROM shortlist_applications sa
+                    JOIN platform_users pu ON pu.id = sa.user_id
+                    LEFT JOIN seeker_profiles sp ON sp.user_id = sa.user_id
+                    LEFT JOIN candidate_insights ci ON ci.application_id = sa.id
+                    WHERE sa.position_id = ANY(%s)
+                      AND sa.fit_score >= %s
+                      AND sa.hard_filter_failed = FALSE
+                      AND sa.applied_at >= NOW() - INTERVAL '7 days'
+                      AND sa.status != 'cancelled'
+                ) ranked
+                WHERE candidate_rank <= 5
+                ORDER BY position_id, candidate_rank
+            """, (role_ids, min_score))
+            for row in cur.fetchall():
+                top_candidates[row['position_id']].append(row)
 
+        roles_with_updates = []
+        for role_id in role_ids:
             candidates = []
-            for row in cur.fetchall():
+            for row in top_candidates[role_id]:
                 candidate = dict(row)
+                del candidate['position_id'], candidate['candidate_rank']
                 # Extract current position from profile
                 profile = candidate.get('extracted_profile')
                 if profile:
@@ -132,9 +131,9 @@ def get_digest_data_for_company(company_id: int, min_score: int = 80) -> Dict:
                 candidates.append(candidate)
 
             roles_with_updates.append({
-                'role_id': role['role_id'],
-                'role_title': role['role_title'],
-                'new_candidate_count': role['new_candidate_count'],
+                'role_id': role_id,
+                'role_title': titles[role_id],
+                'new_candidate_count': stats[role_id]['new_this_week'],
                 'candidates': candidates
             })
 
@@ -278,8 +277,7 @@ def log_digest_sent(company_id: int, recipient_email: str, roles_included: List[
     """
     Log the digest send to the database.
     """
-    conn = get_db()
-    with conn.cursor() as cur:
+    with pooled_connection() as conn, conn.cursor() as cur:
         cur.execute("""
             INSERT INTO email_digest_logs (company_profile_id, recipient_email, roles_included, status)
             VALUES (%s, %s, %s, %s)
@@ -0,0 +1,76 @@
+"""
+Embedding Storage Codec for ShortList
+Shared encode/decode for job and resume embeddings.
+
+Embeddings are stored as raw float32 in BYTEA columns
+(description_embedding_bin, resume_embedding_bin): 6 KB per 1536-dim vector
+instead of ~30 KB of JSON text, and decoding is a zero-parse np.frombuffer.
+Values are big-endian (network order) to match Postgres float4send(), so
+migrate_embeddings.py can convert rows server-side without shipping them.
+
+While migrate_embeddings.py converts existing rows, readers dual-read: the
+binary column wins, and the legacy JSONB column (description_embedding,
+resume_embedding) is only selected for rows that haven't been converted.
+"""
+
+import json
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+# Same byte layout as float4send()
+STORAGE_DTYPE = np.dtype('>f4')
+
+# Legacy JSONB column -> binary column
+BINARY_COLUMNS = {
+    'description_embedding': 'description_embedding_bin',
+    'resume_embedding': 'resume_embedding_bin',
+}
+
+
+def encode_embedding(embedding: Optional[Sequence[float]]) -> Optional[bytes]:
+    """Pack an embedding into float32 bytes for a BYTEA column."""
+    if embedding is None:
+        return None
+    return np.asarray(embedding, dtype=STORAGE_DTYPE).tobytes()
+
+
+def decode_embedding(value: Union[bytes, memoryview, str, list, None]) -> Optional[np.ndarray]:
+    """
+    Decode a stored embedding from either format.
+    BYTEA comes back from psycopg2 as memoryview; JSONB as a list (or str
+    if it was cast to text).
+    """
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(value, dtype=STORAGE_DTYPE).astype(np.float32)
+    if isinstance(value, str):
+        value = json.loads(value)
+    return np.asarray(value, dtype=np.float32)
+
+
+def select_embedding(column: str, table_alias: str = '') -> str:
+    """
+    SELECT fragment for dual-reading an embedding column.
+    Yields `<column>_bin` and `<column>`; the JSON value is only transferred
+    for rows that have no binary value yet.
+    """
+    prefix = f"{table_alias}." if table_alias else ''
+    binary = BINARY_COLUMNS[column]
+    return (f"{prefix}{binary} AS {binary}, "
+            f"CASE WHEN {prefix}{binary} IS NULL THEN {prefix}{column} END AS {column}")
+
+
+def has_embedding(column: str, table_alias: str = '') -> str:
+    """WHERE fragment matching rows with an embedding in either format."""
+    prefix = f"{table_alias}." if table_alias else ''
+    return f"({prefix}{BINARY_COLUMNS[column]} IS NOT NULL OR {prefix}{column} IS NOT NULL)"
+
+
+def read_embedding(row: dict, column: str) -> Optional[np.ndarray]:
+    """Decode the embedding from a row selected with select_embedding()."""
+    binary = row.get(BINARY_COLUMNS[column])
+    if binary is not None:
+        return decode_embedding(binary)
+    return decode_embedding(row.get(column))
@@ -14,29 +14,21 @@ Generates:
 
 import os
 import json
-import psycopg2
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 from openai import OpenAI
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from db_pool import get_connection, release_connection
+
 # Load environment variables
 load_dotenv()
 
-# Database connection - matches app.py config
-DB_CONFIG = {
-    'dbname': os.environ.get('DB_NAME', 'jobs_comprehensive'),
-    'user': os.environ.get('DB_USER', 'noahhopkins'),
-    'password': os.environ.get('DB_PASSWORD', ''),
-    'host': os.environ.get('DB_HOST', 'localhost'),
-    'port': int(os.environ.get('DB_PORT', 5432))
-}
-
 
 def get_db():
-    """Get database connection."""
-    return psycopg2.connect(**DB_CONFIG)
+    """Get a pooled database connection; return it with release_connection()."""
+    return get_connection()
 
 
 def generate_candidate_insights(
@@ -75,7 +67,7 @@ def generate_candidate_insights(
 
     finally:
         if should_close_conn:
-            conn.close()
+            release_connection(conn)
 
 
 def _gather_candidate_data(conn, application_id: int) -> Optional[Dict]:
@@ -27,10 +27,11 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-import psycopg2
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+from db_pool import get_connection, release_connection
+
 # Load environment variables
 load_dotenv()
 
@@ -73,14 +74,6 @@ except ImportError:
 # CONFIGURATION
 # =============================================================================
 
-DATABASE_URL = {
-    'host': os.environ.get('DB_HOST', 'localhost'),
-    'port': os.environ.get('DB_PORT', '5432'),
-    'dbname': os.environ.get('DB_NAME', 'jobs_comprehensive'),
-    'user': os.environ.get('DB_USER', 'noahhopkins'),
-    'password': os.environ.get('DB_PASSWORD', '')
-}
-
 MAX_INTERVIEW_DURATION_SECONDS = 900  # 15 minutes hard limit
 RAPPORT_DURATION_SECONDS = 30  # 30 seconds of rapport building
 
@@ -125,8 +118,8 @@ class CandidateResponse(BaseModel):
 # =============================================================================
 
 def get_db_connection():
-    """Get a database connection."""
-    return psycopg2.connect(**DATABASE_URL)
+    """Get a pooled database connection; return it with release_connection()."""
+    return get_connection()
 
 
 def get_application_data(application_id: int, user_id: int) -> Optional[dict]:
@@ -156,7 +149,7 @@ def get_application_data(application_id: int, user_id: int) -> Optional[dict]:
             """, (application_id, user_id))
             return cur.fetchone()
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def get_resume_text(resume_path: str) -> str:
@@ -192,7 +185,7 @@ def save_interview_results(
             """, (status, json.dumps(transcript), json.dumps(evaluation), application_id))
             conn.commit()
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def verify_jwt_token(token: str) -> Optional[int]:
@@ -1150,22 +1143,24 @@ async def interview_websocket(websocket: WebSocket, application_id: int):
                     from insights_generator import generate_and_store_insights
 
                     conn = get_db_connection()
-
-                    # Calculate fit score (includes interview performance bucket)
-                    score_result = await loop.run_in_executor(
-                        None,
-                        lambda: calculate_and_store_fit_score(conn, application_id)
-                    )
-                    if score_result:
-                        print(f"[INTERVIEW] Fit score calculated for {application_id}: {score_result.overall_score}% ({score_result.confidence})")
-
-                    # Generate AI insights
-                    insights = await loop.run_in_executor(
-                        None,
-                        lambda: generate_and_store_insights(conn, application_id)
-                    )
-                    if insights:
-                        print(f"[INTERVIEW] Insights generated for {application_id}")
+                    try:
+                        # Calculate fit score (includes interview performance bucket)
+                        score_result = await loop.run_in_executor(
+                            None,
+                            lambda: calculate_and_store_fit_score(conn, application_id)
+                        )
+                        if score_result:
+                            print(f"[INTERVIEW] Fit score calculated for {application_id}: {score_result.overall_score}% ({score_result.confidence})")
+
+                        # Generate AI insights
+                        insights = await loop.run_in_executor(
+                            None,
+                            lambda: generate_and_store_insights(conn, application_id)
+                        )
+                        if insights:
+                            print(f"[INTERVIEW] Insights generated for {application_id}")
+                    finally:
+                        release_connection(conn)
                 except Exception as e:
                     print(f"[INTERVIEW] Scoring/insights error for {application_id}: {e}")
                     import traceback
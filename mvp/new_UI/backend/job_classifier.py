@@ -0,0 +1,245 @@
+"""
+Job Title Classifier for ShortList
+Maps a job title to a role_type (12 categories) and an experience level.
+
+Every rule is indexed by a literal keyword in one Aho-Corasick automaton, so a
+title is scanned once no matter how many rules there are. Only the rules whose
+keyword occurs in the title are considered, in priority order; rules that need
+more than a substring test (word boundaries, wildcards) run their regex just
+for those candidates.
+
+The same rules, in the same order, as setup_classification_trigger.sql.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Regex metacharacters; a pattern without any is matched by its keyword alone
+_REGEX_CHARS = set('.^$*+?{}[]\\|()')
+
+# (role_type, patterns) - order matters, more specific patterns first
+ROLE_TYPE_PATTERNS = [
+    # Engineering Manager (before software_engineer to catch managers)
+    ('engineering_manager', [
+        'engineering manager', 'eng manager', 'development manager',
+        'software manager', 'technical manager', 'head of engineering',
+        (r'director.*(engineering|software|development)', 'director'),
+        (r'vp.*(engineering|software)', 'vp'),
+    ]),
+    # Software Engineer
+    ('software_engineer', [
+        'software engineer', 'software developer', 'backend engineer',
+        'frontend engineer', (r'full.?stack', 'full'), 'web developer',
+        (r'mobile (developer|engineer)', 'mobile '), (r'ios (developer|engineer)', 'ios '),
+        (r'android (developer|engineer)', 'android '), 'platform engineer',
+        'systems engineer', 'devops', 'sre', 'site reliability',
+        'infrastructure engineer', 'cloud engineer', 'qa engineer',
+        'test engineer', 'sdet', 'automation engineer',
+        'security engineer', 'application engineer', 'embedded'
+    ]),
+    # Data Scientist
+    ('data_scientist', [
+        'data scientist', 'machine learning', 'ml engineer',
+        'ai engineer', 'research scientist', 'applied scientist',
+        'deep learning', 'nlp engineer', 'computer vision'
+    ]),
+    # Data Analyst
+    ('data_analyst', [
+        'data analyst', 'business analyst', 'analytics',
+        'bi analyst', 'business intelligence', 'reporting analyst',
+        'insights analyst', 'data engineer'
+    ]),
+    # Product Manager
+    ('product_manager', [
+        'product manager', 'product owner', 'program manager',
+        'project manager', 'technical program', 'tpm',
+        'product lead', 'head of product'
+    ]),
+    # Sales
+    ('sales', [
+        'sales', 'account executive', 'business development',
+        'bdr', 'sdr', 'account manager', 'customer success',
+        'solutions consultant', 'solutions engineer', (r'pre.?sales', 'sales')
+    ]),
+    # Marketing
+    ('marketing', [
+        'marketing', 'growth', 'content', 'brand',
+        'communications', 'pr ', 'public relations',
+        'social media', 'seo', 'sem', 'demand gen'
+    ]),
+    # Design
+    ('design', [
+        'designer', 'ux', 'ui', 'user experience',
+        'user interface', 'product design', 'visual design',
+        'graphic design', 'creative', 'art director'
+    ]),
+    # Operations
+    ('operations', [
+        'operations', 'supply chain', 'logistics', 'procurement',
+        'facilities', 'office manager', 'executive assistant',
+        'chief of staff', 'strategy', 'consulting'
+    ]),
+    # Finance
+    ('finance', [
+        'finance', 'accountant', 'accounting', 'controller',
+        'cfo', 'financial analyst', 'fp&a', 'treasury',
+        'audit', 'tax', 'payroll'
+    ]),
+    # HR
+    ('hr', [
+        'human resources', (r'\bhr\b', 'hr'), 'recruiter', 'recruiting',
+        'talent', 'people ops', 'people operations',
+        'compensation', 'benefits', 'hrbp'
+    ]),
+    # Support
+    ('support', [
+        'customer support', 'customer service', 'technical support',
+        'help desk', 'support engineer', 'support specialist',
+        'client services', 'implementation'
+    ]),
+]
+
+# (experience_level, patterns) - checked in this order
+EXPERIENCE_LEVEL_PATTERNS = [
+    ('intern', [
+        (r'\bintern\b', 'intern'), (r'\binternship\b', 'internship'),
+    ]),
+    # Senior/Lead/Staff/Principal
+    ('senior', [
+        (r'\bsenior\b', 'senior'), (r'\bsr\.?\b', 'sr'), (r'\blead\b', 'lead'),
+        (r'\bprincipal\b', 'principal'), (r'\bstaff\b', 'staff'), (r'\bdirector\b', 'director'),
+        (r'\bhead\b', 'head'), (r'\bvp\b', 'vp'), (r'\bchief\b', 'chief'),
+        (r'\bmanager\b', 'manager'), (r'\biii\b', 'iii'), (r'\biv\b', 'iv'),
+        (r'\b[4-9]\b', '4', '5', '6', '7', '8', '9'),
+    ]),
+    # Entry/Junior/Associate
+    ('entry', [
+        (r'\bjunior\b', 'junior'), (r'\bjr\.?\b', 'jr'), (r'\bentry\b', 'entry'),
+        (r'\bassociate\b', 'associate'), (r'\b[i1]\b(?!\w)', 'i', '1'),
+        (r'\bnew grad\b', 'new grad'),
+    ]),
+    # Mid-level (II or 2)
+    ('mid', [
+        (r'\bii\b', 'ii'), (r'\b2\b', '2'), (r'\bmid\b', 'mid'),
+    ]),
+]
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton: every keyword occurring in a text, in one pass."""
+
+    def __init__(self, keywords: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (keyword_id,)
+
+        # Breadth-first failure links; outputs inherit from the fallback state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def search(self, text: str) -> Set[int]:
+        """Ids of the keywords that occur anywhere in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class TitleClassifier:
+    """
+    First label (in rule order) with a pattern matching the lowercased title.
+
+    Each pattern is either a plain substring or a (regex, keyword, ...) tuple
+    whose keywords are literals at least one of which must occur for the
+    regex to match.
+    """
+
+    def __init__(self, labelled_patterns: Iterable[Tuple[str, list]]):
+        self._rules: List[Tuple[str, Optional[re.Pattern]]] = []
+        keywords: List[str] = []
+        self._rules_by_keyword: List[List[int]] = []
+        keyword_ids: Dict[str, int] = {}
+
+        for label, patterns in labelled_patterns:
+            for pattern in patterns:
+                if isinstance(pattern, tuple):
+                    regex, anchors = re.compile(pattern[0]), pattern[1:]
+                else:
+                    if _REGEX_CHARS & set(pattern):
+                        raise ValueError(f"regex pattern {pattern!r} needs a literal keyword")
+                    regex, anchors = None, (pattern,)
+
+                rule_id = len(self._rules)
+                self._rules.append((label, regex))
+                for anchor in anchors:
+                    if anchor not in keyword_ids:
+                        keyword_ids[anchor] = len(keywords)
+                        keywords.append(anchor)
+                        self._rules_by_keyword.append([])
+                    self._rules_by_keyword[keyword_ids[anchor]].append(rule_id)
+
+        self._automaton = KeywordAutomaton(keywords)
+
+    def classify(self, title_lower: str) -> Optional[str]:
+        candidates = set()
+        for keyword_id in self._automaton.search(title_lower):
+            candidates.update(self._rules_by_keyword[keyword_id])
+
+        for rule_id in sorted(candidates):
+            label, regex = self._rules[rule_id]
+            if regex is None or regex.search(title_lower):
+                return label
+        return None
+
+
+_role_type_classifier = TitleClassifier(ROLE_TYPE_PATTERNS)
+_experience_level_classifier = TitleClassifier(EXPERIENCE_LEVEL_PATTERNS)
+
+
+def classify_role_type(title):
+    """
+    Classify a job title into one of 12 role categories.
+    Returns the role_type string or None if unclassified.
+    """
+    if not title:
+        return None
+    return _role_type_classifier.classify(title.lower())
+
+
+def classify_experience_level(title):
+    """
+    Classify a job title into one of 4 experience levels.
+    Returns: 'intern', 'entry', 'mid', 'senior', or None if unclear.
+    """
+    if not title:
+        return None
+    return _experience_level_classifier.classify(title.lower())
@@ -0,0 +1,296 @@
+"""
+In-Memory Job Embedding Index for ShortList
+Keeps every position's description embedding in a pre-normalized float32
+matrix so a resume can be scored against all jobs with one matrix-vector
+product instead of a full-table scan + json.loads per request.
+
+The index is loaded once per process and refreshed incrementally: rows
+changed since the last refresh are pulled in and upserted. A row's change
+stamp is the later of embedding_updated_at (written by
+semantic_matcher.generate_job_embeddings) and updated_at (stamped by a
+schema.sql trigger whenever an indexed column is edited). Parsed
+preference-scoring inputs (PreferenceFeatures) are kept alongside and
+updated with the same rows.
+"""
+
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from psycopg2.extras import RealDictCursor
+
+from embedding_codec import select_embedding, has_embedding, read_embedding
+from preference_scoring import PreferenceFeatures
+
+# Seconds between incremental refresh checks (one cheap indexed query)
+REFRESH_INTERVAL_SECONDS = int(os.environ.get('JOB_INDEX_REFRESH_SECONDS', 60))
+# Seconds between full reloads, which also drop deleted/un-embedded positions
+FULL_RELOAD_SECONDS = int(os.environ.get('JOB_INDEX_FULL_RELOAD_SECONDS', 3600))
+# Change stamps are NOW() of the writing transaction, so a row can commit after
+# a refresh has already seen later stamps; each refresh looks back this far
+REFRESH_OVERLAP_SECONDS = int(os.environ.get('JOB_INDEX_REFRESH_OVERLAP_SECONDS', 300))
+
+# Columns kept as categorical codes so filters become boolean masks
+CATEGORICAL_COLUMNS = ('role_type', 'experience_level', 'work_arrangement')
+
+INDEX_QUERY = f"""
+    SELECT id, title, company_name, location, description,
+           role_type, experience_level, salary_range, salary_min, salary_max,
+           work_arrangement, bench_status, {select_embedding('description_embedding')},
+           GREATEST(updated_at, embedding_updated_at) AS changed_at
+    FROM watchable_positions
+    WHERE {has_embedding('description_embedding')}
+"""
+
+
+def _description_preview(description: Optional[str]) -> Optional[str]:
+    """Truncate description the same way the API responses do."""
+    if description and len(description) > 500:
+        return description[:500] + '...'
+    return description
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row; zero vectors stay zero (similarity 0)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class JobEmbeddingIndex:
+    """
+    Process-wide job embedding index.
+
+    Arrays are parallel: row i of `matrix` is the normalized embedding for
+    `jobs[i]`, whose categorical columns are stored as integer codes in
+    `codes[column][i]` (code -1 = NULL) and salary_max in `salary_max[i]`
+    (NaN = NULL); `preferences` holds the same rows parsed for
+    preference scoring.  Job dicts hold metadata only - no embedding, and the
+    description is pre-truncated to the 500-char preview used in responses.
+    """
+
+    def __init__(self):
+        # Held while mutating, and by callers while scoring against the arrays
+        self.lock = threading.RLock()
+        # Bumped on every load and refresh so callers can key caches on it;
+        # never reset, so a full reload always yields a new value
+        self.version = 0
+        self._reset()
+
+    def _reset(self):
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.jobs: List[Dict] = []
+        self.salary_max = np.zeros(0, dtype=np.float64)
+        self.categories: Dict[str, List[Optional[str]]] = {c: [] for c in CATEGORICAL_COLUMNS}
+        self.codes: Dict[str, np.ndarray] = {c: np.zeros(0, dtype=np.int32) for c in CATEGORICAL_COLUMNS}
+        self.preferences = PreferenceFeatures()
+        self._row_by_id: Dict[int, int] = {}
+        # changed_at of each loaded row, so rows re-read in the overlap are skipped
+        self._changed_at: Dict[int, object] = {}
+        self._watermark = None
+        self._last_refresh_check = 0.0
+        self._loaded_at = 0.0
+        self.loaded = False
+
+    def __len__(self):
+        return len(self.jobs)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _fetch(self, conn, incremental: bool = False) -> List[Dict]:
+        query = INDEX_QUERY
+        params = ()
+        if incremental and self._watermark is not None:
+            since = self._watermark - timedelta(seconds=REFRESH_OVERLAP_SECONDS)
+            query += " AND (updated_at >= %s OR embedding_updated_at >= %s)"
+            params = (since, since)
+        elif incremental:
+            query += " AND (updated_at IS NOT NULL OR embedding_updated_at IS NOT NULL)"
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+
+    def _category_code(self, column: str, value) -> int:
+        if value is None:
+            return -1
+        categories = self.categories[column]
+        try:
+            return categories.index(value)
+        except ValueError:
+            categories.append(value)
+            return len(categories) - 1
+
+    def _split_rows(self, rows: List[Dict]) -> Tuple[np.ndarray, List[Dict]]:
+        """Decode embeddings and strip them out of the row dicts."""
+        embeddings = []
+        jobs = []
+        for row in rows:
+            embeddings.append(read_embedding(row, 'description_embedding'))
+            row.pop('description_embedding', None)
+            row.pop('description_embedding_bin', None)
+            self._changed_at[row['id']] = row.pop('changed_at', None)
+            row['description'] = _description_preview(row.get('description'))
+            jobs.append(dict(row))
+        if not embeddings:
+            return np.zeros((0, 0), dtype=np.float32), jobs
+        matrix = np.vstack(embeddings).astype(np.float32, copy=False)
+        return _normalize_rows(matrix), jobs
+
+    def _advance_watermark(self, rows: List[Dict]):
+        stamps = [r['changed_at'] for r in rows if r.get('changed_at')]
+        if stamps:
+            newest = max(stamps)
+            if self._watermark is None or newest > self._watermark:
+                self._watermark = newest
+
+    def load(self, conn):
+        """Full (re)load of every position with an embedding."""
+        rows = self._fetch(conn)
+        with self.lock:
+            self._reset()
+            self._advance_watermark(rows)
+            matrix, jobs = self._split_rows(rows)
+            self._append(matrix, jobs)
+            self.loaded = True
+            self._loaded_at = self._last_refresh_check = time.time()
+            self.version += 1
+        print(f"[JOB INDEX] Loaded {len(self.jobs)} job embeddings")
+
+    def refresh(self, conn) -> int:
+        """
+        Pull rows embedded or edited since the last load/refresh and upsert
+        them. Returns the number of rows added or replaced.
+        """
+        if not self.loaded:
+            self.load(conn)
+            return len(self.jobs)
+
+        rows = self._fetch(conn, incremental=True)
+        with self.lock:
+            self._last_refresh_check = time.time()
+            self._advance_watermark(rows)
+            rows = [r for r in rows if r['id'] not in self._changed_at
+                    or r['changed_at'] != self._changed_at[r['id']]]
+            if not rows:
+                return 0
+            matrix, jobs = self._split_rows(rows)
+
+            new_rows = []
+            for i, job in enumerate(jobs):
+                existing = self._row_by_id.get(job['id'])
+                if existing is not None:
+                    self._replace(existing, matrix[i], job)
+                else:
+                    new_rows.append(i)
+
+            if new_rows:
+                self._append(matrix[new_rows], [jobs[i] for i in new_rows])
+            self.version += 1
+        print(f"[JOB INDEX] Refreshed {len(rows)} job embeddings ({len(self.jobs)} total)")
+        return len(rows)
+
+    def maybe_refresh(self, conn, interval: int = REFRESH_INTERVAL_SECONDS):
+        """Load on first use, then refresh at most once per `interval` seconds."""
+        if not self.loaded or time.time() - self._loaded_at >= FULL_RELOAD_SECONDS:
+            self.load(conn)
+        elif time.time() - self._last_refresh_check >= interval:
+            self.refresh(conn)
+
+    def _append(self, matrix: np.ndarray, jobs: List[Dict]):
+        if not jobs:
+            return
+        start = len(self.jobs)
+        if self.matrix.size == 0:
+            self.matrix = matrix
+        else:
+            self.matrix = np.vstack([self.matrix, matrix])
+        self.jobs.extend(jobs)
+        self.ids = np.concatenate([self.ids, np.array([j['id'] for j in jobs], dtype=np.int64)])
+        self.salary_max = np.concatenate([
+            self.salary_max,
+            np.array([j['salary_max'] if j.get('salary_max') is not None else np.nan for j in jobs],
+                     dtype=np.float64)
+        ])
+        for column in CATEGORICAL_COLUMNS:
+            new_codes = np.array([self._category_code(column, j.get(column)) for j in jobs], dtype=np.int32)
+            self.codes[column] = np.concatenate([self.codes[column], new_codes])
+        self.preferences.append(jobs)
+        for offset, job in enumerate(jobs):
+            self._row_by_id[job['id']] = start + offset
+
+    def _replace(self, row: int, vector: np.ndarray, job: Dict):
+        self.matrix[row] = vector
+        self.jobs[row] = job
+        self.salary_max[row] = job['salary_max'] if job.get('salary_max') is not None else np.nan
+        for column in CATEGORICAL_COLUMNS:
+            self.codes[column][row] = self._category_code(column, job.get(column))
+        self.preferences.replace(row, job)
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def filter_mask(self, filters: Optional[Dict] = None) -> np.ndarray:
+        """
+        Boolean mask over rows for the same filters the SQL path supported:
+        role_types, experience_levels, work_arrangements (ANY match) and
+        min_salary (salary_max >= min_salary, NULL salary excluded).
+        """
+        mask = np.ones(len(self.jobs), dtype=bool)
+        if not filters:
+            return mask
+
+        for key, column in (('role_types', 'role_type'),
+                            ('experience_levels', 'experience_level'),
+                            ('work_arrangements', 'work_arrangement')):
+            wanted = filters.get(key)
+            if wanted:
+                categories = self.categories[column]
+                wanted_codes = [i for i, c in enumerate(categories) if c in wanted]
+                mask &= np.isin(self.codes[column], wanted_codes)
+
+        if filters.get('min_salary'):
+            with np.errstate(invalid='ignore'):
+                mask &= self.salary_max >= filters['min_salary']
+
+        return mask
+
+    def similarities(self, query_embedding) -> np.ndarray:
+        """Cosine similarity of the query against every row."""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0 or self.matrix.size == 0:
+            return np.zeros(len(self.jobs), dtype=np.float32)
+        return self.matrix @ (query / norm)
+
+    def map_column(self, column: str, fn: Callable) -> np.ndarray:
+        """
+        Apply a scalar function to each distinct value of a categorical column
+        and broadcast the results back over all rows (NULL is passed as None).
+        """
+        categories = self.categories[column]
+        lookup = np.array([fn(c) for c in categories] + [fn(None)], dtype=np.float64)
+        # Code -1 (NULL) indexes the trailing fn(None) entry
+        return lookup[self.codes[column]]
+
+    @staticmethod
+    def top_k(scores: np.ndarray, mask: np.ndarray, k: Optional[int]) -> np.ndarray:
+        """Row indices of the k best scores within mask, best first."""
+        candidates = np.flatnonzero(mask)
+        if k is not None and k <= 0:
+            return candidates[:0]
+        if k is not None and k < len(candidates):
+            part = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[part]
+        order = np.argsort(-scores[candidates], kind='stable')
+        return candidates[order]
+
+
+# Shared by every request in this process
+job_index = JobEmbeddingIndex()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Migrate JSONB embeddings to the binary float32 format (embedding_codec.py).
+
+Converts watchable_positions.description_embedding and
+seeker_profiles.resume_embedding into their _bin columns in batches.
+Each batch is a single server-side UPDATE using float4send(), so no
+embedding data crosses the wire; a batch that fails server-side (e.g. a
+malformed legacy value) is retried row by row through the Python codec.
+
+The JSONB value is cleared once converted unless --keep-json is passed.
+Readers dual-read, so the API can keep serving while this runs.
+
+Usage:
+    python migrate_embeddings.py                # migrate both tables
+    python migrate_embeddings.py --table jobs   # only watchable_positions
+    python migrate_embeddings.py --batch-size 500 --keep-json
+"""
+
+import os
+import time
+import argparse
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from dotenv import load_dotenv
+
+from embedding_codec import BINARY_COLUMNS, decode_embedding, encode_embedding
+
+load_dotenv()
+
+DB_CONFIG = {
+    'dbname': os.environ.get('DB_NAME', 'jobs_comprehensive'),
+    'user': os.environ.get('DB_USER', 'noahhopkins'),
+    'password': os.environ.get('DB_PASSWORD', ''),
+    'host': os.environ.get('DB_HOST', 'localhost'),
+    'port': int(os.environ.get('DB_PORT', 5432))
+}
+
+# table key -> (table, key column, legacy JSONB column)
+TABLES = {
+    'jobs': ('watchable_positions', 'id', 'description_embedding'),
+    'profiles': ('seeker_profiles', 'user_id', 'resume_embedding'),
+}
+
+
+def get_db():
+    return psycopg2.connect(**DB_CONFIG)
+
+
+def _pending_ids(cur, table, key, column, batch_size):
+    binary = BINARY_COLUMNS[column]
+    cur.execute(f"""
+        SELECT {key} FROM {table}
+        WHERE {binary} IS NULL AND {column} IS NOT NULL
+        ORDER BY {key}
+        LIMIT %s
+    """, (batch_size,))
+    return [row[0] for row in cur.fetchall()]
+
+
+def _convert_batch_server_side(cur, table, key, column, ids, keep_json):
+    """Convert a batch entirely in Postgres: jsonb array -> concatenated float4send()."""
+    binary = BINARY_COLUMNS[column]
+    clear_json = "" if keep_json else f", {column} = NULL"
+    cur.execute(f"""
+        UPDATE {table} t
+        SET {binary} = (
+                SELECT string_agg(float4send(e.value::float4), ''::bytea ORDER BY e.ord)
+                FROM jsonb_array_elements_text(t.{column}) WITH ORDINALITY AS e(value, ord)
+            ){clear_json}
+        WHERE t.{key} = ANY(%s)
+    """, (ids,))
+    return cur.rowcount
+
+
+def _convert_batch_in_python(conn, table, key, column, ids, keep_json):
+    """Fallback: decode each legacy value with the codec; skip rows that won't parse."""
+    binary = BINARY_COLUMNS[column]
+    clear_json = "" if keep_json else f", {column} = NULL"
+    converted = 0
+    failed = []
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SELECT {key}, {column} FROM {table} WHERE {key} = ANY(%s)", (ids,))
+        rows = cur.fetchall()
+        for row in rows:
+            try:
+                blob = encode_embedding(decode_embedding(row[column]))
+            except (ValueError, TypeError) as e:
+                failed.append((row[key], str(e)))
+                continue
+            cur.execute(f"""
+                UPDATE {table} SET {binary} = %s{clear_json} WHERE {key} = %s
+            """, (blob, row[key]))
+            converted += 1
+    conn.commit()
+    for row_id, error in failed:
+        print(f"  Could not convert {table}.{key}={row_id}: {error}")
+    return converted, [row_id for row_id, _ in failed]
+
+
+def migrate_table(conn, table_key, batch_size=1000, keep_json=False):
+    """Convert every pending row in one table. Returns (converted, failed)."""
+    table, key, column = TABLES[table_key]
+    converted = 0
+    failed = set()
+    start = time.time()
+
+    while True:
+        with conn.cursor() as cur:
+            ids = [i for i in _pending_ids(cur, table, key, column, batch_size + len(failed))
+                   if i not in failed][:batch_size]
+        if not ids:
+            break
+
+        try:
+            with conn.cursor() as cur:
+                converted += _convert_batch_server_side(cur, table, key, column, ids, keep_json)
+            conn.commit()
+        except psycopg2.Error as e:
+            conn.rollback()
+            print(f"  Batch failed server-side ({e.pgerror or e}); retrying row by row")
+            batch_converted, batch_failed = _convert_batch_in_python(conn, table, key, column, ids, keep_json)
+            converted += batch_converted
+            failed.update(batch_failed)
+
+        elapsed = time.time() - start
+        print(f"  {table}: converted {converted} rows ({converted / max(elapsed, 1e-6):.0f}/s)")
+
+    return converted, len(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert JSONB embeddings to binary float32')
+    parser.add_argument('--table', choices=list(TABLES) + ['all'], default='all',
+                        help='Which table to migrate')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Rows converted per UPDATE')
+    parser.add_argument('--keep-json', action='store_true',
+                        help='Keep the legacy JSONB value after converting')
+    args = parser.parse_args()
+
+    tables = list(TABLES) if args.table == 'all' else [args.table]
+
+    print("=" * 50)
+    print("Embedding Migration: JSONB -> float32 BYTEA")
+    print("=" * 50)
+
+    conn = get_db()
+    try:
+        for table_key in tables:
+            print(f"\nMigrating {TABLES[table_key][0]}...")
+            converted, failed = migrate_table(conn, table_key, args.batch_size, args.keep_json)
+            print(f"Done: {converted} converted, {failed} failed")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,457 @@
+"""
+Preference Scoring for ShortList
+How well a job matches a seeker's explicit preferences (location, role type,
+salary, experience level, work arrangement), as a 0-100 score.
+
+calculate_preference_score() scores one job at a time and is used wherever a
+single role is scored. PreferenceFeatures is the columnar version used by
+/api/for-you: each job's location state, salary bounds, role type and
+experience/arrangement codes are parsed once when the job enters the
+JobEmbeddingIndex, and a user's preferences are then scored against every
+job with NumPy masks and weighted sums. String rules (location, work
+arrangement) are evaluated once per distinct value and broadcast back by
+code. Both paths return identical scores - see test_preference_scoring.py.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Component weights (when the preference is set)
+LOCATION_WEIGHT = 35
+ROLE_TYPE_WEIGHT = 25
+SALARY_WEIGHT = 15
+EXPERIENCE_WEIGHT = 15
+WORK_WEIGHT = 10
+
+# Upper bound used when a user only set salary_min
+OPEN_SALARY_MAX = 999999
+
+# Title keywords that suggest each experience level
+LEVEL_KEYWORDS = {
+    'intern': ['intern', 'internship'],
+    'entry': ['entry', 'junior', 'associate', 'i ', ' i,', ' 1', 'new grad'],
+    'mid': ['mid', 'ii ', ' ii,', ' 2', ' 3'],
+    'senior': ['senior', 'sr', 'lead', 'principal', 'staff', 'iii', ' 4', ' 5']
+}
+
+
+def parse_salary_range(salary_str):
+    """Extract min/max salary from salary range string."""
+    if not salary_str:
+        return None, None
+    # Find all numbers in the string
+    numbers = re.findall(r'[\d,]+', salary_str.replace(',', ''))
+    if len(numbers) >= 2:
+        return int(numbers[0]), int(numbers[1])
+    elif len(numbers) == 1:
+        return int(numbers[0]), int(numbers[0])
+    return None, None
+
+
+def has_any_preferences(user_prefs):
+    """Check if user has filled in any preferences."""
+    if not user_prefs:
+        return False
+    return bool(
+        user_prefs.get('preferred_locations') or
+        user_prefs.get('salary_min') or
+        user_prefs.get('salary_max') or
+        user_prefs.get('open_to_roles') or
+        user_prefs.get('experience_level') or
+        user_prefs.get('work_preference')
+    )
+
+
+def location_state(role_location):
+    """Two-letter state from a lowercased job location (e.g. "foster city, ca" -> "ca")."""
+    job_state = None
+    if ', ' in role_location:
+        parts = role_location.split(', ')
+        # Last part might be state abbreviation or full state name
+        potential_state = parts[-1].strip()
+        if len(potential_state) == 2:
+            job_state = potential_state
+        elif len(parts) >= 2:
+            # Try second to last (e.g., "City, MA, USA")
+            potential_state = parts[-2].strip() if len(parts[-2].strip()) == 2 else None
+            job_state = potential_state
+    return job_state
+
+
+def location_score(role_location, job_state, preferred_locations):
+    """Location component for a lowercased job location (0, 40, 65 or 100)."""
+    score = 0
+
+    # Check for exact or partial location match
+    for pref_loc in preferred_locations:
+        pref_lower = pref_loc.lower()
+
+        # Exact city match
+        if pref_lower in role_location or role_location in pref_lower:
+            score = 100
+            break
+
+        # Check for state abbreviation match (e.g., user selected "MA")
+        if len(pref_lower) == 2 and f', {pref_lower}' in role_location:
+            score = 100
+            break
+
+        # Extract state from user's preferred location
+        pref_state = None
+        if ', ' in pref_loc:
+            pref_parts = pref_loc.split(', ')
+            potential_pref_state = pref_parts[-1].strip().lower()
+            if len(potential_pref_state) == 2:
+                pref_state = potential_pref_state
+
+        # Same state but different city = 65% credit
+        if score == 0 and job_state and pref_state and job_state == pref_state:
+            score = 65
+            # Don't break - keep looking for exact match
+
+    # Remote jobs get partial credit if user didn't specifically select remote
+    if score == 0 and 'remote' in role_location:
+        score = 40  # Remote is ok but not as good as preferred location
+
+    return score
+
+
+def work_arrangement_score(role_arrangement, work_preference):
+    """Work arrangement component for a lowercased job arrangement (20, 50, 60 or 100)."""
+    user_pref = work_preference.lower()
+
+    if user_pref in role_arrangement or role_arrangement in user_pref:
+        return 100
+    elif 'hybrid' in role_arrangement and user_pref in ['remote', 'onsite', 'on-site']:
+        # Hybrid is a partial match for both remote and onsite preferences
+        return 60
+    elif role_arrangement:
+        # Has arrangement but doesn't match
+        return 20
+    # No arrangement specified on job - neutral
+    return 50
+
+
+def calculate_preference_score(role, user_prefs):
+    """
+    Calculate how well a role matches user preferences.
+    Returns score 0-100 based on weighted preferences.
+
+    Weights (when preference is set):
+    - Location: 35% (most important - if user wants Boston, CA jobs should score lower)
+    - Role type: 25% (second most important)
+    - Salary: 15%
+    - Experience: 15%
+    - Work arrangement: 10% (remote/onsite/hybrid)
+
+    Returns None if no preferences are set.
+    """
+    if not user_prefs or not has_any_preferences(user_prefs):
+        return None
+
+    weighted_scores = []
+    total_weight = 0
+
+    # Location match - HIGHEST WEIGHT
+    if user_prefs.get('preferred_locations'):
+        role_location = (role.get('location') or '').lower()
+        score = location_score(role_location, location_state(role_location),
+                               user_prefs['preferred_locations'])
+
+        weighted_scores.append((score, LOCATION_WEIGHT))
+        total_weight += LOCATION_WEIGHT
+
+    # Role type match - SECOND HIGHEST
+    if user_prefs.get('open_to_roles'):
+        role_type_score = 0
+        role_type = role.get('role_type')
+        if role_type and role_type in user_prefs['open_to_roles']:
+            role_type_score = 100
+        elif not role_type:
+            # No role type on job - check title for keywords
+            title = (role.get('title') or '').lower()
+            for pref_role in user_prefs['open_to_roles']:
+                if pref_role.replace('_', ' ') in title:
+                    role_type_score = 75
+                    break
+            # Give some credit if we can't determine role type
+            if role_type_score == 0:
+                role_type_score = 30
+
+        weighted_scores.append((role_type_score, ROLE_TYPE_WEIGHT))
+        total_weight += ROLE_TYPE_WEIGHT
+
+    # Salary match
+    if user_prefs.get('salary_min') or user_prefs.get('salary_max'):
+        salary_score = 0
+        role_min, role_max = parse_salary_range(role.get('salary_range'))
+        user_min = user_prefs.get('salary_min') or 0
+        user_max = user_prefs.get('salary_max') or OPEN_SALARY_MAX
+
+        if role_min and role_max:
+            # Check if ranges overlap
+            if role_max >= user_min and role_min <= user_max:
+                # Calculate overlap percentage
+                overlap_min = max(role_min, user_min)
+                overlap_max = min(role_max, user_max)
+                user_range = user_max - user_min if user_max != OPEN_SALARY_MAX else role_max - user_min
+                if user_range > 0:
+                    overlap = (overlap_max - overlap_min) / user_range
+                    salary_score = min(100, int(overlap * 100) + 50)
+                else:
+                    salary_score = 100
+        elif role.get('salary_range'):
+            # Has salary but couldn't parse - give partial credit
+            salary_score = 50
+
+        weighted_scores.append((salary_score, SALARY_WEIGHT))
+        total_weight += SALARY_WEIGHT
+
+    # Experience level match
+    if user_prefs.get('experience_level'):
+        exp_score = 0
+        title = (role.get('title') or '').lower()
+        job_exp_level = role.get('experience_level')
+        user_level = user_prefs['experience_level']
+
+        if job_exp_level and job_exp_level == user_level:
+            exp_score = 100
+        else:
+            # Check if job title contains keywords for user's preferred level
+            for keyword in LEVEL_KEYWORDS.get(user_level, []):
+                if keyword in title:
+                    exp_score = 100
+                    break
+
+            # If user wants intern, non-intern jobs should score low
+            if exp_score == 0 and user_level == 'intern':
+                # Check if it's an entry-level job (partial credit)
+                for keyword in LEVEL_KEYWORDS['entry']:
+                    if keyword in title:
+                        exp_score = 40  # Entry-level is somewhat close to intern
+                        break
+                # If still 0, it's likely mid/senior - no credit
+            elif exp_score == 0 and user_level in ['entry', 'mid']:
+                has_senior_keywords = any(kw in title for kw in LEVEL_KEYWORDS['senior'])
+                if not has_senior_keywords:
+                    exp_score = 50
+
+        weighted_scores.append((exp_score, EXPERIENCE_WEIGHT))
+        total_weight += EXPERIENCE_WEIGHT
+
+    # Work arrangement match
+    if user_prefs.get('work_preference'):
+        role_arrangement = (role.get('work_arrangement') or '').lower()
+        score = work_arrangement_score(role_arrangement, user_prefs['work_preference'])
+
+        weighted_scores.append((score, WORK_WEIGHT))
+        total_weight += WORK_WEIGHT
+
+    # Calculate weighted average
+    if not weighted_scores or total_weight == 0:
+        return None
+
+    weighted_sum = sum(score * weight for score, weight in weighted_scores)
+    return int(weighted_sum / total_weight)
+
+
+class _Factorized:
+    """Distinct values plus a per-row code array (code -1 = NULL/empty)."""
+
+    def __init__(self):
+        self.values: List = []
+        self._code_by_value: Dict = {}
+        self.codes = np.zeros(0, dtype=np.int32)
+
+    def code(self, value) -> int:
+        if not value and value != '':
+            return -1
+        code = self._code_by_value.get(value)
+        if code is None:
+            code = self._code_by_value[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def codes_for(self, wanted: Sequence) -> List[int]:
+        return [self._code_by_value[v] for v in wanted if v in self._code_by_value]
+
+
+class PreferenceFeatures:
+    """
+    Parsed preference inputs for every job, as arrays parallel to the
+    JobEmbeddingIndex rows. Kept up to date by the index through append()
+    and replace(); score() is pure and safe to call under the index lock.
+    """
+
+    def __init__(self):
+        # Lowercased location / work arrangement ('' for NULL), factorized
+        self.locations = _Factorized()
+        self.arrangements = _Factorized()
+        # Truthy role_type / experience_level only; everything else is -1
+        self.role_types = _Factorized()
+        self.experience_levels = _Factorized()
+        self.titles: List[str] = []
+        self._title_array = None
+        # Parsed salary_range (NaN = unparseable/missing) and "has any salary text"
+        self.salary_low = np.zeros(0, dtype=np.float64)
+        self.salary_high = np.zeros(0, dtype=np.float64)
+        self.has_salary_text = np.zeros(0, dtype=bool)
+        # Per-level "title contains a level keyword" flags
+        self.level_flags: Dict[str, np.ndarray] = {
+            level: np.zeros(0, dtype=bool) for level in LEVEL_KEYWORDS
+        }
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _parse(self, job: Dict) -> Dict:
+        title = (job.get('title') or '').lower()
+        low, high = parse_salary_range(job.get('salary_range'))
+        return {
+            'location': self.locations.code((job.get('location') or '').lower()),
+            'arrangement': self.arrangements.code((job.get('work_arrangement') or '').lower()),
+            'role_type': self.role_types.code(job.get('role_type') or None),
+            'experience_level': self.experience_levels.code(job.get('experience_level') or None),
+            'title': title,
+            'salary_low': float(low) if low else np.nan,
+            'salary_high': float(high) if high else np.nan,
+            'has_salary_text': bool(job.get('salary_range')),
+            'levels': {level: any(kw in title for kw in keywords)
+                       for level, keywords in LEVEL_KEYWORDS.items()},
+        }
+
+    def append(self, jobs: List[Dict]):
+        if not jobs:
+            return
+        parsed = [self._parse(job) for job in jobs]
+        for name, column in (('location', self.locations), ('arrangement', self.arrangements),
+                             ('role_type', self.role_types),
+                             ('experience_level', self.experience_levels)):
+            column.codes = np.concatenate([column.codes, np.array([p[name] for p in parsed], dtype=np.int32)])
+        self.titles.extend(p['title'] for p in parsed)
+        self._title_array = None
+        self.salary_low = np.concatenate([self.salary_low, [p['salary_low'] for p in parsed]])
+        self.salary_high = np.concatenate([self.salary_high, [p['salary_high'] for p in parsed]])
+        self.has_salary_text = np.concatenate([self.has_salary_text,
+                                               np.array([p['has_salary_text'] for p in parsed], dtype=bool)])
+        for level in LEVEL_KEYWORDS:
+            self.level_flags[level] = np.concatenate([
+                self.level_flags[level], np.array([p['levels'][level] for p in parsed], dtype=bool)
+            ])
+
+    def replace(self, row: int, job: Dict):
+        p = self._parse(job)
+        self.locations.codes[row] = p['location']
+        self.arrangements.codes[row] = p['arrangement']
+        self.role_types.codes[row] = p['role_type']
+        self.experience_levels.codes[row] = p['experience_level']
+        self.titles[row] = p['title']
+        self._title_array = None
+        self.salary_low[row] = p['salary_low']
+        self.salary_high[row] = p['salary_high']
+        self.has_salary_text[row] = p['has_salary_text']
+        for level in LEVEL_KEYWORDS:
+            self.level_flags[level][row] = p['levels'][level]
+
+    def _titles(self) -> np.ndarray:
+        if self._title_array is None:
+            self._title_array = np.array(self.titles, dtype=str)
+        return self._title_array
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def score(self, user_prefs: Dict, rows: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        calculate_preference_score() for every job (or just `rows`), as an
+        int array. Returns None if no preferences are set.
+        """
+        if not user_prefs or not has_any_preferences(user_prefs):
+            return None
+        if rows is None:
+            rows = np.arange(len(self))
+
+        weighted_sum = np.zeros(len(rows), dtype=np.int64)
+        total_weight = 0
+
+        if user_prefs.get('preferred_locations'):
+            preferred = user_prefs['preferred_locations']
+            lookup = np.array([location_score(loc, location_state(loc), preferred)
+                               for loc in self.locations.values] + [0], dtype=np.int64)
+            weighted_sum += lookup[self.locations.codes[rows]] * LOCATION_WEIGHT
+            total_weight += LOCATION_WEIGHT
+
+        if user_prefs.get('open_to_roles'):
+            weighted_sum += self._role_type_scores(user_prefs['open_to_roles'], rows) * ROLE_TYPE_WEIGHT
+            total_weight += ROLE_TYPE_WEIGHT
+
+        if user_prefs.get('salary_min') or user_prefs.get('salary_max'):
+            weighted_sum += self._salary_scores(user_prefs, rows) * SALARY_WEIGHT
+            total_weight += SALARY_WEIGHT
+
+        if user_prefs.get('experience_level'):
+            weighted_sum += self._experience_scores(user_prefs['experience_level'], rows) * EXPERIENCE_WEIGHT
+            total_weight += EXPERIENCE_WEIGHT
+
+        if user_prefs.get('work_preference'):
+            preference = user_prefs['work_preference']
+            lookup = np.array([work_arrangement_score(value, preference)
+                               for value in self.arrangements.values] + [0], dtype=np.int64)
+            weighted_sum += lookup[self.arrangements.codes[rows]] * WORK_WEIGHT
+            total_weight += WORK_WEIGHT
+
+        if total_weight == 0:
+            return None
+        # Scores and weights are small non-negative ints, so // matches int(a / b)
+        return weighted_sum // total_weight
+
+    def _role_type_scores(self, open_to_roles, rows) -> np.ndarray:
+        codes = self.role_types.codes[rows]
+        scores = np.where(np.isin(codes, self.role_types.codes_for(open_to_roles)), 100, 0)
+
+        # No role type on job: 75 if the title names a wanted role, else 30
+        untyped = np.flatnonzero(codes == -1)
+        if len(untyped):
+            titles = self._titles()[rows[untyped]]
+            named = np.zeros(len(untyped), dtype=bool)
+            for pref_role in open_to_roles:
+                named |= np.char.find(titles, pref_role.replace('_', ' ')) >= 0
+            scores[untyped] = np.where(named, 75, 30)
+        return scores.astype(np.int64)
+
+    def _salary_scores(self, user_prefs, rows) -> np.ndarray:
+        low = self.salary_low[rows]
+        high = self.salary_high[rows]
+        user_min = user_prefs.get('salary_min') or 0
+        user_max = user_prefs.get('salary_max') or OPEN_SALARY_MAX
+
+        parsed = ~np.isnan(low) & ~np.isnan(high)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            overlapping = parsed & (high >= user_min) & (low <= user_max)
+            overlap = np.minimum(high, user_max) - np.maximum(low, user_min)
+            if user_max != OPEN_SALARY_MAX:
+                user_range = np.full(len(rows), float(user_max - user_min))
+            else:
+                user_range = high - user_min
+            partial = np.minimum(100, np.trunc(overlap / user_range * 100) + 50)
+            overlap_scores = np.where(user_range > 0, partial, 100)
+
+        scores = np.where(overlapping, overlap_scores, 0)
+        # Has salary but couldn't parse - partial credit
+        scores = np.where(~parsed & self.has_salary_text[rows], 50, scores)
+        return scores.astype(np.int64)
+
+    def _experience_scores(self, user_level, rows) -> np.ndarray:
+        no_flags = np.zeros(len(rows), dtype=bool)
+        matched = np.isin(self.experience_levels.codes[rows], self.experience_levels.codes_for([user_level]))
+        matched |= self.level_flags[user_level][rows] if user_level in LEVEL_KEYWORDS else no_flags
+        scores = np.where(matched, 100, 0)
+
+        if user_level == 'intern':
+            scores = np.where(~matched & self.level_flags['entry'][rows], 40, scores)
+        elif user_level in ['entry', 'mid']:
+            scores = np.where(~matched & ~self.level_flags['senior'][rows], 50, scores)
+        return scores.astype(np.int64)
@@ -0,0 +1,124 @@
+"""
+Per-User Recommendation Cache for ShortList
+Holds scored /api/for-you results so repeat dashboard visits skip the
+semantic/preference scoring pass entirely.
+
+Entries are keyed on (user_id, profile version, job index version, ...):
+a changed resume/preferences or a refreshed job index produces a new key,
+so a stale entry can never be served. Writers also invalidate explicitly
+(update_preferences, resume uploads) to free the memory right away, and an
+index version bump drops every entry built against the old index.
+
+Bounded by LRU size and TTL:
+    FOR_YOU_CACHE_SIZE         max cached users/queries (default 2048)
+    FOR_YOU_CACHE_TTL_SECONDS  entry lifetime (default 900)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+CACHE_SIZE = int(os.environ.get('FOR_YOU_CACHE_SIZE', 2048))
+CACHE_TTL_SECONDS = float(os.environ.get('FOR_YOU_CACHE_TTL_SECONDS', 900))
+
+
+def profile_version(profile: Dict) -> str:
+    """
+    Digest of every profile field that feeds recommendation scoring
+    (embedding bytes, extracted profile, explicit preferences).
+    """
+    digest = hashlib.md5()
+    for key in sorted(profile):
+        value = profile[key]
+        digest.update(key.encode())
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            digest.update(bytes(value))
+        else:
+            digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class RecommendationCache:
+    """
+    Thread-safe LRU + TTL cache. The first element of every key must be the
+    user_id (for invalidate_user); index_version is passed separately so an
+    index refresh can drop everything built against the previous one.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Any]]' = OrderedDict()
+        self._index_version = None
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evicted': 0,
+            'invalidated': 0,
+        }
+
+    def _check_index_version(self, index_version):
+        if index_version != self._index_version:
+            self._counters['invalidated'] += len(self._entries)
+            self._entries.clear()
+            self._index_version = index_version
+
+    def get(self, key: Tuple[Hashable, ...], index_version) -> Optional[Any]:
+        with self._lock:
+            self._check_index_version(index_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                self._counters['expired'] += 1
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return value
+
+    def put(self, key: Tuple[Hashable, ...], index_version, value: Any):
+        with self._lock:
+            self._check_index_version(index_version)
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evicted'] += 1
+
+    def invalidate_user(self, user_id):
+        """Drop every entry for a user (their profile or preferences changed)."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == user_id]
+            for key in stale:
+                del self._entries[key]
+            self._counters['invalidated'] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._counters['invalidated'] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                **self._counters,
+                'hit_rate': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Shared by every request in this process
+for_you_cache = RecommendationCache()
@@ -260,9 +260,69 @@ BEGIN
     END IF;
 END $$;
 
--- Create index for faster embedding lookups (using GIN for JSONB)
-CREATE INDEX IF NOT EXISTS idx_jobs_embedding ON watchable_positions USING GIN (description_embedding);
-CREATE INDEX IF NOT EXISTS idx_seeker_embedding ON seeker_profiles USING GIN (resume_embedding);
+-- Binary float32 embeddings (see embedding_codec.py). The JSONB columns above
+-- are legacy: writers now fill the _bin columns and migrate_embeddings.py
+-- converts existing rows; readers dual-read until that finishes.
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'watchable_positions' AND column_name = 'description_embedding_bin') THEN
+        ALTER TABLE watchable_positions ADD COLUMN description_embedding_bin BYTEA;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'seeker_profiles' AND column_name = 'resume_embedding_bin') THEN
+        ALTER TABLE seeker_profiles ADD COLUMN resume_embedding_bin BYTEA;
+    END IF;
+END $$;
+
+-- GIN indexes over embedding arrays were never used by any query and made
+-- every embedding write expensive
+DROP INDEX IF EXISTS idx_jobs_embedding;
+DROP INDEX IF EXISTS idx_seeker_embedding;
+
+-- Track when each job embedding was written so the in-memory job index
+-- (job_index.py) can pull only new/changed rows on refresh
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'watchable_positions' AND column_name = 'embedding_updated_at') THEN
+        ALTER TABLE watchable_positions ADD COLUMN embedding_updated_at TIMESTAMP;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_embedding_updated ON watchable_positions(embedding_updated_at);
+
+-- Stamp updated_at whenever a column the job index caches changes, whichever
+-- script or endpoint writes it, so the index's refresh picks up edits too
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'watchable_positions' AND column_name = 'updated_at') THEN
+        ALTER TABLE watchable_positions ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+    END IF;
+END $$;
+
+CREATE OR REPLACE FUNCTION stamp_position_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_stamp_position_updated_at ON watchable_positions;
+CREATE TRIGGER trigger_stamp_position_updated_at
+    BEFORE UPDATE OF title, company_name, location, description, role_type, experience_level,
+                     salary_range, salary_min, salary_max, work_arrangement, bench_status
+    ON watchable_positions
+    FOR EACH ROW
+    WHEN ((OLD.title, OLD.company_name, OLD.location, OLD.description, OLD.role_type,
+           OLD.experience_level, OLD.salary_range, OLD.salary_min, OLD.salary_max,
+           OLD.work_arrangement, OLD.bench_status)
+          IS DISTINCT FROM
+          (NEW.title, NEW.company_name, NEW.location, NEW.description, NEW.role_type,
+           NEW.experience_level, NEW.salary_range, NEW.salary_min, NEW.salary_max,
+           NEW.work_arrangement, NEW.bench_status))
+    EXECUTE FUNCTION stamp_position_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_positions_updated_at ON watchable_positions(updated_at);
 
 -- ============================================================================
 -- FIT SCORING & CANDIDATE INSIGHTS (Premium Employer Experience)
@@ -358,6 +418,10 @@ END $$;
 
 CREATE INDEX IF NOT EXISTS idx_applications_fit_score ON shortlist_applications(position_id, fit_score DESC);
 
+-- Covers the per-role COUNT(*) FILTER aggregate in bench_stats.py
+CREATE INDEX IF NOT EXISTS idx_applications_bench_stats
+    ON shortlist_applications(position_id, status, hard_filter_failed, fit_score, applied_at);
+
 -- Add job requirements columns to watchable_positions
 DO $$
 BEGIN
@@ -419,3 +483,88 @@ CREATE TABLE IF NOT EXISTS employer_digest_preferences (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(user_id, company_profile_id)
 );
+
+-- ============================================================================
+-- SEARCH - trigram indexes, normalized location and keyset pagination
+-- ============================================================================
+-- Leading-wildcard ILIKE '%term%' can't use a btree index; pg_trgm GIN
+-- indexes serve it (and OR'd columns become a BitmapOr of index scans).
+-- Location filters use location_metro / location_state, kept current by
+-- trigger, so the Boston-area listing (/api/roles) and the state filter on
+-- /api/positions are equality checks.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'watchable_positions' AND column_name = 'location_metro') THEN
+        ALTER TABLE watchable_positions ADD COLUMN location_metro VARCHAR(50);
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'watchable_positions' AND column_name = 'location_state') THEN
+        ALTER TABLE watchable_positions ADD COLUMN location_state CHAR(2);
+    END IF;
+END $$;
+
+-- Same match the /api/roles listing used to do with four ILIKEs
+CREATE OR REPLACE FUNCTION location_metro_name(location TEXT) RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN location ILIKE '%boston%' OR location ILIKE '%cambridge%'
+          OR location ILIKE '%massachusetts%' OR location ILIKE '%, MA%' THEN 'boston'
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 'Boston, MA' -> 'MA'; 'Remote, US' -> NULL
+CREATE OR REPLACE FUNCTION location_state_code(location TEXT) RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN location ILIKE '%massachusetts%' THEN 'MA'
+        ELSE NULLIF(substring(location FROM ',\s*([A-Z]{2})\M'), 'US')
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION normalize_position_location()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.location_metro := location_metro_name(NEW.location);
+    NEW.location_state := location_state_code(NEW.location);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_normalize_position_location ON watchable_positions;
+CREATE TRIGGER trigger_normalize_position_location
+    BEFORE INSERT OR UPDATE OF location ON watchable_positions
+    FOR EACH ROW
+    EXECUTE FUNCTION normalize_position_location();
+
+-- Backfill rows written before the trigger existed
+UPDATE watchable_positions
+SET location_metro = location_metro_name(location),
+    location_state = location_state_code(location)
+WHERE location_metro IS DISTINCT FROM location_metro_name(location)
+   OR location_state IS DISTINCT FROM location_state_code(location);
+
+CREATE INDEX IF NOT EXISTS idx_positions_location_metro ON watchable_positions(location_metro);
+CREATE INDEX IF NOT EXISTS idx_positions_location_state ON watchable_positions(location_state);
+
+-- Substring search on positions (/api/roles, /api/positions)
+CREATE INDEX IF NOT EXISTS idx_positions_title_trgm ON watchable_positions USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_positions_company_trgm ON watchable_positions USING GIN (company_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_positions_location_trgm ON watchable_positions USING GIN (location gin_trgm_ops);
+
+-- Substring search on candidates (/api/companies/candidates)
+CREATE INDEX IF NOT EXISTS idx_seeker_profiles_title_trgm ON seeker_profiles USING GIN (current_title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_seeker_profiles_company_trgm ON seeker_profiles USING GIN (current_company gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_platform_users_first_name_trgm ON platform_users USING GIN (first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_platform_users_last_name_trgm ON platform_users USING GIN (last_name gin_trgm_ops);
+
+-- Keyset pagination orders (must match the ORDER BY in platform_api.py)
+CREATE INDEX IF NOT EXISTS idx_positions_posted_keyset
+    ON watchable_positions ((COALESCE(posted_at, '-infinity'::timestamp)) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_seeker_profiles_search_keyset
+    ON seeker_profiles ((CASE search_status
+                            WHEN 'actively-looking' THEN 1
+                            WHEN 'open-to-offers' THEN 2
+                            ELSE 3
+                         END),
+                        (COALESCE(updated_at, '-infinity'::timestamp)) DESC, user_id DESC);
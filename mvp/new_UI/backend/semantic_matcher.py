@@ -7,7 +7,6 @@ Uses OpenAI embeddings to find similar jobs based on resume/profile.
 import os
 import json
 import numpy as np
-import psycopg2
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -16,25 +15,16 @@ import io
 import re
 from typing import List, Dict, Optional, Tuple
 
-load_dotenv()
+from db_pool import pooled_connection
+from embedding_codec import encode_embedding, has_embedding, read_embedding, select_embedding
 
-DB_CONFIG = {
-    'dbname': os.environ.get('DB_NAME', 'jobs_comprehensive'),
-    'user': os.environ.get('DB_USER', 'noahhopkins'),
-    'password': os.environ.get('DB_PASSWORD', ''),
-    'host': os.environ.get('DB_HOST', 'localhost'),
-    'port': int(os.environ.get('DB_PORT', 5432))
-}
+load_dotenv()
 
 # OpenAI embedding model - text-embedding-3-small is fast and cheap
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIMENSIONS = 1536
 
 
-def get_db():
-    return psycopg2.connect(**DB_CONFIG)
-
-
 def get_openai_client():
     api_key = os.environ.get('OPENAI_API_KEY')
     if not api_key:
@@ -109,17 +99,20 @@ def create_job_embedding_text(job: Dict) -> str:
 
 
 def generate_job_embeddings(limit: int = None, batch_size: int = 100):
-    """Generate embeddings for all jobs that don't have them yet."""
+    """
+    Generate embeddings for all jobs that don't have them yet.
+    Stamps embedding_updated_at so running API processes pick the new rows
+    up on their next job index refresh.
+    """
     client = get_openai_client()
-    conn = get_db()
 
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    with pooled_connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
         # Find jobs without embeddings
-        query = """
+        query = f"""
             SELECT id, title, company_name, description, role_type,
                    experience_level, salary_range
             FROM watchable_positions
-            WHERE description_embedding IS NULL
+            WHERE NOT {has_embedding('description_embedding')}
               AND description IS NOT NULL
         """
         if limit:
@@ -145,9 +138,11 @@ def generate_job_embeddings(limit: int = None, batch_size: int = 100):
                 for job, embedding in zip(batch, embeddings):
                     cur.execute("""
                         UPDATE watchable_positions
-                        SET description_embedding = %s
+                        SET description_embedding_bin = %s,
+                            description_embedding = NULL,
+                            embedding_updated_at = NOW()
                         WHERE id = %s
-                    """, (json.dumps(embedding), job['id']))
+                    """, (encode_embedding(embedding), job['id']))
 
                 conn.commit()
                 total_embedded += len(batch)
@@ -157,7 +152,6 @@ def generate_job_embeddings(limit: int = None, batch_size: int = 100):
                 print(f"  Error embedding batch: {e}")
                 conn.rollback()
 
-    conn.close()
     return total_embedded
 
 
@@ -273,7 +267,6 @@ def create_profile_embedding_text(profile: Dict, resume_text: str = None) -> str
 def process_resume_for_user(user_id: int, pdf_path: str = None, pdf_bytes: bytes = None):
     """Process a resume and store extracted profile + embedding for a user."""
     client = get_openai_client()
-    conn = get_db()
 
     # Extract text from PDF
     if pdf_path:
@@ -295,24 +288,24 @@ def process_resume_for_user(user_id: int, pdf_path: str = None, pdf_bytes: bytes
     embedding = get_embedding(client, embedding_text)
 
     # Store in database
-    with conn.cursor() as cur:
+    with pooled_connection() as conn, conn.cursor() as cur:
         cur.execute("""
             UPDATE seeker_profiles
             SET resume_text = %s,
                 extracted_profile = %s,
-                resume_embedding = %s,
+                resume_embedding_bin = %s,
+                resume_embedding = NULL,
                 skills_extracted = TRUE,
                 skills_extracted_at = NOW()
             WHERE user_id = %s
         """, (
             resume_text,
             json.dumps(profile),
-            json.dumps(embedding),
+            encode_embedding(embedding),
             user_id
         ))
         conn.commit()
 
-    conn.close()
     return profile
 
 
@@ -323,20 +316,18 @@ def find_matching_jobs(
     limit: int = 50
 ) -> List[Dict]:
     """Find jobs that match a candidate's profile using semantic similarity."""
-    conn = get_db()
-
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    with pooled_connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
         # Get user's embedding if not provided
         if resume_embedding is None and user_id:
-            cur.execute("""
-                SELECT resume_embedding, extracted_profile
+            cur.execute(f"""
+                SELECT {select_embedding('resume_embedding')}, extracted_profile
                 FROM seeker_profiles
                 WHERE user_id = %s
             """, (user_id,))
             row = cur.fetchone()
-            if row and row['resume_embedding']:
-                resume_embedding = row['resume_embedding']
-            else:
+            if row:
+                resume_embedding = read_embedding(row, 'resume_embedding')
+            if resume_embedding is None:
                 print("No embedding found for user")
                 return []
 
@@ -344,12 +335,12 @@ def find_matching_jobs(
             return []
 
         # Get all jobs with embeddings
-        query = """
+        query = f"""
             SELECT id, title, company_name, location, description,
                    role_type, experience_level, salary_range, salary_min, salary_max,
-                   work_arrangement, description_embedding
+                   work_arrangement, {select_embedding('description_embedding')}
             FROM watchable_positions
-            WHERE description_embedding IS NOT NULL
+            WHERE {has_embedding('description_embedding')}
         """
 
         # Apply filters
@@ -374,16 +365,11 @@ def find_matching_jobs(
         cur.execute(query, params)
         jobs = cur.fetchall()
 
-    conn.close()
-
     # Calculate similarity scores
     results = []
     for job in jobs:
-        if job['description_embedding']:
-            job_embedding = job['description_embedding']
-            if isinstance(job_embedding, str):
-                job_embedding = json.loads(job_embedding)
-
+        job_embedding = read_embedding(job, 'description_embedding')
+        if job_embedding is not None:
             similarity = cosine_similarity(resume_embedding, job_embedding)
 
             results.append({
@@ -395,7 +381,7 @@ def find_matching_jobs(
                 'experience_level': job['experience_level'],
                 'salary_range': job['salary_range'],
                 'work_arrangement': job['work_arrangement'],
-                'match_score': round(similarity * 100, 1),  # Convert to percentage
+                'match_score': round(float(similarity) * 100, 1),  # Convert to percentage
                 'description': job['description'][:500] + '...' if len(job['description'] or '') > 500 else job['description']
             })
 
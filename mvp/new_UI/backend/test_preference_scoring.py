@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Parity check: PreferenceFeatures.score() vs calculate_preference_score()
+========================================================================
+
+Scores a fixed set of edge-case jobs plus randomly generated ones against
+many preference combinations with both implementations and reports any
+job/preferences pair where the columnar score differs from the scalar one.
+Also exercises PreferenceFeatures.replace() and scoring a subset of rows.
+
+No database needed.
+
+Usage:
+    python test_preference_scoring.py
+    python test_preference_scoring.py --jobs 5000 --prefs 500 --seed 7
+"""
+
+import argparse
+import random
+import sys
+
+import numpy as np
+
+from preference_scoring import PreferenceFeatures, calculate_preference_score
+
+LOCATIONS = [
+    'Boston, MA', 'Cambridge, MA', 'Foster City, CA', 'San Francisco, CA, USA',
+    'Remote', 'Remote - US', 'New York, NY', 'Boston', 'MA', 'Austin, Texas',
+    'Somerville, MA, United States', '', None,
+]
+PREF_LOCATIONS = [
+    'Boston', 'Boston, MA', 'MA', 'ca', 'San Francisco, CA', 'Remote',
+    'New York, NY', 'Austin', 'Worcester, MA', 'Texas',
+]
+ROLE_TYPES = ['software_engineer', 'data_scientist', 'product_manager', 'designer', '', None]
+TITLES = [
+    'Senior Software Engineer', 'Software Engineer II, Platform', 'Data Scientist I',
+    'Product Manager', 'Engineering Intern', 'Junior Designer', 'Staff Engineer',
+    'Associate Product Manager', 'New Grad Software Engineer', 'Lead Data Scientist',
+    'Software Engineer 2', 'Mid-level Designer', 'Summer Internship', '', None,
+]
+EXPERIENCE_LEVELS = ['intern', 'entry', 'mid', 'senior', '', None]
+WORK_ARRANGEMENTS = ['Remote', 'Hybrid', 'Onsite', 'on-site', 'Flexible', '', None]
+SALARY_RANGES = [
+    '$120,000 - $160,000', '$90000-$110000', '85000', '$0', 'Competitive',
+    '$150k - $200k', '', None, '$60,000 - $999,999',
+]
+
+
+def random_job(rng: random.Random, job_id: int) -> dict:
+    return {
+        'id': job_id,
+        'title': rng.choice(TITLES),
+        'location': rng.choice(LOCATIONS),
+        'role_type': rng.choice(ROLE_TYPES),
+        'experience_level': rng.choice(EXPERIENCE_LEVELS),
+        'work_arrangement': rng.choice(WORK_ARRANGEMENTS),
+        'salary_range': rng.choice(SALARY_RANGES),
+    }
+
+
+def random_prefs(rng: random.Random) -> dict:
+    def maybe(value):
+        return value if rng.random() < 0.6 else None
+
+    salary_min = maybe(rng.choice([0, 50000, 100000, 130000, 200000]))
+    salary_max = maybe(rng.choice([90000, 150000, 250000, 999999]))
+    return {
+        'preferred_locations': maybe(rng.sample(PREF_LOCATIONS, rng.randint(1, 3))),
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'open_to_roles': maybe(rng.sample([r for r in ROLE_TYPES if r], rng.randint(1, 2))),
+        'experience_level': maybe(rng.choice(['intern', 'entry', 'mid', 'senior', 'executive'])),
+        'work_preference': maybe(rng.choice(['remote', 'hybrid', 'onsite', 'on-site'])),
+    }
+
+
+def check(jobs, prefs_list, features, rows=None) -> int:
+    """Compare both scorers; returns the number of mismatches (first few printed)."""
+    mismatches = 0
+    subset = [jobs[i] for i in rows] if rows is not None else jobs
+    for prefs in prefs_list:
+        expected = [calculate_preference_score(job, prefs) for job in subset]
+        actual = features.score(prefs, rows)
+
+        if actual is None or expected[0] is None:
+            if not (actual is None and all(e is None for e in expected)):
+                mismatches += 1
+                print(f"  MISMATCH (None) prefs={prefs}")
+            continue
+
+        for job, exp, act in zip(subset, expected, actual.tolist()):
+            if exp != act:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"  MISMATCH expected={exp} actual={act}\n    job={job}\n    prefs={prefs}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Columnar vs scalar preference scoring parity')
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--prefs', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    # Every combination of the small value lists appears at least once
+    jobs = [random_job(rng, i) for i in range(args.jobs)]
+    prefs_list = [random_prefs(rng) for _ in range(args.prefs)]
+    prefs_list.append({})
+    prefs_list.append({'salary_min': 100000})
+    prefs_list.append({'salary_max': 120000})
+    prefs_list.append({'preferred_locations': ['MA'], 'work_preference': 'remote'})
+
+    # Load in two batches, like an initial load followed by a refresh
+    features = PreferenceFeatures()
+    half = len(jobs) // 2
+    features.append(jobs[:half])
+    features.append(jobs[half:])
+
+    print(f"Scoring {len(jobs)} jobs x {len(prefs_list)} preference sets...")
+    failures = check(jobs, prefs_list, features)
+
+    print("Replacing rows in place...")
+    for row in rng.sample(range(len(jobs)), min(200, len(jobs))):
+        jobs[row] = random_job(rng, jobs[row]['id'])
+        features.replace(row, jobs[row])
+    failures += check(jobs, prefs_list, features)
+
+    print("Scoring a subset of rows...")
+    rows = np.array(sorted(rng.sample(range(len(jobs)), min(300, len(jobs)))))
+    failures += check(jobs, prefs_list, features, rows)
+
+    print("=" * 60)
+    if failures:
+        print(f"FAILED: {failures} mismatched scores")
+    else:
+        print("OK: columnar scores match calculate_preference_score")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
@@ -28,6 +28,7 @@ from functools import wraps
 import json
 import hashlib
 import secrets
+import base64
 
 from flask import Flask, request, jsonify, g, send_from_directory
 from flask_cors import CORS
@@ -137,6 +138,50 @@ def is_corporate_domain(domain: str) -> bool:
     return domain not in personal_domains
 
 
+# Above this many (estimated) rows, list endpoints report the planner's
+# estimate instead of running an exact COUNT(*)
+EXACT_COUNT_LIMIT = 1000
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset-pagination cursor for the last row of a page."""
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Optional[list]:
+    """Inverse of encode_cursor(); None if the token is malformed."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return values if isinstance(values, list) else None
+    except (ValueError, TypeError):
+        return None
+
+
+def estimate_count(cursor, from_where_sql: str, params: list) -> tuple:
+    """
+    Row count for `SELECT ... {from_where_sql}`.
+
+    Uses the planner's estimate (EXPLAIN, no scan) and only runs an exact
+    COUNT(*) when the estimate is small enough to be cheap.
+
+    Returns:
+        (count, is_estimate)
+    """
+    cursor.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_where_sql}", params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]['Plan']['Plan Rows'])
+
+    if estimate > EXACT_COUNT_LIMIT:
+        return estimate, True
+
+    cursor.execute(f"SELECT COUNT(*) {from_where_sql}", params)
+    return cursor.fetchone()[0], False
+
+
 def get_current_user():
     """Get current user from auth header."""
     auth_header = request.headers.get('Authorization', '')
@@ -951,6 +996,10 @@ def get_seeker_profile():
         columns = [desc[0] for desc in cursor.description]
         profile = dict(zip(columns, row))
 
+        # Remove embedding from response (large; the BYTEA copy isn't JSON)
+        profile.pop('resume_embedding', None)
+        profile.pop('resume_embedding_bin', None)
+
         return jsonify({'profile': profile})
 
 
@@ -1044,14 +1093,28 @@ def get_positions():
     - search: Search term for title/company
     - status: open, filled, all (default: open)
     - company_id: Filter by company
+    - state: Two-letter state code (e.g. MA), matched against location_state
     - limit: Max results (default: 50)
-    - offset: Pagination offset
+    - cursor: next_cursor from the previous page (keyset pagination)
+    - offset: Pagination offset (legacy; ignored when cursor is given)
+
+    `total` is exact for small result sets and the planner's estimate
+    otherwise (`total_is_estimate`).
     """
     search = request.args.get('search', '')
     status = request.args.get('status', 'open')
     company_id = request.args.get('company_id', type=int)
+    state = request.args.get('state', '').strip().upper()
     limit = min(request.args.get('limit', 50, type=int), 100)
     offset = request.args.get('offset', 0, type=int)
+    page_cursor = request.args.get('cursor')
+
+    after = None
+    if page_cursor:
+        after = decode_cursor(page_cursor)
+        if not after or len(after) != 2:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        offset = 0
 
     conn = get_db()
     with conn.cursor() as cursor:
@@ -1064,6 +1127,7 @@ def get_positions():
             params.append(status)
 
         if search:
+            # Served by the pg_trgm indexes on title / company_name
             where_clauses.append("(wp.title ILIKE %s OR wp.company_name ILIKE %s)")
             params.extend([f'%{search}%', f'%{search}%'])
 
@@ -1071,11 +1135,25 @@ def get_positions():
             where_clauses.append("wp.company_id = %s")
             params.append(company_id)
 
+        if state:
+            # location_state is kept current by trigger and indexed
+            where_clauses.append("wp.location_state = %s")
+            params.append(state)
+
         where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
-        # Get total count
-        cursor.execute(f"SELECT COUNT(*) FROM watchable_positions wp {where_sql}", params)
-        total = cursor.fetchone()[0]
+        # Get total count (estimated for large result sets)
+        total, total_is_estimate = estimate_count(
+            cursor, f"FROM watchable_positions wp {where_sql}", params
+        )
+
+        # Keyset: rows strictly after the cursor in (posted_at DESC NULLS LAST, id DESC)
+        if after:
+            where_clauses.append(
+                "(COALESCE(wp.posted_at, '-infinity'::timestamp), wp.id) < (%s::timestamp, %s)"
+            )
+            params.extend([after[0] or '-infinity', after[1]])
+            where_sql = "WHERE " + " AND ".join(where_clauses)
 
         # Get positions
         params.extend([limit, offset])
@@ -1091,12 +1169,13 @@ def get_positions():
             FROM watchable_positions wp
             LEFT JOIN companies c ON wp.company_id = c.id
             {where_sql}
-            ORDER BY wp.posted_at DESC NULLS LAST
+            ORDER BY COALESCE(wp.posted_at, '-infinity'::timestamp) DESC, wp.id DESC
             LIMIT %s OFFSET %s
         """, params)
 
+        rows = cursor.fetchall()
         positions = []
-        for row in cursor.fetchall():
+        for row in rows:
             positions.append({
                 'id': row[0],
                 'company_name': row[1],
@@ -1121,11 +1200,17 @@ def get_positions():
                 'data_as_of_date': row[20].isoformat() if row[20] else None
             })
 
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1][11], rows[-1][0])
+
     return jsonify({
         'positions': positions,
         'total': total,
+        'total_is_estimate': total_is_estimate,
         'limit': limit,
-        'offset': offset
+        'offset': offset,
+        'next_cursor': next_cursor
     })
 
 
@@ -1149,6 +1234,10 @@ def get_position(position_id):
         columns = [desc[0] for desc in cursor.description]
         position = dict(zip(columns, row))
 
+        # Remove embedding from response (large; the BYTEA copy isn't JSON)
+        position.pop('description_embedding', None)
+        position.pop('description_embedding_bin', None)
+
         # Check if current user is watching
         user = get_current_user()
         if user:
@@ -1849,12 +1938,33 @@ def get_position_watchers(position_id):
 @app.route('/api/companies/candidates', methods=['GET'])
 @require_company
 def search_candidates():
-    """Search all candidates (talent discovery)."""
+    """
+    Search all candidates (talent discovery).
+
+    Paginate with `cursor` (next_cursor from the previous page); `offset`
+    is still accepted when no cursor is given.
+    """
     search = request.args.get('search', '')
     status = request.args.get('status', '')  # actively-looking, open-to-offers
     skills = request.args.getlist('skills')
     limit = min(request.args.get('limit', 50, type=int), 100)
     offset = request.args.get('offset', 0, type=int)
+    page_cursor = request.args.get('cursor')
+
+    after = None
+    if page_cursor:
+        after = decode_cursor(page_cursor)
+        if not after or len(after) != 3:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        offset = 0
+
+    # Same expressions as idx_seeker_profiles_search_keyset
+    status_rank = """CASE sp.search_status
+                    WHEN 'actively-looking' THEN 1
+                    WHEN 'open-to-offers' THEN 2
+                    ELSE 3
+                END"""
+    updated = "COALESCE(sp.updated_at, '-infinity'::timestamp)"
 
     conn = get_db()
     with conn.cursor() as cursor:
@@ -1862,6 +1972,7 @@ def search_candidates():
         params = []
 
         if search:
+            # Served by the pg_trgm indexes on these four columns
             where_clauses.append("""
                 (pu.first_name ILIKE %s OR pu.last_name ILIKE %s OR
                  sp.current_title ILIKE %s OR sp.current_company ILIKE %s)
@@ -1876,6 +1987,14 @@ def search_candidates():
             where_clauses.append("sp.skills && %s")
             params.append(skills)
 
+        if after:
+            # Rows strictly after the cursor in (status rank ASC, updated DESC, user_id DESC)
+            where_clauses.append(f"""
+                ({status_rank} > %s OR ({status_rank} = %s AND
+                 ({updated}, sp.user_id) < (%s::timestamp, %s)))
+            """)
+            params.extend([after[0], after[0], after[1] or '-infinity', after[2]])
+
         where_sql = "WHERE " + " AND ".join(where_clauses)
         params.extend([limit, offset])
 
@@ -1889,22 +2008,19 @@ def search_candidates():
                 sp.years_experience,
                 sp.search_status,
                 sp.skills,
-                sp.preferred_locations
+                sp.preferred_locations,
+                {status_rank} AS status_rank,
+                sp.updated_at
             FROM platform_users pu
             JOIN seeker_profiles sp ON pu.id = sp.user_id
             {where_sql}
-            ORDER BY
-                CASE sp.search_status
-                    WHEN 'actively-looking' THEN 1
-                    WHEN 'open-to-offers' THEN 2
-                    ELSE 3
-                END,
-                sp.updated_at DESC
+            ORDER BY {status_rank}, {updated} DESC, sp.user_id DESC
             LIMIT %s OFFSET %s
         """, params)
 
+        rows = cursor.fetchall()
         candidates = []
-        for row in cursor.fetchall():
+        for row in rows:
             candidates.append({
                 'id': row[0],
                 'first_name': row[1],
@@ -1917,7 +2033,11 @@ def search_candidates():
                 'preferred_locations': row[8] or []
             })
 
-    return jsonify({'candidates': candidates})
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1][9], rows[-1][10], rows[-1][0])
+
+    return jsonify({'candidates': candidates, 'next_cursor': next_cursor})
 
 
 @app.route('/api/companies/invite', methods=['POST'])
@@ -15,10 +15,15 @@ echo "========================================"
 echo "Starting refresh at $(date)"
 echo "========================================"
 
-# Refresh all ATS types
-python3 refresh_postings.py --ats greenhouse
-python3 refresh_postings.py --ats lever
-python3 refresh_postings.py --ats smartrecruiters
+# Refresh all ATS types, unless the adaptive scheduler daemon
+# (refresh_scheduler.py) is already refreshing them within its budget
+if pgrep -f refresh_scheduler.py > /dev/null; then
+    echo "refresh_scheduler.py is running - skipping fixed refresh"
+else
+    python3 refresh_postings.py --ats greenhouse
+    python3 refresh_postings.py --ats lever
+    python3 refresh_postings.py --ats smartrecruiters
+fi
 
 # Detect new openings and record events
 python3 detect_openings.py --hours 7
@@ -9,6 +9,7 @@ access to the job database following the archetype-based schema.
 Author: ShortList.ai
 """
 
+import io
 import os
 import logging
 from typing import List, Dict, Any, Optional, Tuple
@@ -16,7 +17,7 @@ from dataclasses import dataclass, asdict
 from datetime import datetime, date
 import psycopg2
 from psycopg2.extras import execute_batch, RealDictCursor, Json
-from psycopg2 import pool
+from psycopg2 import pool, errorcodes
 import json
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,248 @@ class Config:
     max_connections: int = 10
 
 
+# ============================================================================
+# Bulk loading for observed_jobs
+# ============================================================================
+
+# Column order used when bulk loading full observed-job dicts
+OBSERVED_JOB_COLUMNS = (
+    'company_id', 'location_id', 'canonical_role_id',
+    'raw_title', 'raw_company', 'raw_location',
+    'title_confidence', 'seniority', 'seniority_confidence',
+    'employment_type', 'description', 'requirements',
+    'salary_min', 'salary_max', 'salary_point',
+    'salary_currency', 'salary_period', 'salary_type',
+    'source_id', 'source_data_id', 'source_type', 'observation_weight',
+    'record_type', 'status', 'posted_date', 'filled_date',
+    'first_seen', 'last_seen', 'metadata',
+)
+
+# Same defaults as insert_observed_job(); first_seen/last_seen are filled per batch
+OBSERVED_JOB_DEFAULTS = {
+    'title_confidence': 0.5,
+    'seniority_confidence': 0.5,
+    'salary_currency': 'USD',
+    'salary_period': 'annual',
+    'salary_type': 'base',
+    'observation_weight': 0.5,
+    'record_type': 'observed',
+    'status': 'active',
+    'metadata': {},
+}
+
+# Row layouts shared by the ingest scripts (tuples in this column order)
+
+# Payroll-style rows: one salary per title (state, city and visa payrolls)
+PAYROLL_OBSERVED_COLUMNS = (
+    'raw_title', 'salary_point', 'seniority', 'seniority_confidence',
+    'title_confidence', 'source_type', 'source_id', 'company_id',
+    'location_id',
+)
+
+# Rows whose title was already matched to a canonical role
+ROLE_OBSERVED_COLUMNS = (
+    'raw_title', 'canonical_role_id', 'company_id', 'location_id',
+    'source_id', 'seniority', 'seniority_confidence', 'title_confidence',
+    'salary_point', 'source_type',
+)
+
+# Kaggle job-posting datasets: salary_point is the midpoint of the posted
+# range; the dated layout adds the listing time and {'external_id': ...}
+KAGGLE_OBSERVED_COLUMNS = (
+    'raw_title', 'salary_point', 'salary_min', 'salary_max', 'seniority',
+    'seniority_confidence', 'title_confidence', 'source_type', 'source_id',
+    'company_id', 'location_id',
+)
+KAGGLE_DATED_OBSERVED_COLUMNS = KAGGLE_OBSERVED_COLUMNS + ('first_seen', 'metadata')
+
+OBSERVED_JOBS_STAGING_TABLE = 'observed_jobs_staging'
+
+# Errors that no row can avoid (wrong column layout); never retried row by row
+_SCHEMA_ERRORS = (errorcodes.UNDEFINED_COLUMN, errorcodes.UNDEFINED_TABLE)
+
+_COPY_NULL = '\\N'
+
+
+def _copy_value(value) -> str:
+    """Render one value in COPY text format (NULL, NaN and NaT become \\N)."""
+    if value is None:
+        return _COPY_NULL
+    try:
+        if value != value:  # NaN / NaT
+            return _COPY_NULL
+    except TypeError:  # pd.NA refuses boolean comparison
+        return _COPY_NULL
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        text = json.dumps(value, default=str)
+    elif isinstance(value, (datetime, date)):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return (text.replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def _observed_job_records(rows, columns: Tuple[str, ...]):
+    """
+    Yield one tuple per row in `columns` order.
+
+    Rows may be dicts (missing keys take OBSERVED_JOB_DEFAULTS), sequences
+    already in `columns` order, or the rows of a DataFrame.
+    """
+    if hasattr(rows, 'itertuples'):
+        names = list(rows.columns)
+        rows = (dict(zip(names, values)) for values in rows.itertuples(index=False, name=None))
+
+    for row in rows:
+        if isinstance(row, dict):
+            yield tuple(row.get(column, OBSERVED_JOB_DEFAULTS.get(column)) for column in columns)
+        else:
+            if len(row) != len(columns):
+                raise ValueError(f"Row has {len(row)} values, expected {len(columns)} ({', '.join(columns)})")
+            yield tuple(row)
+
+
+def bulk_insert_observed_jobs(conn, rows, columns: Optional[List[str]] = None,
+                              batch_size: int = 10000) -> Dict[str, int]:
+    """
+    Bulk load observed jobs through COPY FROM STDIN.
+
+    Each batch is streamed into a session-local staging table and merged
+    into observed_jobs with a single INSERT ... SELECT. Batches commit
+    independently: a batch that fails (bad value, FK violation, ...) is
+    rolled back to its savepoint and its rows are retried one at a time,
+    so only the offending rows are lost (logged and counted). A column
+    layout that doesn't match observed_jobs raises instead. Work already
+    pending on `conn` (e.g. companies created by the caller) is committed
+    with the first batch.
+
+    Args:
+        conn: Open psycopg2 connection
+        rows: Iterable of observed-job dicts or tuples, or a DataFrame
+        columns: observed_jobs columns to load; defaults to OBSERVED_JOB_COLUMNS.
+            Columns not listed keep their database defaults.
+        batch_size: Rows per COPY/merge
+
+    Returns:
+        Counts: inserted, failed (rows), batches, failed_batches (batches
+        that fell back to row-by-row inserts)
+    """
+    columns = tuple(columns) if columns else OBSERVED_JOB_COLUMNS
+    column_list = ', '.join(columns)
+    counts = {'inserted': 0, 'failed': 0, 'batches': 0, 'failed_batches': 0}
+    # Positions stamped with the batch time when left empty
+    seen_positions = [i for i, column in enumerate(columns) if column in ('first_seen', 'last_seen')]
+
+    records = _observed_job_records(rows, columns)
+    while True:
+        lines = []
+        now = datetime.now()
+        for record in records:
+            if seen_positions:
+                record = list(record)
+                for i in seen_positions:
+                    if record[i] is None:
+                        record[i] = now
+            lines.append('\t'.join(_copy_value(value) for value in record) + '\n')
+            if len(lines) >= batch_size:
+                break
+        if not lines:
+            break
+
+        counts['batches'] += 1
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS {OBSERVED_JOBS_STAGING_TABLE} AS
+                SELECT * FROM observed_jobs WITH NO DATA
+            """)
+            cursor.execute("SAVEPOINT bulk_observed_jobs")
+            try:
+                cursor.execute(f"TRUNCATE {OBSERVED_JOBS_STAGING_TABLE}")
+                cursor.copy_expert(
+                    f"COPY {OBSERVED_JOBS_STAGING_TABLE} ({column_list}) FROM STDIN",
+                    io.StringIO(''.join(lines)))
+                cursor.execute(f"""
+                    INSERT INTO observed_jobs ({column_list})
+                    SELECT {column_list} FROM {OBSERVED_JOBS_STAGING_TABLE}
+                """)
+                inserted = cursor.rowcount
+                cursor.execute("RELEASE SAVEPOINT bulk_observed_jobs")
+            except psycopg2.Error as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_observed_jobs")
+                if e.pgcode in _SCHEMA_ERRORS:
+                    raise
+                counts['failed_batches'] += 1
+                logger.warning(f"Bulk insert batch {counts['batches']} failed ({len(lines)} rows), "
+                               f"retrying row by row: {e}")
+                inserted = 0
+                for line in lines:
+                    cursor.execute("SAVEPOINT bulk_observed_job")
+                    try:
+                        cursor.copy_expert(f"COPY observed_jobs ({column_list}) FROM STDIN",
+                                           io.StringIO(line))
+                        cursor.execute("RELEASE SAVEPOINT bulk_observed_job")
+                        inserted += 1
+                    except psycopg2.Error as row_error:
+                        cursor.execute("ROLLBACK TO SAVEPOINT bulk_observed_job")
+                        counts['failed'] += 1
+                        logger.error(f"Bulk insert skipped row ({line.strip()[:200]}): {row_error}")
+        conn.commit()
+        counts['inserted'] += inserted
+        logger.debug(f"Bulk inserted batch {counts['batches']}: {inserted} observed jobs")
+
+    return counts
+
+
+class ObservedJobBatch:
+    """
+    Buffer for ingest scripts that build observed-job rows one at a time.
+
+    Rows are bulk loaded (bulk_insert_observed_jobs()) every `batch_size`
+    rows and on flush(); `inserted` and `failed` are the running totals.
+    The buffer is emptied on every flush, including one that raises, so a
+    batch is never loaded twice.
+
+    Example:
+        batch = ObservedJobBatch(conn, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
+        for row in rows:
+            if batch.add(make_row(row)):
+                log.info(f"Ingested {batch.inserted:,} records...")
+        batch.flush()
+    """
+
+    def __init__(self, conn, columns: Tuple[str, ...], batch_size: int = 1000):
+        self.conn = conn
+        self.columns = columns
+        self.batch_size = batch_size
+        self.rows: List[tuple] = []
+        self.inserted = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, row: tuple) -> bool:
+        """Buffer a row; True if this filled the batch and it was loaded."""
+        self.rows.append(row)
+        if len(self.rows) < self.batch_size:
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Load the buffered rows; returns how many were inserted."""
+        if not self.rows:
+            return 0
+        rows, self.rows = self.rows, []
+        counts = bulk_insert_observed_jobs(self.conn, rows, self.columns, batch_size=len(rows))
+        self.inserted += counts['inserted']
+        self.failed += counts['failed']
+        return counts['inserted']
+
+
 class DatabaseManager:
     """
     Database manager with connection pooling and schema management.
@@ -351,6 +594,31 @@ class DatabaseManager:
         finally:
             self.release_connection(conn)
 
+    def bulk_insert_observed_jobs(self, rows, columns: Optional[List[str]] = None,
+                                  batch_size: int = 10000, conn=None) -> Dict[str, int]:
+        """
+        Bulk insert observed jobs via COPY (see bulk_insert_observed_jobs()).
+
+        Pass `conn` to load on a connection the caller already holds, so
+        rows can reference companies/locations it created but hasn't
+        committed; otherwise a pooled connection is used.
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = self.get_connection()
+        try:
+            counts = bulk_insert_observed_jobs(conn, rows, columns, batch_size)
+            logger.info(f"Bulk inserted {counts['inserted']} observed jobs "
+                        f"({counts['failed']} rows failed, {counts['failed_batches']} batches retried row by row)")
+            return counts
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error bulk inserting observed jobs: {e}")
+            raise
+        finally:
+            if own_conn:
+                self.release_connection(conn)
+
     # ========================================================================
     # PHASE 6: Compensation Observations
     # ========================================================================
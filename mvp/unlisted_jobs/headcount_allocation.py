@@ -23,11 +23,14 @@ Date: 2026-01-13
 
 import os
 import sys
+import zlib
 import logging
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
+import pandas as pd
 from scipy import stats
 import psycopg2
 from psycopg2.extras import RealDictCursor
@@ -36,6 +39,7 @@ from psycopg2.extras import RealDictCursor
 os.environ['DB_USER'] = os.environ.get('DB_USER', 'noahhopkins')
 
 from database import Config
+from salary_inference import parse_metro_area
 
 logging.basicConfig(
     level=logging.INFO,
@@ -189,9 +193,7 @@ class HeadcountAllocator:
 
         # Extract primary city/state from OEWS area name
         # Format: "City-City-City, State" or "City, State"
-        metro_parts = area_name.split(',')
-        metro_state = metro_parts[-1].strip().split('-')[0].strip() if len(metro_parts) > 1 else None
-        metro_cities = metro_parts[0].split('-') if metro_parts else []
+        metro_state, metro_cities = parse_metro_area(area_name)
 
         # Build evidence query
         # This joins observed_jobs with companies and locations
@@ -268,11 +270,106 @@ class HeadcountAllocator:
         cur.close()
         return evidence_list
 
+    def get_all_company_evidence(
+        self,
+        cells: Dict[Tuple[str, int], Dict]
+    ) -> Dict[Tuple[str, int], List[CompanyEvidence]]:
+        """
+        get_company_evidence() for many metro × role cells with one query.
+
+        Evidence counts are aggregated per company × role × location in SQL,
+        then matched to each cell's metro (location state is the metro state,
+        or city is one of the metro cities) and summed in pandas.
+
+        Args:
+            cells: (area_code, canonical_role_id) -> dict with 'area_name'
+
+        Returns:
+            (area_code, canonical_role_id) -> evidence list, ordered by company_id
+        """
+        if not cells:
+            return {}
+
+        role_ids = sorted({role_id for _, role_id in cells})
+
+        self.connect()
+        cur = self.conn.cursor()
+        cur.execute("""
+            SELECT
+                oj.company_id,
+                c.name as company_name,
+                oj.canonical_role_id,
+                l.state,
+                l.city,
+                COUNT(*) FILTER (WHERE oj.source_type LIKE 'ats_%%') as posting_count,
+                COUNT(*) FILTER (WHERE oj.source_type IN ('state_payroll', 'payroll')) as payroll_count,
+                COUNT(*) FILTER (WHERE oj.source_type = 'h1b_visa') as h1b_count
+            FROM observed_jobs oj
+            JOIN companies c ON oj.company_id = c.id
+            JOIN locations l ON oj.location_id = l.id
+            WHERE oj.canonical_role_id = ANY(%s)
+              AND (oj.source_type LIKE 'ats_%%'
+                   OR oj.source_type IN ('state_payroll', 'payroll', 'h1b_visa'))
+            GROUP BY oj.company_id, c.name, oj.canonical_role_id, l.state, l.city
+        """, (role_ids,))
+        counts = pd.DataFrame(cur.fetchall(), columns=[
+            'company_id', 'company_name', 'canonical_role_id', 'state', 'city',
+            'posting_count', 'payroll_count', 'h1b_count'
+        ])
+        cur.close()
+
+        if counts.empty:
+            return {}
+        counts['row_id'] = np.arange(len(counts))
+
+        area_keys = pd.DataFrame(
+            [(area_code, role_id) + parse_metro_area(cell['area_name'])
+             for (area_code, role_id), cell in cells.items()],
+            columns=['area_code', 'canonical_role_id', 'state', 'city']
+        )
+        by_state = counts.dropna(subset=['state']).merge(
+            area_keys.drop(columns='city').dropna(subset=['state']),
+            on=['canonical_role_id', 'state'])
+        by_city = counts.dropna(subset=['city']).merge(
+            area_keys.drop(columns='state').explode('city').dropna(subset=['city']),
+            on=['canonical_role_id', 'city'])
+
+        # A location matching on both state and city still counts once
+        matched = (pd.concat([by_state, by_city], ignore_index=True)
+                     .drop_duplicates(subset=['row_id', 'area_code']))
+        totals = (matched.groupby(['area_code', 'canonical_role_id', 'company_id'])
+                         .agg(company_name=('company_name', 'first'),
+                              posting_count=('posting_count', 'sum'),
+                              payroll_count=('payroll_count', 'sum'),
+                              h1b_count=('h1b_count', 'sum'))
+                         .reset_index())
+        totals['total_evidence'] = (
+            totals['posting_count'] * self.POSTING_WEIGHT +
+            totals['h1b_count'] * self.H1B_WEIGHT +
+            totals['payroll_count'] * self.PAYROLL_WEIGHT
+        )
+        totals = totals[totals['total_evidence'] >= self.MIN_EVIDENCE_FOR_ALLOCATION]
+
+        evidence = {}
+        for row in totals.itertuples(index=False):
+            evidence.setdefault((row.area_code, row.canonical_role_id), []).append(CompanyEvidence(
+                company_id=int(row.company_id),
+                company_name=row.company_name,
+                posting_count=int(row.posting_count),
+                h1b_count=int(row.h1b_count),
+                payroll_count=int(row.payroll_count),
+                total_evidence=float(row.total_evidence)
+            ))
+
+        logger.info(f"Loaded evidence for {len(evidence)} of {len(cells)} metro × role cells")
+        return evidence
+
     def allocate_headcount(
         self,
         oews_total: int,
         evidence_list: List[CompanyEvidence],
-        uncertainty_samples: int = 1000
+        uncertainty_samples: int = 1000,
+        rng: Optional[np.random.Generator] = None
     ) -> List[Tuple[CompanyEvidence, int, int, int]]:
         """
         Allocate OEWS total headcount to companies based on evidence.
@@ -286,6 +383,7 @@ class HeadcountAllocator:
             oews_total: Total employment from OEWS for this metro × role
             evidence_list: List of company evidence
             uncertainty_samples: Number of Monte Carlo samples
+            rng: Random generator (seed it for reproducible draws)
 
         Returns:
             List of (evidence, headcount_p10, headcount_p50, headcount_p90)
@@ -310,49 +408,51 @@ class HeadcountAllocator:
 
         # Sample from Dirichlet to get share distributions
         # Each sample is a probability distribution over companies
-        share_samples = np.random.dirichlet(alphas, size=uncertainty_samples)
+        rng = rng if rng is not None else np.random.default_rng()
+        share_samples = rng.dirichlet(alphas, size=uncertainty_samples)
 
         # Convert shares to headcounts
         headcount_samples = np.round(share_samples * oews_total).astype(int)
 
-        # Ensure each sample sums to exactly oews_total (adjust rounding)
-        for i in range(uncertainty_samples):
-            diff = oews_total - headcount_samples[i].sum()
-            if diff != 0:
-                # Add/subtract from company with highest share
-                max_idx = np.argmax(share_samples[i])
-                headcount_samples[i, max_idx] += diff
-
-        # Compute percentiles for each company
-        results = []
-        for j, evidence in enumerate(evidence_list):
-            company_headcounts = headcount_samples[:, j]
-            p10 = int(np.percentile(company_headcounts, 10))
-            p50 = int(np.percentile(company_headcounts, 50))
-            p90 = int(np.percentile(company_headcounts, 90))
-
-            # Ensure at least 1 if company has evidence
-            p10 = max(1, p10)
-            p50 = max(1, p50)
-            p90 = max(p50, p90)  # P90 >= P50
-
-            results.append((evidence, p10, p50, p90))
+        # Ensure each sample sums to exactly oews_total: put the rounding
+        # difference on the company with the highest share in that sample
+        diff = oews_total - headcount_samples.sum(axis=1)
+        headcount_samples[np.arange(uncertainty_samples), share_samples.argmax(axis=1)] += diff
 
-        return results
+        # Percentiles for every company at once (rows: P10, P50, P90)
+        percentiles = np.percentile(headcount_samples, [10, 50, 90], axis=0).astype(int)
+
+        # Ensure at least 1 if company has evidence, and P90 >= P50
+        p10 = np.maximum(1, percentiles[0])
+        p50 = np.maximum(1, percentiles[1])
+        p90 = np.maximum(p50, percentiles[2])
+
+        return [
+            (evidence, int(p10[j]), int(p50[j]), int(p90[j]))
+            for j, evidence in enumerate(evidence_list)
+        ]
 
     def run_allocation(
         self,
         year: int = 2024,
         limit_areas: int = None,
-        limit_roles: int = None
+        limit_roles: int = None,
+        workers: int = 1,
+        seed: Optional[int] = None
     ) -> List[HeadcountEstimate]:
         """
         Run headcount allocation for all metro × role combinations.
 
+        Evidence for every cell is loaded with one query. Each cell samples
+        from its own generator seeded by (seed, cell), so results do not
+        depend on cell order or on how cells are spread across processes.
+
         Args:
             year: OEWS reference year
             limit_areas: Limit to first N areas (for testing)
             limit_roles: Limit to first N roles (for testing)
+            workers: Processes to allocate cells in (1 = in this process)
+            seed: Base seed; a random one is drawn (and logged) if omitted
 
         Returns:
             List of HeadcountEstimate objects
@@ -365,9 +465,7 @@ class HeadcountAllocator:
         # Track unique areas and roles for limiting
         areas_seen = set()
         roles_seen = set()
-
-        all_estimates = []
-        processed = 0
+        cells = {}
 
         for (area_code, role_id), oews_data in oews_priors.items():
             # Apply limits
@@ -382,22 +480,45 @@ class HeadcountAllocator:
             oews_total = oews_data['employment']
             if oews_total is None or oews_total <= 0:
                 continue
+            cells[(area_code, role_id)] = oews_data
 
-            # Get company evidence
-            evidence_list = self.get_company_evidence(area_code, role_id)
+        # Get company evidence for all cells at once
+        evidence = self.get_all_company_evidence(cells)
 
-            if not evidence_list:
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy)
+        logger.info(f"Allocation seed: {seed}")
+
+        tasks = []
+        for key, oews_data in cells.items():
+            if key not in evidence:
                 logger.debug(f"No evidence for {oews_data['area_name']} × {oews_data['role_name']}")
                 continue
+            tasks.append((key, int(oews_data['employment']), evidence[key], cell_seed(seed, *key)))
+
+        # Allocate headcount
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(tasks) // (workers * 4))
+                allocated = list(pool.map(_allocate_cell, tasks, chunksize=chunksize))
+        else:
+            allocated = [
+                (key, self.allocate_headcount(oews_total, evidence_list, rng=np.random.default_rng(cell_rng_seed)))
+                for key, oews_total, evidence_list, cell_rng_seed in tasks
+            ]
 
-            # Allocate headcount
-            allocations = self.allocate_headcount(oews_total, evidence_list)
+        all_estimates = []
+        processed = 0
+
+        for (area_code, role_id), allocations in allocated:
+            oews_data = cells[(area_code, role_id)]
+            oews_total = int(oews_data['employment'])
 
             # Create estimates
-            for evidence, p10, p50, p90 in allocations:
+            for evidence_item, p10, p50, p90 in allocations:
                 estimate = HeadcountEstimate(
-                    company_id=evidence.company_id,
-                    company_name=evidence.company_name,
+                    company_id=evidence_item.company_id,
+                    company_name=evidence_item.company_name,
                     metro_id=None,  # Would need to look up
                     metro_name=oews_data['area_name'],
                     canonical_role_id=role_id,
@@ -405,11 +526,11 @@ class HeadcountAllocator:
                     headcount_p10=p10,
                     headcount_p50=p50,
                     headcount_p90=p90,
-                    evidence_score=evidence.total_evidence,
-                    share_of_metro=evidence.evidence_weight,
+                    evidence_score=evidence_item.total_evidence,
+                    share_of_metro=evidence_item.evidence_weight,
                     method='dirichlet_shrinkage',
                     oews_total=oews_total,
-                    companies_in_metro=len(evidence_list)
+                    companies_in_metro=len(allocations)
                 )
                 all_estimates.append(estimate)
 
@@ -503,6 +624,20 @@ class HeadcountAllocator:
         return inserted, updated
 
 
+def cell_seed(seed: int, area_code: str, canonical_role_id: int) -> List[int]:
+    """Seed for one metro × role cell's generator, stable across runs and processes."""
+    return [seed, zlib.crc32(f"{area_code}:{canonical_role_id}".encode())]
+
+
+def _allocate_cell(task):
+    """Process-pool entry point: allocate one cell with its own seeded generator."""
+    key, oews_total, evidence_list, seed = task
+    allocations = HeadcountAllocator().allocate_headcount(
+        oews_total, evidence_list, rng=np.random.default_rng(seed)
+    )
+    return key, allocations
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Allocate headcount to companies using OEWS constraints"
@@ -525,6 +660,18 @@ def main():
         default=None,
         help='Limit to first N roles (for testing)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Processes to spread metro × role cells across'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Base random seed (for reproducible allocations)'
+    )
     parser.add_argument(
         '--save',
         action='store_true',
@@ -548,7 +695,9 @@ def main():
         estimates = allocator.run_allocation(
             year=args.year,
             limit_areas=args.limit_areas,
-            limit_roles=args.limit_roles
+            limit_roles=args.limit_roles,
+            workers=args.workers,
+            seed=args.seed
         )
 
         # Print summary
@@ -19,7 +19,7 @@ import re
 
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -104,10 +104,8 @@ def main():
 
     filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'state_payroll_new', 'employee-compensation-report-2025.csv')
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 500
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=500)
 
     with open(filepath, 'r', encoding='utf-8-sig') as f:
         reader = csv.DictReader(f)
@@ -131,31 +129,17 @@ def main():
 
             company_id = get_or_create_company(cursor, 'City of Phoenix', department)
 
-            batch.append((
+            if batch.add((
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'city_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"  Ingested {count:,} records...")
-
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+            )):
+                log.info(f"  Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     conn.commit()
 
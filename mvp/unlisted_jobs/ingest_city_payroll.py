@@ -18,7 +18,7 @@ import re
 
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -126,10 +126,8 @@ def ingest_chicago(cursor, normalizer: TitleNormalizer) -> int:
     source_id = get_or_create_source(cursor, 'Chicago City Payroll')
     location_id = get_or_create_location(cursor, 'Chicago', 'IL')
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -162,36 +160,25 @@ def ingest_chicago(cursor, normalizer: TitleNormalizer) -> int:
 
             company_id = get_or_create_company(cursor, row.get('Department'))
 
-            batch.append((
+            record = (
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'city_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records ingested, {skipped:,} skipped")
     return count
@@ -216,10 +203,8 @@ def ingest_philadelphia(cursor, normalizer: TitleNormalizer) -> int:
     source_id = get_or_create_source(cursor, 'Philadelphia City Payroll')
     location_id = get_or_create_location(cursor, 'Philadelphia', 'PA')
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -243,36 +228,25 @@ def ingest_philadelphia(cursor, normalizer: TitleNormalizer) -> int:
 
             company_id = get_or_create_company(cursor, row.get('department_name'))
 
-            batch.append((
+            record = (
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'city_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records ingested, {skipped:,} skipped")
     return count
@@ -297,10 +271,8 @@ def ingest_los_angeles(cursor, normalizer: TitleNormalizer) -> int:
     source_id = get_or_create_source(cursor, 'Los Angeles City Payroll')
     location_id = get_or_create_location(cursor, 'Los Angeles', 'CA')
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -329,36 +301,25 @@ def ingest_los_angeles(cursor, normalizer: TitleNormalizer) -> int:
 
             company_id = get_or_create_company(cursor, row.get('DEPARTMENT_TITLE'))
 
-            batch.append((
+            record = (
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'city_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records ingested, {skipped:,} skipped")
     return count
@@ -19,7 +19,7 @@ import re
 
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -124,11 +124,9 @@ def main():
     # (they all have same Annual Rate anyway)
     seen_employees = set()
 
-    count = 0
     skipped = 0
     duplicate = 0
-    batch = []
-    batch_size = 500
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=500)
 
     with open(filepath, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -163,32 +161,18 @@ def main():
             else:
                 location_id = default_location_id
 
-            batch.append((
+            if batch.add((
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'state_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                if count % 10000 == 0:
-                    log.info(f"  Ingested {count:,} records... ({duplicate:,} duplicates)")
-
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+            )):
+                if batch.inserted % 10000 == 0:
+                    log.info(f"  Ingested {batch.inserted:,} records... ({duplicate:,} duplicates)")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     conn.commit()
 
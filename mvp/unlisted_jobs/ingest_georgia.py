@@ -19,7 +19,7 @@ import re
 
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -106,10 +106,8 @@ def main():
 
     filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'state_payroll_new', 'SalaryTravelDataExport2025.txt')
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 500
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=500)
 
     with open(filepath, 'r', encoding='latin-1') as f:
         reader = csv.DictReader(f)
@@ -130,32 +128,18 @@ def main():
 
             company_id = get_or_create_company(cursor, row.get('ORGANIZATION'))
 
-            batch.append((
+            if batch.add((
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'state_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                if count % 50000 == 0:
-                    log.info(f"  Ingested {count:,} records...")
-
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+            )):
+                if batch.inserted % 50000 == 0:
+                    log.info(f"  Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     conn.commit()
 
@@ -6,8 +6,9 @@ Job Posting Ingestion Orchestrator
 Orchestrates job posting ingestion from multiple ATS platforms at scale.
 
 Features:
-- Auto-detects ATS type for unknown companies
-- Parallel fetching with rate limiting
+- Auto-detects ATS type for unknown companies (all platforms probed at once,
+  answers cached in ats_detections)
+- Concurrent asyncio fetching over pooled connections, rate-limited per ATS host
 - Progress tracking and resumption
 - Database upsert with change detection
 - Logging and error handling
@@ -17,6 +18,7 @@ Usage:
     python ingest_job_postings.py --known-only      # Only known ATS companies
     python ingest_job_postings.py --detect-only     # Only detect ATS types
     python ingest_job_postings.py --company stripe  # Single company
+    python ingest_job_postings.py --concurrency 500 # Companies fetched at once
 
 Author: ShortList.ai
 Date: 2026-01-13
@@ -27,11 +29,12 @@ import sys
 import json
 import logging
 import argparse
+import asyncio
 import time
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
 import psycopg2
 from psycopg2.extras import execute_values
 
@@ -47,6 +50,8 @@ from sources.job_postings import (
     SmartRecruitersConnector,
     WorkdayConnector,
     JobPosting,
+    AsyncFetcher,
+    FetchError,
 )
 from sources.job_postings.company_targets import (
     get_all_known_targets,
@@ -83,37 +88,262 @@ class IngestionResult:
     error: Optional[str] = None
 
 
+@dataclass
+class ATSDetection:
+    """Outcome of ATS detection for one company."""
+    ats_type: Optional[str]                      # None = no ATS found
+    config: Dict[str, str] = field(default_factory=dict)  # e.g. Workday host/tenant
+
+    @property
+    def found(self) -> bool:
+        return self.ats_type is not None
+
+
 class ATSDetector:
-    """Detects which ATS platform a company uses."""
+    """
+    Detects which ATS platform a company uses, with a persistent cache.
+
+    Every platform is probed at once, but answers are taken in PLATFORMS
+    order: a platform's positive answer only counts once every platform
+    before it has said no, so a slow Greenhouse board still beats a fast
+    Lever one. Answers - including "no ATS found" - are stored in
+    ats_detections with a TTL, so a company is probed once per TTL rather
+    than once per run. If a probe fails (timeout, 429, 5xx) before the
+    answer is settled, the answer is inconclusive and isn't cached.
+    """
 
-    @staticmethod
-    def detect(company_id: str) -> Optional[str]:
+    # Priority order when a company is found on more than one platform
+    PLATFORMS = ["greenhouse", "lever", "smartrecruiters", "workday"]
+
+    POSITIVE_TTL = timedelta(days=30)
+    NEGATIVE_TTL = timedelta(days=7)
+
+    PROBE_TIMEOUT = 10
+    PROBE_RETRIES = 1
+
+    # Companies probed at once by detect_many_async() (per-host limits still apply)
+    MAX_CONCURRENT_DETECTIONS = 50
+
+    def __init__(self, db_url: str = None):
+        self.db_url = db_url
+        self.config = Config()
+        self._table_ready = False
+
+    # =========================================================================
+    # CACHE
+    # =========================================================================
+
+    def _connect(self):
+        if self.db_url:
+            return psycopg2.connect(self.db_url)
+        return psycopg2.connect(
+            host=self.config.db_host,
+            port=self.config.db_port,
+            database=self.config.db_name,
+            user=self.config.db_user,
+            password=self.config.db_password
+        )
+
+    def _ensure_table(self, cur):
+        if self._table_ready:
+            return
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS ats_detections (
+                company_id_ats VARCHAR(255) PRIMARY KEY,
+                ats_type VARCHAR(50),
+                config JSONB,
+                detected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_ats_detections_expires
+            ON ats_detections(expires_at);
+        """)
+        self._table_ready = True
+
+    def load(self, company_ids: List[str]) -> Dict[str, ATSDetection]:
+        """Unexpired cached detections for the given companies."""
+        if not company_ids:
+            return {}
+        try:
+            conn = self._connect()
+            try:
+                with conn.cursor() as cur:
+                    self._ensure_table(cur)
+                    cur.execute("""
+                        SELECT company_id_ats, ats_type, config
+                        FROM ats_detections
+                        WHERE company_id_ats = ANY(%s) AND expires_at > NOW()
+                    """, (list(company_ids),))
+                    rows = cur.fetchall()
+                conn.commit()
+            finally:
+                conn.close()
+        except psycopg2.Error as e:
+            logger.warning(f"ATS detection cache unavailable: {e}")
+            return {}
+
+        return {
+            company_id: ATSDetection(ats_type, config or {})
+            for company_id, ats_type, config in rows
+        }
+
+    def store(self, detections: Dict[str, ATSDetection]):
+        """Cache detections, each with the TTL for its outcome."""
+        if not detections:
+            return
+        now = datetime.now()
+        try:
+            conn = self._connect()
+            try:
+                with conn.cursor() as cur:
+                    self._ensure_table(cur)
+                    execute_values(cur, """
+                        INSERT INTO ats_detections
+                        (company_id_ats, ats_type, config, detected_at, expires_at)
+                        VALUES %s
+                        ON CONFLICT (company_id_ats) DO UPDATE SET
+                            ats_type = EXCLUDED.ats_type,
+                            config = EXCLUDED.config,
+                            detected_at = EXCLUDED.detected_at,
+                            expires_at = EXCLUDED.expires_at
+                    """, [
+                        (company_id, d.ats_type, json.dumps(d.config) if d.config else None, now,
+                         now + (self.POSITIVE_TTL if d.found else self.NEGATIVE_TTL))
+                        for company_id, d in detections.items()
+                    ])
+                conn.commit()
+            finally:
+                conn.close()
+        except psycopg2.Error as e:
+            logger.warning(f"Could not cache ATS detections: {e}")
+
+    # =========================================================================
+    # PROBING
+    # =========================================================================
+
+    async def _probe_board(self, fetcher: AsyncFetcher, ats_type: str, url: str,
+                           has_jobs: Callable[[Any], bool] = None):
         """
-        Detect which ATS a company uses by probing each platform.
+        ATSDetection if the board exists, False if not, None if unknown.
 
-        Returns:
-            ATS type string or None if not found
+        has_jobs checks the JSON of a 200 response, for APIs that answer
+        200 for any company id.
         """
-        # Try Greenhouse first (most common for tech)
-        if GreenhouseConnector.discover_company(company_id):
-            logger.info(f"Detected Greenhouse for {company_id}")
-            return "greenhouse"
+        try:
+            response = await fetcher.get(url, timeout=self.PROBE_TIMEOUT, max_retries=self.PROBE_RETRIES)
+        except FetchError:
+            return None
+        if response.status == 200:
+            if has_jobs:
+                try:
+                    if not has_jobs(response.json()):
+                        return False
+                except (ValueError, AttributeError):
+                    return False
+            return ATSDetection(ats_type)
+        if response.status in fetcher.RETRY_STATUSES:
+            return None
+        return False
 
-        # Try Lever
-        if LeverConnector.discover_company(company_id):
-            logger.info(f"Detected Lever for {company_id}")
-            return "lever"
+    async def _probe_workday(self, fetcher: AsyncFetcher, company_id: str):
+        config = await WorkdayConnector.discover_company_async(
+            fetcher, company_id, timeout=self.PROBE_TIMEOUT, max_retries=self.PROBE_RETRIES
+        )
+        if config['found']:
+            return ATSDetection("workday", {'host': config['host'], 'tenant': config['tenant']})
+        return None if config['error'] else False
+
+    def _probes(self, fetcher: AsyncFetcher, company_id: str) -> Dict[str, object]:
+        return {
+            "greenhouse": self._probe_board(
+                fetcher, "greenhouse", f"{GreenhouseConnector.API_BASE}/{company_id}/jobs"),
+            "lever": self._probe_board(
+                fetcher, "lever", f"{LeverConnector.API_BASE}/{company_id}?mode=json"),
+            # Unknown company ids get a 200 with no postings
+            "smartrecruiters": self._probe_board(
+                fetcher, "smartrecruiters", f"{SmartRecruitersConnector.API_BASE}/{company_id}/postings?limit=1",
+                has_jobs=lambda data: (data.get('totalFound') or 0) > 0),
+            "workday": self._probe_workday(fetcher, company_id),
+        }
 
-        # Try SmartRecruiters
-        if SmartRecruitersConnector.discover_company(company_id):
-            logger.info(f"Detected SmartRecruiters for {company_id}")
-            return "smartrecruiters"
+    async def probe(self, fetcher: AsyncFetcher, company_id: str) -> Optional[ATSDetection]:
+        """
+        Probe every platform concurrently, bypassing the cache.
 
-        # Workday is harder - would need to try multiple hosts
-        # For now, skip auto-detection for Workday
+        Returns as soon as the answer is settled: the highest-priority
+        positive once every platform before it has said no.
+
+        Returns:
+            The detection, a negative one if every platform said no, or
+            None if inconclusive
+        """
+        probes = self._probes(fetcher, company_id)
+        tasks = {ats_type: asyncio.ensure_future(probes[ats_type]) for ats_type in self.PLATFORMS}
+        try:
+            for ats_type in self.PLATFORMS:
+                # Lower-priority probes keep running while this one is awaited
+                result = await tasks[ats_type]
+                if result is None:
+                    # Can't rule this platform out, so no later positive is safe
+                    logger.debug(f"ATS detection inconclusive for {company_id} ({ats_type} probe failed)")
+                    return None
+                if result:
+                    logger.info(f"Detected {result.ats_type} for {company_id}")
+                    return result
+        finally:
+            for task in tasks.values():
+                task.cancel()
 
         logger.debug(f"No ATS detected for {company_id}")
-        return None
+        return ATSDetection(None)
+
+    async def detect_many_async(self, company_ids: List[str],
+                                fetcher: AsyncFetcher) -> Dict[str, ATSDetection]:
+        """
+        Detect many companies: cached answers first, then the rest probed
+        concurrently and cached.
+
+        Returns:
+            Dict mapping company_id to its detection (inconclusive ones omitted)
+        """
+        company_ids = list(dict.fromkeys(company_ids))
+        detections = await asyncio.to_thread(self.load, company_ids)
+        missing = [c for c in company_ids if c not in detections]
+
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_DETECTIONS)
+
+        async def detect(company_id: str) -> Tuple[str, Optional[ATSDetection]]:
+            async with semaphore:
+                return company_id, await self.probe(fetcher, company_id)
+
+        probed = {
+            company_id: detection
+            for company_id, detection in await asyncio.gather(*(detect(c) for c in missing))
+            if detection is not None
+        }
+        await asyncio.to_thread(self.store, probed)
+
+        logger.info(
+            f"ATS detection: {len(detections)} cached, {len(probed)} probed "
+            f"({sum(d.found for d in probed.values())} found), "
+            f"{len(missing) - len(probed)} inconclusive"
+        )
+        detections.update(probed)
+        return detections
+
+    def detect(self, company_id: str) -> Optional[ATSDetection]:
+        """
+        Blocking detection for one company (cache, then probes).
+
+        Returns:
+            ATSDetection, or None if inconclusive
+        """
+        async def run():
+            async with AsyncFetcher() as fetcher:
+                return await self.detect_many_async([company_id], fetcher)
+
+        return asyncio.run(run()).get(company_id)
 
 
 class JobPostingIngester:
@@ -121,23 +351,29 @@ class JobPostingIngester:
     Orchestrates job posting ingestion from multiple ATS platforms.
     """
 
-    def __init__(self, db_url: str = None, max_workers: int = 5):
+    def __init__(self, db_url: str = None, max_workers: int = 5, max_concurrency: int = 200):
         """
         Initialize the ingester.
 
         Args:
             db_url: PostgreSQL connection URL
-            max_workers: Maximum parallel workers for fetching
+            max_workers: Maximum parallel workers for blocking work
+                         (database upserts, connector setup)
+            max_concurrency: Maximum companies being fetched at once
+                             (per-host limits still apply)
         """
         self.db_url = db_url
         self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
         self.normalizer = TitleNormalizer()
         self.config = Config()
 
-        # Track ATS detections for caching
-        self.detected_ats: Dict[str, str] = {}
+        # ATS detection, cached across runs in ats_detections
+        self.detector = ATSDetector(db_url)
+        self.detected_ats: Dict[str, ATSDetection] = {}
 
-        # Rate limiting
+        # Rate limiting (sequential path only; the async path is
+        # rate-limited per host by AsyncFetcher)
         self.request_delay = 0.5  # seconds between requests per worker
 
     def get_connector(self, target: CompanyTarget):
@@ -148,15 +384,17 @@ class JobPostingIngester:
             Connector instance or None if not found
         """
         ats_type = target.ats_type
+        detection = None
 
         # If no ATS type, try to detect
         if not ats_type:
             if target.company_id in self.detected_ats:
-                ats_type = self.detected_ats[target.company_id]
+                detection = self.detected_ats[target.company_id]
             else:
-                ats_type = ATSDetector.detect(target.company_id)
-                if ats_type:
-                    self.detected_ats[target.company_id] = ats_type
+                detection = self.detector.detect(target.company_id)
+                if detection:
+                    self.detected_ats[target.company_id] = detection
+            ats_type = detection.ats_type if detection else None
 
         if not ats_type:
             return None
@@ -181,6 +419,14 @@ class JobPostingIngester:
                         workday_host=host,
                         tenant=tenant
                     )
+            # Host and tenant found by detection
+            if detection and detection.config.get('host'):
+                return WorkdayConnector(
+                    company_id=target.company_id,
+                    company_name=target.company_name,
+                    workday_host=detection.config['host'],
+                    tenant=detection.config.get('tenant')
+                )
             # Try auto-discovery for unknown Workday
             return WorkdayConnector(target.company_id, target.company_name)
 
@@ -206,7 +452,7 @@ class JobPostingIngester:
             # Rate limiting
             time.sleep(self.request_delay)
 
-            return jobs, ats_type, None
+            return jobs, ats_type, connector.fetch_error
 
         except Exception as e:
             logger.error(f"Error fetching {target.company_name}: {e}")
@@ -226,39 +472,69 @@ class JobPostingIngester:
         jobs, ats_type, error = self.fetch_company_jobs(target)
 
         if error:
-            return IngestionResult(
-                company_id=target.company_id,
-                company_name=target.company_name,
-                ats_type=ats_type or "unknown",
-                jobs_found=0,
-                jobs_inserted=0,
-                jobs_updated=0,
-                duration_seconds=time.time() - start_time,
-                error=error
-            )
+            return self._result(target, ats_type or "unknown", start_time, error=error)
 
         if not jobs:
-            return IngestionResult(
-                company_id=target.company_id,
-                company_name=target.company_name,
-                ats_type=ats_type,
-                jobs_found=0,
-                jobs_inserted=0,
-                jobs_updated=0,
-                duration_seconds=time.time() - start_time
-            )
+            return self._result(target, ats_type, start_time)
 
         # Ingest to database
         inserted, updated = self.upsert_jobs(jobs, target.company_name)
 
+        return self._result(target, ats_type, start_time, len(jobs), inserted, updated)
+
+    async def ingest_company_async(self, target: CompanyTarget, fetcher: AsyncFetcher,
+                                   db_executor: ThreadPoolExecutor) -> IngestionResult:
+        """
+        ingest_company() for the async path: the fetch goes through the
+        shared fetcher, blocking work runs on threads.
+
+        Returns:
+            IngestionResult with statistics
+        """
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        logger.info(f"Processing {target.company_name} ({target.company_id})")
+
+        ats_type = target.ats_type
+        try:
+            # Connector setup may hit the detection cache; keep it off the loop
+            connector = await asyncio.to_thread(self.get_connector, target)
+            if not connector:
+                return self._result(target, ats_type or "unknown", start_time, error="No ATS detected")
+
+            ats_type = connector.ATS_TYPE
+            jobs = await connector.fetch_jobs_async(fetcher)
+
+        except Exception as e:
+            logger.error(f"Error fetching {target.company_name}: {e}")
+            return self._result(target, ats_type or "unknown", start_time, error=str(e))
+
+        if connector.fetch_error:
+            return self._result(target, ats_type, start_time, error=connector.fetch_error)
+
+        if not jobs:
+            return self._result(target, ats_type, start_time)
+
+        # Ingest to database
+        inserted, updated = await loop.run_in_executor(
+            db_executor, self.upsert_jobs, jobs, target.company_name
+        )
+
+        return self._result(target, ats_type, start_time, len(jobs), inserted, updated)
+
+    @staticmethod
+    def _result(target: CompanyTarget, ats_type: str, start_time: float,
+                jobs_found: int = 0, jobs_inserted: int = 0, jobs_updated: int = 0,
+                error: str = None) -> IngestionResult:
         return IngestionResult(
             company_id=target.company_id,
             company_name=target.company_name,
             ats_type=ats_type,
-            jobs_found=len(jobs),
-            jobs_inserted=inserted,
-            jobs_updated=updated,
-            duration_seconds=time.time() - start_time
+            jobs_found=jobs_found,
+            jobs_inserted=jobs_inserted,
+            jobs_updated=jobs_updated,
+            duration_seconds=time.time() - start_time,
+            error=error
         )
 
     def upsert_jobs(self, jobs: List[JobPosting], company_name: str) -> Tuple[int, int]:
@@ -496,30 +772,52 @@ class JobPostingIngester:
         Returns:
             Dict mapping company_id to detected ATS type
         """
-        results = {}
+        results = {target.company_id: target.ats_type for target in targets if target.ats_type}
+
+        async def detect():
+            async with AsyncFetcher() as fetcher:
+                await self._detect_ats_async(targets, fetcher)
+
+        asyncio.run(detect())
 
         for target in targets:
-            if target.ats_type:
-                results[target.company_id] = target.ats_type
+            detection = self.detected_ats.get(target.company_id)
+            if target.ats_type or not detection:
                 continue
-
-            ats_type = ATSDetector.detect(target.company_id)
-            if ats_type:
-                results[target.company_id] = ats_type
-                logger.info(f"Detected {ats_type} for {target.company_name}")
+            if detection.found:
+                results[target.company_id] = detection.ats_type
+                logger.info(f"Detected {detection.ats_type} for {target.company_name}")
             else:
                 logger.debug(f"No ATS found for {target.company_name}")
 
-            # Rate limiting
-            time.sleep(0.3)
-
         return results
 
+    async def _detect_ats_async(self, targets: List[CompanyTarget], fetcher: AsyncFetcher):
+        """
+        Detect every target without a known ATS, all at once, before any
+        are ingested. Inconclusive ones count as not found for this run
+        (but aren't cached, so the next run probes them again).
+        """
+        unknown = [
+            target.company_id for target in targets
+            if not target.ats_type and target.company_id not in self.detected_ats
+        ]
+        if not unknown:
+            return
+
+        detections = await self.detector.detect_many_async(unknown, fetcher)
+        for company_id in unknown:
+            self.detected_ats[company_id] = detections.get(company_id) or ATSDetection(None)
+
     def run_ingestion(self, targets: List[CompanyTarget],
                       parallel: bool = True) -> List[IngestionResult]:
         """
         Run full ingestion for all targets.
 
+        In parallel mode up to max_concurrency companies are fetched at once
+        on one event loop, sharing an AsyncFetcher (pooled connections and
+        per-ATS-host rate limits); database upserts run on max_workers threads.
+
         Args:
             targets: List of company targets
             parallel: Whether to run in parallel
@@ -527,53 +825,64 @@ class JobPostingIngester:
         Returns:
             List of IngestionResult objects
         """
+        if parallel and len(targets) > 1:
+            return asyncio.run(self._run_ingestion_async(targets))
+
         results = []
+        for target in targets:
+            result = self.ingest_company(target)
+            results.append(result)
+            self._log_result(target, result)
 
-        if parallel and len(targets) > 1:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_target = {
-                    executor.submit(self.ingest_company, target): target
-                    for target in targets
-                }
-
-                for future in as_completed(future_to_target):
-                    target = future_to_target[future]
-                    try:
-                        result = future.result()
-                        results.append(result)
-                        if result.error:
-                            logger.warning(f"{target.company_name}: {result.error}")
-                        else:
-                            logger.info(
-                                f"{target.company_name}: {result.jobs_found} jobs "
-                                f"({result.jobs_inserted} new, {result.jobs_updated} updated)"
-                            )
-                    except Exception as e:
-                        logger.error(f"Error processing {target.company_name}: {e}")
-                        results.append(IngestionResult(
-                            company_id=target.company_id,
-                            company_name=target.company_name,
-                            ats_type=target.ats_type or "unknown",
-                            jobs_found=0,
-                            jobs_inserted=0,
-                            jobs_updated=0,
-                            duration_seconds=0,
-                            error=str(e)
-                        ))
-        else:
-            for target in targets:
-                result = self.ingest_company(target)
-                results.append(result)
-                if result.error:
-                    logger.warning(f"{target.company_name}: {result.error}")
-                else:
-                    logger.info(
-                        f"{target.company_name}: {result.jobs_found} jobs "
-                        f"({result.jobs_inserted} new, {result.jobs_updated} updated)"
+        return results
+
+    async def _run_ingestion_async(self, targets: List[CompanyTarget]) -> List[IngestionResult]:
+        results = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def ingest(target: CompanyTarget, fetcher: AsyncFetcher,
+                         db_executor: ThreadPoolExecutor) -> Tuple[CompanyTarget, IngestionResult]:
+            async with semaphore:
+                try:
+                    return target, await self.ingest_company_async(target, fetcher, db_executor)
+                except Exception as e:
+                    logger.error(f"Error processing {target.company_name}: {e}")
+                    return target, IngestionResult(
+                        company_id=target.company_id,
+                        company_name=target.company_name,
+                        ats_type=target.ats_type or "unknown",
+                        jobs_found=0,
+                        jobs_inserted=0,
+                        jobs_updated=0,
+                        duration_seconds=0,
+                        error=str(e)
                     )
 
+        with ThreadPoolExecutor(max_workers=self.max_workers) as db_executor:
+            async with AsyncFetcher() as fetcher:
+                await self._detect_ats_async(targets, fetcher)
+
+                tasks = [ingest(target, fetcher, db_executor) for target in targets]
+                for task in asyncio.as_completed(tasks):
+                    target, result = await task
+                    results.append(result)
+                    self._log_result(target, result)
+
+                logger.info(f"HTTP: {fetcher.stats['requests']} requests, "
+                            f"{fetcher.stats['retries']} retries, {fetcher.stats['failures']} failures")
+
         return results
 
+    @staticmethod
+    def _log_result(target: CompanyTarget, result: IngestionResult):
+        if result.error:
+            logger.warning(f"{target.company_name}: {result.error}")
+        else:
+            logger.info(
+                f"{target.company_name}: {result.jobs_found} jobs "
+                f"({result.jobs_inserted} new, {result.jobs_updated} updated)"
+            )
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -604,7 +913,13 @@ def main():
         '--workers',
         type=int,
         default=5,
-        help='Number of parallel workers'
+        help='Number of parallel database workers'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=200,
+        help='Number of companies fetched at once'
     )
     parser.add_argument(
         '--no-parallel',
@@ -633,7 +948,7 @@ def main():
     logger.info(f"Processing {len(targets)} company targets")
 
     # Initialize ingester
-    ingester = JobPostingIngester(max_workers=args.workers)
+    ingester = JobPostingIngester(max_workers=args.workers, max_concurrency=args.concurrency)
 
     if args.detect_only:
         # Just run detection
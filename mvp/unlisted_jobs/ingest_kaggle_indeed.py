@@ -32,7 +32,7 @@ import glob
 # Set DB_USER
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, KAGGLE_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 
 # Setup logging
@@ -210,10 +210,8 @@ def ingest_csv(cursor, filepath: str, normalizer: TitleNormalizer, source_id: in
 
     log.info(f"  Mapped columns: title={title_col}, company={company_col}, salary={salary_col}")
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, KAGGLE_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -264,41 +262,33 @@ def ingest_csv(cursor, filepath: str, normalizer: TitleNormalizer, source_id: in
                 skipped += 1
                 continue
 
-            batch.append((
+            record = (
                 normalized_title,
                 observed_salary,
+                min_salary,
+                max_salary,
                 seniority,
                 seniority_conf,
                 title_conf,
+                'posting',
                 source_id,
                 company_id,
                 location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, observed_salary, seniority, seniority_confidence,
-                        title_confidence, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
+        # Outside the try: a load error must stop the run, not skip a row
+        batch.add(record)
+
     # Insert remaining
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, observed_salary, seniority, seniority_confidence,
-                title_confidence, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Ingested {count:,} jobs from {os.path.basename(filepath)} (skipped {skipped:,})")
     return count
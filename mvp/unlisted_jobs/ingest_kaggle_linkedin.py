@@ -34,7 +34,7 @@ from datetime import datetime
 # Set DB_USER
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, KAGGLE_DATED_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 
 # Setup logging
@@ -208,10 +208,8 @@ def ingest_jobs(cursor, normalizer: TitleNormalizer, source_id: int, company_map
     # Sample a few rows to understand data
     log.info(f"Sample data:\n{df.head(2).to_string()}")
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, KAGGLE_DATED_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -279,46 +277,37 @@ def ingest_jobs(cursor, normalizer: TitleNormalizer, source_id: int, company_map
                     pass
 
             # Prepare record
-            batch.append((
+            job_id = row.get('job_id')
+            record = (
                 normalized_title,
                 observed_salary,
+                min_salary,
+                max_salary,
                 seniority,
                 seniority_conf,
                 title_conf,
+                'posting',
                 source_id,
                 company_id,
                 location_id,
                 posted_date,
-                row.get('job_id')
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, observed_salary, seniority, seniority_confidence,
-                        title_confidence, source_id, company_id, location_id,
-                        observation_date, external_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"  Ingested {count:,} jobs (skipped {skipped:,})...")
+                {'external_id': None if pd.isna(job_id) else str(job_id)}
+            )
 
         except Exception as e:
             log.warning(f"Error processing row {idx}: {e}")
             skipped += 1
             continue
 
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"  Ingested {batch.inserted:,} jobs (skipped {skipped:,})...")
+
     # Insert remaining batch
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, observed_salary, seniority, seniority_confidence,
-                title_confidence, source_id, company_id, location_id,
-                observation_date, external_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"Ingested {count:,} LinkedIn jobs (skipped {skipped:,} without salary)")
     return count
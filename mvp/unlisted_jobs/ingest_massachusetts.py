@@ -19,7 +19,7 @@ import re
 
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -112,11 +112,9 @@ def main():
     # Deduplicate by (last_name, first_name, dept, title) within year
     seen_employees = set()
 
-    count = 0
     skipped = 0
     duplicate = 0
-    batch = []
-    batch_size = 500
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=500)
 
     with open(filepath, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -155,31 +153,17 @@ def main():
 
             company_id = get_or_create_company(cursor, dept)
 
-            batch.append((
+            if batch.add((
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'state_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"  Ingested {count:,} records...")
-
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+            )):
+                log.info(f"  Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     conn.commit()
 
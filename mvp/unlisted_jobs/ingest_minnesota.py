@@ -18,7 +18,7 @@ from typing import Optional
 
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -115,10 +115,8 @@ def main():
     df = df_hr_dedup.merge(df_earn, on='TEMPORARY_ID', how='inner')
     log.info(f"Merged rows: {len(df):,}")
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 500
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=500)
 
     for idx, row in df.iterrows():
         title = row.get('JOB_TITLE')
@@ -143,31 +141,17 @@ def main():
         else:
             location_id = default_location_id
 
-        batch.append((
+        if batch.add((
             normalized_title, float(salary), parse_result.seniority,
             parse_result.seniority_confidence, parse_result.title_confidence,
             'state_payroll', source_id, company_id, location_id
-        ))
-
-        if len(batch) >= batch_size:
-            cursor.executemany("""
-                INSERT INTO observed_jobs (
-                    raw_title, salary_point, seniority, seniority_confidence,
-                    title_confidence, source_type, source_id, company_id, location_id
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, batch)
-            count += len(batch)
-            batch = []
-            log.info(f"  Ingested {count:,} records...")
-
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+        )):
+            log.info(f"  Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     conn.commit()
 
@@ -19,7 +19,7 @@ import re
 # Set DB_USER
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -171,10 +171,8 @@ def ingest_south_carolina(cursor, normalizer: TitleNormalizer) -> int:
     location_id = get_or_create_location(cursor, config['state'])
 
     cols = config['columns']
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -198,36 +196,25 @@ def ingest_south_carolina(cursor, normalizer: TitleNormalizer) -> int:
 
             company_id = get_or_create_company(cursor, row.iloc[cols['agency']])
 
-            batch.append((
+            record = (
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'state_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records ingested, {skipped:,} skipped")
     return count
@@ -250,10 +237,8 @@ def ingest_oregon(cursor, normalizer: TitleNormalizer) -> int:
     location_id = get_or_create_location(cursor, config['state'])
 
     cols = config['columns']
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -277,36 +262,25 @@ def ingest_oregon(cursor, normalizer: TitleNormalizer) -> int:
 
             company_id = get_or_create_company(cursor, row.get(cols['agency']))
 
-            batch.append((
+            record = (
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'state_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records ingested, {skipped:,} skipped")
     return count
@@ -329,10 +303,8 @@ def ingest_massachusetts(cursor, normalizer: TitleNormalizer) -> int:
     location_id = get_or_create_location(cursor, config['state'])
 
     cols = config['columns']
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -356,36 +328,25 @@ def ingest_massachusetts(cursor, normalizer: TitleNormalizer) -> int:
 
             company_id = get_or_create_company(cursor, row.get(cols['agency']))
 
-            batch.append((
+            record = (
                 normalized_title, salary, parse_result.seniority,
                 parse_result.seniority_confidence, parse_result.title_confidence,
                 'state_payroll', source_id, company_id, location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records ingested, {skipped:,} skipped")
     return count
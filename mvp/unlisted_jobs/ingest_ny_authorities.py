@@ -19,7 +19,7 @@ import re
 
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -137,11 +137,9 @@ def main():
     # We'll track by (authority, last_name, first_name, title) and keep most recent
     seen_employees = set()
 
-    count = 0
     skipped = 0
     duplicate = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     log.info(f"Reading from {DATA_FILE}")
 
@@ -178,40 +176,26 @@ def main():
                 department = row.get('Department', '').strip()
                 company_id = get_or_create_company(cursor, authority, department)
 
-                batch.append((
+                record = (
                     normalized_title, salary, parse_result.seniority,
                     parse_result.seniority_confidence, parse_result.title_confidence,
                     'state_authority', source_id, company_id, location_id
-                ))
-
-                if len(batch) >= batch_size:
-                    cursor.executemany("""
-                        INSERT INTO observed_jobs (
-                            raw_title, salary_point, seniority, seniority_confidence,
-                            title_confidence, source_type, source_id, company_id, location_id
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, batch)
-                    conn.commit()
-                    count += len(batch)
-                    batch = []
-
-                    if count % 50000 == 0:
-                        log.info(f"  Ingested {count:,} records...")
+                )
 
             except Exception as e:
                 log.warning(f"  Error on row {idx}: {e}")
                 skipped += 1
                 continue
 
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        conn.commit()
-        count += len(batch)
+            # Outside the try: a load error must stop the run, not skip a row
+            if batch.add(record):
+                if batch.inserted % 50000 == 0:
+                    log.info(f"  Ingested {batch.inserted:,} records...")
+
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"\nCompleted:")
     log.info(f"  Records ingested: {count:,}")
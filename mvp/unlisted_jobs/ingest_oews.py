@@ -20,14 +20,14 @@ Usage:
 Author: ShortList.ai
 """
 
+import io
 import os
 import sys
 import logging
 import requests
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Optional
-from collections import defaultdict
+from typing import Dict, Optional
 import argparse
 
 # Setup environment
@@ -192,64 +192,98 @@ def load_reference_tables(data_dir: Path) -> Dict[str, pd.DataFrame]:
     return refs
 
 
-def process_data_file(data_dir: Path, year_filter: int = 2024) -> Dict:
+# Key columns of one estimate row, then every datatype column in table order
+ESTIMATE_KEY_COLUMNS = ['area_code', 'occ_code', 'industry_code', 'year']
+ESTIMATE_VALUE_COLUMNS = [
+    'employment', 'employment_rse', 'employment_per_1000', 'location_quotient',
+    'wage_annual_mean', 'wage_annual_p10', 'wage_annual_p25', 'wage_annual_median',
+    'wage_annual_p75', 'wage_annual_p90',
+    'wage_hourly_mean', 'wage_hourly_p10', 'wage_hourly_p25', 'wage_hourly_median',
+    'wage_hourly_p75', 'wage_hourly_p90', 'wage_rse',
+]
+# INTEGER columns in oews_estimates (COPY won't cast '1234.0' to integer)
+ESTIMATE_INTEGER_COLUMNS = [
+    'employment', 'wage_annual_mean', 'wage_annual_p10', 'wage_annual_p25',
+    'wage_annual_median', 'wage_annual_p75', 'wage_annual_p90',
+]
+
+
+def _pivot_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Columnar equivalent of parse_series_id() + DATATYPE_MAP over a chunk:
+    slice the fixed-width series_id fields, map datatype codes to column
+    names, and pivot to one row per (area, occ, industry, year).
+    """
+    series = chunk['series_id']
+    # parse_series_id() rejects ids shorter than 26 chars before stripping
+    chunk = chunk[series.str.len() >= 26]
+    series = chunk['series_id'].str.strip()
+
+    long = pd.DataFrame({
+        'area_code': series.str.slice(4, 11),
+        'occ_code': series.str.slice(17, 23),
+        'industry_code': series.str.slice(11, 17),
+        'year': chunk['year'],
+        'column': series.str.slice(23, 25).map(DATATYPE_MAP),
+        'value': pd.to_numeric(chunk['value'].str.strip(), errors='coerce'),
+    })
+    long = long.dropna(subset=['column', 'value'])
+
+    # Last value wins for a repeated series, as in the row-by-row parser
+    return (long.groupby(ESTIMATE_KEY_COLUMNS + ['column'], sort=False)['value']
+                .last()
+                .unstack('column'))
+
+
+def process_data_file(data_dir: Path, year_filter: int = 2024) -> pd.DataFrame:
     """
     Process the main OEWS data file.
 
     Groups data by (area_code, occ_code, industry_code, year) and
-    pivots datatypes into columns.
+    pivots datatypes into columns. Returns one row per estimate with
+    ESTIMATE_KEY_COLUMNS + ESTIMATE_VALUE_COLUMNS (NaN/<NA> = not published).
     """
     data_file = data_dir / "oe.data.0.Current"
 
     log.info(f"Processing {data_file}...")
     log.info(f"Filtering for year={year_filter}")
 
-    # Read in chunks due to file size
+    # Read in chunks due to file size; only the year-filtered pivot is kept
     chunk_size = 500_000
-    estimates = defaultdict(dict)
+    pivots = []
     total_rows = 0
     filtered_rows = 0
 
-    for chunk in pd.read_csv(data_file, sep='\t', chunksize=chunk_size):
+    reader = pd.read_csv(data_file, sep='\t', chunksize=chunk_size,
+                         dtype=str, keep_default_na=False)
+    for chunk in reader:
         # Strip whitespace from column names
         chunk.columns = chunk.columns.str.strip()
         total_rows += len(chunk)
 
         # Filter to desired year
-        chunk = chunk[chunk['year'] == year_filter]
+        years = pd.to_numeric(chunk['year'], errors='coerce')
+        chunk = chunk[years == year_filter].assign(year=year_filter)
         filtered_rows += len(chunk)
 
-        # Process each row
-        for _, row in chunk.iterrows():
-            series_id = row['series_id']
-            parsed = parse_series_id(series_id)
+        if len(chunk):
+            pivots.append(_pivot_chunk(chunk))
 
-            if not parsed:
-                continue
+        log.info(f"  Processed {total_rows:,} rows, {filtered_rows:,} for {year_filter}...")
+
+    if pivots:
+        # A series split across chunks leaves partial rows; last() merges them
+        # column by column (skipping NaN), again keeping the latest value
+        estimates = pd.concat(pivots).groupby(level=ESTIMATE_KEY_COLUMNS, sort=False).last()
+        estimates = estimates.reindex(columns=ESTIMATE_VALUE_COLUMNS).reset_index()
+    else:
+        estimates = pd.DataFrame(columns=ESTIMATE_KEY_COLUMNS + ESTIMATE_VALUE_COLUMNS)
 
-            # Create unique key
-            key = (
-                parsed['area_code'],
-                parsed['occ_code'],
-                parsed['industry_code'],
-                row['year']
-            )
-
-            # Map datatype to column
-            datatype = parsed['datatype_code']
-            col_name = DATATYPE_MAP.get(datatype)
-
-            if col_name:
-                value = row['value']
-                # Handle special values
-                if pd.notna(value):
-                    try:
-                        value = float(str(value).strip())
-                        estimates[key][col_name] = value
-                    except ValueError:
-                        pass
-
-        log.info(f"  Processed {total_rows:,} rows, {len(estimates):,} unique estimates...")
+    estimates = estimates.astype({'year': 'int64'})
+    estimates[ESTIMATE_INTEGER_COLUMNS] = (estimates[ESTIMATE_INTEGER_COLUMNS]
+                                           .astype('float64').round().astype('Int64'))
+    other_values = [c for c in ESTIMATE_VALUE_COLUMNS if c not in ESTIMATE_INTEGER_COLUMNS]
+    estimates[other_values] = estimates[other_values].astype('float64')
 
     log.info(f"Total rows: {total_rows:,}")
     log.info(f"Filtered rows (year={year_filter}): {filtered_rows:,}")
@@ -331,47 +365,38 @@ def ingest_reference_tables(db: DatabaseManager, refs: Dict[str, pd.DataFrame]):
         cur.close()
 
 
-def ingest_estimates(db: DatabaseManager, estimates: Dict):
-    """Ingest OEWS estimates into database."""
+def ingest_estimates(db: DatabaseManager, estimates: pd.DataFrame, batch_size: int = 100_000):
+    """
+    Ingest OEWS estimates into database.
+
+    Replaces the year's rows and streams the frame from process_data_file()
+    through COPY in batches, all in one transaction.
+    """
 
     log.info(f"Ingesting {len(estimates):,} estimates...")
 
+    columns = ESTIMATE_KEY_COLUMNS + ESTIMATE_VALUE_COLUMNS
+    copy_sql = f"COPY oews_estimates ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
     with db.get_connection() as conn:
         cur = conn.cursor()
 
         # Clear existing data for this year
-        if estimates:
-            sample_key = list(estimates.keys())[0]
-            year = sample_key[3]
+        if len(estimates):
+            year = int(estimates['year'].iloc[0])
             cur.execute("DELETE FROM oews_estimates WHERE year = %s", (year,))
             log.info(f"  Cleared existing data for year {year}")
 
-        batch_size = 10000
-        batch = []
         inserted = 0
-
-        for key, data in estimates.items():
-            area_code, occ_code, industry_code, year = key
-
-            row = {
-                'area_code': area_code,
-                'occ_code': occ_code,
-                'industry_code': industry_code,
-                'year': year,
-                **data
-            }
-            batch.append(row)
-
-            if len(batch) >= batch_size:
-                _insert_batch(cur, batch)
-                inserted += len(batch)
-                batch = []
-                log.info(f"  Inserted {inserted:,} estimates...")
-
-        # Insert remaining
-        if batch:
-            _insert_batch(cur, batch)
+        for start in range(0, len(estimates), batch_size):
+            batch = estimates.iloc[start:start + batch_size]
+            buffer = io.StringIO()
+            # Empty unquoted fields are NULL in CSV COPY
+            batch.to_csv(buffer, columns=columns, header=False, index=False)
+            buffer.seek(0)
+            cur.copy_expert(copy_sql, buffer)
             inserted += len(batch)
+            log.info(f"  Inserted {inserted:,} estimates...")
 
         conn.commit()
         cur.close()
@@ -379,53 +404,6 @@ def ingest_estimates(db: DatabaseManager, estimates: Dict):
         log.info(f"  ✓ Inserted {inserted:,} total estimates")
 
 
-def _insert_batch(cur, batch: List[Dict]):
-    """Insert a batch of estimates."""
-    for row in batch:
-        cur.execute("""
-            INSERT INTO oews_estimates (
-                area_code, occ_code, industry_code, year,
-                employment, employment_rse, employment_per_1000, location_quotient,
-                wage_annual_mean, wage_annual_p10, wage_annual_p25, wage_annual_median,
-                wage_annual_p75, wage_annual_p90,
-                wage_hourly_mean, wage_hourly_p10, wage_hourly_p25, wage_hourly_median,
-                wage_hourly_p75, wage_hourly_p90, wage_rse
-            ) VALUES (
-                %(area_code)s, %(occ_code)s, %(industry_code)s, %(year)s,
-                %(employment)s, %(employment_rse)s, %(employment_per_1000)s, %(location_quotient)s,
-                %(wage_annual_mean)s, %(wage_annual_p10)s, %(wage_annual_p25)s, %(wage_annual_median)s,
-                %(wage_annual_p75)s, %(wage_annual_p90)s,
-                %(wage_hourly_mean)s, %(wage_hourly_p10)s, %(wage_hourly_p25)s, %(wage_hourly_median)s,
-                %(wage_hourly_p75)s, %(wage_hourly_p90)s, %(wage_rse)s
-            )
-            ON CONFLICT (area_code, occ_code, industry_code, year) DO UPDATE SET
-                employment = EXCLUDED.employment,
-                wage_annual_median = EXCLUDED.wage_annual_median
-        """, {
-            'area_code': row['area_code'],
-            'occ_code': row['occ_code'],
-            'industry_code': row['industry_code'],
-            'year': row['year'],
-            'employment': row.get('employment'),
-            'employment_rse': row.get('employment_rse'),
-            'employment_per_1000': row.get('employment_per_1000'),
-            'location_quotient': row.get('location_quotient'),
-            'wage_annual_mean': row.get('wage_annual_mean'),
-            'wage_annual_p10': row.get('wage_annual_p10'),
-            'wage_annual_p25': row.get('wage_annual_p25'),
-            'wage_annual_median': row.get('wage_annual_median'),
-            'wage_annual_p75': row.get('wage_annual_p75'),
-            'wage_annual_p90': row.get('wage_annual_p90'),
-            'wage_hourly_mean': row.get('wage_hourly_mean'),
-            'wage_hourly_p10': row.get('wage_hourly_p10'),
-            'wage_hourly_p25': row.get('wage_hourly_p25'),
-            'wage_hourly_median': row.get('wage_hourly_median'),
-            'wage_hourly_p75': row.get('wage_hourly_p75'),
-            'wage_hourly_p90': row.get('wage_hourly_p90'),
-            'wage_rse': row.get('wage_rse'),
-        })
-
-
 # ============================================================================
 # SOC TO CANONICAL ROLE MAPPING
 # ============================================================================
@@ -20,7 +20,7 @@ import re
 # Set DB_USER
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -208,10 +208,8 @@ def ingest_state(cursor, state_key: str, normalizer: TitleNormalizer) -> int:
     location_id = get_or_create_location(cursor, config['state'])
 
     cols = config['columns']
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -253,7 +251,7 @@ def ingest_state(cursor, state_key: str, normalizer: TitleNormalizer) -> int:
             agency_col = cols['agency']
             company_id = get_or_create_company(cursor, row.get(agency_col))
 
-            batch.append((
+            record = (
                 normalized_title,
                 salary,
                 seniority,
@@ -263,33 +261,22 @@ def ingest_state(cursor, state_key: str, normalizer: TitleNormalizer) -> int:
                 source_id,
                 company_id,
                 location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
     # Insert remaining
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records ingested, {skipped:,} skipped")
     return count
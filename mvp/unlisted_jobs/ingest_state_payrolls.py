@@ -29,7 +29,7 @@ import json
 # Set DB_USER
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ROLE_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 
 # Setup logging
@@ -43,6 +43,9 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+# Rows per COPY batch
+BULK_BATCH_SIZE = 10000
+
 # ============================================================================
 # STATE CONFIGURATIONS - Based on actual data formats
 # ============================================================================
@@ -639,14 +642,13 @@ def ingest_state_payroll(state_code: str, df: pd.DataFrame, normalizer: TitleNor
         cursor.execute("SELECT id FROM locations WHERE city = %s AND state = %s", ('Statewide', state_code))
         location_id = cursor.fetchone()[0]
 
-        # Process records in batches
-        batch_size = 1000
-        for i in range(0, len(df), batch_size):
-            batch = df.iloc[i:i+batch_size]
+        titles = df['title'] if 'title' in df else [''] * len(df)
+        salaries = df['salary'] if 'salary' in df else [None] * len(df)
 
-            for _, row in batch.iterrows():
+        def observed_rows():
+            for title, salary in zip(titles, salaries):
                 try:
-                    title = str(row.get('title', '')).strip()
+                    title = str(title).strip()
                     if not title or title == 'nan' or title == 'Unknown':
                         stats['skipped'] += 1
                         continue
@@ -660,20 +662,10 @@ def ingest_state_payroll(state_code: str, df: pd.DataFrame, normalizer: TitleNor
 
                     stats['normalized'] += 1
 
-                    # Get salary
-                    salary = row.get('salary')
                     if pd.isna(salary) or salary <= 0:
                         salary = None
 
-                    # Insert job
-                    cursor.execute("""
-                        INSERT INTO observed_jobs (
-                            raw_title, canonical_role_id, company_id, location_id,
-                            source_id, seniority, seniority_confidence, title_confidence,
-                            salary_point, source_type
-                        )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
+                    yield (
                         title,
                         result.canonical_role_id,
                         company_id,
@@ -684,21 +676,18 @@ def ingest_state_payroll(state_code: str, df: pd.DataFrame, normalizer: TitleNor
                         result.title_confidence,
                         salary,
                         'state_payroll'
-                    ))
-
-                    stats['inserted'] += 1
+                    )
 
                 except Exception as e:
                     stats['errors'] += 1
                     if stats['errors'] <= 5:  # Log first 5 errors
                         log.warning(f"  Error processing row: {str(e)}")
 
-            # Commit batch
-            conn.commit()
-
-            # Progress update
-            if (i + batch_size) % 10000 == 0:
-                log.info(f"  Processed {i + batch_size:,} / {len(df):,} records...")
+        # Stream rows through COPY in batches
+        counts = db.bulk_insert_observed_jobs(observed_rows(), columns=ROLE_OBSERVED_COLUMNS,
+                                              batch_size=BULK_BATCH_SIZE, conn=conn)
+        stats['inserted'] = counts['inserted']
+        stats['errors'] += counts['failed']
 
     finally:
         db.release_connection(conn)
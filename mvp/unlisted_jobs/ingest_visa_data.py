@@ -25,7 +25,7 @@ from datetime import datetime
 # Set DB_USER
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, ROLE_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 
 # Setup logging
@@ -39,6 +39,9 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+# Rows per COPY batch
+BULK_BATCH_SIZE = 10000
+
 
 def normalize_salary(wage_from, wage_to, wage_unit: str) -> Optional[float]:
     """Convert wage to annual salary."""
@@ -88,6 +91,58 @@ def check_existing_data(cursor, source_name: str) -> int:
     return cursor.fetchone()[0]
 
 
+def get_or_create_company(cursor, cache: dict, employer_name: str) -> int:
+    """Look up (or create) an employer, memoized per ingestion run."""
+    normalized_name = employer_name.upper().strip()
+    if normalized_name in cache:
+        return cache[normalized_name]
+
+    cursor.execute("SELECT id FROM companies WHERE normalized_name = %s", (normalized_name,))
+    row = cursor.fetchone()
+    if row:
+        company_id = row[0]
+    else:
+        cursor.execute("""
+            INSERT INTO companies (name, normalized_name)
+            VALUES (%s, %s)
+            RETURNING id
+        """, (employer_name, normalized_name))
+        company_id = cursor.fetchone()[0]
+        # Commit right away so batched jobs never reference a rolled-back company
+        cursor.connection.commit()
+
+    cache[normalized_name] = company_id
+    return company_id
+
+
+def get_or_create_location(cursor, cache: dict, city: Optional[str], state: Optional[str]) -> int:
+    """Look up (or create) a worksite location, memoized per ingestion run."""
+    loc_city = city.strip() if city else 'Unknown'
+    loc_state = state.strip() if state else 'Unknown'
+    key = (loc_city, loc_state)
+    if key in cache:
+        return cache[key]
+
+    cursor.execute("""
+        SELECT id FROM locations
+        WHERE city = %s AND state = %s AND country = 'USA'
+    """, key)
+    row = cursor.fetchone()
+    if row:
+        location_id = row[0]
+    else:
+        cursor.execute("""
+            INSERT INTO locations (city, state, country)
+            VALUES (%s, %s, 'USA')
+            RETURNING id
+        """, key)
+        location_id = cursor.fetchone()[0]
+        cursor.connection.commit()
+
+    cache[key] = location_id
+    return location_id
+
+
 def ingest_h1b_lca(file_path: str, db: DatabaseManager, normalizer: TitleNormalizer):
     """Ingest H-1B LCA disclosure data."""
     log.info(f"Reading H-1B LCA file: {file_path}")
@@ -122,9 +177,13 @@ def ingest_h1b_lca(file_path: str, db: DatabaseManager, normalizer: TitleNormali
             RETURNING id
         """, ('h1b_visa', 'visa'))
         source_id = cursor.fetchone()[0]
+        # Committed like companies/locations, so a row's rollback can't undo it
+        conn.commit()
 
-    inserted = 0
     skipped = 0
+    batch = ObservedJobBatch(conn, ROLE_OBSERVED_COLUMNS, batch_size=BULK_BATCH_SIZE)
+    company_ids = {}
+    location_ids = {}
 
     for idx, row in df.iterrows():
         try:
@@ -148,47 +207,10 @@ def ingest_h1b_lca(file_path: str, db: DatabaseManager, normalizer: TitleNormali
             # Parse title
             result = normalizer.parse_title(job_title)
 
-            # Get or create company
-            normalized_name = employer_name.upper().strip()
-            cursor.execute("SELECT id FROM companies WHERE normalized_name = %s", (normalized_name,))
-            row = cursor.fetchone()
-            if row:
-                company_id = row[0]
-            else:
-                cursor.execute("""
-                    INSERT INTO companies (name, normalized_name)
-                    VALUES (%s, %s)
-                    RETURNING id
-                """, (employer_name, normalized_name))
-                company_id = cursor.fetchone()[0]
-
-            # Get or create location
-            loc_city = city.strip() if city else 'Unknown'
-            loc_state = state.strip() if state else 'Unknown'
-            cursor.execute("""
-                SELECT id FROM locations
-                WHERE city = %s AND state = %s AND country = 'USA'
-            """, (loc_city, loc_state))
-            row = cursor.fetchone()
-            if row:
-                location_id = row[0]
-            else:
-                cursor.execute("""
-                    INSERT INTO locations (city, state, country)
-                    VALUES (%s, %s, 'USA')
-                    RETURNING id
-                """, (loc_city, loc_state))
-                location_id = cursor.fetchone()[0]
-
-            # Insert job
-            cursor.execute("""
-                INSERT INTO observed_jobs (
-                    raw_title, canonical_role_id, company_id, location_id,
-                    source_id, seniority, seniority_confidence, title_confidence,
-                    salary_point, source_type
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
+            company_id = get_or_create_company(cursor, company_ids, employer_name)
+            location_id = get_or_create_location(cursor, location_ids, city, state)
+
+            record = (
                 job_title,
                 result.canonical_role_id,
                 company_id,
@@ -199,13 +221,7 @@ def ingest_h1b_lca(file_path: str, db: DatabaseManager, normalizer: TitleNormali
                 result.title_confidence,
                 salary,
                 'visa'
-            ))
-
-            inserted += 1
-
-            if inserted % 10000 == 0:
-                conn.commit()
-                log.info(f"  Inserted {inserted:,} H-1B records...")
+            )
 
         except Exception as e:
             conn.rollback()  # Rollback to recover from error
@@ -213,9 +229,14 @@ def ingest_h1b_lca(file_path: str, db: DatabaseManager, normalizer: TitleNormali
             skipped += 1
             continue
 
-    conn.commit()
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"  Inserted {batch.inserted:,} H-1B records...")
+
+    batch.flush()
     db.release_connection(conn)
-    log.info(f"H-1B LCA ingestion complete: {inserted:,} inserted, {skipped:,} skipped")
+    log.info(f"H-1B LCA ingestion complete: {batch.inserted:,} inserted, {skipped:,} skipped, "
+             f"{batch.failed:,} failed to insert")
 
 
 def ingest_perm(file_path: str, db: DatabaseManager, normalizer: TitleNormalizer):
@@ -252,9 +273,13 @@ def ingest_perm(file_path: str, db: DatabaseManager, normalizer: TitleNormalizer
             RETURNING id
         """, ('perm_visa', 'visa'))
         source_id = cursor.fetchone()[0]
+        # Committed like companies/locations, so a row's rollback can't undo it
+        conn.commit()
 
-    inserted = 0
     skipped = 0
+    batch = ObservedJobBatch(conn, ROLE_OBSERVED_COLUMNS, batch_size=BULK_BATCH_SIZE)
+    company_ids = {}
+    location_ids = {}
 
     for idx, row in df.iterrows():
         try:
@@ -285,47 +310,10 @@ def ingest_perm(file_path: str, db: DatabaseManager, normalizer: TitleNormalizer
             # Parse title
             result = normalizer.parse_title(job_title)
 
-            # Get or create company
-            normalized_name = employer_name.upper().strip()
-            cursor.execute("SELECT id FROM companies WHERE normalized_name = %s", (normalized_name,))
-            row = cursor.fetchone()
-            if row:
-                company_id = row[0]
-            else:
-                cursor.execute("""
-                    INSERT INTO companies (name, normalized_name)
-                    VALUES (%s, %s)
-                    RETURNING id
-                """, (employer_name, normalized_name))
-                company_id = cursor.fetchone()[0]
-
-            # Get or create location
-            loc_city = city.strip() if city else 'Unknown'
-            loc_state = state.strip() if state else 'Unknown'
-            cursor.execute("""
-                SELECT id FROM locations
-                WHERE city = %s AND state = %s AND country = 'USA'
-            """, (loc_city, loc_state))
-            row = cursor.fetchone()
-            if row:
-                location_id = row[0]
-            else:
-                cursor.execute("""
-                    INSERT INTO locations (city, state, country)
-                    VALUES (%s, %s, 'USA')
-                    RETURNING id
-                """, (loc_city, loc_state))
-                location_id = cursor.fetchone()[0]
-
-            # Insert job
-            cursor.execute("""
-                INSERT INTO observed_jobs (
-                    raw_title, canonical_role_id, company_id, location_id,
-                    source_id, seniority, seniority_confidence, title_confidence,
-                    salary_point, source_type
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
+            company_id = get_or_create_company(cursor, company_ids, employer_name)
+            location_id = get_or_create_location(cursor, location_ids, city, state)
+
+            record = (
                 job_title,
                 result.canonical_role_id,
                 company_id,
@@ -336,13 +324,7 @@ def ingest_perm(file_path: str, db: DatabaseManager, normalizer: TitleNormalizer
                 result.title_confidence,
                 salary,
                 'visa'
-            ))
-
-            inserted += 1
-
-            if inserted % 10000 == 0:
-                conn.commit()
-                log.info(f"  Inserted {inserted:,} PERM records...")
+            )
 
         except Exception as e:
             conn.rollback()  # Rollback to recover from error
@@ -350,9 +332,14 @@ def ingest_perm(file_path: str, db: DatabaseManager, normalizer: TitleNormalizer
             skipped += 1
             continue
 
-    conn.commit()
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"  Inserted {batch.inserted:,} PERM records...")
+
+    batch.flush()
     db.release_connection(conn)
-    log.info(f"PERM ingestion complete: {inserted:,} inserted, {skipped:,} skipped")
+    log.info(f"PERM ingestion complete: {batch.inserted:,} inserted, {skipped:,} skipped, "
+             f"{batch.failed:,} failed to insert")
 
 
 def main():
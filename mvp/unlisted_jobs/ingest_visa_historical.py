@@ -25,7 +25,7 @@ import glob
 # Set DB_USER
 os.environ['DB_USER'] = 'noahhopkins'
 
-from database import DatabaseManager, Config
+from database import DatabaseManager, Config, ObservedJobBatch, PAYROLL_OBSERVED_COLUMNS
 from title_normalizer import TitleNormalizer
 from normalize_titles import normalize_title
 
@@ -185,10 +185,8 @@ def ingest_h1b_file(cursor, filepath: str, normalizer: TitleNormalizer, source_i
 
     log.info(f"  Using columns: title={title_col}, employer={employer_col}")
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -237,7 +235,7 @@ def ingest_h1b_file(cursor, filepath: str, normalizer: TitleNormalizer, source_i
                 state = row.get(state_col) if state_col else None
                 location_id = get_or_create_location(cursor, city, state)
 
-            batch.append((
+            record = (
                 normalized_title,
                 salary,
                 seniority,
@@ -247,33 +245,22 @@ def ingest_h1b_file(cursor, filepath: str, normalizer: TitleNormalizer, source_i
                 source_id,
                 company_id,
                 location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
     # Insert remaining
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records, {skipped:,} skipped")
     return count
@@ -313,10 +300,8 @@ def ingest_perm_file(cursor, filepath: str, normalizer: TitleNormalizer, source_
 
     log.info(f"  Using columns: title={title_col}, employer={employer_col}")
 
-    count = 0
     skipped = 0
-    batch = []
-    batch_size = 1000
+    batch = ObservedJobBatch(cursor.connection, PAYROLL_OBSERVED_COLUMNS, batch_size=1000)
 
     for idx, row in df.iterrows():
         try:
@@ -364,7 +349,7 @@ def ingest_perm_file(cursor, filepath: str, normalizer: TitleNormalizer, source_
                 state = row.get(state_col) if state_col else None
                 location_id = get_or_create_location(cursor, city, state)
 
-            batch.append((
+            record = (
                 normalized_title,
                 salary,
                 seniority,
@@ -374,33 +359,22 @@ def ingest_perm_file(cursor, filepath: str, normalizer: TitleNormalizer, source_
                 source_id,
                 company_id,
                 location_id
-            ))
-
-            if len(batch) >= batch_size:
-                cursor.executemany("""
-                    INSERT INTO observed_jobs (
-                        raw_title, salary_point, seniority, seniority_confidence,
-                        title_confidence, source_type, source_id, company_id, location_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, batch)
-                count += len(batch)
-                batch = []
-                log.info(f"    Ingested {count:,} records...")
+            )
 
         except Exception as e:
             log.warning(f"  Error on row {idx}: {e}")
             skipped += 1
             continue
 
+        # Outside the try: a load error must stop the run, not skip a row
+        if batch.add(record):
+            log.info(f"    Ingested {batch.inserted:,} records...")
+
     # Insert remaining
-    if batch:
-        cursor.executemany("""
-            INSERT INTO observed_jobs (
-                raw_title, salary_point, seniority, seniority_confidence,
-                title_confidence, source_type, source_id, company_id, location_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, batch)
-        count += len(batch)
+    batch.flush()
+    count = batch.inserted
+    if batch.failed:
+        log.warning(f"  {batch.failed:,} records failed to insert")
 
     log.info(f"  Completed: {count:,} records, {skipped:,} skipped")
     return count
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Migrate observed_jobs lifecycle links to real columns
+======================================================
+
+Posting rows in observed_jobs used to carry their posting_lifecycle id and
+content hash only inside metadata JSONB. This adds first-class lifecycle_id
+and content_hash columns, backfills them from metadata in id-range batches,
+and then builds the btree indexes used by PostingIngestionManager.
+
+Safe to re-run: columns/indexes use IF NOT EXISTS and only rows whose
+columns are still NULL are backfilled.
+
+Usage:
+    python migrate_observed_jobs_lifecycle.py
+    python migrate_observed_jobs_lifecycle.py --batch-size 50000
+
+Author: ShortList.ai
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from database import DatabaseManager, Config
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+log = logging.getLogger(__name__)
+
+
+ADD_COLUMNS = [
+    "ALTER TABLE observed_jobs ADD COLUMN IF NOT EXISTS lifecycle_id BIGINT REFERENCES posting_lifecycle(id)",
+    "ALTER TABLE observed_jobs ADD COLUMN IF NOT EXISTS content_hash TEXT",
+]
+
+# Built after the backfill so the UPDATEs don't maintain them row by row
+CREATE_INDEXES = [
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_observed_jobs_lifecycle
+       ON observed_jobs(lifecycle_id) WHERE lifecycle_id IS NOT NULL""",
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_observed_jobs_content_hash
+       ON observed_jobs(company_id, content_hash) WHERE content_hash IS NOT NULL""",
+]
+
+
+def add_columns(conn):
+    """Add the lifecycle_id / content_hash columns."""
+    log.info("Adding lifecycle_id and content_hash columns...")
+    with conn.cursor() as cursor:
+        for stmt in ADD_COLUMNS:
+            cursor.execute(stmt)
+    conn.commit()
+
+
+def backfill(conn, batch_size: int = 20000) -> int:
+    """
+    Copy metadata->>'lifecycle_id' / 'content_hash' into the new columns,
+    walking observed_jobs by id range so each batch is a short transaction.
+
+    lifecycle_id is only set when the referenced posting_lifecycle row still
+    exists, so the foreign key can't reject a batch.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT MIN(id), MAX(id) FROM observed_jobs
+            WHERE source_type LIKE 'job_posting_%'
+        """)
+        min_id, max_id = cursor.fetchone()
+    conn.commit()
+
+    if min_id is None:
+        log.info("No posting rows to backfill")
+        return 0
+
+    updated = 0
+    start = time.time()
+    for low in range(min_id, max_id + 1, batch_size):
+        high = low + batch_size - 1
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                UPDATE observed_jobs o
+                SET lifecycle_id = pl.id
+                FROM posting_lifecycle pl
+                WHERE o.id BETWEEN %s AND %s
+                  AND o.lifecycle_id IS NULL
+                  AND o.metadata->>'lifecycle_id' ~ '^[0-9]+$'
+                  AND pl.id = (o.metadata->>'lifecycle_id')::bigint
+            """, (low, high))
+            updated += cursor.rowcount
+
+            cursor.execute("""
+                UPDATE observed_jobs
+                SET content_hash = metadata->>'content_hash'
+                WHERE id BETWEEN %s AND %s
+                  AND content_hash IS NULL
+                  AND metadata->>'content_hash' IS NOT NULL
+            """, (low, high))
+        conn.commit()
+
+        done = min(high, max_id) - min_id + 1
+        log.info(f"  Backfilled ids up to {min(high, max_id)} "
+                 f"({100.0 * done / (max_id - min_id + 1):.1f}%, {updated} linked, "
+                 f"{time.time() - start:.1f}s)")
+
+    return updated
+
+
+def create_indexes(conn):
+    """Build the btree indexes (CONCURRENTLY, so ingestion can keep running)."""
+    log.info("Creating indexes...")
+    conn.commit()
+    previous = conn.autocommit
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            for stmt in CREATE_INDEXES:
+                cursor.execute(stmt)
+            cursor.execute("ANALYZE observed_jobs")
+    finally:
+        conn.autocommit = previous
+
+
+def get_stats(conn):
+    """Posting rows vs. rows linked through the new columns."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                COUNT(*) FILTER (WHERE lifecycle_id IS NOT NULL),
+                COUNT(*) FILTER (WHERE content_hash IS NOT NULL),
+                COUNT(*) FILTER (WHERE lifecycle_id IS NULL AND metadata ? 'lifecycle_id')
+            FROM observed_jobs
+            WHERE source_type LIKE 'job_posting_%'
+        """)
+        total, linked, hashed, orphaned = cursor.fetchone()
+    conn.commit()
+    return {'posting_rows': total, 'linked': linked, 'hashed': hashed, 'orphaned': orphaned}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill observed_jobs.lifecycle_id / content_hash')
+    parser.add_argument('--batch-size', type=int, default=20000,
+                        help='observed_jobs ids per UPDATE batch')
+    args = parser.parse_args()
+
+    log.info("=" * 60)
+    log.info("OBSERVED_JOBS LIFECYCLE COLUMN MIGRATION")
+    log.info("=" * 60)
+
+    config = Config()
+    db = DatabaseManager(config)
+    conn = db.get_connection()
+
+    try:
+        add_columns(conn)
+        backfill(conn, args.batch_size)
+        create_indexes(conn)
+
+        stats = get_stats(conn)
+
+        log.info("\n" + "=" * 60)
+        log.info("MIGRATION COMPLETE")
+        log.info("=" * 60)
+        log.info(f"Posting rows: {stats['posting_rows']}")
+        log.info(f"  With lifecycle_id: {stats['linked']}")
+        log.info(f"  With content_hash: {stats['hashed']}")
+        if stats['orphaned']:
+            log.warning(f"  {stats['orphaned']} rows reference a missing posting_lifecycle row")
+
+    except Exception as e:
+        conn.rollback()
+        log.error(f"Error during migration: {e}")
+        raise
+    finally:
+        db.release_connection(conn)
+
+
+if __name__ == "__main__":
+    main()
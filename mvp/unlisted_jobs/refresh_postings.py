@@ -5,6 +5,11 @@ Job Posting Refresh Scheduler
 
 Refreshes job postings from all enabled targets. Designed to be run via cron.
 
+Refreshes are change-aware: boards served by a single request are fetched
+conditionally (ETag / Last-Modified stored per target), and any board whose
+digest matches the last refresh is skipped without touching its postings.
+Changed boards are applied as a diff of new, modified and removed postings.
+
 Usage:
     # Run all targets
     python refresh_postings.py
@@ -28,6 +33,7 @@ Date: 2026-01-15
 import os
 import sys
 import argparse
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import List, Optional
@@ -39,6 +45,8 @@ os.environ['DB_USER'] = 'noahhopkins'
 
 from database import DatabaseManager, Config
 from sources.job_postings.posting_ingestion import PostingIngestionManager, IngestionTarget
+from sources.job_postings.base_connector import BaseATSConnector, board_digest
+from sources.job_postings.http_client import AsyncFetcher
 from sources.job_postings.greenhouse import GreenhouseConnector
 from sources.job_postings.lever import LeverConnector
 from sources.job_postings.smartrecruiters import SmartRecruitersConnector
@@ -78,18 +86,44 @@ class PostingRefresher:
         # Extend manager's connector classes
         self.manager.CONNECTOR_CLASSES = self.CONNECTOR_CLASSES
 
+        # Adds the change detection columns on older databases
+        self.manager.create_targets_table()
+
+        # One fetcher (and event loop) for every refresh by this refresher,
+        # so connections and per-host rate limits are shared; opened lazily
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fetcher: Optional[AsyncFetcher] = None
+
         self.stats = {
             'targets_due': 0,
             'targets_processed': 0,
+            'targets_unchanged': 0,
             'targets_skipped': 0,
             'postings_fetched': 0,
             'postings_new': 0,
+            'postings_modified': 0,
+            'postings_removed': 0,
             'errors': 0,
         }
 
     def close(self):
+        if self._fetcher is not None:
+            self._loop.run_until_complete(self._fetcher.close())
+            self._loop.close()
+            self._fetcher = None
+            self._loop = None
         self.manager.close()
 
+    def _fetch_jobs(self, connector: BaseATSConnector) -> list:
+        """connector.fetch_jobs_async() through the shared fetcher."""
+        if self._fetcher is None:
+            self._loop = asyncio.new_event_loop()
+            self._fetcher = AsyncFetcher(timeout=BaseATSConnector.REQUEST_TIMEOUT,
+                                         max_retries=BaseATSConnector.MAX_RETRIES,
+                                         backoff_base=BaseATSConnector.RETRY_DELAY)
+            self._loop.run_until_complete(self._fetcher.open())
+        return self._loop.run_until_complete(connector.fetch_jobs_async(self._fetcher))
+
     def get_targets_due_for_refresh(self, ats_type: str = None,
                                      company_id: str = None) -> List[IngestionTarget]:
         """
@@ -100,7 +134,8 @@ class PostingRefresher:
             with conn.cursor() as cursor:
                 query = """
                     SELECT id, company_name, company_id_ats, ats_type, careers_url,
-                           enabled, last_fetched, db_company_id, fetch_frequency_hours
+                           enabled, last_fetched, db_company_id, fetch_frequency_hours,
+                           etag, last_modified, board_digest
                     FROM posting_targets
                     WHERE enabled = true
                 """
@@ -134,7 +169,10 @@ class PostingRefresher:
                         careers_url=row[4],
                         enabled=row[5],
                         last_fetched=row[6],
-                        db_company_id=row[7]
+                        db_company_id=row[7],
+                        etag=row[9],
+                        last_modified=row[10],
+                        board_digest=row[11]
                     )
                     for row in rows
                 ]
@@ -143,7 +181,12 @@ class PostingRefresher:
 
     def refresh_target(self, target: IngestionTarget) -> dict:
         """
-        Refresh a single target.
+        Refresh a single target, doing only the work its changes need.
+
+        1. Fetch, conditionally if the target has stored validators: a 304
+           means the board is unchanged. A failed fetch changes nothing.
+        2. Otherwise compare the board digest with the stored one.
+        3. Unchanged -> no posting work at all; changed -> apply the diff.
         """
         connector_class = self.CONNECTOR_CLASSES.get(target.ats_type)
         if not connector_class:
@@ -158,25 +201,77 @@ class PostingRefresher:
             else:
                 connector = connector_class(target.company_id_ats, target.company_name)
 
+            connector.etag = target.etag
+            connector.last_modified = target.last_modified
+
             # Fetch jobs
-            postings = connector.fetch_jobs()
-            log.info(f"  Fetched {len(postings)} postings from {target.company_name}")
+            postings = self._fetch_jobs(connector)
+
+            if connector.fetch_error:
+                # No or only some postings came back: diffing them would mark
+                # the rest removed. Leave the target as is and retry later.
+                log.error(f"  Fetch failed for {target.company_name}: {connector.fetch_error}")
+                return {'error': connector.fetch_error}
+
+            if connector.not_modified:
+                digest = target.board_digest
+                log.info(f"  Not modified since last fetch ({target.company_name})")
+            else:
+                digest = board_digest(postings)
+                log.info(f"  Fetched {len(postings)} postings from {target.company_name}")
+            unchanged = connector.not_modified or (
+                target.board_digest is not None and digest == target.board_digest
+            )
 
             if self.dry_run:
                 return {
                     'fetched': len(postings),
                     'new': 0,
+                    'board_unchanged': unchanged,
                     'dry_run': True
                 }
 
-            # Use the manager's ingest method
-            result = self.manager.ingest_target(target)
+            if unchanged:
+                self.manager.refresh_unchanged_target(target, connector.etag, connector.last_modified)
+                self._remember_fetch_state(target, connector.etag, connector.last_modified, target.board_digest)
+                log.info("  Board unchanged - skipped")
+                return {'fetched': len(postings), 'new': 0, 'board_unchanged': True}
+
+            result = self.manager.refresh_changed_target(
+                target, postings, connector.etag, connector.last_modified, digest
+            )
+            self._remember_fetch_state(target, connector.etag, connector.last_modified, digest)
+            log.info(f"  {result['new']} new, {result['modified']} modified, "
+                     f"{result['removed']} removed, {result['unchanged']} unchanged")
             return result
 
         except Exception as e:
             log.error(f"  Error refreshing {target.company_name}: {e}")
             return {'error': str(e)}
 
+    @staticmethod
+    def _remember_fetch_state(target: IngestionTarget, etag: Optional[str],
+                              last_modified: Optional[str], digest: Optional[str]):
+        """Mirror what was just stored, for callers that keep targets between refreshes."""
+        target.etag = etag
+        target.last_modified = last_modified
+        target.board_digest = digest
+        target.last_fetched = datetime.now()
+
+    def record_result(self, result: dict):
+        """Add one refresh_target() result to the run stats."""
+        if 'error' in result:
+            self.stats['errors'] += 1
+        elif result.get('board_unchanged'):
+            self.stats['targets_unchanged'] += 1
+            self.stats['postings_fetched'] += result.get('fetched', 0)
+        else:
+            self.stats['targets_processed'] += 1
+            self.stats['postings_fetched'] += result.get('fetched', 0)
+            self.stats['postings_new'] += result.get('new', 0)
+            self.stats['postings_modified'] += result.get('modified', 0)
+            self.stats['postings_removed'] += result.get('removed', 0)
+
     def run(self, ats_type: str = None, company_id: str = None,
             force_all: bool = False, limit: int = None):
         """
@@ -215,14 +310,7 @@ class PostingRefresher:
                 self.stats['targets_skipped'] += 1
                 continue
 
-            result = self.refresh_target(target)
-
-            if 'error' in result:
-                self.stats['errors'] += 1
-            else:
-                self.stats['targets_processed'] += 1
-                self.stats['postings_fetched'] += result.get('fetched', 0)
-                self.stats['postings_new'] += result.get('new', 0)
+            self.record_result(self.refresh_target(target))
 
         # Update lifecycle for closed postings
         if not self.dry_run:
@@ -237,9 +325,12 @@ class PostingRefresher:
         log.info(f"Duration: {duration:.1f} seconds")
         log.info(f"Targets due: {self.stats['targets_due']}")
         log.info(f"Targets processed: {self.stats['targets_processed']}")
+        log.info(f"Targets unchanged: {self.stats['targets_unchanged']}")
         log.info(f"Targets skipped: {self.stats['targets_skipped']}")
         log.info(f"Postings fetched: {self.stats['postings_fetched']}")
         log.info(f"Postings new: {self.stats['postings_new']}")
+        log.info(f"Postings modified: {self.stats['postings_modified']}")
+        log.info(f"Postings removed: {self.stats['postings_removed']}")
         log.info(f"Errors: {self.stats['errors']}")
 
         return self.stats
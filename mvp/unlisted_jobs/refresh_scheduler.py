@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Adaptive Posting Refresh Scheduler
+==================================
+
+Long-running daemon that spends a fixed request budget where new openings
+are most likely, instead of refreshing every target on its fixed
+fetch_frequency_hours (which this daemon ignores).
+
+Each target's rate of new postings is learned from posting_lifecycle:
+postings first seen over the last LEARNING_WINDOW_DAYS, not counting the
+board's initial load, smoothed towards a prior of one new posting a week so
+quiet and brand-new boards are still checked. A target is worth refreshing
+once the postings expected since its last fetch, per request the refresh
+costs, reach a threshold; the threshold is solved so the whole schedule
+spends --budget requests per hour. Targets wait in a priority queue keyed
+by the time they reach it, so the next refresh is always the one with the
+most expected new postings per request.
+
+Refreshes go through PostingRefresher (so unchanged boards stay cheap), and
+new openings are recorded every --detect-minutes with OpeningDetector, so
+send_notifications.py sees them on its next run. While this daemon runs,
+cron_refresh.sh skips its fixed refresh and only detects and notifies.
+
+Usage:
+    # Run with a budget of 2000 requests per hour
+    python refresh_scheduler.py --budget 2000
+
+    # Only schedule one ATS type
+    python refresh_scheduler.py --budget 500 --ats greenhouse
+
+    # Print the learned schedule and exit
+    python refresh_scheduler.py --budget 2000 --plan
+
+Author: ShortList.ai
+Date: 2026-01-21
+"""
+
+import os
+import sys
+import argparse
+import heapq
+import logging
+import math
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from refresh_postings import PostingRefresher
+from detect_openings import OpeningDetector
+from sources.job_postings.posting_ingestion import PostingIngestionManager, IngestionTarget
+
+log = logging.getLogger(__name__)
+
+
+# Postings per request for paginated ATS APIs; the rest serve a board in one
+PAGE_SIZES = {
+    'smartrecruiters': 100,
+    'workday': 20,
+}
+
+# History used to learn change rates
+LEARNING_WINDOW_DAYS = 28
+
+# Postings first seen this soon after a board's first posting are its
+# initial load, not new openings
+INITIAL_LOAD_GRACE = timedelta(hours=1)
+
+
+@dataclass
+class TargetRate:
+    """What the scheduler knows about one target."""
+    target: IngestionTarget
+    new_postings: int = 0        # New postings seen in the learning window
+    observed_hours: float = 0.0  # Hours of history they were counted over
+    open_postings: int = 0
+
+    def rate(self, prior_postings: float, prior_hours: float) -> float:
+        """New postings per hour (Gamma-Poisson posterior mean)."""
+        return (self.new_postings + prior_postings) / (self.observed_hours + prior_hours)
+
+    @property
+    def cost(self) -> int:
+        """Requests one refresh takes."""
+        page_size = PAGE_SIZES.get(self.target.ats_type)
+        if not page_size:
+            return 1
+        return max(1, math.ceil(self.open_postings / page_size))
+
+
+class RefreshPlanner:
+    """
+    Turns learned rates into per-target refresh intervals within a budget.
+
+    Refreshing target i every T_i hours finds rate_i * T_i new postings for
+    cost_i requests. Refreshing each target once rate_i * T_i / cost_i
+    reaches a common threshold maximises new postings found (and minimises
+    their detection delay) for the requests spent; the threshold is found by
+    bisection so that sum(cost_i / T_i) equals the budget.
+    """
+
+    def __init__(self, budget_per_hour: float,
+                 min_interval_hours: float = 1.0,
+                 max_interval_hours: float = 72.0,
+                 prior_postings: float = 1.0,
+                 prior_hours: float = 168.0):
+        self.budget_per_hour = budget_per_hour
+        self.min_interval_hours = min_interval_hours
+        self.max_interval_hours = max_interval_hours
+        self.prior_postings = prior_postings
+        self.prior_hours = prior_hours
+        self.threshold = 0.0
+
+        # Requests/hour the last plan needs: the budget, unless it was too
+        # small to refresh every target within max_interval_hours
+        self.request_rate = budget_per_hour
+
+    def _interval(self, rate: float, cost: int, threshold: float) -> float:
+        interval = threshold * cost / rate
+        return min(self.max_interval_hours, max(self.min_interval_hours, interval))
+
+    def spend(self, rates: List[TargetRate], intervals: Dict[int, float]) -> float:
+        """Requests per hour the given intervals use."""
+        return sum(r.cost / intervals[r.target.id] for r in rates)
+
+    def intervals(self, rates: List[TargetRate]) -> Dict[int, float]:
+        """Refresh interval in hours for each target id."""
+        self.request_rate = self.budget_per_hour
+        if not rates:
+            return {}
+
+        params = [(r.target.id, r.rate(self.prior_postings, self.prior_hours), r.cost) for r in rates]
+
+        def spend(threshold: float) -> float:
+            return sum(cost / self._interval(rate, cost, threshold) for _, rate, cost in params)
+
+        if spend(0.0) <= self.budget_per_hour:
+            # Budget covers refreshing everything as often as allowed
+            self.threshold = 0.0
+        else:
+            high = max(self.max_interval_hours * rate / cost for _, rate, cost in params)
+            if spend(high) > self.budget_per_hour:
+                log.warning(
+                    f"Budget of {self.budget_per_hour:g} requests/hour is below the "
+                    f"{spend(high):.1f} needed to refresh every target within "
+                    f"{self.max_interval_hours:.0f}h - overspending to keep postings open"
+                )
+                self.threshold = high
+                self.request_rate = spend(high)
+            else:
+                low = 0.0
+                for _ in range(60):
+                    mid = (low + high) / 2
+                    if spend(mid) > self.budget_per_hour:
+                        low = mid
+                    else:
+                        high = mid
+                self.threshold = high
+
+        return {target_id: self._interval(rate, cost, self.threshold)
+                for target_id, rate, cost in params}
+
+
+class RefreshScheduler:
+    """
+    Priority-queue refresh loop over a request budget.
+
+    Single-threaded by design: PostingRefresher shares the manager's caches
+    between refreshes, and the budget (not concurrency) sets the pace.
+    """
+
+    # How often to relearn rates and reload targets
+    RELEARN_INTERVAL = timedelta(hours=1)
+
+    # Retry delay after a failed refresh (capped at the target's interval)
+    ERROR_RETRY = timedelta(hours=1)
+
+    # Window searched for unrecorded openings; already recorded ones are
+    # skipped, so overlap between runs is harmless
+    OPENINGS_LOOKBACK_HOURS = 6
+
+    # Longest single sleep, so signals and schedule changes are noticed
+    MAX_SLEEP_SECONDS = 60
+
+    def __init__(self, refresher: PostingRefresher, planner: RefreshPlanner,
+                 ats_type: str = None, detect_minutes: float = 30,
+                 lifecycle_hours: float = 6):
+        self.refresher = refresher
+        self.planner = planner
+        self.ats_type = ats_type
+        self.detect_interval = timedelta(minutes=detect_minutes)
+        self.lifecycle_interval = timedelta(hours=lifecycle_hours)
+
+        self.rates: Dict[int, TargetRate] = {}
+        self.intervals: Dict[int, float] = {}
+        self.queue: List[Tuple[datetime, int]] = []
+        self._retry_at: Dict[int, datetime] = {}  # Failed targets (last_fetched isn't updated)
+
+        # Request budget: refills at the planner's request_rate, holds a
+        # minute's worth (or the largest single refresh, so no target is starved)
+        self._tokens = 0.0
+        self._token_capacity = 0.0
+        self._tokens_updated = time.monotonic()
+
+        self.requests_spent = 0
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    # =========================================================================
+    # LEARNING
+    # =========================================================================
+
+    def load_history(self) -> Dict[Tuple[str, str], Tuple[int, float, int]]:
+        """
+        Per-board posting history from posting_lifecycle.
+
+        Returns {(source name, normalized company name): (new postings in
+        the window, hours observed, open postings)}.
+        """
+        now = datetime.now()
+        window_start = now - timedelta(days=LEARNING_WINDOW_DAYS)
+
+        conn = self.refresher.db.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    WITH boards AS (
+                        SELECT source_id, company_id, MIN(first_seen) AS first_load
+                        FROM posting_lifecycle
+                        GROUP BY source_id, company_id
+                    )
+                    SELECT s.name, c.normalized_name, b.first_load,
+                           COUNT(*) FILTER (
+                               WHERE pl.first_seen >= %(window_start)s
+                                 AND pl.first_seen > b.first_load + %(grace)s
+                           ),
+                           COUNT(*) FILTER (WHERE pl.disappeared_date IS NULL)
+                    FROM boards b
+                    JOIN posting_lifecycle pl
+                      ON pl.source_id = b.source_id AND pl.company_id = b.company_id
+                    JOIN sources s ON s.id = b.source_id
+                    JOIN companies c ON c.id = b.company_id
+                    WHERE s.type = 'job_posting'
+                    GROUP BY s.name, c.normalized_name, b.first_load
+                """, {'window_start': window_start, 'grace': INITIAL_LOAD_GRACE})
+                rows = cursor.fetchall()
+        finally:
+            self.refresher.db.release_connection(conn)
+
+        history = {}
+        for source_name, company_name, first_load, new_postings, open_postings in rows:
+            observed_from = max(first_load + INITIAL_LOAD_GRACE, window_start)
+            observed_hours = max(0.0, (now - observed_from).total_seconds() / 3600)
+            history[(source_name, company_name)] = (new_postings, observed_hours, open_postings)
+        return history
+
+    def learn(self):
+        """Reload targets, relearn their rates and rebuild the queue."""
+        targets = [
+            t for t in self.refresher.manager.get_enabled_targets(self.ats_type)
+            if t.ats_type in self.refresher.CONNECTOR_CLASSES
+        ]
+        history = self.load_history()
+
+        rates = {}
+        for target in targets:
+            key = (PostingIngestionManager._source_name(target.ats_type),
+                   PostingIngestionManager._normalize_company_name(target.company_name))
+            new_postings, observed_hours, open_postings = history.get(key, (0, 0.0, 0))
+            rates[target.id] = TargetRate(target, new_postings, observed_hours, open_postings)
+
+        self.rates = rates
+        self.intervals = self.planner.intervals(list(rates.values()))
+
+        now = datetime.now()
+        self.queue = [(self.next_due(rate.target, now), target_id) for target_id, rate in rates.items()]
+        heapq.heapify(self.queue)
+
+        self._token_capacity = max(
+            [self.planner.request_rate / 60] + [r.cost for r in rates.values()]
+        )
+        self._tokens = min(self._tokens, self._token_capacity)
+
+        log.info(f"Learned rates for {len(rates)} targets: threshold "
+                 f"{self.planner.threshold:.3f} new postings/request, "
+                 f"planned spend {self.planner.spend(list(rates.values()), self.intervals):.0f} "
+                 f"of {self.planner.request_rate:.0f} requests/hour")
+
+    def next_due(self, target: IngestionTarget, now: datetime) -> datetime:
+        """
+        Never-fetched targets are due now; others one interval after their
+        last fetch, but not before a pending retry after a failure.
+        """
+        due = now
+        if target.last_fetched is not None:
+            due = target.last_fetched + timedelta(hours=self.intervals[target.id])
+        retry_at = self._retry_at.get(target.id)
+        return max(due, retry_at) if retry_at else due
+
+    def plan(self) -> List[Tuple[datetime, TargetRate, float]]:
+        """The queue in due order: (due, rate info, interval hours)."""
+        return [(due, self.rates[target_id], self.intervals[target_id])
+                for due, target_id in sorted(self.queue)]
+
+    # =========================================================================
+    # BUDGET
+    # =========================================================================
+
+    def _take_requests(self, cost: int) -> float:
+        """Spend `cost` requests of budget; returns seconds to wait if short."""
+        now = time.monotonic()
+        self._tokens = min(self._token_capacity,
+                           self._tokens + (now - self._tokens_updated) * self.planner.request_rate / 3600)
+        self._tokens_updated = now
+        if self._tokens >= cost:
+            self._tokens -= cost
+            self.requests_spent += cost
+            return 0.0
+        return (cost - self._tokens) * 3600 / self.planner.request_rate
+
+    # =========================================================================
+    # LOOP
+    # =========================================================================
+
+    def refresh_next(self):
+        """Refresh the target at the head of the queue and requeue it."""
+        _, target_id = heapq.heappop(self.queue)
+        rate = self.rates[target_id]
+        target = rate.target
+
+        log.info(f"{target.company_name} ({target.ats_type}): "
+                 f"{rate.rate(self.planner.prior_postings, self.planner.prior_hours) * 24:.2f} "
+                 f"new/day, every {self.intervals[target_id]:.1f}h")
+        result = self.refresher.refresh_target(target)
+        self.refresher.record_result(result)
+
+        now = datetime.now()
+        interval = timedelta(hours=self.intervals[target_id])
+        if 'error' in result:
+            due = self._retry_at[target_id] = now + min(interval, self.ERROR_RETRY)
+        else:
+            self._retry_at.pop(target_id, None)
+            due = now + interval
+        heapq.heappush(self.queue, (due, target_id))
+
+    def record_openings(self, detector: OpeningDetector):
+        openings = detector.detect_new_openings(since_hours=self.OPENINGS_LOOKBACK_HOURS)
+        recorded = detector.record_opening_events(openings)
+        stats = self.refresher.stats
+        log.info(f"Recorded {recorded} new openings | since start: "
+                 f"{stats['targets_processed']} changed, {stats['targets_unchanged']} unchanged, "
+                 f"{stats['postings_new']} new postings, {stats['errors']} errors, "
+                 f"{self.requests_spent} requests")
+
+    def run(self):
+        """Refresh until stop() is called."""
+        detector = None
+        if not self.refresher.dry_run:
+            detector = OpeningDetector()
+            detector.ensure_opening_events_table()
+
+        try:
+            self.learn()
+            now = datetime.now()
+            next_learn = now + self.RELEARN_INTERVAL
+            next_detect = now + self.detect_interval
+            next_lifecycle = now + self.lifecycle_interval
+
+            while not self._stop.is_set():
+                now = datetime.now()
+
+                if now >= next_learn:
+                    self.learn()
+                    next_learn = now + self.RELEARN_INTERVAL
+
+                if detector and now >= next_detect:
+                    self.record_openings(detector)
+                    next_detect = now + self.detect_interval
+
+                if not self.refresher.dry_run and now >= next_lifecycle:
+                    self.refresher.manager.update_lifecycle_status()
+                    next_lifecycle = now + self.lifecycle_interval
+
+                wait_until = min(next_learn, next_detect, next_lifecycle)
+                if self.queue:
+                    due, target_id = self.queue[0]
+                    if due <= now:
+                        wait = self._take_requests(self.rates[target_id].cost)
+                        if not wait:
+                            self.refresh_next()
+                            continue
+                        wait_until = min(wait_until, now + timedelta(seconds=wait))
+                    else:
+                        wait_until = min(wait_until, due)
+
+                sleep = (wait_until - datetime.now()).total_seconds()
+                self._stop.wait(min(self.MAX_SLEEP_SECONDS, max(0.0, sleep)))
+
+            log.info("Scheduler stopped")
+        finally:
+            if detector:
+                detector.close()
+
+
+def print_plan(scheduler: RefreshScheduler, limit: int):
+    """Print the learned schedule, soonest first."""
+    plan = scheduler.plan()
+    now = datetime.now()
+    print(f"\n{'Company':<30} {'ATS':<16} {'New/day':>8} {'Cost':>5} {'Every':>7} {'Due in':>8}")
+    print("-" * 79)
+    for due, rate, interval in plan[:limit]:
+        due_hours = max(0.0, (due - now).total_seconds() / 3600)
+        new_per_day = rate.rate(scheduler.planner.prior_postings, scheduler.planner.prior_hours) * 24
+        print(f"{rate.target.company_name[:30]:<30} {rate.target.ats_type:<16} "
+              f"{new_per_day:>8.2f} {rate.cost:>5} {interval:>6.1f}h {due_hours:>7.1f}h")
+    if len(plan) > limit:
+        print(f"... and {len(plan) - limit} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Adaptive job posting refresh daemon')
+    parser.add_argument('--budget', type=float, required=True, help='Requests per hour to spend on refreshes')
+    parser.add_argument('--ats', type=str, help='Only schedule specific ATS type (greenhouse, lever, etc.)')
+    parser.add_argument('--min-interval-hours', type=float, default=1.0,
+                        help='Never refresh a target more often than this')
+    parser.add_argument('--max-interval-hours', type=float, default=72.0,
+                        help='Always refresh a target at least this often')
+    parser.add_argument('--detect-minutes', type=float, default=30,
+                        help='How often to record new openings')
+    parser.add_argument('--plan', action='store_true', help='Print the learned schedule and exit')
+    parser.add_argument('--limit', type=int, default=50, help='Rows to print with --plan')
+    parser.add_argument('--dry-run', action='store_true', help='Fetch but do not save')
+
+    args = parser.parse_args()
+
+    # Open postings not seen for DAYS_UNTIL_CLOSED are closed, and last_seen
+    # is only bumped every LAST_SEEN_RESOLUTION
+    longest = (timedelta(days=PostingIngestionManager.DAYS_UNTIL_CLOSED)
+               - PostingIngestionManager.LAST_SEEN_RESOLUTION)
+    if timedelta(hours=args.max_interval_hours) >= longest:
+        parser.error(f"--max-interval-hours must be under {longest.total_seconds() / 3600:.0f} "
+                     f"or open postings would be closed between refreshes")
+    if args.min_interval_hours > args.max_interval_hours:
+        parser.error("--min-interval-hours must not exceed --max-interval-hours")
+
+    planner = RefreshPlanner(
+        budget_per_hour=args.budget,
+        min_interval_hours=args.min_interval_hours,
+        max_interval_hours=args.max_interval_hours,
+    )
+    refresher = PostingRefresher(dry_run=args.dry_run)
+    scheduler = RefreshScheduler(refresher, planner, ats_type=args.ats,
+                                 detect_minutes=args.detect_minutes)
+
+    try:
+        if args.plan:
+            scheduler.learn()
+            print_plan(scheduler, args.limit)
+            return 0
+
+        signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+        signal.signal(signal.SIGINT, lambda *_: scheduler.stop())
+        scheduler.run()
+        return 0
+    finally:
+        refresher.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,9 +29,10 @@ import argparse
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
+import pandas as pd
 from scipy import stats
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 
 # Setup environment for database
 os.environ['DB_USER'] = os.environ.get('DB_USER', 'noahhopkins')
@@ -45,6 +46,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Posterior percentiles reported per estimate, and their standard normal quantiles
+PERCENTILES = {'p10': 0.10, 'p25': 0.25, 'p50': 0.50, 'p75': 0.75, 'p90': 0.90}
+PERCENTILE_Z = dict(zip(PERCENTILES, stats.norm.ppf(list(PERCENTILES.values()))))
+
+
+def parse_metro_area(area_name: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Split an OEWS metro name into (state, cities) for location matching,
+    e.g. "Boston-Cambridge-Nashua, MA-NH" -> ("MA", ["Boston", "Cambridge", "Nashua"]).
+    """
+    metro_parts = area_name.split(',')
+    metro_state = metro_parts[-1].strip().split('-')[0].strip() if len(metro_parts) > 1 else None
+    metro_cities = metro_parts[0].split('-') if metro_parts else []
+    return metro_state, metro_cities
+
+
 @dataclass
 class OEWSWagePrior:
     """OEWS wage prior for a metro × role."""
@@ -224,9 +241,7 @@ class SalaryInferenceModel:
         area_name = row['area_name']
 
         # Parse metro for location matching
-        metro_parts = area_name.split(',')
-        metro_state = metro_parts[-1].strip().split('-')[0].strip() if len(metro_parts) > 1 else None
-        metro_cities = metro_parts[0].split('-') if metro_parts else []
+        metro_state, metro_cities = parse_metro_area(area_name)
 
         cur.execute("""
             SELECT
@@ -386,9 +401,7 @@ class SalaryInferenceModel:
             return []
         area_name = row['area_name']
 
-        metro_parts = area_name.split(',')
-        metro_state = metro_parts[-1].strip().split('-')[0].strip() if len(metro_parts) > 1 else None
-        metro_cities = metro_parts[0].split('-') if metro_parts else []
+        metro_state, metro_cities = parse_metro_area(area_name)
 
         cur.execute("""
             SELECT DISTINCT
@@ -406,35 +419,54 @@ class SalaryInferenceModel:
         cur.close()
         return results
 
+    def _select_priors(
+        self,
+        oews_priors: Dict[Tuple[str, int], OEWSWagePrior],
+        limit_areas: int = None,
+        limit_roles: int = None
+    ) -> Dict[Tuple[str, int], OEWSWagePrior]:
+        """Apply --limit-areas/--limit-roles: keep the first N areas/roles seen."""
+        areas_seen = set()
+        roles_seen = set()
+        selected = {}
+
+        for (area_code, role_id), prior in oews_priors.items():
+            if limit_areas and len(areas_seen) >= limit_areas and area_code not in areas_seen:
+                continue
+            if limit_roles and len(roles_seen) >= limit_roles and role_id not in roles_seen:
+                continue
+
+            areas_seen.add(area_code)
+            roles_seen.add(role_id)
+            selected[(area_code, role_id)] = prior
+
+        return selected
+
     def run_inference(
         self,
         year: int = 2024,
         limit_areas: int = None,
-        limit_roles: int = None
+        limit_roles: int = None,
+        batch: bool = True
     ) -> List[SalaryEstimate]:
         """
         Run salary inference for all metro × role × company combinations.
+
+        By default runs in batch mode (one streamed query, array math); pass
+        batch=False for the original per metro × role × company queries.
         """
         logger.info("Starting salary inference...")
 
         # Get OEWS priors
-        oews_priors = self.get_oews_wage_priors(year)
+        oews_priors = self._select_priors(self.get_oews_wage_priors(year), limit_areas, limit_roles)
+
+        if batch:
+            return self.run_inference_batch(oews_priors)
 
-        areas_seen = set()
-        roles_seen = set()
         all_estimates = []
         processed = 0
 
         for (area_code, role_id), prior in oews_priors.items():
-            # Apply limits
-            if limit_areas and len(areas_seen) >= limit_areas and area_code not in areas_seen:
-                continue
-            if limit_roles and len(roles_seen) >= limit_roles and role_id not in roles_seen:
-                continue
-
-            areas_seen.add(area_code)
-            roles_seen.add(role_id)
-
             # Get companies with salary evidence
             companies = self.get_companies_with_evidence(area_code, role_id)
 
@@ -478,60 +510,297 @@ class SalaryInferenceModel:
         logger.info(f"Generated {len(all_estimates)} salary estimates")
         return all_estimates
 
+    # ------------------------------------------------------------------
+    # Batch mode
+    # ------------------------------------------------------------------
+
+    OBSERVATION_COLUMNS = [
+        'company_id', 'company_name', 'canonical_role_id', 'source_type',
+        'salary_min', 'salary_max', 'salary_point', 'state', 'city'
+    ]
+    OBSERVATION_FETCH_SIZE = 50000
+
+    def load_salary_observations(self, role_ids: List[int]) -> pd.DataFrame:
+        """
+        Stream every salary-bearing observed job for the given roles, joined
+        to its company and location, in a single server-side cursor query.
+        """
+        self.connect()
+        cur = self.conn.cursor(name='salary_observations')
+        cur.itersize = self.OBSERVATION_FETCH_SIZE
+        cur.execute("""
+            SELECT
+                oj.company_id,
+                c.name as company_name,
+                oj.canonical_role_id,
+                oj.source_type,
+                oj.salary_min,
+                oj.salary_max,
+                oj.salary_point,
+                l.state,
+                l.city
+            FROM observed_jobs oj
+            JOIN companies c ON oj.company_id = c.id
+            JOIN locations l ON oj.location_id = l.id
+            WHERE oj.canonical_role_id = ANY(%s)
+              AND (oj.salary_min IS NOT NULL OR oj.salary_max IS NOT NULL OR oj.salary_point IS NOT NULL)
+        """, (list(role_ids),))
+
+        frames = []
+        while True:
+            rows = cur.fetchmany(self.OBSERVATION_FETCH_SIZE)
+            if not rows:
+                break
+            frame = pd.DataFrame(rows, columns=self.OBSERVATION_COLUMNS)
+            for column in ('salary_min', 'salary_max', 'salary_point'):
+                frame[column] = frame[column].astype(float)
+            frames.append(frame)
+
+        cur.close()
+        self.conn.commit()  # Ends the transaction holding the named cursor
+
+        if not frames:
+            return pd.DataFrame(columns=self.OBSERVATION_COLUMNS)
+        observations = pd.concat(frames, ignore_index=True)
+        logger.info(f"Loaded {len(observations):,} salary observations")
+        return observations
+
+    def _observation_values(self, observations: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized form of the per-observation rules in estimate_posterior():
+        point estimate, validity filter and source weight.
+        """
+        # Zero salaries count as missing, like the truthiness checks above
+        point = observations['salary_point'].where(observations['salary_point'] != 0)
+        low = observations['salary_min'].where(observations['salary_min'] != 0)
+        high = observations['salary_max'].where(observations['salary_max'] != 0)
+
+        value = np.where(point.notna(), point,
+                np.where(low.notna() & high.notna(), (low + high) / 2,
+                np.where(low.notna(), low * 1.1, high * 0.9)))
+
+        observations = observations.assign(value=value)
+        observations['valid'] = observations['value'].between(20000, 1000000)
+        observations['weight'] = (observations['source_type']
+                                  .map(self.SOURCE_WEIGHTS)
+                                  .fillna(self.SOURCE_WEIGHTS['default'])
+                                  .astype(float))
+        return observations
+
+    def _match_observations(
+        self,
+        observations: pd.DataFrame,
+        priors: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Pair observations with every metro × role prior they fall in: same
+        role, and the location's state is the metro's state or its city is
+        one of the metro's cities (the SQL matching in the per-pair path).
+        """
+        area_keys = priors[['area_code', 'canonical_role_id', 'area_name']].copy()
+        parsed = area_keys['area_name'].map(parse_metro_area)
+        area_keys['state'] = parsed.str[0]
+        area_keys['city'] = parsed.str[1]
+
+        observations = observations.reset_index().rename(columns={'index': 'obs_id'})
+
+        by_state = observations.dropna(subset=['state']).merge(
+            area_keys[['area_code', 'canonical_role_id', 'state']].dropna(subset=['state']),
+            on=['canonical_role_id', 'state'])
+        by_city = observations.dropna(subset=['city']).merge(
+            area_keys[['area_code', 'canonical_role_id', 'city']].explode('city').dropna(subset=['city']),
+            on=['canonical_role_id', 'city'])
+
+        # An observation matching on both state and city still counts once
+        return (pd.concat([by_state, by_city], ignore_index=True)
+                  .drop_duplicates(subset=['obs_id', 'area_code']))
+
+    def compute_posteriors(self, groups: pd.DataFrame) -> pd.DataFrame:
+        """
+        estimate_posterior() for many groups at once.
+
+        Expects prior columns (wage_p10..wage_p90, wage_mean) and per-group
+        evidence (total_weight, weighted_sum, valid_count, value_std); adds
+        p10..p90, mean, stddev, effective_n and shrinkage.
+        """
+        mu_prior = groups['wage_p50'].to_numpy(dtype=float)
+        sigma_prior = mu_prior * self.PRIOR_CV
+        n_prior = self.PRIOR_EFFECTIVE_N
+
+        total_weight = groups['total_weight'].to_numpy(dtype=float)
+        has_evidence = total_weight > 0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mu_obs = groups['weighted_sum'].to_numpy(dtype=float) / total_weight
+            sigma_obs = np.where(groups['valid_count'].to_numpy() > 1,
+                                 groups['value_std'].to_numpy(dtype=float), sigma_prior)
+
+            # Bayesian update (precision weighting)
+            precision_prior = n_prior / (sigma_prior ** 2)
+            precision_obs = total_weight / (sigma_obs ** 2 + 1e-6)
+            precision_post = precision_prior + precision_obs
+            mu_post = (precision_prior * mu_prior + precision_obs * mu_obs) / precision_post
+            sigma_post = np.sqrt(1 / precision_post)
+            shrinkage = precision_obs / precision_post
+
+            # Lognormal with the posterior mean/stddev
+            cv2 = (sigma_post / mu_post) ** 2
+            log_mu = np.log(mu_post) - 0.5 * cv2
+            log_sigma = np.sqrt(np.log(1 + cv2))
+
+        result = groups.copy()
+        for name, z in PERCENTILE_Z.items():
+            posterior = np.exp(log_mu + log_sigma * z)
+            result[name] = np.where(has_evidence, posterior, groups[f'wage_{name}'])
+        result['mean'] = np.where(has_evidence, mu_post, groups['wage_mean'])
+        result['stddev'] = np.where(has_evidence, sigma_post, sigma_prior)
+        result['effective_n'] = np.where(has_evidence, total_weight, 0.0)
+        result['shrinkage'] = np.where(has_evidence, shrinkage, 1.0)
+        return result
+
+    def run_inference_batch(
+        self,
+        oews_priors: Dict[Tuple[str, int], OEWSWagePrior]
+    ) -> List[SalaryEstimate]:
+        """
+        Batch salary inference: one streamed observation query, then
+        grouping and posterior math over arrays instead of N×M queries.
+        """
+        if not oews_priors:
+            return []
+
+        priors = pd.DataFrame([vars(p) for p in oews_priors.values()])
+        observations = self.load_salary_observations(priors['canonical_role_id'].unique().tolist())
+        if observations.empty:
+            logger.info("Generated 0 salary estimates")
+            return []
+
+        matched = self._match_observations(self._observation_values(observations), priors)
+        keys = ['area_code', 'canonical_role_id', 'company_id']
+
+        groups = matched.groupby(keys, sort=False).agg(
+            company_name=('company_name', 'first'),
+            observation_count=('obs_id', 'size'),
+        )
+        groups = groups[groups['observation_count'] >= self.MIN_OBSERVATIONS]
+
+        valid = matched[matched['valid']].assign(
+            weighted_value=lambda df: df['value'] * df['weight'])
+        evidence = valid.groupby(keys, sort=False).agg(
+            total_weight=('weight', 'sum'),
+            weighted_sum=('weighted_value', 'sum'),
+            valid_count=('value', 'size'),
+        )
+        # Population stddev, as np.std in estimate_posterior()
+        evidence['value_std'] = valid.groupby(keys, sort=False)['value'].std(ddof=0)
+
+        groups = (groups.join(evidence)
+                        .reset_index()
+                        .merge(priors, on=['area_code', 'canonical_role_id']))
+        groups[['total_weight', 'weighted_sum', 'valid_count']] = (
+            groups[['total_weight', 'weighted_sum', 'valid_count']].fillna(0))
+
+        results = self.compute_posteriors(groups)
+
+        all_estimates = [
+            SalaryEstimate(
+                company_id=int(row['company_id']),
+                company_name=row['company_name'],
+                metro_name=row['area_name'],
+                canonical_role_id=int(row['canonical_role_id']),
+                role_name=row['role_name'],
+                salary_p10=float(row['p10']),
+                salary_p25=float(row['p25']),
+                salary_p50=float(row['p50']),
+                salary_p75=float(row['p75']),
+                salary_p90=float(row['p90']),
+                salary_mean=float(row['mean']),
+                salary_stddev=float(row['stddev']),
+                method='bayesian_shrinkage',
+                observation_count=int(row['observation_count']),
+                effective_sample_size=float(row['effective_n']),
+                shrinkage_factor=float(row['shrinkage']),
+                oews_median=float(row['wage_p50'])
+            )
+            for row in results.to_dict('records')
+        ]
+
+        logger.info(f"Generated {len(all_estimates)} salary estimates "
+                    f"from {len(oews_priors)} metro × role priors")
+        return all_estimates
+
+    # Estimates per UPDATE statement in save_to_archetypes()
+    SAVE_BATCH_SIZE = 1000
+
     def save_to_archetypes(self, estimates: List[SalaryEstimate]):
         """
         Update job_archetypes table with salary estimates.
+
+        Each batch of estimates is matched to archetypes (company, role and
+        metro name) and applied in a single UPDATE ... FROM (VALUES ...).
+        If several estimates hit the same archetype, the later one wins.
         """
         self.connect()
         cur = self.conn.cursor()
 
         updated = 0
 
-        for est in estimates:
-            try:
-                # Find matching archetype
-                cur.execute("""
-                    SELECT ja.id FROM job_archetypes ja
-                    JOIN metro_areas m ON ja.metro_id = m.id
-                    WHERE ja.company_id = %s
-                      AND ja.canonical_role_id = %s
-                      AND m.name ILIKE %s
-                    LIMIT 1
-                """, (
+        for start in range(0, len(estimates), self.SAVE_BATCH_SIZE):
+            batch = estimates[start:start + self.SAVE_BATCH_SIZE]
+            values = [
+                (
+                    start + i,
                     est.company_id,
                     est.canonical_role_id,
-                    f"%{est.metro_name.split(',')[0]}%"
-                ))
-                row = cur.fetchone()
-
-                if row:
-                    # Update existing archetype
-                    cur.execute("""
-                        UPDATE job_archetypes SET
-                            salary_p25 = %s,
-                            salary_p50 = %s,
-                            salary_p75 = %s,
-                            salary_mean = %s,
-                            salary_stddev = %s,
-                            salary_method = %s,
-                            updated_at = NOW()
-                        WHERE id = %s
-                    """, (
-                        est.salary_p25,
-                        est.salary_p50,
-                        est.salary_p75,
-                        est.salary_mean,
-                        est.salary_stddev,
-                        est.method,
-                        row[0]
-                    ))
-                    updated += 1
+                    f"%{est.metro_name.split(',')[0]}%",
+                    est.salary_p25,
+                    est.salary_p50,
+                    est.salary_p75,
+                    est.salary_mean,
+                    est.salary_stddev,
+                    est.method
+                )
+                for i, est in enumerate(batch)
+            ]
+
+            try:
+                execute_values(cur, """
+                    UPDATE job_archetypes ja SET
+                        salary_p25 = est.salary_p25,
+                        salary_p50 = est.salary_p50,
+                        salary_p75 = est.salary_p75,
+                        salary_mean = est.salary_mean,
+                        salary_stddev = est.salary_stddev,
+                        salary_method = est.salary_method,
+                        updated_at = NOW()
+                    FROM (
+                        SELECT DISTINCT ON (match.id)
+                            match.id AS archetype_id, v.*
+                        FROM (VALUES %s) AS v(
+                            seq, company_id, canonical_role_id, metro_pattern,
+                            salary_p25, salary_p50, salary_p75, salary_mean,
+                            salary_stddev, salary_method
+                        )
+                        JOIN LATERAL (
+                            SELECT ja2.id FROM job_archetypes ja2
+                            JOIN metro_areas m ON ja2.metro_id = m.id
+                            WHERE ja2.company_id = v.company_id
+                              AND ja2.canonical_role_id = v.canonical_role_id
+                              AND m.name ILIKE v.metro_pattern
+                            LIMIT 1
+                        ) match ON TRUE
+                        ORDER BY match.id, v.seq DESC
+                    ) est
+                    WHERE ja.id = est.archetype_id
+                """, values, page_size=len(values))
+                updated += cur.rowcount
+                self.conn.commit()
 
             except Exception as e:
-                logger.warning(f"Error updating archetype: {e}")
+                self.conn.rollback()
+                logger.warning(f"Error updating archetypes {start}-{start + len(batch)}: {e}")
                 continue
 
-        self.conn.commit()
         cur.close()
 
         logger.info(f"Updated {updated} archetypes with salary data")
@@ -560,6 +829,11 @@ def main():
         default=None,
         help='Limit to first N roles (for testing)'
     )
+    parser.add_argument(
+        '--per-pair',
+        action='store_true',
+        help='Query each metro × role × company separately instead of batch mode'
+    )
     parser.add_argument(
         '--save',
         action='store_true',
@@ -583,7 +857,8 @@ def main():
         estimates = model.run_inference(
             year=args.year,
             limit_areas=args.limit_areas,
-            limit_roles=args.limit_roles
+            limit_roles=args.limit_roles,
+            batch=not args.per_pair
         )
 
         # Print summary
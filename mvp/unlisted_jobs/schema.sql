@@ -252,6 +252,15 @@ CREATE TABLE IF NOT EXISTS posting_lifecycle (
 CREATE INDEX idx_posting_lifecycle_company ON posting_lifecycle(company_id);
 CREATE INDEX idx_posting_lifecycle_disappeared ON posting_lifecycle(disappeared_date);
 
+-- Link observed posting rows to their lifecycle record. Kept as real columns
+-- (not just metadata keys) so lifecycle refresh and dedupe hit btree indexes;
+-- migrate_observed_jobs_lifecycle.py backfills them on existing databases.
+ALTER TABLE observed_jobs ADD COLUMN IF NOT EXISTS lifecycle_id BIGINT REFERENCES posting_lifecycle(id);
+ALTER TABLE observed_jobs ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_observed_jobs_lifecycle ON observed_jobs(lifecycle_id) WHERE lifecycle_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_observed_jobs_content_hash ON observed_jobs(company_id, content_hash) WHERE content_hash IS NOT NULL;
+
 
 -- ============================================================================
 -- PHASE 6: COMPENSATION OBSERVATIONS
@@ -11,9 +11,14 @@ Supported ATS Platforms:
 - Workday (basic)
 
 Also includes a generic JSON-LD JobPosting extractor for sites with structured data.
+
+All connectors fetch through AsyncFetcher (pooled connections, per-host
+rate limits, retries); fetch_jobs_async() is the coroutine, fetch_jobs()
+a blocking wrapper.
 """
 
 from .base_connector import BaseATSConnector, JobPosting
+from .http_client import AsyncFetcher, FetchError, FetchResponse, HostPolicy
 from .greenhouse import GreenhouseConnector
 from .lever import LeverConnector
 from .smartrecruiters import SmartRecruitersConnector
@@ -29,6 +34,10 @@ from .company_targets import (
 __all__ = [
     'BaseATSConnector',
     'JobPosting',
+    'AsyncFetcher',
+    'FetchError',
+    'FetchResponse',
+    'HostPolicy',
     'GreenhouseConnector',
     'LeverConnector',
     'SmartRecruitersConnector',
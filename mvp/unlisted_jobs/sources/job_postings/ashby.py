@@ -18,6 +18,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 from .base_connector import BaseATSConnector, JobPosting
+from .http_client import AsyncFetcher, FetchError
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +56,7 @@ class AshbyConnector(BaseATSConnector):
     def _get_default_base_url(self) -> str:
         return f"{self.API_BASE}/{self.company_id}"
 
-    def fetch_jobs(self) -> List[JobPosting]:
+    async def fetch_jobs_async(self, fetcher: AsyncFetcher) -> List[JobPosting]:
         """
         Fetch all active job postings from Ashby.
 
@@ -63,14 +64,17 @@ class AshbyConnector(BaseATSConnector):
             List of JobPosting objects
         """
         jobs = []
+        self.fetch_error = None
 
         try:
             # Fetch job list with compensation data
             url = f"{self.base_url}?includeCompensation=true"
             logger.info(f"Fetching jobs from: {url}")
 
-            response = requests.get(url, timeout=self.REQUEST_TIMEOUT)
-            response.raise_for_status()
+            response = await self._get_board(fetcher, url)
+            if response is None:
+                logger.info(f"{self.company_name} board not modified since last fetch")
+                return jobs
 
             data = response.json()
             raw_jobs = data.get("jobs", [])
@@ -86,12 +90,14 @@ class AshbyConnector(BaseATSConnector):
                     logger.warning(f"Error parsing job {raw_job.get('id')}: {e}")
                     continue
 
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
+        except FetchError as e:
+            self.fetch_error = str(e)
+            if e.status == 404:
                 logger.error(f"Company '{self.company_id}' not found on Ashby")
             else:
                 logger.error(f"HTTP error fetching Ashby jobs: {e}")
         except Exception as e:
+            self.fetch_error = str(e)
             logger.error(f"Error fetching Ashby jobs: {e}")
 
         return jobs
@@ -11,6 +11,7 @@ Date: 2026-01-13
 """
 
 import os
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field, asdict
@@ -19,6 +20,8 @@ from typing import List, Dict, Any, Optional
 import hashlib
 import json
 
+from .http_client import AsyncFetcher, FetchResponse
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,13 +86,28 @@ class JobPosting:
         return hashlib.md5(content.encode()).hexdigest()[:16]
 
 
+def board_digest(postings: List[JobPosting]) -> str:
+    """
+    Digest of a whole job board: which postings are up and their content.
+
+    Order-independent, so an unchanged board gives the same digest however
+    the ATS sorts it.
+    """
+    entries = sorted(f"{p.external_id}:{p.content_hash()}" for p in postings)
+    return hashlib.md5("\n".join(entries).encode()).hexdigest()
+
+
 class BaseATSConnector(ABC):
     """
     Abstract base class for ATS connectors.
 
     All connectors must implement:
-    - fetch_jobs(): Retrieve all active job postings
+    - fetch_jobs_async(): Retrieve all active job postings (coroutine)
     - parse_job(): Convert raw ATS data to JobPosting format
+
+    fetch_jobs() is a blocking wrapper for one-off use. To fetch many
+    companies, share one AsyncFetcher across their fetch_jobs_async() calls
+    so connections and per-host rate limits are shared too.
     """
 
     # ATS identifier (must be overridden)
@@ -114,21 +132,49 @@ class BaseATSConnector(ABC):
         self.base_url = base_url or self._get_default_base_url()
         self.session = None
 
+        # HTTP validators for conditional fetches (see _get_board). Set
+        # these from the previous fetch; they're replaced after each one.
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.not_modified = False
+
+        # Why the last fetch failed, or None. A failed fetch returns no (or
+        # only some) postings, which must not be mistaken for an empty board.
+        self.fetch_error: Optional[str] = None
+
     @abstractmethod
     def _get_default_base_url(self) -> str:
         """Return the default base URL for this ATS type."""
         pass
 
     @abstractmethod
-    def fetch_jobs(self) -> List[JobPosting]:
+    async def fetch_jobs_async(self, fetcher: AsyncFetcher) -> List[JobPosting]:
         """
         Fetch all active job postings from the company's career page.
 
+        Args:
+            fetcher: Open AsyncFetcher to send requests through
+
         Returns:
-            List of JobPosting objects
+            List of JobPosting objects (empty, with not_modified set, if a
+            conditional fetch found the board unchanged; empty or partial,
+            with fetch_error set, if the fetch failed)
         """
         pass
 
+    def fetch_jobs(self) -> List[JobPosting]:
+        """
+        Blocking fetch_jobs_async() with its own short-lived fetcher.
+
+        Must not be called from inside a running event loop.
+        """
+        async def run():
+            async with AsyncFetcher(timeout=self.REQUEST_TIMEOUT, max_retries=self.MAX_RETRIES,
+                                    backoff_base=self.RETRY_DELAY) as fetcher:
+                return await self.fetch_jobs_async(fetcher)
+
+        return asyncio.run(run())
+
     @abstractmethod
     def parse_job(self, raw_job: Dict[str, Any]) -> JobPosting:
         """
@@ -142,6 +188,32 @@ class BaseATSConnector(ABC):
         """
         pass
 
+    async def _get_board(self, fetcher: AsyncFetcher, url: str, **kwargs) -> Optional[FetchResponse]:
+        """
+        GET a job board served by a single request, conditionally when
+        etag / last_modified are set.
+
+        Returns None (and sets not_modified) on 304 Not Modified; otherwise
+        raises FetchError for 4xx/5xx or records the new validators and
+        returns the response.
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        response = await fetcher.get(url, headers=headers or None, **kwargs)
+        if response.status == 304:
+            self.not_modified = True
+            return None
+
+        response.raise_for_status()
+        self.not_modified = False
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        return response
+
     def get_job_url(self, job_id: str) -> str:
         """Generate the public URL for a specific job posting."""
         return f"{self.base_url}/jobs/{job_id}"
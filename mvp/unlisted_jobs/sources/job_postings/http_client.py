@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Async HTTP Fetch Layer
+======================
+
+Shared asyncio HTTP client for the ATS connectors.
+
+One AsyncFetcher holds a single aiohttp session, so requests to the same
+host reuse pooled keep-alive connections instead of a new TLS handshake per
+call. Every request goes through a per-host limiter (a concurrency cap plus
+a token-bucket rate limit), and transient failures (connection errors,
+timeouts, 429 and 5xx) are retried with jittered exponential backoff,
+honoring Retry-After.
+
+That lets one process have thousands of posting targets in flight while
+each ATS host only ever sees its own configured request rate.
+
+Usage:
+    async with AsyncFetcher() as fetcher:
+        jobs = await GreenhouseConnector("stripe").fetch_jobs_async(fetcher)
+
+Author: ShortList.ai
+Date: 2026-01-20
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+
+class FetchError(Exception):
+    """A request that failed for good (after retries, or with a non-retryable status)."""
+
+    def __init__(self, message: str, status: int = None, url: str = None):
+        super().__init__(message)
+        self.status = status
+        self.url = url
+
+
+@dataclass
+class FetchResponse:
+    """A fully read response; the connection is already back in the pool."""
+    status: int
+    url: str
+    headers: Mapping[str, str]  # Case-insensitive
+    text: str
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise FetchError(f"HTTP {self.status} for {self.url}", status=self.status, url=self.url)
+
+
+@dataclass
+class HostPolicy:
+    """Limits applied to every request to one host."""
+    max_concurrency: int = 2        # Requests in flight at once
+    requests_per_second: float = 1.0
+    burst: int = 2                  # Token bucket capacity
+
+
+# Keyed by hostname, or by ".suffix" to cover every host under a domain (each
+# host gets its own limiter, e.g. one per Workday tenant)
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    'boards-api.greenhouse.io': HostPolicy(max_concurrency=8, requests_per_second=10, burst=10),
+    'api.lever.co': HostPolicy(max_concurrency=8, requests_per_second=10, burst=10),
+    'api.ashbyhq.com': HostPolicy(max_concurrency=4, requests_per_second=5, burst=5),
+    'api.smartrecruiters.com': HostPolicy(max_concurrency=4, requests_per_second=4, burst=4),
+    'api.rippling.com': HostPolicy(max_concurrency=4, requests_per_second=4, burst=4),
+    '.myworkdayjobs.com': HostPolicy(max_concurrency=4, requests_per_second=5, burst=5),
+}
+
+# Anything else (JSON-LD career sites): be polite
+DEFAULT_HOST_POLICY = HostPolicy()
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` tokens per second, at most `capacity` saved up."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HostLimiter:
+    """Concurrency cap + token bucket for one host."""
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self._semaphore = asyncio.Semaphore(policy.max_concurrency)
+        self._bucket = TokenBucket(policy.requests_per_second, policy.burst)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            await self._bucket.acquire()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self._semaphore.release()
+
+
+class AsyncFetcher:
+    """
+    Pooled, rate-limited HTTP client shared by all connectors in a run.
+
+    Must be used as an async context manager (or open()/close()) inside
+    the event loop that will run the requests.
+    """
+
+    # Statuses worth retrying; anything else is returned to the caller as-is
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self,
+                 host_policies: Dict[str, HostPolicy] = None,
+                 default_policy: HostPolicy = None,
+                 max_connections: int = 200,
+                 timeout: float = 30,
+                 max_retries: int = 3,
+                 backoff_base: float = 1.0,
+                 backoff_max: float = 30.0,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        self.host_policies = HOST_POLICIES if host_policies is None else host_policies
+        self.default_policy = default_policy or DEFAULT_HOST_POLICY
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.user_agent = user_agent
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._limiters: Dict[str, HostLimiter] = {}
+
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+        }
+
+    async def open(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': self.user_agent},
+            )
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def policy_for(self, host: str) -> HostPolicy:
+        """Exact host match first, then the longest matching '.suffix' entry."""
+        if host in self.host_policies:
+            return self.host_policies[host]
+        suffixes = [key for key in self.host_policies if key.startswith('.') and host.endswith(key)]
+        if suffixes:
+            return self.host_policies[max(suffixes, key=len)]
+        return self.default_policy
+
+    def _limiter(self, host: str) -> HostLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = HostLimiter(self.policy_for(host))
+        return limiter
+
+    def _backoff(self, attempt: int, response: Optional[FetchResponse]) -> float:
+        """Retry-After if the server sent one, else exponential backoff with jitter."""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    async def request(self, method: str, url: str, *,
+                      params: Dict[str, Any] = None,
+                      json: Any = None,
+                      headers: Dict[str, str] = None,
+                      allow_redirects: bool = True,
+                      timeout: float = None,
+                      max_retries: int = None) -> FetchResponse:
+        """
+        Send a request through the host's limiter, retrying transient failures.
+
+        Returns the final response whatever its status (call
+        raise_for_status() to treat 4xx/5xx as errors). Raises FetchError
+        if every attempt failed to get a response at all. max_retries
+        overrides the fetcher's default (0 for one-shot probes).
+        """
+        if self._session is None:
+            raise RuntimeError("AsyncFetcher is not open; use 'async with AsyncFetcher()'")
+
+        limiter = self._limiter(urlparse(url).hostname or '')
+        # Always explicit: timeout=None here would mean "no timeout", not the session's
+        request_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+        retries = self.max_retries if max_retries is None else max_retries
+
+        for attempt in range(retries + 1):
+            response = None
+            error = None
+            async with limiter:
+                self.stats['requests'] += 1
+                try:
+                    async with self._session.request(
+                        method, url,
+                        params=params,
+                        json=json,
+                        headers=headers,
+                        allow_redirects=allow_redirects,
+                        timeout=request_timeout,
+                    ) as resp:
+                        text = await resp.text(errors='replace')
+                        response = FetchResponse(resp.status, str(resp.url), resp.headers.copy(), text)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = e
+
+            if response is not None and response.status not in self.RETRY_STATUSES:
+                return response
+
+            if attempt == retries:
+                self.stats['failures'] += 1
+                if response is not None:
+                    return response
+                raise FetchError(f"{method} {url} failed: {error!r}", url=url)
+
+            delay = self._backoff(attempt, response)
+            reason = f"HTTP {response.status}" if response is not None else repr(error)
+            logger.debug(f"Retrying {method} {url} in {delay:.1f}s ({reason})")
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> FetchResponse:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> FetchResponse:
+        return await self.request('POST', url, **kwargs)
@@ -15,6 +15,7 @@ Author: ShortList.ai
 Date: 2026-01-13
 """
 
+import asyncio
 import json
 import logging
 import re
@@ -25,6 +26,7 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
 from .base_connector import BaseATSConnector, JobPosting
+from .http_client import AsyncFetcher, FetchError
 
 logger = logging.getLogger(__name__)
 
@@ -68,27 +70,24 @@ class JSONLDExtractor(BaseATSConnector):
     def _get_default_base_url(self) -> str:
         return self.careers_url
 
-    def fetch_jobs(self) -> List[JobPosting]:
+    async def fetch_jobs_async(self, fetcher: AsyncFetcher) -> List[JobPosting]:
         """
         Fetch job postings by extracting JSON-LD from the careers page.
 
+        If the page itself has no JobPosting entries, the linked job pages
+        are fetched concurrently (paced by the fetcher's per-host limits).
+
         Returns:
             List of JobPosting objects
         """
         jobs = []
+        self.fetch_error = None
 
         try:
             # Fetch the careers page
             logger.info(f"Fetching careers page: {self.careers_url}")
 
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-            response = requests.get(
-                self.careers_url,
-                timeout=self.REQUEST_TIMEOUT,
-                headers=headers
-            )
+            response = await fetcher.get(self.careers_url)
             response.raise_for_status()
 
             # Extract JSON-LD from page
@@ -116,13 +115,16 @@ class JSONLDExtractor(BaseATSConnector):
                 job_links = self._find_job_links(response.text)
                 logger.info(f"Found {len(job_links)} job links to scrape")
 
-                for link in job_links[:50]:  # Limit to 50 jobs
+                job_links = job_links[:50]  # Limit to 50 jobs
+                job_pages = await asyncio.gather(
+                    *(fetcher.get(link) for link in job_links),
+                    return_exceptions=True
+                )
+
+                for link, job_page in zip(job_links, job_pages):
                     try:
-                        job_page = requests.get(
-                            link,
-                            timeout=self.REQUEST_TIMEOUT,
-                            headers=headers
-                        )
+                        if isinstance(job_page, Exception):
+                            raise job_page
                         job_jsonld = self._extract_jsonld(job_page.text)
                         job_postings = self._find_job_postings(job_jsonld)
 
@@ -136,9 +138,11 @@ class JSONLDExtractor(BaseATSConnector):
                         logger.debug(f"Error scraping {link}: {e}")
                         continue
 
-        except requests.exceptions.HTTPError as e:
+        except FetchError as e:
+            self.fetch_error = str(e)
             logger.error(f"HTTP error fetching careers page: {e}")
         except Exception as e:
+            self.fetch_error = str(e)
             logger.error(f"Error fetching jobs: {e}")
 
         return jobs
@@ -16,12 +16,15 @@ Date: 2026-01-13
 
 import os
 import sys
+import time
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import json
 
+from psycopg2.extras import execute_values
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
@@ -59,6 +62,11 @@ class IngestionTarget:
     last_fetched: datetime = None
     db_company_id: int = None  # Our internal company ID
 
+    # Change detection state from the last successful fetch
+    etag: str = None
+    last_modified: str = None
+    board_digest: str = None
+
 
 class PostingIngestionManager:
     """
@@ -68,6 +76,20 @@ class PostingIngestionManager:
     # Days until a posting is considered closed
     DAYS_UNTIL_CLOSED = 7
 
+    # Rows per multi-row INSERT / UPDATE statement
+    BATCH_PAGE_SIZE = 500
+
+    # Stale postings closed per transaction in update_lifecycle_status
+    LIFECYCLE_BATCH_SIZE = 5000
+
+    # Company ids covered per transaction in dedupe_postings
+    DEDUPE_COMPANY_BATCH_SIZE = 500
+
+    # On refresh, a posting still on the board only has last_seen rewritten
+    # once it is this old, so several refreshes a day don't rewrite every
+    # row every time. Must stay well under DAYS_UNTIL_CLOSED.
+    LAST_SEEN_RESOLUTION = timedelta(hours=12)
+
     # Connector registry
     CONNECTOR_CLASSES = {
         'greenhouse': GreenhouseConnector,
@@ -80,6 +102,9 @@ class PostingIngestionManager:
         self.db.initialize_pool()
         self.normalizer = TitleNormalizer()
 
+        # (city, state) -> location id, shared by every target in the run
+        self._location_cache: Dict[Tuple[str, str], int] = {}
+
         # Statistics
         self.stats = {
             'targets_processed': 0,
@@ -115,11 +140,19 @@ class PostingIngestionManager:
                         last_fetched TIMESTAMP,
                         db_company_id INTEGER REFERENCES companies(id),
                         fetch_frequency_hours INTEGER DEFAULT 24,
+                        etag TEXT,
+                        last_modified TEXT,
+                        board_digest TEXT,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         UNIQUE(company_id_ats, ats_type)
                     );
 
+                    -- Change detection state (tables created before it existed)
+                    ALTER TABLE posting_targets ADD COLUMN IF NOT EXISTS etag TEXT;
+                    ALTER TABLE posting_targets ADD COLUMN IF NOT EXISTS last_modified TEXT;
+                    ALTER TABLE posting_targets ADD COLUMN IF NOT EXISTS board_digest TEXT;
+
                     CREATE INDEX IF NOT EXISTS idx_posting_targets_enabled
                     ON posting_targets(enabled, ats_type);
 
@@ -166,7 +199,8 @@ class PostingIngestionManager:
             with conn.cursor() as cursor:
                 query = """
                     SELECT id, company_name, company_id_ats, ats_type, careers_url,
-                           enabled, last_fetched, db_company_id
+                           enabled, last_fetched, db_company_id,
+                           etag, last_modified, board_digest
                     FROM posting_targets
                     WHERE enabled = true
                 """
@@ -187,7 +221,10 @@ class PostingIngestionManager:
                         careers_url=row[4],
                         enabled=row[5],
                         last_fetched=row[6],
-                        db_company_id=row[7]
+                        db_company_id=row[7],
+                        etag=row[8],
+                        last_modified=row[9],
+                        board_digest=row[10]
                     )
                     for row in rows
                 ]
@@ -223,38 +260,185 @@ class PostingIngestionManager:
         try:
             connector = connector_class(target.company_id_ats, target.company_name)
             postings = connector.fetch_jobs()
-            target_stats['fetched'] = len(postings)
-            log.info(f"Fetched {len(postings)} postings from {target.company_name}")
         except Exception as e:
             log.error(f"Error fetching from {target.company_name}: {e}")
             target_stats['errors'] += 1
             return target_stats
 
+        if connector.fetch_error:
+            # No or only some postings came back: recording them (and bumping
+            # last_fetched) would let the rest age out as closed. Leave the
+            # target as is and retry on the next run.
+            log.error(f"Fetch failed for {target.company_name}: {connector.fetch_error}")
+            target_stats['errors'] += 1
+            return target_stats
+
+        target_stats['fetched'] = len(postings)
+        log.info(f"Fetched {len(postings)} postings from {target.company_name}")
+
         # Get or create source
         source_id = self._get_or_create_source(target.ats_type, target.company_name)
 
         # Get or create company
         db_company_id = self._get_or_create_company(target.company_name)
 
-        # Process each posting
-        for posting in postings:
-            try:
-                result = self._process_posting(posting, source_id, db_company_id, target.id)
-                if result == 'new':
-                    target_stats['new'] += 1
-                elif result == 'updated':
-                    target_stats['updated'] += 1
-                if result in ('new', 'updated'):
-                    target_stats['matched'] += 1
-            except Exception as e:
-                log.warning(f"Error processing posting {posting.external_id}: {e}")
-                target_stats['errors'] += 1
+        # Process the whole result set as one batch; if that fails, fall back
+        # to posting-by-posting so one bad row doesn't lose the rest
+        try:
+            new_count, updated_count = self._process_postings(
+                postings, source_id, db_company_id, target.id
+            )
+            target_stats['new'] += new_count
+            target_stats['updated'] += updated_count
+            target_stats['matched'] += new_count + updated_count
+        except Exception as e:
+            log.warning(f"Batch upsert failed for {target.company_name} ({e}); processing postings individually")
+            for posting in postings:
+                try:
+                    result = self._process_posting(posting, source_id, db_company_id, target.id)
+                    if result == 'new':
+                        target_stats['new'] += 1
+                    elif result == 'updated':
+                        target_stats['updated'] += 1
+                    if result in ('new', 'updated'):
+                        target_stats['matched'] += 1
+                except Exception as e:
+                    log.warning(f"Error processing posting {posting.external_id}: {e}")
+                    target_stats['errors'] += 1
 
         # Update target's last_fetched
         self._update_target_last_fetched(target.id)
 
         return target_stats
 
+    def _process_postings(self, postings: List[JobPosting], source_id: int,
+                          company_id: int, target_id: int) -> Tuple[int, int]:
+        """
+        Set-based version of _process_posting() for a connector's full result set.
+
+        One transaction: bulk lookup of existing external_ids, one UPDATE ...
+        FROM VALUES to bump last_seen on those, and multi-row INSERTs for the
+        new lifecycle, raw and observed rows.
+
+        Returns:
+            (new, updated) counts
+        """
+        if not postings:
+            return 0, 0
+
+        # A repeated external_id is an update of the first occurrence
+        unique: Dict[str, JobPosting] = {}
+        for posting in postings:
+            unique.setdefault(posting.external_id, posting)
+        repeats = len(postings) - len(unique)
+
+        # Locations upserted in a rolled-back batch must not stay cached
+        location_cache = dict(self._location_cache)
+
+        conn = self.db.get_connection()
+        try:
+            now = datetime.now()
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT external_id, id FROM posting_lifecycle
+                    WHERE source_id = %s AND external_id = ANY(%s)
+                """, (source_id, list(unique)))
+                existing = dict(cursor.fetchall())
+
+                if existing:
+                    execute_values(cursor, """
+                        UPDATE posting_lifecycle pl
+                        SET last_seen = v.seen, updated_at = v.seen
+                        FROM (VALUES %s) AS v(id, seen)
+                        WHERE pl.id = v.id
+                    """, [(lifecycle_id, now) for lifecycle_id in existing.values()],
+                        page_size=self.BATCH_PAGE_SIZE)
+
+                    cursor.execute("""
+                        UPDATE observed_jobs
+                        SET last_seen = %s, updated_at = %s
+                        WHERE lifecycle_id = ANY(%s)
+                    """, (now, now, list(existing.values())))
+
+                new_postings = [p for ext_id, p in unique.items() if ext_id not in existing]
+                if new_postings:
+                    self._insert_new_postings(cursor, new_postings, source_id, company_id, target_id, now)
+
+            conn.commit()
+            return len(new_postings), len(existing) + repeats
+
+        except Exception:
+            conn.rollback()
+            self._location_cache = location_cache
+            raise
+        finally:
+            self.db.release_connection(conn)
+
+    def _insert_new_postings(self, cursor, postings: List[JobPosting], source_id: int,
+                             company_id: int, target_id: int, now: datetime):
+        """Multi-row INSERTs of lifecycle, raw and observed rows for unseen postings."""
+        norm_results = [self.normalizer.parse_title(p.title) for p in postings]
+        location_ids = self._get_or_create_locations(
+            cursor, [(p.city, p.state, p.is_remote) for p in postings]
+        )
+
+        lifecycle_rows = execute_values(cursor, """
+            INSERT INTO posting_lifecycle (
+                external_id, source_id, company_id, canonical_role_id,
+                first_seen, last_seen
+            ) VALUES %s
+            RETURNING external_id, id
+        """, [
+            (p.external_id, source_id, company_id, norm.canonical_role_id, now, now)
+            for p, norm in zip(postings, norm_results)
+        ], page_size=self.BATCH_PAGE_SIZE, fetch=True)
+        lifecycle_ids = dict(lifecycle_rows)
+
+        raw_rows = execute_values(cursor, """
+            INSERT INTO source_data_raw (
+                source_id, raw_company, raw_location, raw_title, raw_description,
+                source_url, source_document_id, as_of_date, raw_data
+            ) VALUES %s
+            RETURNING source_document_id, id
+        """, [
+            (source_id, p.company_name, p.location_raw, p.title, p.description,
+             p.url, p.external_id, now.date(), json.dumps(p.raw_data, default=str))
+            for p in postings
+        ], page_size=self.BATCH_PAGE_SIZE, fetch=True)
+        raw_data_ids = dict(raw_rows)
+
+        observed_rows = []
+        for posting, norm, location_id in zip(postings, norm_results, location_ids):
+            metadata = {
+                'lifecycle_id': lifecycle_ids[posting.external_id],
+                'target_id': target_id,
+                'ats_type': posting.ats_type,
+                'content_hash': posting.content_hash(),
+            }
+            observed_rows.append((
+                company_id, location_id, norm.canonical_role_id,
+                posting.title, posting.company_name, posting.location_raw,
+                norm.seniority, posting.description, posting.requirements,
+                posting.salary_min, posting.salary_max,
+                posting.salary_currency, posting.salary_period,
+                source_id, raw_data_ids[posting.external_id], f"job_posting_{posting.ats_type}",
+                'active', posting.posted_date, now, now,
+                metadata['lifecycle_id'], metadata['content_hash'],
+                json.dumps(metadata)
+            ))
+
+        execute_values(cursor, """
+            INSERT INTO observed_jobs (
+                company_id, location_id, canonical_role_id,
+                raw_title, raw_company, raw_location,
+                seniority, description, requirements,
+                salary_min, salary_max, salary_currency, salary_period,
+                source_id, source_data_id, source_type,
+                status, posted_date, first_seen, last_seen,
+                lifecycle_id, content_hash, metadata
+            ) VALUES %s
+        """, observed_rows, page_size=self.BATCH_PAGE_SIZE)
+
     def _process_posting(self, posting: JobPosting, source_id: int,
                         company_id: int, target_id: int) -> str:
         """
@@ -298,8 +482,8 @@ class PostingIngestionManager:
                     cursor.execute("""
                         UPDATE observed_jobs
                         SET last_seen = %s, updated_at = %s
-                        WHERE metadata->>'lifecycle_id' = %s
-                    """, (now, now, str(lifecycle_id)))
+                        WHERE lifecycle_id = %s
+                    """, (now, now, lifecycle_id))
 
                     conn.commit()
                     return 'updated'
@@ -335,10 +519,10 @@ class PostingIngestionManager:
                             salary_min, salary_max, salary_currency, salary_period,
                             source_id, source_data_id, source_type,
                             status, posted_date, first_seen, last_seen,
-                            metadata
+                            lifecycle_id, content_hash, metadata
                         ) VALUES (
                             %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s, %s, %s, %s
+                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
                         )
                         RETURNING id
                     """, (
@@ -349,6 +533,7 @@ class PostingIngestionManager:
                         posting.salary_currency, posting.salary_period,
                         source_id, raw_data_id, f"job_posting_{posting.ats_type}",
                         'active', posting.posted_date, now, now,
+                        lifecycle_id, metadata['content_hash'],
                         json.dumps(metadata)
                     ))
 
@@ -382,161 +567,432 @@ class PostingIngestionManager:
         ))
         return cursor.fetchone()[0]
 
+    # =========================================================================
+    # INCREMENTAL REFRESH
+    # =========================================================================
+
+    def refresh_unchanged_target(self, target: IngestionTarget, etag: str = None,
+                                 last_modified: str = None) -> int:
+        """
+        Record a refresh that found the target's board unchanged (304, or
+        the same board digest as last time).
+
+        Nothing is fetched from or written for individual postings: the
+        target's open postings only get last_seen bumped (when older than
+        LAST_SEEN_RESOLUTION, so usually no rows at all) so they aren't
+        closed as stale, and the target's fetch state is updated.
+
+        Returns:
+            Number of lifecycle rows whose last_seen was bumped
+        """
+        now = datetime.now()
+        conn = self.db.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                # Resolve source and company by name rather than through the
+                # get-or-create helpers, which would INSERT
+                cursor.execute("""
+                    WITH touched AS (
+                        UPDATE posting_lifecycle pl
+                        SET last_seen = %(now)s, updated_at = %(now)s
+                        FROM sources s, companies c
+                        WHERE s.name = %(source)s
+                          AND c.normalized_name = %(company)s
+                          AND pl.source_id = s.id
+                          AND pl.company_id = c.id
+                          AND pl.disappeared_date IS NULL
+                          AND pl.last_seen < %(cutoff)s
+                        RETURNING pl.id
+                    ),
+                    touched_jobs AS (
+                        UPDATE observed_jobs o
+                        SET last_seen = %(now)s, updated_at = %(now)s
+                        FROM touched t
+                        WHERE o.lifecycle_id = t.id
+                    )
+                    SELECT COUNT(*) FROM touched
+                """, {
+                    'now': now,
+                    'source': self._source_name(target.ats_type),
+                    'company': self._normalize_company_name(target.company_name),
+                    'cutoff': now - self.LAST_SEEN_RESOLUTION,
+                })
+                touched = cursor.fetchone()[0]
+
+                self._update_target_fetch_state(cursor, target.id, etag, last_modified,
+                                                target.board_digest)
+            conn.commit()
+            return touched
+
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db.release_connection(conn)
+
+    def refresh_changed_target(self, target: IngestionTarget, postings: List[JobPosting],
+                               etag: str = None, last_modified: str = None,
+                               digest: str = None) -> Dict[str, int]:
+        """
+        Apply a changed board as a diff against what's stored for the target.
+
+        Each posting's content_hash() is compared with the stored one:
+        - new: never seen -> inserted as in _process_postings()
+        - modified: content changed -> observed_jobs content columns updated
+        - unchanged: last_seen bumped (subject to LAST_SEEN_RESOLUTION)
+        - removed: open for this company but no longer on the board -> only
+          counted; they stop being seen, and update_lifecycle_status()
+          closes them after DAYS_UNTIL_CLOSED as before
+
+        The new digest and validators are stored in the same transaction,
+        so a failed apply is retried in full on the next refresh.
+
+        Returns:
+            Dict with fetched, new, modified, unchanged, removed counts
+        """
+        source_id = self._get_or_create_source(target.ats_type, target.company_name)
+        company_id = self._get_or_create_company(target.company_name)
+
+        # A repeated external_id is the same posting
+        unique: Dict[str, JobPosting] = {}
+        for posting in postings:
+            unique.setdefault(posting.external_id, posting)
+
+        # Locations upserted in a rolled-back batch must not stay cached
+        location_cache = dict(self._location_cache)
+
+        conn = self.db.get_connection()
+        try:
+            now = datetime.now()
+            with conn.cursor() as cursor:
+                # Postings on the board, plus everything still open for the company
+                cursor.execute("""
+                    SELECT pl.external_id, pl.id, pl.last_seen,
+                           pl.disappeared_date IS NULL, o.content_hash
+                    FROM posting_lifecycle pl
+                    LEFT JOIN observed_jobs o ON o.lifecycle_id = pl.id
+                    WHERE pl.source_id = %s
+                      AND (pl.external_id = ANY(%s)
+                           OR (pl.company_id = %s AND pl.disappeared_date IS NULL))
+                """, (source_id, list(unique), company_id))
+                stored = {row[0]: row[1:] for row in cursor.fetchall()}
+
+                new_postings = [p for ext_id, p in unique.items() if ext_id not in stored]
+                removed = [ext_id for ext_id, (_, _, is_open, _) in stored.items()
+                           if is_open and ext_id not in unique]
+
+                modified = []
+                stale_ids = []
+                cutoff = now - self.LAST_SEEN_RESOLUTION
+                for ext_id, posting in unique.items():
+                    if ext_id not in stored:
+                        continue
+                    lifecycle_id, last_seen, _, content_hash = stored[ext_id]
+                    if content_hash != posting.content_hash():
+                        modified.append((lifecycle_id, posting))
+                    if last_seen < cutoff:
+                        stale_ids.append(lifecycle_id)
+
+                if stale_ids:
+                    cursor.execute("""
+                        UPDATE posting_lifecycle
+                        SET last_seen = %s, updated_at = %s
+                        WHERE id = ANY(%s)
+                    """, (now, now, stale_ids))
+
+                    cursor.execute("""
+                        UPDATE observed_jobs
+                        SET last_seen = %s, updated_at = %s
+                        WHERE lifecycle_id = ANY(%s)
+                    """, (now, now, stale_ids))
+
+                if modified:
+                    self._update_modified_postings(cursor, modified, now)
+
+                if new_postings:
+                    self._insert_new_postings(cursor, new_postings, source_id, company_id, target.id, now)
+
+                self._update_target_fetch_state(cursor, target.id, etag, last_modified, digest)
+
+            conn.commit()
+
+        except Exception:
+            conn.rollback()
+            self._location_cache = location_cache
+            raise
+        finally:
+            self.db.release_connection(conn)
+
+        existing = len(unique) - len(new_postings)
+        return {
+            'fetched': len(postings),
+            'new': len(new_postings),
+            'modified': len(modified),
+            'unchanged': existing - len(modified),
+            'removed': len(removed),
+        }
+
+    def _update_modified_postings(self, cursor, modified: List[Tuple[int, JobPosting]], now: datetime):
+        """One UPDATE ... FROM VALUES of the content columns of changed postings."""
+        norm_results = [self.normalizer.parse_title(p.title) for _, p in modified]
+        location_ids = self._get_or_create_locations(
+            cursor, [(p.city, p.state, p.is_remote) for _, p in modified]
+        )
+
+        execute_values(cursor, """
+            UPDATE observed_jobs o
+            SET raw_title = v.raw_title,
+                raw_location = v.raw_location,
+                location_id = v.location_id,
+                canonical_role_id = v.canonical_role_id,
+                seniority = v.seniority,
+                description = v.description,
+                requirements = v.requirements,
+                salary_min = v.salary_min,
+                salary_max = v.salary_max,
+                content_hash = v.content_hash,
+                metadata = jsonb_set(COALESCE(o.metadata, '{}'::jsonb), '{content_hash}',
+                                     to_jsonb(v.content_hash)),
+                last_seen = v.seen,
+                updated_at = v.seen
+            FROM (VALUES %s) AS v(lifecycle_id, raw_title, raw_location, location_id,
+                                  canonical_role_id, seniority, description, requirements,
+                                  salary_min, salary_max, content_hash, seen)
+            WHERE o.lifecycle_id = v.lifecycle_id
+        """, [
+            (lifecycle_id, p.title, p.location_raw, location_id,
+             norm.canonical_role_id, norm.seniority, p.description, p.requirements,
+             p.salary_min, p.salary_max, p.content_hash(), now)
+            for (lifecycle_id, p), norm, location_id in zip(modified, norm_results, location_ids)
+        ], template="(%s::bigint, %s::text, %s::text, %s::integer, %s::integer, %s::text, "
+                    "%s::text, %s::text, %s::numeric, %s::numeric, %s::text, %s::timestamp)",
+            page_size=self.BATCH_PAGE_SIZE)
+
+    @staticmethod
+    def _update_target_fetch_state(cursor, target_id: int, etag: Optional[str],
+                                   last_modified: Optional[str], board_digest: Optional[str]):
+        cursor.execute("""
+            UPDATE posting_targets
+            SET last_fetched = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP,
+                etag = %s, last_modified = %s, board_digest = %s
+            WHERE id = %s
+        """, (etag, last_modified, board_digest, target_id))
+
     # =========================================================================
     # LIFECYCLE MANAGEMENT
     # =========================================================================
 
-    def update_lifecycle_status(self):
+    def update_lifecycle_status(self, batch_size: int = None) -> Dict[str, Any]:
         """
         Update posting lifecycle status.
 
         Marks postings as closed if not seen for N days.
         Calculates filled probability.
+
+        Runs as one set-based statement per batch of LIFECYCLE_BATCH_SIZE
+        stale postings (closing the lifecycle rows and their observed_jobs
+        rows together), committing between batches so a large backlog
+        doesn't hold long locks.
+
+        Returns:
+            Dict with stale_before, stale_after, closed, jobs_closed, seconds
         """
+        batch_size = batch_size or self.LIFECYCLE_BATCH_SIZE
+        cutoff_date = datetime.now() - timedelta(days=self.DAYS_UNTIL_CLOSED)
+        start = time.time()
+
         conn = self.db.get_connection()
         try:
-            cutoff_date = datetime.now() - timedelta(days=self.DAYS_UNTIL_CLOSED)
-
             with conn.cursor() as cursor:
-                # Find postings that haven't been seen recently and aren't already closed
-                cursor.execute("""
-                    SELECT id, external_id, company_id, canonical_role_id,
-                           first_seen, last_seen
-                    FROM posting_lifecycle
-                    WHERE last_seen < %s
-                      AND disappeared_date IS NULL
-                """, (cutoff_date,))
-
-                stale_postings = cursor.fetchall()
+                stale_before = self._count_stale_postings(cursor, cutoff_date)
                 closed_count = 0
+                jobs_closed = 0
 
-                for row in stale_postings:
-                    lifecycle_id = row[0]
-                    first_seen = row[4]
-                    last_seen = row[5]
-
-                    # Calculate posting duration
-                    duration_days = (last_seen - first_seen).days if first_seen else 0
-
-                    # Simple filled probability heuristic:
+                while True:
+                    # Filled probability heuristic by posting duration:
                     # - Short duration (< 14 days): likely filled (0.7)
                     # - Medium duration (14-30 days): moderate (0.5)
                     # - Long duration (> 30 days): possibly cancelled (0.3)
-                    if duration_days < 14:
-                        filled_prob = 0.7
-                        closure_reason = 'likely_filled'
-                    elif duration_days < 30:
-                        filled_prob = 0.5
-                        closure_reason = 'possibly_filled'
-                    else:
-                        filled_prob = 0.3
-                        closure_reason = 'possibly_cancelled'
-
-                    # Update lifecycle record
-                    cursor.execute("""
-                        UPDATE posting_lifecycle
-                        SET disappeared_date = %s,
-                            filled_probability = %s,
-                            closure_reason = %s,
-                            posting_duration_days = %s,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = %s
-                    """, (last_seen, filled_prob, closure_reason, duration_days, lifecycle_id))
-
-                    # Update observed_jobs status
                     cursor.execute("""
-                        UPDATE observed_jobs
-                        SET status = 'closed', updated_at = CURRENT_TIMESTAMP
-                        WHERE metadata->>'lifecycle_id' = %s
-                    """, (str(lifecycle_id),))
+                        WITH batch AS (
+                            SELECT id, last_seen,
+                                   COALESCE(EXTRACT(DAY FROM last_seen - first_seen)::int, 0) AS duration_days
+                            FROM posting_lifecycle
+                            WHERE last_seen < %s
+                              AND disappeared_date IS NULL
+                            ORDER BY id
+                            LIMIT %s
+                            FOR UPDATE SKIP LOCKED
+                        ),
+                        closed AS (
+                            UPDATE posting_lifecycle pl
+                            SET disappeared_date = b.last_seen,
+                                filled_probability = CASE
+                                    WHEN b.duration_days < 14 THEN 0.7
+                                    WHEN b.duration_days < 30 THEN 0.5
+                                    ELSE 0.3
+                                END,
+                                closure_reason = CASE
+                                    WHEN b.duration_days < 14 THEN 'likely_filled'
+                                    WHEN b.duration_days < 30 THEN 'possibly_filled'
+                                    ELSE 'possibly_cancelled'
+                                END,
+                                posting_duration_days = b.duration_days,
+                                updated_at = CURRENT_TIMESTAMP
+                            FROM batch b
+                            WHERE pl.id = b.id
+                            RETURNING pl.id
+                        ),
+                        closed_jobs AS (
+                            UPDATE observed_jobs o
+                            SET status = 'closed', updated_at = CURRENT_TIMESTAMP
+                            FROM closed c
+                            WHERE o.lifecycle_id = c.id
+                            RETURNING o.id
+                        )
+                        SELECT (SELECT COUNT(*) FROM closed), (SELECT COUNT(*) FROM closed_jobs)
+                    """, (cutoff_date, batch_size))
 
-                    closed_count += 1
+                    batch_closed, batch_jobs = cursor.fetchone()
+                    conn.commit()
+                    if not batch_closed:
+                        break
+                    closed_count += batch_closed
+                    jobs_closed += batch_jobs
+                    log.debug(f"Closed {closed_count}/{stale_before} stale postings")
 
-                conn.commit()
-                log.info(f"Closed {closed_count} stale postings")
-                self.stats['postings_closed'] = closed_count
+                stale_after = self._count_stale_postings(cursor, cutoff_date)
+            conn.commit()
 
+            result = {
+                'stale_before': stale_before,
+                'stale_after': stale_after,
+                'closed': closed_count,
+                'jobs_closed': jobs_closed,
+                'seconds': round(time.time() - start, 2),
+            }
+            log.info(f"Closed {closed_count} stale postings ({jobs_closed} observed jobs); "
+                     f"stale open postings {stale_before} -> {stale_after} in {result['seconds']}s")
+            self.stats['postings_closed'] = closed_count
+            return result
+
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             self.db.release_connection(conn)
 
+    @staticmethod
+    def _count_stale_postings(cursor, cutoff_date: datetime) -> int:
+        cursor.execute("""
+            SELECT COUNT(*) FROM posting_lifecycle
+            WHERE last_seen < %s AND disappeared_date IS NULL
+        """, (cutoff_date,))
+        return cursor.fetchone()[0]
+
     # =========================================================================
     # DEDUPLICATION
     # =========================================================================
 
-    def dedupe_postings(self):
+    def dedupe_postings(self, companies_per_batch: int = None) -> Dict[str, Any]:
         """
         Identify and link duplicate postings.
 
         Uses content hash to find similar postings at the same company.
         Doesn't delete anything - just marks duplicates in metadata.
+
+        The earliest-seen posting per (company, content_hash) is picked with a
+        window function and every later one is marked in a single UPDATE per
+        batch of company ids. Batches cover whole companies, so each
+        partition is always complete.
+
+        Returns:
+            Dict with duplicates_before, duplicates_after, marked, seconds
         """
+        companies_per_batch = companies_per_batch or self.DEDUPE_COMPANY_BATCH_SIZE
+        start = time.time()
+
         conn = self.db.get_connection()
         try:
             with conn.cursor() as cursor:
-                # Find postings with same content hash at same company
+                duplicates_before = self._count_marked_duplicates(cursor)
+
                 cursor.execute("""
-                    WITH content_hashes AS (
-                        SELECT
-                            id,
-                            company_id,
-                            metadata->>'content_hash' as content_hash,
-                            first_seen,
-                            ROW_NUMBER() OVER (
-                                PARTITION BY company_id, metadata->>'content_hash'
-                                ORDER BY first_seen ASC
-                            ) as rn
-                        FROM observed_jobs
-                        WHERE source_type LIKE 'job_posting_%'
-                          AND metadata->>'content_hash' IS NOT NULL
-                    )
-                    SELECT id, company_id, content_hash
-                    FROM content_hashes
-                    WHERE rn > 1
+                    SELECT MIN(company_id), MAX(company_id) FROM observed_jobs
+                    WHERE content_hash IS NOT NULL
                 """)
+                min_company, max_company = cursor.fetchone()
+                conn.commit()
 
-                duplicates = cursor.fetchall()
                 dupe_count = 0
-
-                for row in duplicates:
-                    job_id = row[0]
-                    company_id = row[1]
-                    content_hash = row[2]
-
-                    # Find the original posting
-                    cursor.execute("""
-                        SELECT id FROM observed_jobs
-                        WHERE company_id = %s
-                          AND metadata->>'content_hash' = %s
-                          AND id != %s
-                        ORDER BY first_seen ASC
-                        LIMIT 1
-                    """, (company_id, content_hash, job_id))
-
-                    original = cursor.fetchone()
-                    if original:
-                        original_id = original[0]
-
-                        # Mark as duplicate (don't delete)
+                if min_company is not None:
+                    for low in range(min_company, max_company + 1, companies_per_batch):
+                        high = low + companies_per_batch - 1
                         cursor.execute("""
-                            UPDATE observed_jobs
-                            SET metadata = metadata || %s::jsonb
-                            WHERE id = %s
-                        """, (json.dumps({'is_duplicate_of': original_id}), job_id))
-                        dupe_count += 1
-
-                conn.commit()
-                log.info(f"Identified {dupe_count} duplicate postings")
+                            WITH ranked AS (
+                                SELECT
+                                    id,
+                                    FIRST_VALUE(id) OVER w AS original_id,
+                                    ROW_NUMBER() OVER w AS rn
+                                FROM observed_jobs
+                                WHERE company_id BETWEEN %s AND %s
+                                  AND content_hash IS NOT NULL
+                                  AND source_type LIKE 'job_posting_%%'
+                                WINDOW w AS (
+                                    PARTITION BY company_id, content_hash
+                                    ORDER BY first_seen ASC, id ASC
+                                )
+                            )
+                            UPDATE observed_jobs o
+                            SET metadata = COALESCE(o.metadata, '{}'::jsonb)
+                                           || jsonb_build_object('is_duplicate_of', r.original_id)
+                            FROM ranked r
+                            WHERE o.id = r.id
+                              AND r.rn > 1
+                              AND (o.metadata->>'is_duplicate_of') IS DISTINCT FROM r.original_id::text
+                        """, (low, high))
+                        dupe_count += cursor.rowcount
+                        conn.commit()
+
+                duplicates_after = self._count_marked_duplicates(cursor)
+            conn.commit()
 
+            result = {
+                'duplicates_before': duplicates_before,
+                'duplicates_after': duplicates_after,
+                'marked': dupe_count,
+                'seconds': round(time.time() - start, 2),
+            }
+            log.info(f"Identified {dupe_count} duplicate postings; "
+                     f"marked duplicates {duplicates_before} -> {duplicates_after} in {result['seconds']}s")
+            return result
+
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             self.db.release_connection(conn)
 
+    @staticmethod
+    def _count_marked_duplicates(cursor) -> int:
+        cursor.execute("""
+            SELECT COUNT(*) FROM observed_jobs
+            WHERE content_hash IS NOT NULL
+              AND metadata ? 'is_duplicate_of'
+        """)
+        return cursor.fetchone()[0]
+
     # =========================================================================
     # HELPER METHODS
     # =========================================================================
 
+    @staticmethod
+    def _source_name(ats_type: str) -> str:
+        return f"Job Postings - {ats_type.title()}"
+
     def _get_or_create_source(self, ats_type: str, company_name: str) -> int:
         """Get or create source record."""
-        source_name = f"Job Postings - {ats_type.title()}"
+        source_name = self._source_name(ats_type)
         conn = self.db.get_connection()
         try:
             with conn.cursor() as cursor:
@@ -558,13 +1014,17 @@ class PostingIngestionManager:
         finally:
             self.db.release_connection(conn)
 
-    def _get_or_create_company(self, company_name: str) -> int:
-        """Get or create company record."""
-        # Normalize company name (same logic as DatabaseManager)
+    @staticmethod
+    def _normalize_company_name(company_name: str) -> str:
+        """Normalize company name (same logic as DatabaseManager)."""
         normalized = company_name.lower().strip()
         for suffix in ['Inc.', 'Inc', 'LLC', 'L.L.C.', 'Corp.', 'Corporation', 'Ltd.', 'Limited', 'Co.', 'Company']:
             normalized = normalized.replace(suffix.lower(), '')
-        normalized = ''.join(c for c in normalized if c.isalnum() or c.isspace()).strip()
+        return ''.join(c for c in normalized if c.isalnum() or c.isspace()).strip()
+
+    def _get_or_create_company(self, company_name: str) -> int:
+        """Get or create company record."""
+        normalized = self._normalize_company_name(company_name)
 
         conn = self.db.get_connection()
         try:
@@ -587,27 +1047,52 @@ class PostingIngestionManager:
         finally:
             self.db.release_connection(conn)
 
+    @staticmethod
+    def _location_key(city: str, state: str, is_remote: bool) -> Tuple[str, str]:
+        return (city or ('Remote' if is_remote else 'Unknown'), state or 'Unknown')
+
     def _get_or_create_location(self, city: str, state: str, is_remote: bool) -> int:
-        """Get or create location record."""
+        """Get or create location record (cached for the run)."""
+        key = self._location_key(city, state, is_remote)
+        if key in self._location_cache:
+            return self._location_cache[key]
+
         conn = self.db.get_connection()
         try:
             with conn.cursor() as cursor:
-                city = city or ('Remote' if is_remote else 'Unknown')
-                state = state or 'Unknown'
-
-                cursor.execute("""
-                    INSERT INTO locations (city, state, country, is_remote)
-                    VALUES (%s, %s, 'United States', %s)
-                    ON CONFLICT (city, state, country)
-                    DO UPDATE SET is_remote = EXCLUDED.is_remote
-                    RETURNING id
-                """, (city, state, is_remote))
-                location_id = cursor.fetchone()[0]
+                location_id = self._get_or_create_locations(cursor, [(city, state, is_remote)])[0]
             conn.commit()
             return location_id
         finally:
             self.db.release_connection(conn)
 
+    def _get_or_create_locations(self, cursor, locations: List[Tuple[str, str, bool]]) -> List[int]:
+        """
+        Resolve (city, state, is_remote) tuples to location ids, upserting
+        any not yet in the run's cache with a single multi-row INSERT.
+        Runs on the caller's cursor/transaction.
+        """
+        missing = {}
+        for city, state, is_remote in locations:
+            key = self._location_key(city, state, is_remote)
+            if key not in self._location_cache:
+                missing[key] = bool(is_remote)
+
+        if missing:
+            rows = execute_values(cursor, """
+                INSERT INTO locations (city, state, country, is_remote)
+                VALUES %s
+                ON CONFLICT (city, state, country)
+                DO UPDATE SET is_remote = EXCLUDED.is_remote
+                RETURNING city, state, id
+            """, [(city, state, is_remote) for (city, state), is_remote in missing.items()],
+                template="(%s, %s, 'United States', %s)",
+                page_size=self.BATCH_PAGE_SIZE, fetch=True)
+            for city, state, location_id in rows:
+                self._location_cache[(city, state)] = location_id
+
+        return [self._location_cache[self._location_key(*location)] for location in locations]
+
     def _update_target_last_fetched(self, target_id: int):
         """Update target's last_fetched timestamp."""
         conn = self.db.get_connection()
@@ -19,9 +19,9 @@ import logging
 import requests
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-import time
 
 from .base_connector import BaseATSConnector, JobPosting
+from .http_client import AsyncFetcher, FetchError
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +59,7 @@ class SmartRecruitersConnector(BaseATSConnector):
     def _get_default_base_url(self) -> str:
         return f"{self.API_BASE}/{self.company_id}"
 
-    def fetch_jobs(self) -> List[JobPosting]:
+    async def fetch_jobs_async(self, fetcher: AsyncFetcher) -> List[JobPosting]:
         """
         Fetch all active job postings from SmartRecruiters.
 
@@ -69,6 +69,7 @@ class SmartRecruitersConnector(BaseATSConnector):
             List of JobPosting objects
         """
         jobs = []
+        self.fetch_error = None
         offset = 0
         limit = 100  # Max per request
 
@@ -82,11 +83,7 @@ class SmartRecruitersConnector(BaseATSConnector):
 
                 logger.info(f"Fetching jobs from: {url} (offset={offset})")
 
-                response = requests.get(
-                    url,
-                    params=params,
-                    timeout=self.REQUEST_TIMEOUT
-                )
+                response = await fetcher.get(url, params=params)
                 response.raise_for_status()
 
                 data = response.json()
@@ -113,17 +110,16 @@ class SmartRecruitersConnector(BaseATSConnector):
                 if offset >= total_found:
                     break
 
-                # Rate limiting
-                time.sleep(0.5)
-
             logger.info(f"Total jobs found at {self.company_name}: {len(jobs)}")
 
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
+        except FetchError as e:
+            self.fetch_error = str(e)
+            if e.status == 404:
                 logger.error(f"Company '{self.company_id}' not found on SmartRecruiters")
             else:
                 logger.error(f"HTTP error fetching SmartRecruiters jobs: {e}")
         except Exception as e:
+            self.fetch_error = str(e)
             logger.error(f"Error fetching SmartRecruiters jobs: {e}")
 
         return jobs
@@ -231,7 +227,7 @@ class SmartRecruitersConnector(BaseATSConnector):
             raw_data=raw_job
         )
 
-    def fetch_job_details(self, job_id: str) -> Optional[Dict]:
+    async def fetch_job_details(self, fetcher: AsyncFetcher, job_id: str) -> Optional[Dict]:
         """
         Fetch detailed job posting including description.
 
@@ -240,7 +236,7 @@ class SmartRecruitersConnector(BaseATSConnector):
         """
         try:
             url = f"{self.base_url}/postings/{job_id}"
-            response = requests.get(url, timeout=self.REQUEST_TIMEOUT)
+            response = await fetcher.get(url)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -8,22 +8,24 @@ Fetches job postings from Workday-powered career sites.
 Workday career sites typically have URLs like:
 https://{company}.wd5.myworkdayjobs.com/en-US/{tenant}/jobs
 
-The jobs are loaded via a GraphQL-like API that returns JSON.
+The jobs are loaded via a GraphQL-like API that returns JSON, 20 per page.
+The first page reports the total, so the remaining pages are fetched
+concurrently (PAGE_WINDOW at a time, within the tenant's host rate limit).
 
 Author: ShortList.ai
 Date: 2026-01-13
 """
 
+import asyncio
 import json
 import logging
 import re
-import requests
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin, urlparse
-import time
 
 from .base_connector import BaseATSConnector, JobPosting
+from .http_client import AsyncFetcher, FetchError
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +53,18 @@ class WorkdayConnector(BaseATSConnector):
         "wd12.myworkdayjobs.com",
     ]
 
+    # Postings per search request (the CXS API rejects larger pages)
+    PAGE_SIZE = 20
+
+    # Requests in flight at once for one tenant. Each tenant has its own
+    # host, so the '.myworkdayjobs.com' HOST_POLICIES entry rate-limits it.
+    PAGE_WINDOW = 4
+
+    API_HEADERS = {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+    }
+
     def __init__(self, company_id: str, company_name: str = None, workday_host: str = None, tenant: str = None):
         """
         Initialize Workday connector.
@@ -61,9 +75,12 @@ class WorkdayConnector(BaseATSConnector):
             company_name: Human-readable company name (optional)
             workday_host: The Workday host (e.g., "wd5.myworkdayjobs.com")
             tenant: The tenant/career site ID (often "en-US" followed by site name)
+
+        Without a host, the host and tenant are discovered on the first fetch.
         """
         self.workday_host = workday_host
         self.tenant = tenant
+        self.careers_url = f"https://{company_id}.{workday_host}/en-US/{tenant}/" if workday_host and tenant else None
 
         super().__init__(
             company_id=company_id,
@@ -71,46 +88,26 @@ class WorkdayConnector(BaseATSConnector):
             base_url=None  # Will be set after discovery
         )
 
-        # Try to discover the correct host if not provided
-        if not self.workday_host:
-            self._discover_workday_config()
-
     def _get_default_base_url(self) -> str:
         if self.workday_host and self.tenant:
             return f"https://{self.company_id}.{self.workday_host}/wday/cxs/{self.company_id}/{self.tenant}"
         return None
 
-    def _discover_workday_config(self):
-        """
-        Try to discover the correct Workday host and tenant.
-
-        Workday URLs follow patterns like:
-        - https://{company}.{host}/wday/cxs/{company}/{tenant}/jobs
-        - https://{company}.{host}/en-US/{tenant}/
-        """
-        for host in self.WORKDAY_HOSTS:
-            # Try the main careers page
-            careers_url = f"https://{self.company_id}.{host}/"
-
-            try:
-                response = requests.get(careers_url, timeout=10, allow_redirects=True)
-                if response.status_code == 200:
-                    # Look for tenant in the response
-                    tenant = self._extract_tenant(response.text, response.url)
-                    if tenant:
-                        self.workday_host = host
-                        self.tenant = tenant
-                        self.base_url = self._get_default_base_url()
-                        self.careers_url = f"https://{self.company_id}.{host}/en-US/{tenant}/"
-                        logger.info(f"Discovered Workday config: host={host}, tenant={tenant}")
-                        return
-            except Exception as e:
-                logger.debug(f"Could not connect to {host}: {e}")
-                continue
-
-        logger.warning(f"Could not auto-discover Workday config for {self.company_id}")
-
-    def _extract_tenant(self, html: str, url: str) -> Optional[str]:
+    async def _discover_workday_config(self, fetcher: AsyncFetcher):
+        """Discover and apply the Workday host and tenant (see discover_company_async)."""
+        config = await self.discover_company_async(fetcher, self.company_id)
+        if not config['found']:
+            logger.warning(f"Could not auto-discover Workday config for {self.company_id}")
+            return
+
+        self.workday_host = config['host']
+        self.tenant = config['tenant']
+        self.base_url = self._get_default_base_url()
+        self.careers_url = f"https://{self.company_id}.{self.workday_host}/en-US/{self.tenant}/"
+        logger.info(f"Discovered Workday config: host={self.workday_host}, tenant={self.tenant}")
+
+    @staticmethod
+    def _extract_tenant(html: str, url: str) -> Optional[str]:
         """
         Extract tenant identifier from Workday page.
 
@@ -137,7 +134,7 @@ class WorkdayConnector(BaseATSConnector):
 
         return None
 
-    def fetch_jobs(self) -> List[JobPosting]:
+    async def fetch_jobs_async(self, fetcher: AsyncFetcher) -> List[JobPosting]:
         """
         Fetch all active job postings from Workday.
 
@@ -147,80 +144,93 @@ class WorkdayConnector(BaseATSConnector):
             List of JobPosting objects
         """
         jobs = []
+        self.fetch_error = None
+
+        if not self.workday_host:
+            await self._discover_workday_config(fetcher)
 
         if not self.base_url:
             logger.error(f"No Workday configuration found for {self.company_id}")
+            self.fetch_error = "No Workday configuration found"
             return jobs
 
-        offset = 0
-        limit = 20  # Workday typically returns 20 per page
-
         try:
-            while True:
-                # Workday uses POST with JSON body for searches
-                search_url = f"{self.base_url}/jobs"
-                payload = {
-                    "appliedFacets": {},
-                    "limit": limit,
-                    "offset": offset,
-                    "searchText": ""
-                }
-
-                headers = {
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json',
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                }
-
-                logger.info(f"Fetching jobs from Workday (offset={offset})")
-
-                response = requests.post(
-                    search_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.REQUEST_TIMEOUT
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                raw_jobs = data.get('jobPostings', [])
-
-                if not raw_jobs:
-                    break
-
-                logger.info(f"Got {len(raw_jobs)} jobs in this batch")
-
-                for raw_job in raw_jobs:
-                    try:
-                        posting = self.parse_job(raw_job)
-                        if posting:
-                            jobs.append(posting)
-                    except Exception as e:
-                        logger.warning(f"Error parsing job: {e}")
-                        continue
-
-                # Check if more pages
-                total = data.get('total', len(raw_jobs))
-                offset += limit
-
-                if offset >= total or len(raw_jobs) < limit:
-                    break
-
-                # Rate limiting
-                time.sleep(0.5)
+            # The first page reports the total; fetch the rest concurrently
+            first_page = await self._fetch_page(fetcher, 0)
+            raw_jobs = list(first_page.get('jobPostings', []))
+            total = first_page.get('total') or len(raw_jobs)
+
+            offsets = range(self.PAGE_SIZE, total, self.PAGE_SIZE) if len(raw_jobs) >= self.PAGE_SIZE else []
+            if offsets:
+                logger.info(f"Fetching {total} jobs from Workday in {len(offsets) + 1} pages")
+                for page in await self._gather_windowed(lambda offset: self._fetch_page(fetcher, offset), offsets):
+                    raw_jobs.extend(page.get('jobPostings', []))
+
+            # Postings added or removed mid-fetch can shift one into two pages
+            seen = set()
+            for raw_job in raw_jobs:
+                try:
+                    posting = self.parse_job(raw_job)
+                    if posting and posting.external_id not in seen:
+                        seen.add(posting.external_id)
+                        jobs.append(posting)
+                except Exception as e:
+                    logger.warning(f"Error parsing job: {e}")
+                    continue
 
             logger.info(f"Total jobs found at {self.company_name}: {len(jobs)}")
 
-        except requests.exceptions.HTTPError as e:
+        except FetchError as e:
             logger.error(f"HTTP error fetching Workday jobs: {e}")
             # Try alternative API structure
-            jobs = self._fetch_jobs_alternative()
+            jobs = await self._fetch_jobs_alternative(fetcher)
+            if not jobs:
+                self.fetch_error = str(e)
         except Exception as e:
+            self.fetch_error = str(e)
             logger.error(f"Error fetching Workday jobs: {e}")
 
         return jobs
 
-    def _fetch_jobs_alternative(self) -> List[JobPosting]:
+    async def _gather_windowed(self, func, items) -> List[Any]:
+        """
+        await func(item) for every item, at most PAGE_WINDOW at a time;
+        results in item order.
+
+        If one fails the rest are cancelled, so a broken tenant doesn't keep
+        spending requests.
+        """
+        window = asyncio.Semaphore(self.PAGE_WINDOW)
+
+        async def run(item):
+            async with window:
+                return await func(item)
+
+        tasks = [asyncio.ensure_future(run(item)) for item in items]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _fetch_page(self, fetcher: AsyncFetcher, offset: int) -> Dict[str, Any]:
+        """One page of the CXS job search."""
+        # Workday uses POST with JSON body for searches
+        payload = {
+            "appliedFacets": {},
+            "limit": self.PAGE_SIZE,
+            "offset": offset,
+            "searchText": ""
+        }
+
+        logger.debug(f"Fetching jobs from Workday (offset={offset})")
+
+        response = await fetcher.post(f"{self.base_url}/jobs", json=payload, headers=self.API_HEADERS)
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch_jobs_alternative(self, fetcher: AsyncFetcher) -> List[JobPosting]:
         """
         Alternative method to fetch jobs if primary API fails.
 
@@ -239,14 +249,9 @@ class WorkdayConnector(BaseATSConnector):
                     'Accept': 'application/json'
                 }
 
-                response = requests.post(
-                    search_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.REQUEST_TIMEOUT
-                )
+                response = await fetcher.post(search_url, json=payload, headers=headers)
 
-                if response.status_code == 200:
+                if response.status == 200:
                     data = response.json()
                     # Process faceted results
                     for item in data.get('facets', []):
@@ -370,34 +375,50 @@ class WorkdayConnector(BaseATSConnector):
         return None
 
     @classmethod
-    def discover_company(cls, company_id: str) -> Dict[str, Any]:
+    async def discover_company_async(cls, fetcher: AsyncFetcher, company_id: str,
+                                     timeout: float = 10, max_retries: int = 0) -> Dict[str, Any]:
         """
-        Check if a company uses Workday and return configuration.
+        Check if a company uses Workday and find its host and tenant.
+
+        Probes every host in WORKDAY_HOSTS at once. Workday URLs follow
+        patterns like:
+        - https://{company}.{host}/wday/cxs/{company}/{tenant}/jobs
+        - https://{company}.{host}/en-US/{tenant}/
 
         Returns:
-            Dict with 'found', 'host', 'tenant' keys
+            Dict with 'found', 'host', 'tenant' keys, plus 'error' (True if
+            nothing was found but some host couldn't be checked)
         """
-        result = {'found': False, 'host': None, 'tenant': None}
+        async def probe(host: str) -> Optional[str]:
+            response = await fetcher.get(f"https://{company_id}.{host}/",
+                                         timeout=timeout, max_retries=max_retries)
+            if response.status in fetcher.RETRY_STATUSES:
+                raise FetchError(f"HTTP {response.status}", status=response.status, url=response.url)
+            if response.status == 200:
+                return cls._extract_tenant(response.text, response.url)
+            return None
 
-        for host in cls.WORKDAY_HOSTS:
-            careers_url = f"https://{company_id}.{host}/"
+        results = await asyncio.gather(*(probe(host) for host in cls.WORKDAY_HOSTS),
+                                       return_exceptions=True)
 
-            try:
-                response = requests.get(careers_url, timeout=10, allow_redirects=True)
-                if response.status_code == 200:
-                    result['found'] = True
-                    result['host'] = host
+        error = False
+        for host, tenant in zip(cls.WORKDAY_HOSTS, results):
+            if isinstance(tenant, Exception):
+                logger.debug(f"Could not connect to {host}: {tenant}")
+                error = True
+            elif tenant:
+                return {'found': True, 'host': host, 'tenant': tenant, 'error': False}
 
-                    # Try to find tenant
-                    tenant_match = re.search(r'/en-US/([^/]+)/', response.url)
-                    if tenant_match:
-                        result['tenant'] = tenant_match.group(1)
+        return {'found': False, 'host': None, 'tenant': None, 'error': error}
 
-                    return result
-            except:
-                continue
+    @classmethod
+    def discover_company(cls, company_id: str) -> Dict[str, Any]:
+        """Blocking discover_company_async() with its own short-lived fetcher."""
+        async def run():
+            async with AsyncFetcher() as fetcher:
+                return await cls.discover_company_async(fetcher, company_id)
 
-        return result
+        return asyncio.run(run())
 
 
 # ============================================================================
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+AsyncFetcher timeout check
+==========================
+
+Starts a local server that accepts requests and never answers, then checks
+that AsyncFetcher gives up with FetchError within its configured timeout -
+both the fetcher-wide default and a per-request override - instead of
+hanging and holding the host's limiter.
+
+No database or network access needed.
+
+Usage:
+    python test_http_client.py
+"""
+
+import asyncio
+import sys
+import time
+
+from aiohttp import web
+
+from sources.job_postings.http_client import AsyncFetcher, FetchError
+
+# Slack for event loop scheduling and retry jitter on a busy machine
+TOLERANCE = 1.0
+
+
+async def stall(request):
+    await asyncio.sleep(3600)
+    return web.Response()
+
+
+async def check(name: str, fetcher: AsyncFetcher, url: str, limit: float, **kwargs) -> bool:
+    """True if the request fails with FetchError within `limit` seconds."""
+    start = time.monotonic()
+    try:
+        await asyncio.wait_for(fetcher.get(url, **kwargs), timeout=limit + 5)
+        outcome = "returned a response"
+    except FetchError:
+        outcome = "FetchError"
+    except asyncio.TimeoutError:
+        outcome = "hung"
+    elapsed = time.monotonic() - start
+
+    passed = outcome == "FetchError" and elapsed <= limit + TOLERANCE
+    print(f"{'PASS' if passed else 'FAIL'}  {name}: {outcome} after {elapsed:.1f}s (limit {limit:.1f}s)")
+    return passed
+
+
+async def run_checks() -> bool:
+    app = web.Application()
+    app.router.add_get('/stall', stall)
+    runner = web.AppRunner(app, shutdown_timeout=0.1)  # Don't wait on stalled handlers
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/stall"
+
+    results = []
+    try:
+        async with AsyncFetcher(timeout=1, max_retries=0) as fetcher:
+            results.append(await check("fetcher default timeout", fetcher, url, 1.0))
+            results.append(await check("per-request timeout", fetcher, url, 0.5, timeout=0.5))
+
+        async with AsyncFetcher(timeout=0.5, max_retries=1, backoff_base=0.1) as fetcher:
+            # Two attempts plus at most one backoff
+            results.append(await check("timeout with retries", fetcher, url, 1.1))
+    finally:
+        await runner.cleanup()
+
+    return all(results)
+
+
+def main():
+    passed = asyncio.run(run_checks())
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
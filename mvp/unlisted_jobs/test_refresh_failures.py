@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Refresh fetch-failure check
+===========================
+
+Serves job boards from a local server and runs PostingRefresher.refresh_target
+against them with an in-memory stand-in for the ingestion manager. A board
+whose fetch fails (missing board, broken response, a page failing mid-way)
+must come back as an error with the target's digest, validators and postings
+left exactly as they were - not be applied as an empty or partial board.
+
+No database or network access needed.
+
+Usage:
+    python test_refresh_failures.py
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from refresh_postings import PostingRefresher
+from sources.job_postings.greenhouse import GreenhouseConnector
+from sources.job_postings.posting_ingestion import IngestionTarget
+from sources.job_postings.smartrecruiters import SmartRecruitersConnector
+
+GREENHOUSE_JOBS = [
+    {'id': 1, 'title': 'Engineer', 'location': {'name': 'Boston, MA'}},
+    {'id': 2, 'title': 'Designer', 'location': {'name': 'Remote'}},
+]
+
+
+class BoardHandler(BaseHTTPRequestHandler):
+    """
+    /gh/ok/jobs       - Greenhouse board with GREENHOUSE_JOBS
+    /gh/gone/jobs     - 404
+    /gh/garbled/jobs  - 200 that isn't JSON
+    /sr/paged/postings - SmartRecruiters board whose second page is refused
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        offset = int(parse_qs(url.query).get('offset', ['0'])[0])
+
+        if url.path == '/gh/ok/jobs':
+            self._send(200, json.dumps({'jobs': GREENHOUSE_JOBS}))
+        elif url.path == '/gh/garbled/jobs':
+            self._send(200, '<html>maintenance</html>')
+        elif url.path == '/sr/paged/postings' and offset == 0:
+            content = [{'id': str(i), 'name': f'Job {i}'} for i in range(100)]
+            self._send(200, json.dumps({'content': content, 'totalFound': 150}))
+        elif url.path == '/sr/paged/postings':
+            self._send(403, '{}')
+        else:
+            self._send(404, '{}')
+
+    def _send(self, status: int, body: str):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeManager:
+    """
+    The parts of PostingIngestionManager that refresh_target() writes
+    through, keeping posting status in memory: a changed board marks the
+    company's postings missing from it removed, like the real diff.
+    """
+
+    def __init__(self, external_ids):
+        self.status = {external_id: 'active' for external_id in external_ids}
+        self.writes = []
+
+    def refresh_unchanged_target(self, target, etag=None, last_modified=None):
+        self.writes.append('refresh_unchanged_target')
+        return 0
+
+    def refresh_changed_target(self, target, postings, etag=None, last_modified=None, digest=None):
+        self.writes.append('refresh_changed_target')
+        seen = {posting.external_id for posting in postings}
+        prefix = f"_{target.company_id_ats}_"
+        removed = 0
+        for external_id in self.status:
+            if prefix not in external_id or external_id in seen:
+                continue
+            if self.status[external_id] == 'active':
+                self.status[external_id] = 'removed'
+                removed += 1
+        for external_id in seen:
+            self.status[external_id] = 'active'
+        return {'fetched': len(postings), 'new': 0, 'modified': 0,
+                'unchanged': len(seen), 'removed': removed}
+
+
+class OfflineRefresher(PostingRefresher):
+    """PostingRefresher without a database connection."""
+
+    def __init__(self, manager: FakeManager, port: int):
+        class LocalGreenhouse(GreenhouseConnector):
+            API_BASE = f"http://127.0.0.1:{port}/gh"
+
+        class LocalSmartRecruiters(SmartRecruitersConnector):
+            API_BASE = f"http://127.0.0.1:{port}/sr"
+
+        self.CONNECTOR_CLASSES = {'greenhouse': LocalGreenhouse,
+                                  'smartrecruiters': LocalSmartRecruiters}
+        self.dry_run = False
+        self.manager = manager
+        self._loop = None
+        self._fetcher = None
+
+    def close(self):
+        if self._fetcher is not None:
+            self._loop.run_until_complete(self._fetcher.close())
+            self._loop.close()
+
+
+def make_target(ats_type: str, company_id: str) -> IngestionTarget:
+    return IngestionTarget(
+        id=1, company_name=company_id.title(), company_id_ats=company_id,
+        ats_type=ats_type, careers_url=f"https://example.com/{company_id}",
+        etag='"v1"', last_modified='Mon, 05 Oct 2026 00:00:00 GMT',
+        board_digest='digest-from-last-refresh',
+    )
+
+
+def check_failure(refresher: OfflineRefresher, ats_type: str, company_id: str) -> bool:
+    """True if refreshing the board fails without changing anything."""
+    target = make_target(ats_type, company_id)
+    before = (target.etag, target.last_modified, target.board_digest, target.last_fetched)
+    statuses = dict(refresher.manager.status)
+
+    result = refresher.refresh_target(target)
+
+    problems = []
+    if 'error' not in result:
+        problems.append(f"returned {result}")
+    if refresher.manager.writes:
+        problems.append(f"wrote through {refresher.manager.writes}")
+    if (target.etag, target.last_modified, target.board_digest, target.last_fetched) != before:
+        problems.append("target fetch state changed")
+    if refresher.manager.status != statuses:
+        problems.append("posting status changed")
+
+    passed = not problems
+    detail = f"error: {result.get('error')}" if passed else '; '.join(problems)
+    print(f"{'PASS' if passed else 'FAIL'}  {ats_type}/{company_id}: {detail}")
+    return passed
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BoardHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    # Postings stored from an earlier refresh of each board
+    stored = ['gh_ok_1', 'gh_ok_2', 'gh_ok_3', 'gh_gone_1', 'gh_garbled_1', 'sr_paged_0', 'sr_paged_120']
+    manager = FakeManager(stored)
+    refresher = OfflineRefresher(manager, port)
+
+    results = []
+    try:
+        # The harness itself: a good fetch is applied, closing what's gone
+        result = refresher.refresh_target(make_target('greenhouse', 'ok'))
+        passed = result.get('removed') == 1 and manager.status['gh_ok_3'] == 'removed'
+        print(f"{'PASS' if passed else 'FAIL'}  greenhouse/ok: applied, {result.get('removed')} removed")
+        results.append(passed)
+        manager.writes.clear()
+
+        results.append(check_failure(refresher, 'greenhouse', 'gone'))
+        results.append(check_failure(refresher, 'greenhouse', 'garbled'))
+        results.append(check_failure(refresher, 'smartrecruiters', 'paged'))
+    finally:
+        refresher.close()
+        server.shutdown()
+
+    passed = all(results)
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
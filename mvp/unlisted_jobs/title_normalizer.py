@@ -16,11 +16,34 @@ Author: ShortList.ai
 
 import re
 import logging
+from functools import lru_cache
 from typing import Tuple, Optional, Dict, List
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Distinct lowercased titles memoized per normalizer (payroll files repeat
+# the same titles thousands of times)
+TITLE_CACHE_SIZE = 100_000
+
+
+def compile_priority_matcher(rule_patterns: List[List[str]]) -> re.Pattern:
+    """
+    Compile ordered rules into a single regex that reports the first rule
+    (in list order) with any pattern matching anywhere in the text.
+
+    Each rule becomes an empty named group `r<index>` guarded by a lookahead,
+    and all branches are anchored at the start of the string. The regex
+    engine tries branches in order, so this keeps the first-match-wins
+    priority of looping `re.search` over every pattern, in one C-level call.
+    Use `.match(text)` and read the rule index from `match.lastgroup`.
+    """
+    branches = []
+    for index, patterns in enumerate(rule_patterns):
+        alternation = '|'.join(f'(?:{pattern})' for pattern in patterns)
+        branches.append(f'(?=.*?(?:{alternation}))(?P<r{index}>)')
+    return re.compile(r'\A(?:' + '|'.join(branches) + ')', re.DOTALL)
+
 
 @dataclass
 class TitleParseResult:
@@ -701,6 +724,17 @@ class TitleNormalizer:
         ],
     }
 
+    # Keyword sets for _tokenize_title
+    LEVEL_KEYWORDS = frozenset(['senior', 'junior', 'lead', 'principal', 'staff', 'intern',
+                                'entry', 'associate', 'manager', 'director', 'chief', 'vp',
+                                'i', 'ii', 'iii'])
+    FUNCTION_KEYWORDS = frozenset(['engineer', 'developer', 'analyst', 'manager', 'scientist',
+                                   'specialist', 'consultant', 'coordinator', 'representative',
+                                   'assistant', 'technician', 'nurse', 'physician', 'teacher'])
+    DOMAIN_KEYWORDS = frozenset(['software', 'data', 'financial', 'marketing', 'sales', 'customer',
+                                 'product', 'project', 'human', 'resources', 'it', 'network',
+                                 'security', 'web', 'mobile', 'cloud', 'database'])
+
     def __init__(self, database_manager=None):
         """
         Initialize title normalizer.
@@ -715,6 +749,23 @@ class TitleNormalizer:
         if self.db:
             self._load_role_mappings()
 
+        self._role_matcher, self._role_names, self._seniority_matcher = self._compiled_rules()
+
+        # Results are shared between callers with the same title - treat as read-only
+        self._parse_lowered = lru_cache(maxsize=TITLE_CACHE_SIZE)(self._parse_lowered_title)
+
+    @classmethod
+    def _compiled_rules(cls):
+        """Compile ROLE_PATTERNS / SENIORITY_PATTERNS once per process (per class)."""
+        compiled = cls.__dict__.get('_COMPILED_RULES')
+        if compiled is None:
+            role_names = list(cls.ROLE_PATTERNS)
+            role_matcher = compile_priority_matcher([cls.ROLE_PATTERNS[name] for name in role_names])
+            seniority_matcher = compile_priority_matcher([[pattern] for pattern, _, _ in cls.SENIORITY_PATTERNS])
+            compiled = (role_matcher, role_names, seniority_matcher)
+            cls._COMPILED_RULES = compiled
+        return compiled
+
     def _load_role_mappings(self):
         """Load canonical roles and mapping rules from database."""
         try:
@@ -756,8 +807,10 @@ class TitleNormalizer:
                 domain_tokens=[]
             )
 
-        title_lower = title.lower()
+        return self._parse_lowered(title.lower())
 
+    def _parse_lowered_title(self, title_lower: str) -> TitleParseResult:
+        """Uncached parse of an already-lowercased, non-empty title."""
         # Parse seniority
         seniority, seniority_confidence = self._detect_seniority(title_lower)
 
@@ -792,9 +845,10 @@ class TitleNormalizer:
         Returns:
             (seniority_level, confidence)
         """
-        for pattern, level, confidence in self.SENIORITY_PATTERNS:
-            if re.search(pattern, title_lower):
-                return level, confidence
+        match = self._seniority_matcher.match(title_lower)
+        if match:
+            _, level, confidence = self.SENIORITY_PATTERNS[int(match.lastgroup[1:])]
+            return level, confidence
 
         # Default to mid if no seniority detected
         return 'mid', 0.3
@@ -806,22 +860,16 @@ class TitleNormalizer:
         Returns:
             (level_tokens, function_tokens, domain_tokens)
         """
+        words = title_lower.split()
+
         # Level tokens (seniority indicators)
-        level_keywords = ['senior', 'junior', 'lead', 'principal', 'staff', 'intern',
-                         'entry', 'associate', 'manager', 'director', 'chief', 'vp', 'i', 'ii', 'iii']
-        level_tokens = [word for word in title_lower.split() if word in level_keywords]
+        level_tokens = [word for word in words if word in self.LEVEL_KEYWORDS]
 
         # Function tokens (what they do)
-        function_keywords = ['engineer', 'developer', 'analyst', 'manager', 'scientist',
-                           'specialist', 'consultant', 'coordinator', 'representative',
-                           'assistant', 'technician', 'nurse', 'physician', 'teacher']
-        function_tokens = [word for word in title_lower.split() if word in function_keywords]
+        function_tokens = [word for word in words if word in self.FUNCTION_KEYWORDS]
 
         # Domain tokens (area of work)
-        domain_keywords = ['software', 'data', 'financial', 'marketing', 'sales', 'customer',
-                          'product', 'project', 'human', 'resources', 'it', 'network',
-                          'security', 'web', 'mobile', 'cloud', 'database']
-        domain_tokens = [word for word in title_lower.split() if word in domain_keywords]
+        domain_tokens = [word for word in words if word in self.DOMAIN_KEYWORDS]
 
         return level_tokens, function_tokens, domain_tokens
 
@@ -832,11 +880,10 @@ class TitleNormalizer:
         Returns:
             (canonical_role_name, confidence)
         """
-        # Try high-precision patterns first
-        for canonical_role, patterns in self.ROLE_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, title_lower):
-                    return canonical_role, 0.90
+        # Try high-precision patterns first (one pass, ROLE_PATTERNS order wins)
+        match = self._role_matcher.match(title_lower)
+        if match:
+            return self._role_names[int(match.lastgroup[1:])], 0.90
 
         # Try fuzzy matching on function words
         if 'engineer' in title_lower:
@@ -890,13 +937,19 @@ class TitleNormalizer:
         """
         Parse multiple titles in batch.
 
+        Titles are deduplicated (case-insensitively) first so each distinct
+        title is parsed once, then results are broadcast back to input order.
+
         Args:
-            titles: List of raw job titles
+            titles: List (or pandas Series) of raw job titles
 
         Returns:
-            List of TitleParseResult
+            List of TitleParseResult, aligned with the input
         """
-        return [self.parse_title(title) for title in titles]
+        lowered = [title.lower() if isinstance(title, str) and title else None for title in titles]
+        parsed = {key: self.parse_title(key) for key in dict.fromkeys(lowered) if key is not None}
+        empty = self.parse_title(None)
+        return [parsed[key] if key is not None else empty for key in lowered]
 
 
 def seed_canonical_roles(database_manager):